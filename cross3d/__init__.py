@@ -2,6 +2,33 @@
 import glob
 import os
 import sys
+import imp
+import time as _time
+import types as _types
+
+# Time spent importing cross3d, see importReport.
+_importStart = _time.time()
+_importTimes = []
+
+class _Cross3dModule(_types.ModuleType):
+	""" The cross3d module, importing the module of a lazy symbol the first time it is accessed.
+
+	Python 2 modules can not define __getattr__, so this module replaces the one created by the
+	import in sys.modules. It does so before importing the library modules, so the modules importing
+	cross3d while it is initialized get the module the symbols are registered in.
+	"""
+	def __getattr__(self, name):
+		if name not in _lazySymbols:
+			raise AttributeError("'module' object has no attribute '%s'" % name)
+		return _resolveSymbol(name)
+
+	def __dir__(self):
+		return sorted(set(self.__dict__) | set(_lazySymbols))
+
+	def __setattr__(self, name, value):
+		_types.ModuleType.__setattr__(self, name, value)
+		if name == 'debugLevel':
+			_applyDebugLevel(value)
 
 
 # Setup logging for the cross3d library.
@@ -32,6 +59,8 @@ if not logger.handlers:
 # 		cross3d.debugLevel = cross3d.constants.DebugLevels.Mid
 # To check if the current debug level is Mid or higher:
 #		cross3d.debugLevel >= cross3d.constants.DebugLevels.Mid
+# Setting it to High also installs cross3d.hostProfiler, which counts the calls made into the
+# host software per cross3d function, see HostProfiler.
 from constants import DebugLevels as _DebugLevels
 debugLevel = _DebugLevels[os.getenv('CROSS3D_DEBUG_LEVEL', 'Disabled')]
 
@@ -88,33 +117,84 @@ def debugObjectString(object, msg):
 _debugModule = os.getenv('CROSS3D_DEBUG_MODULE')
 logger.debug('DebugModule: {}'.format(_debugModule))
 
+_module = _Cross3dModule(__name__, __doc__)
+_module.__dict__.update(globals())
+# The functions of this file keep using the globals of the original module, which python 2 clears
+# when the module is collected.
+_module._originalModule = sys.modules[__name__]
+sys.modules[__name__] = _module
+
 import constants
 
+_classesStart = _time.time()
 from classes import FCurve
 from classes import Exceptions
 from classes import ValueRange
 from classes import FrameRange
+from classes import FrameSet
 from classes import FileSequence
 from classes import Timecode
 from classes import Clipboard
 from classes import FlipBook
+from classes import PointCacheFile
 from classes import Dispatch as _Dispatch
+from classes import HostProfiler as _HostProfiler
+_importTimes.append(('import cross3d.classes', _time.time() - _classesStart))
+
+# Dispatch uses cross3d.migrate.aboutToClearPaths. It is not a software specific module, so init does not import it.
+import migrate
 
 # Global Dispatch object.  This is the main entry point for connecting to events and signals generated by the 3D environment.
 dispatch = _Dispatch()
 
+# Counts the calls made into the host software, installed while debugLevel is High.
+hostProfiler = _HostProfiler()
+
+def _applyDebugLevel(level):
+	if level >= _DebugLevels.High:
+		if not hostProfiler.isInstalled():
+			hostProfiler.install()
+	elif hostProfiler.isInstalled():
+		hostProfiler.uninstall()
+
+# The packages that are not software specific modules.
+_libraryPackages = ('abstract', 'classes', 'migrate')
+
+# The module each software specific module needs, probed before the package itself is imported.
+_hostModules = {
+	'studiomax': 'Py3dsMax',
+	'maya': 'maya',
+	'softimage': 'PySoftimage',
+	'motionbuilder': 'pyfbsdk',
+}
+
 def _methodNames():
 	filenames = glob.glob(os.path.split(__file__)[0] + '/*/__init__.py')
 	ret = []
 	for filename in filenames:
 		modname = os.path.normpath(filename).split(os.path.sep)[-2]
-		if (modname != 'abstract'):
-			ret.append(os.path.normpath(filename).split(os.path.sep)[-2])
+		if modname not in _libraryPackages:
+			ret.append(modname)
 	return ret
 
 def packageName(modname):
 	return 'cross3d.%s' % modname
 
+def _probeHost(modname):
+	""" Returns False if the software of the modname package is certainly not available.
+
+	The probe only looks for the module the package needs on the path, it does not import the
+	package or the module. Packages without a known host module are always tried.
+	"""
+	hostModule = _hostModules.get(modname)
+	if hostModule is None or hostModule in sys.modules:
+		return True
+	try:
+		imp.find_module(hostModule)
+	except ImportError:
+		return False
+	return True
+
 def init():
 	if _debugModule != None:
 		logger.debug('Forced import of Software Specific module: {}'.format(_debugModule))
@@ -127,26 +207,42 @@ def init():
 	else:
 		# import any overrides to the abstract symbols
 		for modname in _methodNames():
+			start = _time.time()
+			if not _probeHost(modname):
+				_importTimes.append(('probe %s' % modname, _time.time() - start))
+				continue
+
 			pckg = packageName(modname)
 
 			# Attempt to import and init this modname.
 			try:
 				__import__(pckg)
 			except ImportError:
+				_importTimes.append(('import %s' % pckg, _time.time() - start))
 				continue
 
 			mod = sys.modules[pckg]
 			try:
 				mod.init()
+				_importTimes.append(('init %s' % pckg, _time.time() - start))
 				logger.debug('The module "{}" initialized successfully.'.format(modname))
 				# The module successfully initalized no need to try any other modules.
 				break
 			except:
+				_importTimes.append(('init %s' % pckg, _time.time() - start))
 				continue
 
 	# import the abstract api for default implementations of api
+	start = _time.time()
 	import abstract
 	abstract.init()
+	_importTimes.append(('init cross3d.abstract', _time.time() - start))
+
+	# Resolving all the lazy symbols upfront restores the import behavior of older versions, which
+	# helps tracking down import order issues.
+	if os.getenv('CROSS3D_EAGER_SYMBOLS'):
+		for name in sorted(_lazySymbols):
+			getattr(sys.modules[__name__], name)
 
 def external(appName):
 	appName = appName.lower()
@@ -160,16 +256,73 @@ def external(appName):
 	except AttributeError:
 		return cross3d.abstract.external.External
 
-def registerSymbol(name, value, ifNotFound=False):
+#--------------------------------------------------------------------------------
+# Symbol registry
+#--------------------------------------------------------------------------------
+
+# The symbols registered lazily and not used yet. { name: (modulePath, attribute) }
+_lazySymbols = {}
+
+def registerSymbol(name, value, ifNotFound=False, lazy=False):
 	"""
 		Used by the *adaptors* to register their own classes and functions as
 		part of the cross3d.  
+
+		With lazy, value is the path of the module defining the symbol, optionally
+		followed by ":attribute". The module is only imported the first time the
+		symbol is accessed, and is expected to register the symbol when imported.
 	"""
 	# initialize a value in the dictionary
 	import cross3d
-	if ifNotFound and name in cross3d.__dict__:
-		return
+	if ifNotFound:
+		if name in cross3d.__dict__:
+			return
+
+		# A lazy symbol is resolved by its own module, whatever ifNotFound says.
+		pending = _lazySymbols.get(name)
+		if pending and (lazy or pending[0] != getattr(value, '__module__', None)):
+			return
+
+	if lazy:
+		modulePath, _, attribute = value.partition(':')
+		cross3d.__dict__.pop(name, None)
+		_lazySymbols[name] = (modulePath, attribute or None)
+	else:
+		_lazySymbols.pop(name, None)
+		cross3d.__dict__[name] = value
+
+def _resolveSymbol(name):
+	modulePath, attribute = _lazySymbols[name]
+	start = _time.time()
+	__import__(modulePath)
+	cross3d = sys.modules[__name__]
+
+	# Importing the module normally registers the symbol.
+	if name in _lazySymbols:
+		module = sys.modules[modulePath]
+		if attribute is None or not hasattr(module, attribute):
+			raise ImportError('{} did not register the cross3d.{} symbol.'.format(modulePath, name))
+		registerSymbol(name, getattr(module, attribute))
+	hostProfiler.patchModules()
+	_importTimes.append(('symbol %s from %s' % (name, modulePath), _time.time() - start))
+	return cross3d.__dict__[name]
+
+def importReport():
+	""" Returns a report of the time spent importing cross3d.
+
+	It lists the import of cross3d.classes, the probe, import or init of each software specific
+	module that was tried, the init of the abstract module and the lazy symbols resolved since.
+	Set the CROSS3D_IMPORT_PROFILE environment variable to print it once cross3d is imported.
+	"""
+	lines = ['%-72s %9.2f ms' % (label, seconds * 1000) for label, seconds in _importTimes]
+	lines.append('%d symbols not resolved yet: %s' % (len(_lazySymbols), ', '.join(sorted(_lazySymbols))))
+	return '\n'.join(lines)
 
-	cross3d.__dict__[name] = value
+# The globals defined since the module was replaced.
+_module.__dict__.update((key, value) for key, value in globals().items() if key not in _module.__dict__)
 
 init()
+_applyDebugLevel(debugLevel)
+_importTimes.append(('import cross3d', _time.time() - _importStart))
+if os.getenv('CROSS3D_IMPORT_PROFILE'):
+	sys.stderr.write(importReport() + '\n')
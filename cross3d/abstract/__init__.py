@@ -9,36 +9,50 @@
 #	\date		03/15/10
 #
 
+import cross3d
 import external
 
+# The abstract modules and the symbols they register when the software specific module does not
+# define them. They are imported the first time one of their symbols is used.
+_lazyModules = (
+	('abstractexceptionrouter', ('ExceptionRouter',)),
+	('abstractuserprops', ('UserProps', 'FileProps')),
+	('abstractundocontext', ('UndoContext',)),
+	('abstractapplication', ('Application', 'application')),
+	('abstractscene', ('Scene',)),
+	('abstractscenewrapper', ('SceneWrapper',)),
+	('abstractsceneobject', ('SceneObject',)),
+	('abstractcontainer', ('Container',)),
+	('abstractscenelayer', ('SceneLayer',)),
+	('abstractscenelayergroup', ('SceneLayerGroup',)),
+	('abstractgroup', ('Group',)),
+	('abstractscenematerial', ('SceneMaterial',)),
+	('abstractscenemap', ('SceneMap',)),
+	('abstractsceneatmospheric', ('SceneAtmospheric',)),
+	('abstractscenefx', ('SceneFx',)),
+	('abstractscenerenderer', ('SceneRenderer',)),
+	('abstractscenemodel', ('SceneModel',)),
+	('abstractscenecamera', ('SceneCamera',)),
+	('abstractscenerenderpass', ('SceneRenderPass',)),
+	('abstractsceneviewport', ('SceneViewport',)),
+	('abstractsceneanimationcontroller', ('SceneAnimationController',)),
+	('abstractsceneanimationkey', ('SceneAnimationKey',)),
+	('abstractscenecache', ('SceneCache',)),
+	('abstractscenepropset', ('ScenePropSet', 'SceneObjectPropSet')),
+	('mixer.trackportion', ('TrackPortion',)),
+	('mixer.clipportion', ('ClipPortion',)),
+	('mixer.clip', ('Clip',)),
+	('mixer.track', ('Track',)),
+	('mixer.trackgroup', ('TrackGroup',)),
+	('mixer.mixer', ('Mixer',)),
+	('collection', ('Collection',)),
+)
+
 def init():
 	"""
 	Initializes the original abstract classes, registering them to the api 
 	module when necessary
 	"""
-	import abstractexceptionrouter
-	import abstractuserprops
-	import abstractundocontext
-	import abstractapplication
-	import abstractscene
-	import abstractscenewrapper
-	import abstractsceneobject
-	import abstractcontainer
-	import abstractscenelayer
-	import abstractscenelayergroup
-	import abstractgroup
-	import abstractscenematerial
-	import abstractscenemap
-	import abstractsceneatmospheric
-	import abstractscenefx
-	import abstractscenerenderer
-	import abstractscenemodel
-	import abstractscenecamera
-	import abstractscenerenderpass
-	import abstractsceneviewport
-	import abstractsceneanimationcontroller
-	import abstractsceneanimationkey
-	import abstractscenecache
-	import abstractscenepropset
-	import mixer
-	import collection
+	for module, symbols in _lazyModules:
+		for symbol in symbols:
+			cross3d.registerSymbol(symbol, '{}.{}'.format(__name__, module), ifNotFound=True, lazy=True)
@@ -15,14 +15,15 @@ the method.  All @abstractmethod methods MUST be implemented in a subclass.
 import re
 
 import cross3d
-from PyQt4.QtCore import QObject
 from cross3d import abstractmethod
+# QObject when PyQt4 is available, the pure python SignalBus otherwise.
+from cross3d.classes.dispatch import SignalBase
 from contextlib import contextmanager
 
 dispatch = None
 
 
-class AbstractApplication(QObject):
+class AbstractApplication(SignalBase):
 	"""
 	The Application class will define all operations for application 
 	interaction. It is a singleton class, so calling cross3d.Application() will
@@ -41,7 +42,7 @@ class AbstractApplication(QObject):
 	_blockRefresh = False
 
 	def __init__(self):
-		QObject.__init__(self)
+		SignalBase.__init__(self)
 		self._objectToBeDeleted = None
 
 	def connect(self):
@@ -5,7 +5,7 @@
 #				package will access information from a Scene instance.  This way, you can have a reference to a Studiomax scene, a Softimage scene, a
 #				Proxy scene, whatever, and access all generic object, layer, material information in the same way
 #
-#				The AbstractScene is a QObject instance and any changes to scene data can be controlled by connecting to the signals defined here.
+#				The AbstractScene is a QObject instance (a SignalBus without Qt) and any changes to scene data can be controlled by connecting to the signals defined here.
 #
 #				When subclassing the AbstractScene, methods tagged as @abstractmethod will be required to be overwritten.  Methods tagged with [virtual]
 #				are flagged such that additional operations could be required based on the needs of the method.  All @abstractmethod methods MUST be implemented
@@ -22,25 +22,25 @@
 import collections as _collections
 
 import cross3d
-from PyQt4.QtCore import QObject, pyqtSignal
 from cross3d import abstractmethod, constants
+from cross3d.classes.dispatch import Signal, SignalBase
 
-class AbstractScene(QObject):
+class AbstractScene(SignalBase):
 	# layer signals
-	layerStateChanged			 = pyqtSignal()
-	layerCreated				 = pyqtSignal(object)
-	layerRenamed				 = pyqtSignal(object)
-	layerRemoved 				 = pyqtSignal(object)
-	layerGroupCreated			 = pyqtSignal(str)
-	layerGroupRemoved			 = pyqtSignal(str)
+	layerStateChanged			 = Signal()
+	layerCreated				 = Signal(object)
+	layerRenamed				 = Signal(object)
+	layerRemoved 				 = Signal(object)
+	layerGroupCreated			 = Signal(str)
+	layerGroupRemoved			 = Signal(str)
 
 	# generic signals
-	progressUpdated				 = pyqtSignal(str, int, str)		# section, % complete (0-100), message
-	progressErrored				 = pyqtSignal(str, str)			# section, error message
+	progressUpdated				 = Signal(str, int, str)		# section, % complete (0-100), message
+	progressErrored				 = Signal(str, str)			# section, error message
 
 	# submit signals
-	submitSuccess				 = pyqtSignal()
-	submitError					 = pyqtSignal(str)
+	submitSuccess				 = Signal()
+	submitError					 = Signal(str)
 
 	# create the scene instance
 	_instance = None
@@ -49,7 +49,7 @@ class AbstractScene(QObject):
 	_updatesDisabled = 0
 
 	def __init__(self):
-		QObject.__init__(self)
+		SignalBase.__init__(self)
 
 		# create custom properties
 		self._materialCache		 = None
@@ -57,6 +57,7 @@ class AbstractScene(QObject):
 		self._metaData 		     = None
 		self._buffer             = {}
 		self._state		    	 = {}
+		self._identityMap		 = None
 
 	#------------------------------------------------------------------------------------------------------------------------
 	# 												protected methods
@@ -84,6 +85,38 @@ class AbstractScene(QObject):
 		"""
 		return False
 
+	def _cacheNativeMaps(self, cacheType, nativeMaps):
+		"""Cache the inputed native maps in the scene.
+
+		Hosts that store their caches in scene data override this to store all the maps with a
+		single write, the default caches them one by one.
+
+		:type cacheType: :class:`cross3d.constants.MapCacheType`
+		:param nativeMaps: list of nativeMaps [<variant> nativeMap, ..]
+		:return: True if the cache changed, False otherwise
+		:rtype: bool
+		"""
+		changed = False
+		for nativeMap in nativeMaps:
+			changed = bool(self._cacheNativeMap(cacheType, nativeMap)) or changed
+		return changed
+
+	def _cacheNativeMaterials(self, cacheType, nativeMaterials):
+		"""Cache the inputed native materials in the scene.
+
+		Hosts that store their caches in scene data override this to store all the materials
+		with a single write, the default caches them one by one.
+
+		:type cacheType: :class:`cross3d.constants.MaterialCacheType`
+		:param nativeMaterials: list of nativeMaterials [<variant> nativeMaterial, ..]
+		:return: True if the cache changed, False otherwise
+		:rtype: bool
+		"""
+		changed = False
+		for nativeMaterial in nativeMaterials:
+			changed = bool(self._cacheNativeMaterial(cacheType, nativeMaterial)) or changed
+		return changed
+
 	@abstractmethod
 	def _cachedNativeMap(self, cacheType, uniqueId, default=None):
 		"""Return the cached native map for the inputed material id.
@@ -106,6 +139,26 @@ class AbstractScene(QObject):
 		"""
 		return default
 
+	def _cachedNativeMapsForIds(self, cacheType, uniqueIds, default=None):
+		"""Return the cached native maps for the inputed map ids, in the same order.
+
+		:type cacheType: :class:`cross3d.constants.MapCacheType`
+		:param uniqueIds: list of ids [<str> uniqueId, ..]
+		:param default: value returned for the ids that were not found
+		:rtype: list of nativeMaps [<variant> nativeMap || default, ..]
+		"""
+		return [self._cachedNativeMap(cacheType, uniqueId, default=default) for uniqueId in uniqueIds]
+
+	def _cachedNativeMaterialsForIds(self, cacheType, uniqueIds, default=None):
+		"""Return the cached native materials for the inputed material ids, in the same order.
+
+		:type cacheType: :class:`cross3d.constants.MaterialCacheType`
+		:param uniqueIds: list of ids [<str> uniqueId, ..]
+		:param default: value returned for the ids that were not found
+		:rtype: list of nativeMaterials [<variant> nativeMaterial || default, ..]
+		"""
+		return [self._cachedNativeMaterial(cacheType, uniqueId, default=default) for uniqueId in uniqueIds]
+
 	@abstractmethod
 	def _cachedNativeMaps(self, cacheType):
 		"""Return the cached native maps for the inputed cache type.
@@ -468,6 +521,14 @@ class AbstractScene(QObject):
 		"""
 		return []
 
+	def _iterNativeLayers(self, wildcard=''):
+		""" Yields the native layers of the scene whose name matches wildcard, one at a time.
+
+		The default implementation iterates _nativeLayers, back-ends reimplement it to stream the
+		layers from the host.
+		"""
+		return iter(self._nativeLayers(wildcard))
+
 	@abstractmethod
 	def _nativeLayerGroups(self):
 		"""
@@ -486,6 +547,14 @@ class AbstractScene(QObject):
 		"""
 		return []
 
+	def _iterNativeMaterials(self, baseMaterials=False):
+		""" Yields the native materials of the scene one at a time.
+
+		The default implementation iterates _nativeMaterials, back-ends reimplement it to stream
+		the materials from the host.
+		"""
+		return iter(self._nativeMaterials(baseMaterials))
+
 	@abstractmethod
 	def _nativeMaps(self):
 		"""
@@ -504,6 +573,36 @@ class AbstractScene(QObject):
 		"""
 		return []
 
+	def _iterNativeObjects(self, wildcard='', objectType=0, layer=None, selected=None):
+		""" Yields the native objects of the scene matching all the predicates, one at a time.
+
+		The default implementation lets _nativeObjects apply the selection, wildcard and type
+		predicates, or the layer list its objects, and tests the remaining predicates on the
+		wrappers of the objects. Back-ends reimplement it to translate the predicates into native
+		filtered queries and to stream the objects from the host.
+
+		Args:
+			wildcard (str): A star based wildcard the object names must match.
+			objectType (int): A cross3d.constants.ObjectType, 0 for any type.
+			layer: The native layer the objects must be on, None for any layer.
+			selected (bool): True for selected objects only, False for unselected objects only, None
+				for both.
+		"""
+		from cross3d import SceneObject, SceneLayer
+		from cross3d.classes.scenequery import ObjectQuery
+		query = ObjectQuery(wildcard, objectType, layer, selected)
+		if layer is not None:
+			nativeObjects = SceneLayer(self, layer)._nativeObjects()
+			applied = ('layer',)
+		else:
+			nativeObjects = self._nativeObjects(bool(selected), wildcard, objectType)
+			applied = ('wildcard', 'objectType', 'selected') if selected else ('wildcard', 'objectType')
+		return query.filter(nativeObjects, applied,
+							name=lambda nativeObject: SceneObject(self, nativeObject).name(),
+							objectType=SceneObject._typeOfNativeObject,
+							layer=lambda nativeObject: SceneObject(self, nativeObject)._nativeLayer(),
+							selected=lambda nativeObject: SceneObject(self, nativeObject).isSelected())
+
 	@abstractmethod
 	def _nativeRootObject(self):
 		"""
@@ -1348,7 +1447,7 @@ class AbstractScene(QObject):
 	def setRenderFrameRange(self, frameRange):
 		"""
 			\remarks	set the render frame range of the scene
-			\param		size	<cross3d.FrameRange>
+			\param		size	<cross3d.FrameRange> || <cross3d.FrameSet> for sparse or stepped frames
 			\return		<bool> success
 		"""
 		return False
@@ -1437,7 +1536,17 @@ class AbstractScene(QObject):
 			\return		<bool> success
 		"""
 		return self._cacheNativeMap(cacheType, sceneMap.nativePointer())
-	
+
+	def cacheMaps(self, cacheType, sceneMaps):
+		"""
+			\remarks	cache the inputed maps in the scene for the given cache type, hosts store them with a single write
+			\sa			_cacheNativeMaps
+			\param		cacheType	<cross3d.constants.MapCacheType>
+			\param		sceneMaps	<list> [ <cross3d.SceneMap> map, .. ]
+			\return		<bool> changed
+		"""
+		return self._cacheNativeMaps(cacheType, [sceneMap.nativePointer() for sceneMap in sceneMaps])
+
 	def cacheMaterial(self, cacheType, material):
 		"""
 			\remarks	cache the inputed material in the scene for the given cache type
@@ -1448,6 +1557,16 @@ class AbstractScene(QObject):
 		"""
 		return self._cacheNativeMaterial(cacheType, material.nativePointer())
 
+	def cacheMaterials(self, cacheType, materials):
+		"""
+			\remarks	cache the inputed materials in the scene for the given cache type, hosts store them with a single write
+			\sa			_cacheNativeMaterials
+			\param		cacheType	<cross3d.constants.MaterialCacheType>
+			\param		materials	<list> [ <cross3d.SceneMaterial> material, .. ]
+			\return		<bool> changed
+		"""
+		return self._cacheNativeMaterials(cacheType, [material.nativePointer() for material in materials])
+
 	def cachedMap(self, cacheType, uniqueId, default=None):
 		"""
 			\remarks	return the cached map given the inputed id
@@ -1461,7 +1580,20 @@ class AbstractScene(QObject):
 		if (nativeMap):
 			from cross3d import SceneMap
 			return SceneMap(self, nativeMap)
-		return None
+		return default
+
+	def cachedMapsForIds(self, cacheType, uniqueIds, default=None):
+		"""
+			\remarks	return the cached maps for all the inputed ids at once, in the same order
+			\sa			_cachedNativeMapsForIds
+			\param		cacheType	<cross3d.constants.MapCacheType>
+			\param		uniqueIds	<list> [ <str> uniqueId, .. ]
+			\param		default		<variant>	value returned for the ids that were not found
+			\return		<list> [ <cross3d.SceneMap> || default, .. ]
+		"""
+		from cross3d import SceneMap
+		nativeMaps = self._cachedNativeMapsForIds(cacheType, uniqueIds)
+		return [SceneMap(self, nativeMap) if nativeMap else default for nativeMap in nativeMaps]
 
 	def cachedMaps(self, cacheType):
 		"""
@@ -1482,11 +1614,24 @@ class AbstractScene(QObject):
 			\param		default		<variant>	default return value if not found
 			\return		<cross3d.SceneMaterial> || None
 		"""
-		nativeMaterial = self._cachedNativeMaterial(cacheType, uniqueId, default=default)
+		nativeMaterial = self._cachedNativeMaterial(cacheType, uniqueId)
 		if (nativeMaterial):
 			from cross3d import SceneMaterial
 			return SceneMaterial(self, nativeMaterial)
-		return None
+		return default
+
+	def cachedMaterialsForIds(self, cacheType, uniqueIds, default=None):
+		"""
+			\remarks	return the cached materials for all the inputed ids at once, in the same order
+			\sa			_cachedNativeMaterialsForIds
+			\param		cacheType	<cross3d.constants.MaterialCacheType>
+			\param		uniqueIds	<list> [ <str> uniqueId, .. ]
+			\param		default		<variant>	value returned for the ids that were not found
+			\return		<list> [ <cross3d.SceneMaterial> || default, .. ]
+		"""
+		from cross3d import SceneMaterial
+		nativeMaterials = self._cachedNativeMaterialsForIds(cacheType, uniqueIds)
+		return [SceneMaterial(self, nativeMaterial) if nativeMaterial else default for nativeMaterial in nativeMaterials]
 
 	def cachedMaterials(self, cacheType):
 		"""
@@ -1498,6 +1643,15 @@ class AbstractScene(QObject):
 		from cross3d import SceneMaterial
 		return [ SceneMaterial(self, material) for material in self._cachedNativeMaterials(cacheType) if material != None ]
 
+	def cameras(self, wildcard=''):
+		"""
+			\remarks	returns the cameras in the scene
+			\sa			iterCameras
+			\param		wildcard <string>
+			\return		<list> [ <cross3d.SceneCamera>, .. ]
+		"""
+		return list(self.iterCameras(wildcard))
+
 	@abstractmethod
 	def importFBX(self, path, **kwargs):
 		return False
@@ -1790,7 +1944,7 @@ class AbstractScene(QObject):
 			\param		state		<bool>
 			\return		<bool> success
 		"""
-		return self._freezeNativeObjects([ obj.nativePointer() for obj in objects ], state)
+		return cross3d.Collection(self, objects).setFrozen(state)
 
 	def findAtmospheric(self, name='', uniqueId=0):
 		"""
@@ -1957,7 +2111,7 @@ class AbstractScene(QObject):
 			\param		state		<bool>
 			\return		<bool> success
 		"""
-		return self._hideNativeObjects([ obj.nativePointer() for obj in objects ], state)
+		return cross3d.Collection(self, objects).setHidden(state)
 
 	def highlightObjects(self, objects, color=None, tme=.2, branch=True):
 		"""
@@ -1970,6 +2124,55 @@ class AbstractScene(QObject):
 		"""
 		return self._highlightNativeObjects([obj.nativePointer() for obj in objects], color, tme, branch)
 
+	def identityMap(self):
+		"""Return the identity map of the scene, None if it is disabled.
+		
+		:rtype: :class:`cross3d.classes.identitymap.IdentityMap` || None
+		"""
+		return self._identityMap
+
+	def setIdentityMapEnabled(self, state):
+		"""Enable or disable the identity map of the scene.
+		
+		While it is enabled, wrapping a native object that is already wrapped returns the existing
+		SceneObject with its cached type instead of probing the native object again. Wrappers are
+		weakly referenced, and the map is invalidated by the objectDeleted, objectRenamed and
+		sceneInvalidated dispatch signals. Its hit rate is available from identityMap().stats().
+		
+		:type state: bool
+		:return: True if successful, False otherwise
+		:rtype: bool
+		"""
+		if bool(state) == (self._identityMap is not None):
+			return True
+		from cross3d.classes.identitymap import IdentityMap
+		connections = (('objectDeleted', self._identityMapObjectDeleted),
+					('objectRenamed', self._identityMapObjectRenamed),
+					('sceneInvalidated', self._identityMapSceneInvalidated))
+		if state:
+			self._identityMap = IdentityMap()
+			for signal, slot in connections:
+				cross3d.dispatch.connect(signal, slot)
+		else:
+			for signal, slot in connections:
+				cross3d.dispatch.disconnect(signal, slot)
+			self._identityMap = None
+		return True
+
+	def _identityMapObjectDeleted(self, name):
+		# Only the name of deleted objects is known, and a native handle may be reused by a new object.
+		if self._identityMap is not None:
+			self._identityMap.invalidate()
+
+	def _identityMapObjectRenamed(self, oldName, newName, sceneObject):
+		# The object type can depend on the name, for instance for namespaced Maya models.
+		if self._identityMap is not None and sceneObject is not None:
+			self._identityMap.discard(sceneObject._identityKey)
+
+	def _identityMapSceneInvalidated(self):
+		if self._identityMap is not None:
+			self._identityMap.invalidate()
+
 	def isEnvironmentMapOverridden(self):
 		"""
 			\remarks	checks to see if the current environment map is in an overridden state
@@ -1986,6 +2189,50 @@ class AbstractScene(QObject):
 		"""
 		return self._isolateNativeObjects([ obj.nativePointer() for obj in objects ])
 
+	def iterCameras(self, wildcard=''):
+		""" Yields the cameras of the scene one at a time.
+
+		Args:
+			wildcard (str): A star based wildcard the camera names must match.
+		"""
+		return self.iterObjects(wildcard, constants.ObjectType.Camera)
+
+	def iterLayers(self, wildcard=''):
+		""" Yields the layers of the scene one at a time, wrapped as they are reached.
+
+		Args:
+			wildcard (str): A star based wildcard the layer names must match.
+		"""
+		from cross3d import SceneLayer
+		for nativeLayer in self._iterNativeLayers(wildcard):
+			yield SceneLayer(self, nativeLayer)
+
+	def iterMaterials(self, baseMaterials=False):
+		""" Yields the materials of the scene one at a time, wrapped as they are reached. """
+		from cross3d import SceneMaterial
+		for nativeMaterial in self._iterNativeMaterials(baseMaterials):
+			yield SceneMaterial(self, nativeMaterial)
+
+	def iterObjects(self, wildcard='', type=0, layer=None, selected=None):
+		""" Yields the objects of the scene matching all the predicates, wrapped as they are reached.
+
+		Unlike objects, nothing is collected upfront: looking for the first match or streaming the
+		objects into another loop only reads the objects it gets to. Back-ends apply the predicates
+		natively where they can, for instance by only visiting the nodes of the layer. The scene
+		should not be modified while iterating.
+
+		Args:
+			wildcard (str): A star based wildcard the object names must match.
+			type (int): A cross3d.constants.ObjectType, 0 for any type.
+			layer (cross3d.SceneLayer): The layer the objects must be on, None for any layer.
+			selected (bool): True for selected objects only, False for unselected objects only, None
+				for both.
+		"""
+		from cross3d import SceneObject
+		nativeLayer = layer.nativePointer() if layer is not None else None
+		for nativeObject in self._iterNativeObjects(wildcard, type, nativeLayer, selected):
+			yield SceneObject(self, nativeObject)
+
 	def layers(self, wildcard=''):
 		"""
 			\remarks	collects all the layers in the scene and returns them
@@ -2186,7 +2433,7 @@ class AbstractScene(QObject):
 			\param		objects		<list> [ <cross3d.SceneObject>, .. ]
 			\return		<bool> success
 		"""
-		return self._removeNativeObjects([ obj.nativePointer() for obj in objects if not obj.isDeleted()])
+		return cross3d.Collection(self, [obj for obj in objects if not obj.isDeleted()]).delete()
 
 	def renameObjects(self, objects, names, display=True):
 		"""
@@ -2261,7 +2508,7 @@ class AbstractScene(QObject):
 			if (sceneMap):
 				nativeMap = sceneMap.nativePointer()
 
-			nativeMaps[index] = sceneMap
+			nativeMaps[index] = nativeMap
 			self._setCachedNativeMaps(cacheType, nativeMaps)
 			return True
 		return False
@@ -2273,7 +2520,7 @@ class AbstractScene(QObject):
 			\param		sceneMaps		<list> [ <cross3d.SceneMap> map, .. ]
 			\return		<bool> success
 		"""
-		return self._setCachedNativeMaps([sceneMap.nativePointer() for sceneMap in sceneMaps])
+		return self._setCachedNativeMaps(cacheType, [sceneMap.nativePointer() for sceneMap in sceneMaps])
 
 	def setCachedMaterialAt(self, cacheType, index, material):
 		"""
@@ -2289,7 +2536,7 @@ class AbstractScene(QObject):
 			if (material):
 				nativeMaterial = material.nativePointer()
 
-			nativeMaterials[index] = material
+			nativeMaterials[index] = nativeMaterial
 			self._setCachedNativeMaterials(cacheType, nativeMaterials)
 			return True
 		return False
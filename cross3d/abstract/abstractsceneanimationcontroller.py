@@ -61,31 +61,51 @@ class AbstractSceneAnimationController(SceneWrapper):
 	#								public methods
 	#--------------------------------------------------------------------------------
 
-	def bake(self, rng=None, interpolation=TangentType.Automatic, extrapolation=ExtrapolationType.Constant):
-		""" TODO: Add support for extrapolation.
+	def bake(self, rng=None, interpolation=TangentType.Automatic, extrapolation=ExtrapolationType.Constant, tolerance=None):
+		""" Replaces the controller with keys sampled every frame.
+
+		Args:
+			rng (FrameRange): The range to bake, defaults to the scene animation range.
+			interpolation (TangentType): The tangent type of the baked keys.
+			extrapolation (ExtrapolationType): The extrapolation of the baked curve.
+			tolerance (float): If provided, the samples are reduced to the fewest Bezier keys
+				passing within tolerance of them and interpolation is ignored.
+
+		TODO: Add support for extrapolation.
 		"""
 
 		# If the use does not provide a range we use the active range instead.
 		if not rng:
 			rng = self._scene.animationRange()
 
-		# Creating a FCurve instead to store all the data.
-		fCurve = FCurve()
+		# Sampling the whole range with a single host call.
+		frames = range(rng[0], rng[1] + 1)
+		values = self.valuesAtFrames(frames)
+
+		if tolerance is not None:
+
+			# Fitting as few keys as possible on the samples.
+			fCurve = FCurve.fromSamples(frames, values, tolerance)
+
+		else:
+
+			# Creating a FCurve instead to store all the data.
+			fCurve = FCurve()
 
-		# Figuring the tangent type.
-		tangentType = interpolation
+			# Figuring the tangent type.
+			tangentType = interpolation
 
-		# Feeling up the FCurve data for the desired range.
-		for frame in range(rng[0], rng[1] + 1):
+			# Feeling up the FCurve data for the desired range.
+			for frame, value in zip(frames, values):
 
-			if interpolation == TangentType.Automatic:
+				if interpolation == TangentType.Automatic:
 
-				# Defining tangent types. We don't want automatic for last and first key.
-				tangentType = TangentType.Linear if frame in (rng[0], rng[1]) else TangentType.Automatic
+					# Defining tangent types. We don't want automatic for last and first key.
+					tangentType = TangentType.Linear if frame in (rng[0], rng[1]) else TangentType.Automatic
 
-			# TODO: Use abstracted tangent types.
-			kwargs = {'time': frame, 'value': self.valueAtFrame(frame), 'inTangentType': tangentType, 'outTangentType': tangentType}
-			fCurve.addKey(**kwargs)
+				# TODO: Use abstracted tangent types.
+				kwargs = {'time': frame, 'value': value, 'inTangentType': tangentType, 'outTangentType': tangentType}
+				fCurve.addKey(**kwargs)
 
 		# Applying the FCurve to the controller.
 		self.setFCurve(fCurve)
@@ -168,9 +188,94 @@ class AbstractSceneAnimationController(SceneWrapper):
  	def valueAtFrame(self, frame):
  		return 0.0
 
- 	@abstractmethod
- 	def framesForValue(self, value):
- 		return []
+	def valuesAtFrames(self, frames):
+		"""Returns the values of the controller at each of the frames.
+
+		Back-ends should override this to sample all the frames with a single
+		host call, the default implementation calls valueAtFrame for each frame.
+
+		Args:
+			frames (list): The frames to sample.
+
+		Returns:
+			list: One float per frame.
+		"""
+		return [self.valueAtFrame(frame) for frame in frames]
+
+	@classmethod
+	def valuesAtFramesForControllers(cls, controllers, frames):
+		"""Samples many controllers at the same frames.
+
+		Back-ends should override this to sample all the controllers with a single
+		host call.
+
+		Args:
+			controllers (list): The SceneAnimationControllers to sample.
+			frames (list): The frames to sample.
+
+		Returns:
+			list: A list of values per controller, in the order of controllers.
+		"""
+		frames = list(frames)
+		return [controller.valuesAtFrames(frames) for controller in controllers]
+
+	def framesForValue(self, value, closest=True):
+		""" Returns a list o frames that match the given controller value.
+
+		Args:
+		    value (float): The value we want to lookup frame for.
+		    closest (bool, optional): This will return the closest value if not value can be found.
+
+		Returns:
+		    list: The list of matching frames.
+		"""
+
+		# Keyed controllers can solve their curve for the value directly.
+		fCurve = self.fCurve()
+		if fCurve:
+			frames = sorted(set(int(round(time)) for time in fCurve.timesForValue(value)))
+			if frames or not closest:
+				return frames
+
+		# TODO: (Douglas) This function is far from being perfect but it does the job.
+		frames = {}
+
+		keys = self.keys()
+		closestFrame = 0
+		if keys:
+			start = int(round(keys[0].time()))
+			end = int(round(keys[-1].time()))
+			index = 0
+			previousValue = None
+			closestValue = 0.0
+
+			# Sampling all the frames with a single host call.
+			sampledFrames = range(start, end + 1)
+			values = self.valuesAtFrames(sampledFrames)
+
+			# Looping through frames.
+			for frame, currentValue in zip(sampledFrames, values):
+
+				if closest:
+					if abs(value - currentValue) < abs(value - closestValue):
+						closestValue = currentValue
+						closestFrame = frame
+
+				if round(currentValue) == round(value):
+					if previousValue is None or abs(value - currentValue) < abs(value - previousValue):
+						frames[index] = frame
+
+						# Saving value as previous value.
+						previousValue = currentValue
+
+				elif frames.get(index):
+					index += 1
+					previousValue = None
+
+		if not frames and closest:
+			return [closestFrame]
+
+		return sorted(frames.values())
 
  	@abstractmethod
  	def fCurve(self):
@@ -191,6 +296,36 @@ class AbstractSceneAnimationController(SceneWrapper):
  	def setFCurve(self, fCurve):
  		return False
 
+	@classmethod
+	def fCurvesForControllers(cls, controllers):
+		"""Returns the FCurves of many controllers.
+
+		Back-ends should override this to read all the curves with a single host call.
+
+		Args:
+			controllers (list): The SceneAnimationControllers to read.
+
+		Returns:
+			list: One FCurve per controller.
+		"""
+		return [controller.fCurve() for controller in controllers]
+
+	@classmethod
+	def setFCurvesForControllers(cls, controllers, fCurves):
+		"""Applies an FCurve to each controller.
+
+		Back-ends should override this to write all the curves with a single host call.
+
+		Args:
+			controllers (list): The SceneAnimationControllers to write.
+			fCurves (list): One FCurve per controller.
+
+		Returns:
+			bool: True if all the curves were applied.
+		"""
+		results = [controller.setFCurve(fCurve) for controller, fCurve in zip(controllers, fCurves)]
+		return all(results)
+
 
 	def extrapolation(self):
 		return None
@@ -237,15 +372,16 @@ class AbstractSceneAnimationController(SceneWrapper):
 
 	def valueRange(self, frameRange=None):
 		frameRange = self.frameRange() if frameRange is None else frameRange
-		low = None
-		high = None
-		for frame in range(frameRange.start(), frameRange.end() + 1):
-			value = self.valueAtFrame(frame)
-			if low is None or value < low:
-				low = value
-			if high is None or value > high:
-				high = value
-		return (low, high)
+
+		# Keyed controllers can solve their range from the curve segments without sampling.
+		fCurve = self.fCurve()
+		if fCurve:
+			return tuple(fCurve.valueRange((frameRange.start(), frameRange.end())))
+
+		values = self.valuesAtFrames(range(frameRange.start(), frameRange.end() + 1))
+		if not values:
+			return (None, None)
+		return (min(values), max(values))
 
 # register the symbol
 cross3d.registerSymbol('SceneAnimationController', AbstractSceneAnimationController, ifNotFound=True)
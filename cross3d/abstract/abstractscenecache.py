@@ -38,6 +38,18 @@ class AbstractSceneCache(SceneWrapper):
 		"""
 		return self.setEnabled(True)
 
+	def fileHeader(self):
+		"""Reads the header of the point cache file this cache is pulling from
+		without going through the host application.
+
+		:return: :class:`cross3d.classes.cachefile.PointCacheHeader` or None if the
+				 file is missing or is not a PC2 point cache
+
+		"""
+		from cross3d.classes.cachefile import scanHeaders
+		filename = self.filename()
+		return scanHeaders([filename])[filename] if filename else None
+
 	@abstractmethod
 	def filename(self):
 		"""Return the filename that this cache is pulling from
@@ -10,10 +10,28 @@
 #
 
 import cross3d
-from PyQt4.QtGui import QColor
 from cross3d import SceneWrapper, abstractmethod
 from cross3d.constants import ObjectType, RotationOrder
 
+class _SceneObjectFactory(type):
+	""" Returns the wrapper already created for a native object when its scene has an identity map.
+	A cached wrapper skips both the __new__ type probe and __init__.
+	"""
+
+	def __call__(cls, scene, nativeObject, *args, **kwargs):
+		identityMap = getattr(scene, '_identityMap', None)
+		if identityMap is None or nativeObject is None or args or kwargs:
+			return type.__call__(cls, scene, nativeObject, *args, **kwargs)
+
+		key = cls._nativeIdentity(nativeObject)
+		if key is None:
+			return type.__call__(cls, scene, nativeObject)
+		wrapper = identityMap.get(key, cls)
+		if wrapper is None:
+			wrapper = identityMap.add(key, type.__call__(cls, scene, nativeObject))
+			wrapper._identityKey = key
+		return wrapper
+
 class AbstractSceneObject(SceneWrapper):
 
 	"""
@@ -22,15 +40,23 @@ class AbstractSceneObject(SceneWrapper):
 		generic overview structure for all manipulations of 3d objects
 	"""
 
+	__metaclass__ = _SceneObjectFactory
+
 	_objectType = ObjectType.Generic
 	_subClasses = {}
+	_identityKey = None
+
+	# The symbols of the specialized wrappers __new__ returns, they can be registered lazily.
+	_specializedSymbols = ('SceneCamera', 'SceneModel')
 
 	def __init__(self, scene, nativeObject):
 		SceneWrapper.__init__(self, scene, nativeObject)
 
 		# This is for further type definition for generic objects we did not implement in the API.
+		# __new__ already probed the native type, so it is reused when available.
+		objectType = self.__dict__.pop('_probedObjectType', None)
 		if self._objectType & ObjectType.Generic:
-			self._objectType = self._typeOfNativeObject(nativeObject)
+			self._objectType = objectType if objectType is not None else self._typeOfNativeObject(nativeObject)
 
 		self._parameters = {}
 
@@ -40,6 +66,9 @@ class AbstractSceneObject(SceneWrapper):
 			\return		<variant> SceneObject
 		"""
 		if not cls._subClasses:
+			# The specialized wrappers are only found once their modules are imported.
+			for name in cls._specializedSymbols:
+				getattr(cross3d, name, None)
 			for c in cls._subclasses(cls):
 				if not c._objectType == ObjectType.Generic:
 					cls._subClasses[ c._objectType ] = c
@@ -48,8 +77,11 @@ class AbstractSceneObject(SceneWrapper):
 			
 		if sceneObjectType in cls._subClasses:
 			c = cls._subClasses[sceneObjectType]
-			return SceneWrapper.__new__(c)
-		return SceneWrapper.__new__(cls)
+			sceneObject = SceneWrapper.__new__(c)
+		else:
+			sceneObject = SceneWrapper.__new__(cls)
+		sceneObject._probedObjectType = sceneObjectType
+		return sceneObject
 
 	#------------------------------------------------------------------------------------------------------------------------
 	# 												protected methods
@@ -95,6 +127,15 @@ class AbstractSceneObject(SceneWrapper):
 		"""
 		return []
 
+	def _iterNativeChildren(self, recursive=False, wildcard='', type=''):
+		"""
+			\remarks	yields the native children for this object one at a time, depth first when recursive. The default implementation
+						iterates _nativeChildren, back-ends reimplement it to walk the hierarchy lazily
+			\sa			iterChildren
+			\return		<iterator> [ <variant> nativeObject, .. ]
+		"""
+		return iter(self._nativeChildren(recursive, wildcard, type))
+
 	@abstractmethod
 	def _nativeLayer(self):
 		"""
@@ -282,10 +323,25 @@ class AbstractSceneObject(SceneWrapper):
 		:type type: str
 		:return: list of :class:`cross3d.SceneObject` objects
 
+		"""
+		return list(self.iterChildren(recursive, wildcard, type))
+
+	def iterChildren(self, recursive=False, wildcard='', type=''):
+		"""Yields SceneObject wrappers over the children for this object, wrapping each child as
+		it is reached.
+
+		:param recursive: If True, will recursively traverse child tree depth first
+		:param wildcard: A star based wildcard the child names must match
+		:type wildcard: str
+		:param type: ?
+		:type type: str
+		:return: iterator of :class:`cross3d.SceneObject` objects
+
 		"""
 		from cross3d import SceneObject
 		scene = self._scene
-		return [SceneObject(scene, native) for native in self._nativeChildren(recursive, wildcard, type)]
+		for native in self._iterNativeChildren(recursive, wildcard, type):
+			yield SceneObject(scene, native)
 
 	def constrainedObjects(self):
 		from cross3d import SceneObject
@@ -621,6 +677,7 @@ class AbstractSceneObject(SceneWrapper):
 		:param color: :class:`PyQt4.QtGui.QColor`
 
 		"""
+		from PyQt4.QtGui import QColor
 		return self._setNativeWireColor(self._scene._toNativeValue(QColor(color)))
 
 	@abstractmethod
@@ -726,6 +783,16 @@ class AbstractSceneObject(SceneWrapper):
 		"""
 		return ObjectType.Generic
 
+	@classmethod
+	def _nativeIdentity(cls, nativeObject):
+		"""
+			\remarks	[virtual]	returns a hashable key that identifies the nativeObject for the lifetime of the scene. The scene identity map
+						uses it to return the same wrapper for the same native object. None disables the identity map for the object.
+			\param		<variant> nativeObject
+			\return		<hashable> key || None
+		"""
+		return None
+
 	#------------------------------------------------------------------------------------------------------------------------
 	# 												static methods
 	#------------------------------------------------------------------------------------------------------------------------
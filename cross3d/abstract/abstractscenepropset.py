@@ -8,10 +8,236 @@
 #	\date		09/08/10
 #
 
+import re
+import zlib
+
 import cross3d
 from cross3d import SceneWrapper, abstractmethod
 
 
+# Values the legacy format wrote with str() that are read back without evaluating them.
+_legacyInteger = re.compile(r'^[-+]?\d+L?$')
+_legacyFloat = re.compile(r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$|^[-+]?(inf|nan)$')
+_legacyString = re.compile(r'''^(?:'([^'\\]*)'|"([^"\\]*)")$''')
+_legacyConstants = {'True': True, 'False': False, 'None': None}
+
+# Marks a field that could not be read, the property keeps its current value.
+_keep = object()
+
+# The encoders of the most common types, subclasses are handled by PropSetCodec._encodeValue.
+_encoders = {
+	type(None): lambda value: 'n',
+	bool: lambda value: 'T' if value else 'F',
+	int: lambda value: 'i%d' % value,
+	float: lambda value: 'f%r' % value,
+	str: lambda value: 's' + PropSetCodec._escape(value),
+}
+
+
+class PropSetCodec(object):
+	"""
+	Encodes and decodes the values of a property set as a string.
+
+	Records start with a header holding the format version and an id of the
+	property names they were written with. Each value is prefixed with its
+	type and '|' separates the values. Strings escape '\\' and '|' so any
+	value survives a round trip, and nothing is ever evaluated when a record
+	is read. Records written by the legacy format, the str() of each value
+	joined by '|', are still read::
+
+		codec = PropSetCodec.forKeys(['renderable', 'gbufferchannel'])
+		record = codec.encode([True, 3])		# '#2:1b7f6a2c|T|i3'
+		codec.decode(record, [True, 0])			# [True, 3]
+
+	Codecs are shared per list of property names, and each one caches the
+	records it decoded, as many objects and layers store the same records.
+	Records written with the property names of another codec are read by
+	property name. When their property names are unknown the values are
+	read in order, and records of an unknown version are not read at all.
+	
+	:param keys: list of property names, in the order of the values
+	
+	"""
+	version = 2
+	cacheSize = 4096
+	_codecs = {}
+	# The property names of the codecs created so far by schema id.
+	_schemas = {}
+
+	def __init__(self, keys):
+		self._keys = tuple(str(key) for key in keys)
+		self._schemaId = '%08x' % (zlib.crc32('|'.join(self._keys)) & 0xffffffff)
+		self._header = '#%d:%s' % (self.version, self._schemaId)
+		self._schemas.setdefault(self._schemaId, self._keys)
+		self._decoded = {}
+		self.hits = 0
+		self.misses = 0
+
+	@classmethod
+	def forKeys(cls, keys):
+		"""
+		Returns the codec shared by the property sets with the inputed property names
+		
+		:param keys: list of property names
+		:return: :class:`PropSetCodec`
+		
+		"""
+		keys = tuple(keys)
+		codec = cls._codecs.get(keys)
+		if codec is None:
+			codec = cls._codecs[keys] = cls(keys)
+		return codec
+
+	def keys(self):
+		return list(self._keys)
+
+	def schemaId(self):
+		"""
+		Returns the id of the property names, written in the header of the records
+		
+		"""
+		return self._schemaId
+
+	@staticmethod
+	def _escape(text):
+		return text.replace('\\', '\\\\').replace('|', '\\p')
+
+	@classmethod
+	def _encodeValue(cls, value):
+		encoder = _encoders.get(type(value))
+		if encoder is not None:
+			return encoder(value)
+		if isinstance(value, (int, long)):
+			return 'i%d' % value
+		if isinstance(value, float):
+			return 'f%r' % value
+		if isinstance(value, unicode):
+			return 'u' + cls._escape(value.encode('utf-8'))
+		return 's' + cls._escape(str(value))
+
+	@staticmethod
+	def _unescape(text):
+		if '\\' not in text:
+			return text
+		return re.sub(r'\\(.)', lambda match: '|' if match.group(1) == 'p' else match.group(1), text)
+
+	@classmethod
+	def _decodeValue(cls, field):
+		code, payload = field[:1], field[1:]
+		try:
+			if code == 'T':
+				return True
+			if code == 'F':
+				return False
+			if code == 'n':
+				return None
+			if code == 'i':
+				return int(payload)
+			if code == 'f':
+				return float(payload)
+			if code == 's':
+				return cls._unescape(payload)
+			if code == 'u':
+				return cls._unescape(payload).decode('utf-8')
+		except ValueError:
+			pass
+		return _keep
+
+	@staticmethod
+	def _decodeLegacyValue(token):
+		if token in _legacyConstants:
+			return _legacyConstants[token]
+		if _legacyInteger.match(token):
+			return int(token.rstrip('L'))
+		if _legacyFloat.match(token):
+			return float(token)
+		match = _legacyString.match(token)
+		if match:
+			return match.group(1) if match.group(1) is not None else match.group(2)
+
+		# Undefined max values were written as is and read back as a string.
+		if token == 'undefined':
+			return token
+		return _keep
+
+	def encode(self, values):
+		"""
+		Returns the record of the inputed values
+		
+		:param values: list of values, one per property name
+		:return: str
+		
+		"""
+		encodeValue = self._encodeValue
+		return '|'.join([self._header] + [encodeValue(value) for value in values])
+
+	def _parse(self, record):
+		""" Returns a (token, value) tuple per property, token is only kept for legacy records. """
+		fields = record.split('|')
+		if not (fields[0].startswith('#') and ':' in fields[0]):
+			return [(field, self._decodeLegacyValue(field)) for field in fields]
+
+		version, schemaId = fields[0][1:].split(':', 1)
+		parser = self._parsers.get(version)
+		if parser is None:
+			# Written by a newer format, every property keeps its value.
+			return []
+		return parser(self, schemaId, fields[1:])
+
+	def _parseVersion2(self, schemaId, fields):
+		values = [(None, self._decodeValue(field)) for field in fields]
+		if schemaId == self._schemaId:
+			return values
+		keys = self._schemas.get(schemaId)
+		if keys is None:
+			# The property names the record was written with are unknown, the values are read in order.
+			return values
+		values = dict(zip(keys, values))
+		return [values.get(key, (None, _keep)) for key in self._keys]
+
+	# The parsers of the records by the version in their header.
+	_parsers = {'2': _parseVersion2}
+
+	def decode(self, record, defaults):
+		"""
+		Returns the values stored in the inputed record. Properties missing from
+		the record or that can't be read keep their default value.
+		
+		:param record: str
+		:param defaults: list of the current values, one per property name
+		:return: list of values
+		
+		"""
+		record = str(record)
+		parsed = self._decoded.get(record)
+		if parsed is None:
+			self.misses += 1
+			if len(self._decoded) >= self.cacheSize:
+				self._decoded.clear()
+			parsed = self._decoded[record] = self._parse(record)
+		else:
+			self.hits += 1
+
+		values = list(defaults)
+		for index, (token, value) in enumerate(parsed[:len(values)]):
+			# Legacy records wrote booleans either as integers or as True and False.
+			if token is not None and type(values[index]) == bool:
+				values[index] = token in ('1', 'True')
+			elif value is not _keep:
+				values[index] = value
+		return values
+
+	def isLegacy(self, record):
+		"""
+		Returns whether the inputed record was written by the legacy format
+		
+		"""
+		return not str(record).startswith('#')
+
+	def clearCache(self):
+		self._decoded.clear()
+
+
 class AbstractScenePropSet(SceneWrapper):
 	"""
 	The ScenePropSet defines a class that creates a generic property set 
@@ -137,6 +363,6 @@ class AbstractScenePropSet(SceneWrapper):
 
 
 # register the class to the system
-cross3d.registerSymbol('ScenePropSet', AbstractScenePropSet)
-cross3d.registerSymbol('SceneObjectPropSet', AbstractScenePropSet)
+cross3d.registerSymbol('ScenePropSet', AbstractScenePropSet, ifNotFound=True)
+cross3d.registerSymbol('SceneObjectPropSet', AbstractScenePropSet, ifNotFound=True)
 
@@ -53,5 +53,5 @@ class AbstractSceneRenderPass(SceneWrapper): # new douglas. technically it shoul
 
 
 # register the symbol
-cross3d.registerSymbol('SceneRenderPass', AbstractSceneRenderPass)
+cross3d.registerSymbol('SceneRenderPass', AbstractSceneRenderPass, ifNotFound=True)
 
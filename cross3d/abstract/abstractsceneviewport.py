@@ -199,4 +199,4 @@ class AbstractSceneViewport(QObject):
 
 
 # register the symbol
-cross3d.registerSymbol('SceneViewport', AbstractSceneViewport)
+cross3d.registerSymbol('SceneViewport', AbstractSceneViewport, ifNotFound=True)
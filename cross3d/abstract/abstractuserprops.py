@@ -13,7 +13,6 @@ import re
 import json
 import cross3d
 from collections import OrderedDict
-from PyQt4.QtCore import QTimer as _QTimer
 
 dispatchObject = cross3d.dispatch.dispatchObject
 
@@ -322,7 +321,8 @@ class AbstractFileProps(AbstractUserProps):
 		if save:
 			self._saveScheduled = save
 		if not self._closeScheduled:
-			_QTimer.singleShot(0, self._close)
+			from PyQt4.QtCore import QTimer
+			QTimer.singleShot(0, self._close)
 			self._closeScheduled = True
 
 	def clear(self):
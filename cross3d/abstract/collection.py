@@ -11,7 +11,6 @@
 #-------------------------------------------------------------------------
 
 import cross3d
-from cross3d import abstractmethod
 from collections import MutableSequence
 
 class Collection(MutableSequence):
@@ -19,51 +18,100 @@ class Collection(MutableSequence):
 	""" 
 		The Collection object allows to perform operation on several objects at once
 		allowing to optimize the process and lift weight from the Scene object.
+
+		The collection stores the native pointers of its objects, SceneObject wrappers are only
+		created when items are accessed. Software specific collections implement the bulk
+		operations with a single native call.
 	"""
 
-	# ----------------------------------------------
+	def __init__(self, scene, objects=[]):
+		objects = list(objects)
+		self._scene = scene
+		self._nativeObjects = [self._nativeObject(obj) for obj in objects]
+		self._objects = [obj if isinstance(obj, cross3d.SceneObject) else None for obj in objects]
+		super(Collection, self).__init__()
+
+	@classmethod
+	def _nativeObject(cls, obj):
+		if isinstance(obj, cross3d.SceneObject):
+			return obj.nativePointer()
+		return obj
 
-	# TODO: Implement that block.
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self[i] for i in xrange(*index.indices(len(self)))]
+		obj = self._objects[index]
+		if obj is None:
+			obj = cross3d.SceneObject(self._scene, self._nativeObjects[index])
+			self._objects[index] = obj
+		return obj
 
 	def __setitem__(self, index, item):
-		pass
+		self._nativeObjects[index] = self._nativeObject(item)
+		self._objects[index] = item if isinstance(item, cross3d.SceneObject) else None
 
 	def __delitem__(self, index):
-		pass
+		del self._nativeObjects[index]
+		del self._objects[index]
 
 	def __len__(self):
-		pass
+		return len(self._nativeObjects)
 
 	def insert(self, index, item):
-		pass
-		
+		self._nativeObjects.insert(index, self._nativeObject(item))
+		self._objects.insert(index, item if isinstance(item, cross3d.SceneObject) else None)
+
+	def nativeObjects(self):
+		return list(self._nativeObjects)
+
+	def objects(self):
+		return self[:]
+
 	# ----------------------------------------------
 
-	@classmethod
-	def _objectsGenerator(cls, scene, objects):
-		for obj in objects:
-			if isinstance(obj, cross3d.SceneObject):
-				yield obj
-			else:
-				yield cross3d.SceneObject(scene, obj)
+	def delete(self):
+		""" Deletes all the objects from the scene and empties the collection. """
+		ret = self._scene._removeNativeObjects(self._nativeObjects)
+		del self[:]
+		return ret
 
-	@classmethod
-	def _nativeObjectsGenerator(cls, objects):
-		for obj in objects:
-			if isinstance(obj, cross3d.SceneObject):
-				yield obj()
-			else:
-				yield obj
-
-	def __init__(self, scene, objects):
-		self._scene = scene
-		self._objects = self._objectsGenerator(scene, objects)
-		self._nativeObjects = self._nativeObjectsGenerator(objects)
-		super(Collection, self).__init__()
+	def setFrozen(self, state):
+		return self._scene._freezeNativeObjects(self._nativeObjects, state)
+
+	def setHidden(self, state):
+		return self._scene._hideNativeObjects(self._nativeObjects, state)
+
+	def setLayer(self, layer):
+		""" Moves all the objects to the layer, None moves them to the world layer. """
+		return all([obj.setLayer(layer) for obj in self])
+
+	def setMaterial(self, material):
+		return all([obj.setMaterial(material) for obj in self])
+
+	def setParent(self, parent):
+		return all([obj.setParent(parent) for obj in self])
+
+	def setWireColor(self, color):
+		return all([obj.setWireColor(color) for obj in self])
+
+	def setUserProps(self, props):
+		""" Updates the user props of all the objects with the props dictionary. """
+		for obj in self:
+			obj.userProps().update(props)
+		return True
+
+	def translate(self, axes, relative=False):
+		""" Translates all the objects. Collections of software that translate several objects at
+		once implement it, by default the objects are given to Scene.translate.
+
+		:param axes: A list with a length of 3 floats representing x, y, z
+		:param relative: Apply the translation as relative or absolute. Absolute by default.
+		"""
+		return self._scene.translate(self.objects(), axes, relative)
 
-	@abstractmethod
-	def setHidden(self, hidden):
-		return False
+	def userProps(self):
+		""" Returns a list with a copy of the user props dictionary of each object. """
+		return [obj.userProps().copy() for obj in self]
 
 # Registering the symbol.
-cross3d.registerSymbol('Collection', Collection)
+cross3d.registerSymbol('Collection', Collection, ifNotFound=True)
@@ -10,13 +10,19 @@
 
 #------------------------------------------------------------------------------------------------------------------------
 
-from PyQt4.QtCore import QObject
+import os
+import sys
+
 from cross3d import abstractmethod
 from cross3d.constants import ScriptLanguage
 
 #------------------------------------------------------------------------------------------------------------------------
 
-class External(QObject):
+class External(object):
+	# Number of jobs submitted with submit that can run at the same time.
+	_maxConcurrentJobs = int(os.environ.get('CROSS3D_EXTERNAL_MAX_JOBS', 4))
+	# Shared JobQueue per application name, created on first use.
+	_jobQueues = {}
 	# map languages to ids
 	_languageIDs = {'English': ('409', 'en-US', 'ENU'), 'French': ('40C', 'fr-FR', 'FRA'), 'German': ('407', 'de-DE', 'DEU'), 
 					'Japanese': ('411', 'ja-JP', 'JPN'), 'Korean': ('412', 'ko-KR', 'KOR'), 'Simplified Chinese': ('804', 'zh-CN', 'CHS')}
@@ -44,6 +50,97 @@ class External(QObject):
 	def runScript(cls, script, version=None, architecture=64, language=ScriptLanguage.Python, debug=False, headless=True):
 		return False
 	
+	@classmethod
+	def jobCommand(cls, runnerPath, directory, version=None, architecture=64, debug=False, headless=True):
+		""" Returns the command line that launches the application and runs the python file
+		runnerPath. Any extra file the application needs is written to directory. This
+		implementation runs the python file in the current python interpreter, it is used as a
+		stand-in for the application by tests. Software specific modules override it to launch
+		their application.
+		"""
+		return [sys.executable, runnerPath]
+
+	@classmethod
+	def jobQueue(cls):
+		""" The JobQueue used by submit when no queue is provided. At most 
+		CROSS3D_EXTERNAL_MAX_JOBS jobs run at once per application, 4 by default.
+		"""
+		name = cls.name()
+		if name not in External._jobQueues:
+			from cross3d.classes.externaljob import JobQueue
+			External._jobQueues[name] = JobQueue(cls._maxConcurrentJobs)
+		return External._jobQueues[name]
+
+	@classmethod
+	def submit(cls, script, version=None, architecture=64, language=ScriptLanguage.Python, debug=False, headless=True, timeout=None, queue=None, keepFiles=True):
+		""" Runs a script in a new instance of the application without blocking.
+
+		Unlike runScript every job uses its own script and log files, so any number of jobs can
+		be submitted at once::
+
+			External = cross3d.external('studiomax')
+			jobs = [External.submit(convertScript % path, timeout=600) for path in paths]
+			for job in jobs:
+				print job.exitCode(), job.result()
+
+		Args:
+			script (str): The script source, or the path to a script file. Python scripts return
+				a value by assigning it to a global named result.
+			version: The version of the software. Default is the latest installed version.
+			architecture (int): The bit type of the software (32, 64).
+			language (ScriptLanguage): The language of the script.
+			debug (bool): Keep the application open once the script finished.
+			headless (bool): Run the application without user interface where supported.
+			timeout (float): Seconds before the application is killed.
+			queue (cross3d.classes.externaljob.JobQueue): Queue limiting how many jobs run at once.
+				Defaults to jobQueue().
+			keepFiles (bool): Keep the job directory once the job finished.
+
+		Returns:
+			cross3d.classes.externaljob.ExternalJob: The job handle.
+		"""
+		from cross3d.classes.externaljob import ExternalJob
+		def commandBuilder(runnerPath, directory):
+			return cls.jobCommand(runnerPath, directory, version, architecture, debug, headless)
+		job = ExternalJob(script, ScriptLanguage.keyByValue(language), commandBuilder, timeout, keepFiles, cls.name())
+		return (queue or cls.jobQueue()).submit(job)
+
+	@classmethod
+	def workerCommand(cls, version=None, architecture=64, debug=False):
+		""" Returns the command line that launches a headless instance of the application
+		running cross3d.classes.workerprocess. This implementation runs the worker in the
+		current python interpreter, it is used as a stand-in for the application by tests.
+		Software specific modules override it to launch their application.
+		"""
+		return [sys.executable, cls.workerScriptPath()]
+
+	@classmethod
+	def workerPool(cls, workers=2, maxJobs=100, version=None, architecture=64, debug=False, startTimeout=300):
+		""" Creates a pool of headless application processes that are reused to run scripts.
+		Unlike runScript, the application is only launched once per worker and every job reports
+		its result or raises its exception.
+
+		Args:
+			workers (int): The maximum number of application processes.
+			maxJobs (int): Number of jobs a process runs before it is restarted.
+			version: The version of the software. Default is the latest installed version.
+			architecture (int): The bit type of the software (32, 64).
+			debug (bool): Passed to workerCommand.
+			startTimeout (float): Seconds to wait for an application to start.
+
+		Returns:
+			cross3d.classes.workerpool.WorkerPool: The pool, call close when done with it.
+		"""
+		from cross3d.classes.workerpool import WorkerPool
+		command = cls.workerCommand(version, architecture, debug)
+		return WorkerPool(command, workers=workers, maxJobs=maxJobs, startTimeout=startTimeout)
+
+	@classmethod
+	def workerScriptPath(cls):
+		""" The path of the python file run by worker processes. """
+		from cross3d.classes import workerprocess
+		return os.path.splitext(workerprocess.__file__)[0] + '.py'
+
 	@classmethod
 	def scriptPath(cls):
 		return r'C:\temp\%s_script.py' % cls.name().lower()
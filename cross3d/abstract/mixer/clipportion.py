@@ -55,6 +55,11 @@ class AbstractClipPortion(object):
 	def end(self, value):
 		self._end = value
 	
+	@property
+	def frames(self):
+		"""The FrameSet of the whole frames covered by the region."""
+		return cross3d.FrameSet.fromRange(int(round(self._start)), int(round(self._end)))
+
 	@property
 	def start(self):
 		"""The start of the region, in global frames."""
@@ -78,4 +83,4 @@ class AbstractClipPortion(object):
 ################################################################################
 
 # register the symbol
-cross3d.registerSymbol('ClipPortion', AbstractClipPortion)
+cross3d.registerSymbol('ClipPortion', AbstractClipPortion, ifNotFound=True)
@@ -89,6 +89,17 @@ class AbstractMixer(object):
 		"""
 		return None
 
+	def getUsedFrames(self):
+		"""Returns the frames covered by the used portions of all the clips.
+
+		Returns:
+						FrameSet: The union of the frames of every ClipPortion.
+		"""
+		frames = cross3d.FrameSet()
+		for clipPortion in self.getClipPortions() or []:
+			frames = frames | clipPortion.frames
+		return frames
+
 
 # register the symbol
 cross3d.registerSymbol('Mixer', AbstractMixer, ifNotFound=True)
@@ -44,6 +44,11 @@ class AbstractTrackPortion(object):
 	def end(self, value):
 		self._end = value
 	
+	@property
+	def frames(self):
+		"""The FrameSet of the whole frames covered by the region."""
+		return cross3d.FrameSet.fromRange(int(round(self._start)), int(round(self._end)))
+
 	@property
 	def start(self):
 		"""The start of the region, in global frames."""
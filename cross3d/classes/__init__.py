@@ -14,6 +14,16 @@ from dispatch import Dispatch
 from clipboard import Clipboard
 from valuerange import ValueRange
 from framerange import FrameRange
+from frameset import FrameSet
 from filesequence import FileSequence
 from timecode import Timecode
 from flipbook import FlipBook
+from cachefile import PointCacheFile
+from identitymap import IdentityMap
+from cacheindex import CacheIndex
+from layerindex import LayerIndex
+from materialrules import MaterialRules, OverrideCache
+from propsetdiff import PropSetOverridePlanner
+from scenequery import ObjectQuery
+from signalbus import SignalBus
+from hostprofiler import HostProfiler
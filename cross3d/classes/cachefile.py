@@ -0,0 +1,145 @@
+##
+#	\namespace	cross3d.classes.cachefile
+#
+#	\remarks	Reads point cache (PC2) files without the host application. Headers are read
+#				with a single 32 byte read, point data is memory mapped and exposed as numpy
+#				views so no sample data is copied.
+#
+#	\author		Blur Studio
+#
+
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+# char[12] signature, int fileVersion, int numPoints, float startFrame, float sampleRate, int numSamples
+_pc2Header = struct.Struct('<12siiffi')
+PC2_SIGNATURE = 'POINTCACHE2\0'
+
+class PointCacheHeader(namedtuple('PointCacheHeader', ('version', 'pointCount', 'startFrame', 'sampleRate', 'sampleCount'))):
+	""" The header of a PC2 file. sampleRate is the frame interval between samples. """
+
+	__slots__ = ()
+
+	@property
+	def endFrame(self):
+		return self.startFrame + max(0, self.sampleCount - 1) * self.sampleRate
+
+	@property
+	def dataSize(self):
+		""" The size in bytes of the point data described by the header. """
+		return self.sampleCount * self.pointCount * 12
+
+def _parseHeader(data, path=''):
+	if len(data) < _pc2Header.size:
+		raise ValueError('{} is too small to be a point cache.'.format(path))
+	signature, version, pointCount, startFrame, sampleRate, sampleCount = _pc2Header.unpack_from(data)
+	if signature != PC2_SIGNATURE:
+		raise ValueError('{} is not a PC2 point cache.'.format(path))
+	return PointCacheHeader(version, pointCount, startFrame, sampleRate, sampleCount)
+
+def readHeader(path):
+	""" Reads the header of a PC2 file without touching its point data.
+
+	Raises:
+		ValueError: The file is not a PC2 file.
+		IOError: The file can't be read.
+	"""
+	with open(path, 'rb') as fle:
+		return _parseHeader(fle.read(_pc2Header.size), path)
+
+def scanHeaders(paths):
+	""" Reads the headers of many PC2 files. Each unique path is only read once.
+
+	Returns:
+		dict: Maps each path to its PointCacheHeader, or to None if it could not be read.
+	"""
+	headers = {}
+	for path in paths:
+		if path in headers:
+			continue
+		try:
+			headers[path] = readHeader(path)
+		except (IOError, OSError, ValueError):
+			headers[path] = None
+	return headers
+
+
+class PointCacheFile(object):
+	""" Memory mapped access to the point data of a PC2 file::
+
+		with PointCacheFile(path) as cache:
+			print cache.header().startFrame
+			positions = cache.sample(10)	# numpy (pointCount, 3) float32 view
+
+	Sample arrays are views into the mapped file, they must not be used once the file is
+	closed. Copy them if they need to outlive it.
+	"""
+
+	def __init__(self, path):
+		self._path = path
+		self._file = open(path, 'rb')
+		try:
+			self._header = _parseHeader(self._file.read(_pc2Header.size), path)
+			expected = _pc2Header.size + self._header.dataSize
+			if os.fstat(self._file.fileno()).st_size < expected:
+				raise ValueError('{} is truncated, expected {} bytes.'.format(path, expected))
+			self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._header.dataSize else None
+		except:
+			self._file.close()
+			raise
+		self._samples = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+		return False
+
+	def __len__(self):
+		return self._header.sampleCount
+
+	def close(self):
+		self._samples = None
+		if self._map is not None:
+			self._map.close()
+			self._map = None
+		self._file.close()
+
+	def header(self):
+		return self._header
+
+	def path(self):
+		return self._path
+
+	def samples(self):
+		""" Returns all the point data as a (sampleCount, pointCount, 3) float32 numpy view. """
+		if self._samples is None:
+			import numpy as np
+			header = self._header
+			if self._map is None:
+				self._samples = np.zeros((header.sampleCount, header.pointCount, 3), dtype='<f4')
+			else:
+				self._samples = np.frombuffer(self._map, dtype='<f4', count=header.sampleCount * header.pointCount * 3, offset=_pc2Header.size)
+				self._samples = self._samples.reshape((header.sampleCount, header.pointCount, 3))
+		return self._samples
+
+	def sample(self, index):
+		""" Returns the points of a sample as a (pointCount, 3) float32 numpy view. """
+		if not 0 <= index < self._header.sampleCount:
+			raise IndexError('Sample {} out of range for {} samples.'.format(index, self._header.sampleCount))
+		return self.samples()[index]
+
+	def sampleIndex(self, frame):
+		""" Returns the index of the sample closest to frame, clamped to the cached range. """
+		header = self._header
+		if not header.sampleCount:
+			return -1
+		index = int(round((frame - header.startFrame) / header.sampleRate)) if header.sampleRate else 0
+		return min(max(index, 0), header.sampleCount - 1)
+
+	def frame(self, frame):
+		""" Returns the points of the sample closest to frame as a (pointCount, 3) numpy view. """
+		return self.sample(self.sampleIndex(frame))
@@ -0,0 +1,135 @@
+##
+#	\namespace	cross3d.classes.cacheindex
+#
+#	\remarks	This module holds the CacheIndex class scenes use to look up their cached materials
+#				and maps by unique id or name.
+#
+#	\author		Blur Studio
+#
+
+class CacheIndex(object):
+	""" An ordered list of cached native items indexed by unique id and by name.
+
+	The ids and names of the items are read once when the index is built, lookups are then
+	dictionary hits instead of a scan calling the host for every cached item. Items added
+	afterwards are indexed as they come and the index remembers it has to be written back, so
+	a scene can store many additions with a single write::
+
+		index = CacheIndex(nativeMaterials, uniqueId=mxs.blurUtil.uniqueId, name=lambda m: m.name)
+		index.add(nativeMaterial)
+		nativeMaterial = index.find('1234')
+		if index.isDirty():
+			data.setValue('baseMaterialCache', index.items())
+			index.setDirty(False)
+
+	Args:
+		items (list): The cached items, None entries are kept but not indexed.
+		uniqueId (callable): Returns the unique id of an item.
+		name (callable): Returns the name of an item.
+	"""
+
+	def __init__(self, items=(), uniqueId=id, name=str):
+		self._uniqueId = uniqueId
+		self._name = name
+		self.reset(items)
+
+	def __contains__(self, item):
+		return item is not None and str(self._uniqueId(item)) in self._ids
+
+	def __len__(self):
+		return len(self._items)
+
+	def _append(self, item):
+		self._items.append(item)
+		if item is None:
+			return
+
+		# The first item wins for both keys, like a scan of the list would.
+		self._ids.setdefault(str(self._uniqueId(item)), item)
+		self._names.setdefault(str(self._name(item)), item)
+
+	def reset(self, items):
+		""" Rebuilds the index from items, the index is not dirty afterwards. """
+		self._items = []
+		self._ids = {}
+		self._names = {}
+		self._dirty = False
+		for item in items:
+			self._append(item)
+
+	def add(self, item):
+		""" Appends item if it is not cached yet.
+
+		Returns:
+			bool: True if the item was added.
+		"""
+		if item is None or item in self:
+			return False
+		self._append(item)
+		self._dirty = True
+		return True
+
+	def _lookup(self, key):
+		""" Returns the item whose unique id or current name is key, without reading all the names. """
+		item = self._ids.get(key)
+		if item is not None:
+			return item
+		item = self._names.get(key)
+		if item is not None and str(self._name(item)) == key:
+			return item
+		return None
+
+	def find(self, key, default=None, refresh=True):
+		""" Returns the item whose unique id or name is key.
+
+		Unique ids never change, names can. A name hit is checked against the current name of
+		the item and the names are read again when it is stale.
+
+		Args:
+			key (str): The unique id or name to look for.
+			default: The value returned if no item matches.
+			refresh (bool): If True a miss reads the names again before giving up, in case an item
+				was renamed to key. Bulk lookups use findAll instead.
+		"""
+		item = self._lookup(key)
+		if item is not None:
+			return item
+
+		# A stale name always reads the names again.
+		if refresh or key in self._names:
+			self.refreshNames()
+			return self._names.get(key, default)
+		return default
+
+	def findAll(self, keys, default=None):
+		""" Returns the items for many keys. The names of the items are read again at most once,
+		on the first key that misses.
+		"""
+		results = []
+		refreshed = False
+		for key in keys:
+			item = self._lookup(key)
+			if item is None:
+				if not refreshed:
+					self.refreshNames()
+					refreshed = True
+				item = self._names.get(key)
+			results.append(default if item is None else item)
+		return results
+
+	def refreshNames(self):
+		""" Reads the current names of the items to pick up renamed items. """
+		self._names = {}
+		for item in self._items:
+			if item is not None:
+				self._names.setdefault(str(self._name(item)), item)
+
+	def items(self):
+		return list(self._items)
+
+	def isDirty(self):
+		""" Returns True if items were added since the index was built or last written. """
+		return self._dirty
+
+	def setDirty(self, state):
+		self._dirty = state
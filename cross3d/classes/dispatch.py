@@ -5,77 +5,103 @@ TODO: Only enable or disable signals that have a connection to them
 TODO: Only emit a single ScenePreInvalidated/SceneInvalidated signal on 
 file operations, using a reference counter
 
-"""
+Dispatch is built on Qt signals when PyQt4 is available and on the pure python signals of
+cross3d.classes.signalbus otherwise, so headless and farm processes can use it without Qt. The
+CROSS3D_SIGNAL_BACKEND environment variable forces a back-end, 'qt' or 'python'. With the python
+back-end, signals emitted from another thread are queued and delivered by dispatch.processEvents().
 
-from PyQt4.QtCore import pyqtSignal, QObject
+"""
 
-class Dispatch(QObject):
+import os
+from eventcoalescer import EventCoalescer
+from signalbus import ConnectionType, Slot
+
+signalBackend = os.getenv('CROSS3D_SIGNAL_BACKEND', '').lower()
+if signalBackend != 'python':
+	try:
+		from PyQt4.QtCore import pyqtSignal as Signal, QObject as SignalBase, QTimer as Timer
+		signalBackend = 'qt'
+	except ImportError:
+		if signalBackend == 'qt':
+			raise
+		signalBackend = 'python'
+if signalBackend == 'python':
+	from signalbus import Signal, SignalBus as SignalBase, Timer
+
+class Dispatch(SignalBase):
 	# scene signals
-	sceneClosed				 = pyqtSignal()
-	sceneExportRequested	 = pyqtSignal()
-	sceneExportFinished		 = pyqtSignal()
-	sceneImportRequested	 = pyqtSignal()
-	sceneImportFinished		 = pyqtSignal()
-	scenePreInvalidated		 = pyqtSignal()			# linked signal before a import, open, or merge operation
-	sceneInvalidated		 = pyqtSignal()
-	sceneMergeRequested		 = pyqtSignal()
-	sceneReferenceRequested	 = pyqtSignal()
-	sceneMergeFinished		 = pyqtSignal()
-	sceneReferenceFinished   = pyqtSignal()
-	sceneNewRequested		 = pyqtSignal()
-	sceneNewFinished		 = pyqtSignal()
-	sceneOpenRequested		 = pyqtSignal(str)		# <str> The Filename
-	sceneOpenFinished		 = pyqtSignal(str)		# <str> The Filename
-	scenePreReset			 = pyqtSignal()
-	sceneReset				 = pyqtSignal()
-	sceneSaveRequested		 = pyqtSignal(str)		# <str> The Filename
-	sceneSaveFinished		 = pyqtSignal(str)		# <str> The Filename
+	sceneClosed				 = Signal()
+	sceneExportRequested	 = Signal()
+	sceneExportFinished		 = Signal()
+	sceneImportRequested	 = Signal()
+	sceneImportFinished		 = Signal()
+	scenePreInvalidated		 = Signal()			# linked signal before a import, open, or merge operation
+	sceneInvalidated		 = Signal()
+	sceneMergeRequested		 = Signal()
+	sceneReferenceRequested	 = Signal()
+	sceneMergeFinished		 = Signal()
+	sceneReferenceFinished   = Signal()
+	sceneNewRequested		 = Signal()
+	sceneNewFinished		 = Signal()
+	sceneOpenRequested		 = Signal(str)		# <str> The Filename
+	sceneOpenFinished		 = Signal(str)		# <str> The Filename
+	scenePreReset			 = Signal()
+	sceneReset				 = Signal()
+	sceneSaveRequested		 = Signal(str)		# <str> The Filename
+	sceneSaveFinished		 = Signal(str)		# <str> The Filename
 
 	# layer signals
-	layerCreated			 = pyqtSignal()
-	layerDeleted			 = pyqtSignal()
-	layersModified			 = pyqtSignal()
-	layerStateChanged		 = pyqtSignal()
+	layerCreated			 = Signal()
+	layerDeleted			 = Signal()
+	layersModified			 = Signal()
+	layerStateChanged		 = Signal()
 
 	# object signals
-	selectionChanged		 = pyqtSignal()
-	objectFreeze			 = pyqtSignal(object)
-	objectUnfreeze			 = pyqtSignal(object)
-	objectHide				 = pyqtSignal(object)
-	objectUnHide			 = pyqtSignal(object)
-	objectRenamed			 = pyqtSignal(str, str, object)		# oldName, newName, Object
-	valueChanged			 = pyqtSignal(object, str, object)
+	selectionChanged		 = Signal()
+	objectFreeze			 = Signal(object)
+	objectUnfreeze			 = Signal(object)
+	objectHide				 = Signal(object)
+	objectUnHide			 = Signal(object)
+	objectRenamed			 = Signal(str, str, object)		# oldName, newName, Object
+	valueChanged			 = Signal(object, str, object)
 	# object signals that may need disabled during imports, merges, file opening
-	newObject				 = pyqtSignal()		# linked signal for object creation
-	objectCreated			 = pyqtSignal(object)
-	objectCloned			 = pyqtSignal(object)
-	objectAdded				 = pyqtSignal(object)
-	objectDeleted			 = pyqtSignal(str)		# returns the name of the object that was just deleted
-	objectPreDelete			 = pyqtSignal(object)
-	objectPostDelete		 = pyqtSignal()
-	objectParented			 = pyqtSignal(object)	# the object that had its parenting changed
+	newObject				 = Signal()		# linked signal for object creation
+	objectCreated			 = Signal(object)
+	objectCloned			 = Signal(object)
+	objectAdded				 = Signal(object)
+	objectDeleted			 = Signal(str)		# returns the name of the object that was just deleted
+	objectPreDelete			 = Signal(object)
+	objectPostDelete		 = Signal()
+	objectParented			 = Signal(object)	# the object that had its parenting changed
 	# User props changes
-	customPropChanged		 = pyqtSignal(object)
-	blurTagChanged			 = pyqtSignal(object)
+	customPropChanged		 = Signal(object)
+	blurTagChanged			 = Signal(object)
+
+	# batched object signals, emitted with the list of objects after their single object signal
+	objectsCreated			 = Signal(list)
+	objectsCloned			 = Signal(list)
+	objectsAdded			 = Signal(list)
+	objectsParented			 = Signal(list)
+	customPropsChanged		 = Signal(list)
 
 	# render signals
-	rednerFrameRequested	 = pyqtSignal(int)
-	renderFrameFinished		 = pyqtSignal()
-	renderSceneRequested	 = pyqtSignal(list)
-	renderSceneFinished		 = pyqtSignal()
+	rednerFrameRequested	 = Signal(int)
+	renderFrameFinished		 = Signal()
+	renderSceneRequested	 = Signal(list)
+	renderSceneFinished		 = Signal()
 
 	# time signals
-	currentFrameChanged		 = pyqtSignal(int)
-	frameRangeChanged		 = pyqtSignal()
+	currentFrameChanged		 = Signal(int)
+	frameRangeChanged		 = Signal()
 
 	# application signals
-	startupFinished			 = pyqtSignal()
-	shutdownStarted			 = pyqtSignal()
+	startupFinished			 = Signal()
+	shutdownStarted			 = Signal()
 
 	# viewport signals
-	viewportRedrawn			 = pyqtSignal()
+	viewportRedrawn			 = Signal()
 
-	eventCalled = pyqtSignal(list)
+	eventCalled = Signal(list)
 
 	_instance = None
 
@@ -84,8 +110,26 @@ class Dispatch(QObject):
 	# these signals should never actualy be connected, The supplied function will instead be called directly. This is for when exicution order is critical.
 	_functionSignals = (viewportRedrawn,)
 
+	# maps the single object signals to their batched version
+	_batchedSignals = {'objectCreated': 'objectsCreated',
+						'objectCloned': 'objectsCloned',
+						'objectAdded': 'objectsAdded',
+						'objectParented': 'objectsParented',
+						'customPropChanged': 'customPropsChanged'}
+
+	# signals that are queued and deduplicated while coalescing
+	_coalescedSignals = set(['selectionChanged', 'objectFreeze', 'objectUnfreeze', 'objectHide', 'objectUnHide', 'valueChanged',
+							'newObject', 'objectCreated', 'objectCloned', 'objectAdded', 'objectParented', 'customPropChanged',
+							'blurTagChanged', 'layerCreated', 'layerDeleted', 'layersModified', 'layerStateChanged'])
+
+	# if True, events are coalesced from scenePreInvalidated to sceneInvalidated
+	coalesceFileOperations = False
+
+	# caches whether a signal name is a declared signal of the class
+	_signalTypes = {}
+
 	def __init__(self):
-		QObject.__init__(self)
+		SignalBase.__init__(self)
 
 	def __del__(self):
 		print 'Removing Dispatch with __del__'
@@ -96,6 +140,11 @@ class Dispatch(QObject):
 			global cross3d
 			cls._instance._linkedSignals = {}
 			cls._instance._linkedTriggers = []
+			cls._instance._coalescer = EventCoalescer()
+			cls._instance._coalescing = 0
+			cls._instance._coalescingInterval = 100
+			cls._instance._flushing = False
+			cls._instance._flushTimer = None
 			cls._process = None
 			import cross3d
 		return cls._instance
@@ -134,14 +183,16 @@ class Dispatch(QObject):
 				# Signals.
 				cross3d.migrate.aboutToClearPaths.connect(self.disconnectSignals)
 		# connect the signal
-		if (hasattr(self, signal) and type(getattr(self, signal)).__name__ == 'pyqtBoundSignal'):
+		if self._isSignal(signal):
 			if not signal in self._functionSignals:
 				getattr(self, signal).connect(function)
-			# keep track of what signals are connected to dispatch
+			# keep track of what signals are connected to dispatch. Bound methods are weakly referenced like the signal
+			# connections, so a connection does not keep its object alive.
+			slot = Slot(function, 0, ConnectionType.Direct, True, lambda slot: self._connectionDeleted(signal, slot))
 			if signal in self._connections:
-				self._connections[signal].append(function)
+				self._connections[signal].append(slot)
 			else:
-				self._connections[signal] = [function]
+				self._connections[signal] = [slot]
 				if signal in self._linkedTriggers:
 					for key in self._linkedSignals:
 						if signal in self._linkedSignals[key]:
@@ -158,7 +209,7 @@ class Dispatch(QObject):
 			\param		signal	<str>	The name of the signal you wish to connect to
 			\param		function	<function>	a pointer to the function needed to run
 		"""
-		if (hasattr(self, signal) and type(getattr(self, signal)).__name__ == 'pyqtBoundSignal'):
+		if self._isSignal(signal):
 			if not signal in self._functionSignals:
 				try:
 					getattr(self, signal).disconnect(function)
@@ -166,19 +217,9 @@ class Dispatch(QObject):
 					pass
 			# remove the signal from the connections list
 			if signal in self._connections:
-				if function in self._connections[signal]:
-					self._connections[signal].remove(function)
-					# if the signal is empty remove it
-					if not len(self._connections[signal]):
-						self._connections.pop(signal)
-						if signal in self._linkedTriggers:
-							for key in self._linkedSignals:
-								if signal in self._linkedSignals[key]:
-									# Note: if at some point we need two linked signals to share a signal, this may need to be revised to only disconnect once the last signal is disconnected.
-									cross3d.application.disconnectCallback(key)
-						else:
-							# remove the application callback. this way callbacks that are not being used do not need to be processed
-							cross3d.application.disconnectCallback(signal)
+				slot = next((slot for slot in self._connections[signal] if slot.matches(function)), None)
+				if slot is not None:
+					self._removeConnection(signal, slot)
 				else:
 					cross3d.logger.debug('The function %s for signal %s has been disconnected, but was not recorded as connected' % (str(function), signal))
 			else:
@@ -189,6 +230,29 @@ class Dispatch(QObject):
 			# print "Trying to disconnect signals"
 			self.disconnectSignals()
 
+	def _removeConnection(self, signal, slot):
+		connections = self._connections.get(signal)
+		if connections is None or slot not in connections:
+			return
+		connections.remove(slot)
+		# if the signal is empty remove it
+		if not connections:
+			self._connections.pop(signal)
+			if signal in self._linkedTriggers:
+				for key in self._linkedSignals:
+					if signal in self._linkedSignals[key]:
+						# Note: if at some point we need two linked signals to share a signal, this may need to be revised to only disconnect once the last signal is disconnected.
+						cross3d.application.disconnectCallback(key)
+			else:
+				# remove the application callback. this way callbacks that are not being used do not need to be processed
+				cross3d.application.disconnectCallback(signal)
+
+	def _connectionDeleted(self, signal, slot):
+		# the object of a connected method was deleted, the connection is removed like disconnect would
+		self._removeConnection(signal, slot)
+		if self._isConnected and not self._connections:
+			self.disconnectSignals()
+
 	def dispatch(self, signal, *args):
 		"""
 			\remarks	dispatches a string based signal through the system from an application
@@ -198,29 +262,34 @@ class Dispatch(QObject):
 		if cross3d.application.shouldBlockSignal(signal, self.signalsBlocked()):
 			return
 
-		# emit a defined pyqtSignal
-		if (hasattr(self, signal) and type(getattr(self, signal)).__name__ == 'pyqtBoundSignal'):
-			getattr(self, signal).emit(*args)
+		if self.coalesceFileOperations and signal == 'scenePreInvalidated':
+			self.beginCoalescing()
 
-		# otherwise emit a custom signal
-		else:
-			from PyQt4.QtCore import SIGNAL
-			self.emit(SIGNAL(signal), *args)
+		if self._isCoalesced(signal):
+			self._queueEvent(signal, args)
+			return
+
+		self._emit(signal, args)
 
 		# emit linked signals
 		if (signal in self._linkedSignals):
 			for trigger in self._linkedSignals[signal]:
 				self.dispatch(trigger)
 
+		if self.coalesceFileOperations and signal == 'sceneInvalidated' and self._coalescing:
+			self.endCoalescing()
+
 	def dispatchFunction(self, signal):
 		"""
 			\remarks	directly calls the function, this is used when the delay from a callback is not acceptable, for example when a viewport is rendering, it needs to draw in a specific order. The function should not expect any arguments.
 			\param		signal	<str>	The name of th signal that is being called
 		"""
 		if signal in self._connections:
-			for fn in self._connections[signal]:
-				# call the function
-				fn()
+			for slot in list(self._connections[signal]):
+				fn = slot.target()
+				# call the function, unless its object was deleted
+				if fn is not None:
+					fn()
 
 	def dispatchObject(self, signal, *args):
 		"""
@@ -231,14 +300,17 @@ class Dispatch(QObject):
 		if cross3d.application.shouldBlockSignal(signal, self.signalsBlocked()):
 			return
 
-		# emit a defined pyqtSignal
-		if (hasattr(self, signal) and type(getattr(self, signal)).__name__ == 'pyqtBoundSignal') and args[0]:
-			getattr(self, signal).emit(cross3d.SceneObject(cross3d.Scene.instance(), args[0]))
+		if self._isCoalesced(signal):
+			self._queueEvent(signal, args, objectEvent=True)
+			return
+
+		# emit a declared signal
+		if self._isSignal(signal) and args[0]:
+			self._emitObjects(signal, [args[0]])
 
 		# otherwise emit a custom signal
 		else:
-			from PyQt4.QtCore import SIGNAL
-			self.emit(SIGNAL(signal), *args)
+			self._emitCustom(signal, args)
 
 		# emit linked signals
 		if (signal in self._linkedSignals):
@@ -264,6 +336,114 @@ class Dispatch(QObject):
 				so = cross3d.SceneObject(cross3d.Scene.instance(), node)
 				self.objectRenamed.emit(oldName, newName, so)
 
+	def _isSignal(self, signal):
+		isSignal = self._signalTypes.get(signal)
+		if isSignal is None:
+			isSignal = isinstance(getattr(type(self), signal, None), Signal)
+			self._signalTypes[signal] = isSignal
+		return isSignal
+
+	def _isCoalesced(self, signal):
+		return self._coalescing and not self._flushing and signal in self._coalescedSignals
+
+	def _emit(self, signal, args):
+		# emit a declared signal
+		if self._isSignal(signal):
+			getattr(self, signal).emit(*args)
+
+		# otherwise emit a custom signal
+		else:
+			self._emitCustom(signal, args)
+
+	def _emitCustom(self, signal, args):
+		if signalBackend == 'qt':
+			from PyQt4.QtCore import SIGNAL
+			self.emit(SIGNAL(signal), *args)
+		else:
+			self.signal(signal).emit(*args)
+
+	def _emitObjects(self, signal, nativeObjects):
+		scene = cross3d.Scene.instance()
+		sceneObjects = [cross3d.SceneObject(scene, nativeObject) for nativeObject in nativeObjects]
+		for sceneObject in sceneObjects:
+			getattr(self, signal).emit(sceneObject)
+		if signal in self._batchedSignals:
+			getattr(self, self._batchedSignals[signal]).emit(sceneObjects)
+
+	def _queueEvent(self, signal, args, objectEvent=False):
+		key = None
+		if objectEvent and args and args[0]:
+			key = cross3d.SceneObject._nativeIdentity(args[0])
+			if key is None:
+				key = id(args[0])
+		self._coalescer.add(signal, (args, objectEvent), key=key)
+
+		if self._coalescingInterval and (self._flushTimer is None or not self._flushTimer.isActive()):
+			if self._flushTimer is None:
+				self._flushTimer = Timer(self)
+				self._flushTimer.setSingleShot(True)
+				self._flushTimer.timeout.connect(self.flushEvents)
+			self._flushTimer.start(self._coalescingInterval)
+
+	def beginCoalescing(self):
+		"""
+			\remarks	starts queuing the object, layer and selection events instead of emitting them. Each event is only kept once per object and
+						queued events are emitted in batches by flushEvents. Calls can be nested, events are flushed by the last endCoalescing call.
+		"""
+		self._coalescing += 1
+
+	def endCoalescing(self):
+		"""
+			\remarks	ends a beginCoalescing call and flushes the queued events if it was the last one.
+		"""
+		self._coalescing = max(0, self._coalescing - 1)
+		if not self._coalescing:
+			self.flushEvents()
+
+	def coalescer(self):
+		return self._coalescer
+
+	def flushEvents(self):
+		"""
+			\remarks	emits the queued events. Object signals are emitted once per object followed by their batched signal, for instance
+						objectsCreated, and linked signals are emitted once per flush.
+		"""
+		if self._flushTimer is not None:
+			self._flushTimer.stop()
+		batches = self._coalescer.flush()
+		if not batches:
+			return
+
+		self._flushing = True
+		try:
+			triggers = []
+			for signal, events in batches:
+				nativeObjects = []
+				for args, objectEvent in events:
+					if objectEvent and args[0] and self._isSignal(signal):
+						nativeObjects.append(args[0])
+					else:
+						self._emit(signal, args)
+				if nativeObjects:
+					self._emitObjects(signal, nativeObjects)
+				for trigger in self._linkedSignals.get(signal, []):
+					if trigger not in triggers:
+						triggers.append(trigger)
+
+			for trigger in triggers:
+				self.dispatch(trigger)
+		finally:
+			self._flushing = False
+
+	def isCoalescing(self):
+		return self._coalescing > 0
+
+	def setCoalescingInterval(self, interval):
+		"""
+			\remarks	sets how long in milliseconds events are queued before being flushed while coalescing. 0 only flushes them on endCoalescing.
+		"""
+		self._coalescingInterval = interval
+
 	def isConnected(self, signal=''):
 		"""
 			\remarks	Returns if a specific signal is connected(cross3d.application.connectCallback). If signal is not provided return if the master connection is connected(cross3d.application.connect)
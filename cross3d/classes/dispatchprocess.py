@@ -8,19 +8,22 @@
 #	\date		06/09/11
 #
 
-from PyQt4.QtCore import QThread
 import time
+from dispatch import signalBackend
 
-class DispatchProcess(QThread):
+if signalBackend == 'qt':
+	from PyQt4.QtCore import QThread as Thread
+else:
+	from signalbus import Thread
+
+class DispatchProcess(Thread):
 	def __init__(self, parent = None):
-		QThread.__init__(self, parent)
+		Thread.__init__(self, parent)
 		self.exiting = False
 		self._eventQueue = []
 		
 		# create connections to signals
-		global Dispatch, Scene, SceneObject
-		from cross3d	import dispatch
-		from cross3d import Scene, SceneObject
+		from cross3d import dispatch
 		dispatch.eventCalled.connect(self.processEvent)
 	
 	def __del__(self):
@@ -43,29 +46,16 @@ class DispatchProcess(QThread):
 		print 'Dispatching event', signal
 		if ( self.signalsBlocked() ):
 			return
-			
-		# emit a defined pyqtSignal
-		if ( hasattr(Dispatch,signal) and type(getattr(Dispatch,signal)).__name__ == 'pyqtBoundSignal' ):
-			# this should identify the object type before emiting it if it needs to emit something
-			getattr(Dispatch,signal).emit(SceneObject(Scene.instance(), args[0]))
-		
-		# elif process application specific signals like xsi's value changed
-		
-		# otherwise emit a custom signal
-		else:
-			from PyQt4.QtCore import SIGNAL
-			self.emit( SIGNAL( signal ), *args )
 		
-		# emit linked signals
-		if ( signal in self._linkedSignals ):
-			for trigger in self._linkedSignals[signal]:
-				self.dispatch( trigger )
+		# Dispatch wraps the native object, emits the declared or custom signal and its linked signals
+		from cross3d import dispatch
+		dispatch.dispatchObject(signal, *args)
 	
 	def run(self):
 		#process items in the queue
 		while not self.exiting:
 			if self._eventQueue:
-				item = self._eventQueue.pop(0)
-				self.dispatchEvent(item[0], item[1])
+				event, args = self._eventQueue.pop(0)
+				self.dispatchEvent(event, *args)
 			else:
 				time.sleep(0.05)
\ No newline at end of file
@@ -0,0 +1,71 @@
+##
+#	\namespace	cross3d.classes.eventcoalescer
+#
+#	\remarks	This module holds the EventCoalescer class Dispatch uses to queue and deduplicate the
+#				events received from the host while coalescing.
+#
+#	\author		Blur Studio
+#
+
+from collections import OrderedDict
+
+class EventCoalescer(object):
+	""" Queues events and drops the ones already queued until they are flushed.
+
+	Events are identified by their signal and a key, the payload itself when no key is given.
+	Flushing returns the events grouped by signal, signals and events being in the order they
+	were first received::
+
+		coalescer.add('objectCreated', (node,), key=handle)
+		coalescer.add('newObject')
+		coalescer.add('objectCreated', (node,), key=handle)	# dropped
+		coalescer.flush()	# [('objectCreated', [(node,)]), ('newObject', [()])]
+	"""
+
+	def __init__(self):
+		self._events = OrderedDict()
+		self.received = 0
+		self.dropped = 0
+
+	def __len__(self):
+		return sum(len(events) for events in self._events.itervalues())
+
+	def add(self, signal, payload=(), key=None):
+		""" Queues an event.
+
+		Args:
+			signal (str): The name of the signal.
+			payload: The data to emit the signal with, returned by flush.
+			key: Identifies the event among the events of the signal. Defaults to the payload.
+				Events with an unhashable key are never merged.
+
+		Returns:
+			bool: False if the event was dropped as a duplicate.
+		"""
+		self.received += 1
+		events = self._events.get(signal)
+		if events is None:
+			events = self._events[signal] = OrderedDict()
+		if key is None:
+			key = payload
+		try:
+			if key in events:
+				self.dropped += 1
+				return False
+		except TypeError:
+			key = object()
+		events[key] = payload
+		return True
+
+	def clear(self):
+		self._events = OrderedDict()
+
+	def flush(self):
+		""" Empties the queue.
+
+		Returns:
+			list: (signal, [payload, ..]) tuples.
+		"""
+		batches = [(signal, events.values()) for signal, events in self._events.iteritems()]
+		self.clear()
+		return batches
@@ -60,3 +60,16 @@ class Exceptions:
 		""" Exception raised if you try to access a native pointer that is no longer valid
 		"""
 		pass
+
+	class WorkerError(Blur3DException):
+		""" Exception raised if an external worker process could not run a job.
+		"""
+		pass
+
+	class ScriptFailed(Blur3DException):
+		""" Exception raised if a script run in an external application raised an exception.
+		The traceback from the external application is stored in the traceback attribute.
+		"""
+		def __init__(self, message, traceback=''):
+			self.traceback = traceback
+			super(Exceptions.ScriptFailed, self).__init__(message)
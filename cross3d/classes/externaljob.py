@@ -0,0 +1,269 @@
+##
+#	\namespace	cross3d.classes.externaljob
+#
+#	\remarks	Tracks scripts submitted to external applications with External.submit.
+#				Every job gets its own directory holding its script, logs and status, so
+#				any number of jobs can run at the same time. A JobQueue limits how many of
+#				them run concurrently.
+#
+#	\author		Blur Studio
+#
+
+import json
+import os
+import Queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from exceptions import Exceptions
+import workerprocess
+
+# Extensions used when writing the script of a job to disk.
+_extensions = {'Python': '.py', 'MAXScript': '.ms', 'MEL': '.mel', 'JavaScript': '.js', 'VisualBasic': '.vbs'}
+
+class ExternalJob(object):
+	""" Handle for a script running in an external application.
+
+	The api follows concurrent.futures.Future so jobs can be waited on from a controller
+	process. In python 3 a job can be awaited with `loop.run_in_executor(None, job.result)`.
+
+	Args:
+		script (str): The script source, or the path to a script file.
+		language (str): The cross3d.constants.ScriptLanguage label of the script.
+		commandBuilder (callable): Called with the path of the python file the application needs
+			to run and the job directory, returns the command line to launch.
+		timeout (float): Seconds the application is allowed to run before it is killed.
+		keepFiles (bool): If False the job directory is removed once the job finished and its
+			logs have been read into memory.
+	"""
+
+	Pending = 'Pending'
+	Running = 'Running'
+	Finished = 'Finished'
+	Failed = 'Failed'
+	TimedOut = 'TimedOut'
+	Cancelled = 'Cancelled'
+
+	_finishedStates = set([Finished, Failed, TimedOut, Cancelled])
+
+	def __init__(self, script, language='Python', commandBuilder=None, timeout=None, keepFiles=True, name='cross3d'):
+		self._language = language
+		self._timeout = timeout
+		self._keepFiles = keepFiles
+		self._state = self.Pending
+		self._exitCode = None
+		self._reply = None
+		self._log = None
+		self._output = None
+		self._callbacks = []
+		self._finished = threading.Event()
+		self._lock = threading.Lock()
+
+		self.directory = tempfile.mkdtemp(prefix='{}_job_'.format(name.lower()))
+		self.logPath = os.path.join(self.directory, 'script.log')
+		self.outputPath = os.path.join(self.directory, 'output.log')
+		self.statusPath = os.path.join(self.directory, 'status.json')
+		self.jobPath = os.path.join(self.directory, 'job.json')
+
+		if os.path.isfile(script):
+			self.scriptPath = script
+		else:
+			self.scriptPath = os.path.join(self.directory, 'script' + _extensions.get(language, '.txt'))
+			with open(self.scriptPath, 'w') as fle:
+				fle.write(script)
+
+		with open(self.jobPath, 'w') as fle:
+			json.dump({'script': self.scriptPath, 'isPath': True, 'language': language, 'log': self.logPath, 'status': self.statusPath}, fle)
+
+		runner = os.path.splitext(workerprocess.__file__)[0] + '.py'
+		self.command = commandBuilder(runner, self.directory) if commandBuilder else None
+
+	def __repr__(self):
+		return '<{} {} {}>'.format(type(self).__name__, self._state, self.directory)
+
+	def _setState(self, state):
+		with self._lock:
+			self._state = state
+			if state not in self._finishedStates:
+				return
+			callbacks, self._callbacks = self._callbacks, []
+		self._finish(callbacks)
+
+	def _finish(self, callbacks):
+		""" Called once the job reached a finished state, outside of the lock. """
+		self._collect()
+		self._finished.set()
+		for callback in callbacks:
+			callback(self)
+
+	def _collect(self):
+		""" Reads the logs and status of the job and removes its directory if requested. """
+		for attr, path in (('_log', self.logPath), ('_output', self.outputPath)):
+			if os.path.exists(path):
+				with open(path) as fle:
+					setattr(self, attr, fle.read())
+		if os.path.exists(self.statusPath):
+			with open(self.statusPath) as fle:
+				self._reply = json.load(fle)
+		if not self._keepFiles:
+			shutil.rmtree(self.directory, ignore_errors=True)
+
+	def _run(self):
+		""" Runs the job in the calling thread. Called by JobQueue. """
+		with self._lock:
+			if self._state != self.Pending:
+				return
+			self._state = self.Running
+
+		env = dict(os.environ)
+		env[workerprocess.JOB_VARIABLE] = self.jobPath
+		try:
+			with open(self.outputPath, 'w') as output:
+				process = subprocess.Popen(self.command, stdout=output, stderr=subprocess.STDOUT, env=env)
+				deadline = time.time() + self._timeout if self._timeout else None
+				# Popen.wait has no timeout in python 2, poll until the process exits.
+				while process.poll() is None:
+					if deadline and time.time() > deadline:
+						process.kill()
+						process.wait()
+						self._exitCode = process.returncode
+						self._setState(self.TimedOut)
+						return
+					time.sleep(0.1)
+				self._exitCode = process.returncode
+		except (OSError, ValueError), e:
+			self._reply = {'success': False, 'error': 'Unable to launch {}: {}'.format(self.command, e)}
+			self._setState(self.Failed)
+			return
+
+		success = os.path.exists(self.statusPath) and self._readSuccess()
+		self._setState(self.Finished if success else self.Failed)
+
+	def _readSuccess(self):
+		with open(self.statusPath) as fle:
+			return json.load(fle).get('success', False)
+
+	def addDoneCallback(self, callback):
+		""" Calls callback with this job once it finished. If it already finished the callback is
+		called immediately.
+		"""
+		with self._lock:
+			if self._state not in self._finishedStates:
+				self._callbacks.append(callback)
+				return
+		callback(self)
+
+	def cancel(self):
+		""" Cancels the job if it has not started yet. Returns True if it was cancelled. """
+		# The state is checked and changed under the same lock, so _run can not start the job in
+		# between.
+		with self._lock:
+			if self._state != self.Pending:
+				return False
+			self._state = self.Cancelled
+			callbacks, self._callbacks = self._callbacks, []
+		self._finish(callbacks)
+		return True
+
+	def cancelled(self):
+		return self._state == self.Cancelled
+
+	def done(self):
+		return self._state in self._finishedStates
+
+	def exitCode(self):
+		""" The exit code of the application, None if it has not exited. """
+		return self._exitCode
+
+	def log(self):
+		""" The output and traceback of the script. """
+		if self._log is None and os.path.exists(self.logPath):
+			with open(self.logPath) as fle:
+				return fle.read()
+		return self._log or ''
+
+	def output(self):
+		""" The stdout and stderr of the application process. """
+		if self._output is None and os.path.exists(self.outputPath):
+			with open(self.outputPath) as fle:
+				return fle.read()
+		return self._output or ''
+
+	def result(self, timeout=None):
+		""" Waits for the job and returns the value its script assigned to `result`.
+
+		Raises:
+			Exceptions.ScriptFailed: The script raised an exception or the application failed.
+			Exceptions.WorkerError: The job timed out, was cancelled, or timeout expired while
+				waiting for it.
+		"""
+		if not self.wait(timeout):
+			raise Exceptions.WorkerError('{} did not finish within {} seconds.'.format(self, timeout))
+		if self._state == self.TimedOut:
+			raise Exceptions.WorkerError('{} was killed after {} seconds.'.format(self, self._timeout))
+		if self._state == self.Cancelled:
+			raise Exceptions.WorkerError('{} was cancelled.'.format(self))
+		reply = self._reply or {}
+		if self._state == self.Failed:
+			error = reply.get('error') or 'The application exited with code {} without running the script.'.format(self._exitCode)
+			raise Exceptions.ScriptFailed(error, reply.get('traceback', ''))
+		return reply.get('result')
+
+	def state(self):
+		return self._state
+
+	def wait(self, timeout=None):
+		""" Blocks until the job finished. Returns False if timeout expired first. """
+		# Event.wait without a timeout can't be interrupted in python 2.
+		if timeout is None:
+			while not self._finished.wait(1):
+				pass
+			return True
+		return self._finished.wait(timeout)
+
+
+class JobQueue(object):
+	""" Runs ExternalJobs with at most maxConcurrent of them running at once. """
+
+	def __init__(self, maxConcurrent=4):
+		self._queue = Queue.Queue()
+		self._threads = []
+		for i in range(max(1, maxConcurrent)):
+			thread = threading.Thread(target=self._process, name='cross3d.JobQueue-{}'.format(i))
+			thread.daemon = True
+			thread.start()
+			self._threads.append(thread)
+
+	def _process(self):
+		while True:
+			job = self._queue.get()
+			try:
+				job._run()
+			finally:
+				self._queue.task_done()
+
+	def maxConcurrent(self):
+		return len(self._threads)
+
+	def submit(self, job):
+		""" Queues the job and returns it. """
+		self._queue.put(job)
+		return job
+
+	def join(self):
+		""" Blocks until every queued job finished. """
+		self._queue.join()
+
+
+def waitForJobs(jobs, timeout=None):
+	""" Waits for all of the jobs and returns the ones that did not finish in time. """
+	deadline = time.time() + timeout if timeout is not None else None
+	pending = []
+	for job in jobs:
+		remaining = None if deadline is None else max(0, deadline - time.time())
+		if not job.wait(remaining):
+			pending.append(job)
+	return pending
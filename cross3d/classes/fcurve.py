@@ -1,5 +1,7 @@
 import os
+import copy
 import math
+import bisect
 import hashlib
 import xml.dom.minidom
 
@@ -7,6 +9,177 @@ from framerange import FrameRange
 from valuerange import ValueRange
 from cross3d.constants import ControllerType, TangentType, ExtrapolationType
 
+#------------------------------------------------------------------------------------------------------------------------
+# Bezier segment helpers. A segment is described by the time and value components of its four control points.
+#------------------------------------------------------------------------------------------------------------------------
+
+def _segmentPoints(key0, key1):
+	""" Returns the time and value control points of the Bezier segment between two keys. """
+	p1x, p1y = key0.outTangentPoint
+	p2x, p2y = key1.inTangentPoint
+	return (key0.time, p1x, p2x, key1.time), (key0.value, p1y, p2y, key1.value)
+
+def _bezier(p, s):
+	""" Evaluates one component of a cubic Bezier at parameter s. """
+	t = 1.0 - s
+	return t * t * t * p[0] + 3.0 * t * t * s * p[1] + 3.0 * t * s * s * p[2] + s * s * s * p[3]
+
+def _bezierDerivative(p, s):
+	t = 1.0 - s
+	return 3.0 * (t * t * (p[1] - p[0]) + 2.0 * t * s * (p[2] - p[1]) + s * s * (p[3] - p[2]))
+
+def _bezierStationaryParameters(p):
+	""" Returns the parameters in ]0, 1[ where the derivative of a Bezier component is zero. """
+	# The derivative is the quadratic a*s^2 + b*s + c (divided by 3).
+	a = p[3] - 3.0 * p[2] + 3.0 * p[1] - p[0]
+	b = 2.0 * (p[2] - 2.0 * p[1] + p[0])
+	c = p[1] - p[0]
+	if abs(a) < 1e-12:
+		roots = [-c / b] if abs(b) > 1e-12 else []
+	else:
+		discriminant = b * b - 4.0 * a * c
+		if discriminant < 0.0:
+			roots = []
+		else:
+			root = math.sqrt(discriminant)
+			roots = [(-b - root) / (2.0 * a), (-b + root) / (2.0 * a)]
+	return sorted(set(s for s in roots if 0.0 < s < 1.0))
+
+def _bezierParameter(p, x, low=0.0, high=1.0, tolerance=1e-9):
+	""" Returns the parameter s in [low, high] where a Bezier component equals x. The component
+	has to be monotonic between low and high.
+
+	Uses Newton iterations kept inside a bisection bracket so it always converges.
+	"""
+	start, end = _bezier(p, low), _bezier(p, high)
+	increasing = end >= start
+	if (x <= start) == increasing:
+		return low
+	if (x >= end) == increasing:
+		return high
+	s = low + (high - low) * (x - start) / (end - start)
+	for i in range(64):
+		difference = _bezier(p, s) - x
+		if abs(difference) < tolerance:
+			break
+		if (difference > 0) == increasing:
+			high = s
+		else:
+			low = s
+		slope = _bezierDerivative(p, s)
+		s = s - difference / slope if slope else low - 1.0
+		if not low < s < high:
+			s = (low + high) / 2.0
+	return s
+
+#------------------------------------------------------------------------------------------------------------------------
+# Key reduction. Samples are split into the fewest segments a single cubic Bezier can fit within a tolerance.
+#------------------------------------------------------------------------------------------------------------------------
+
+def _fitSegment(np, times, values, start, end):
+	""" Least squares fit of a Bezier segment to the samples between start and end included.
+
+	The time handles are placed at a third and two thirds of the segment so the Bezier parameter
+	is linear in time, which leaves a linear problem for the two value handles. They are solved
+	as offsets from a straight line so segments without enough samples stay linear.
+
+	Returns:
+		tuple: The two value handles and the maximum error of the fit.
+	"""
+	t = times[start:end + 1]
+	v = values[start:end + 1]
+	v0, v3 = v[0], v[-1]
+	s = (t - t[0]) / (t[-1] - t[0])
+	r = 1.0 - s
+	b1 = 3.0 * r * r * s
+	b2 = 3.0 * r * s * s
+	line = v0 + (v3 - v0) * s
+	offsets = np.linalg.lstsq(np.column_stack((b1, b2)), v - line, rcond=None)[0]
+	v1 = v0 + (v3 - v0) / 3.0 + offsets[0]
+	v2 = v0 + (v3 - v0) * 2.0 / 3.0 + offsets[1]
+	fitted = r * r * r * v0 + b1 * v1 + b2 * v2 + s * s * s * v3
+	return v1, v2, float(np.abs(fitted - v).max())
+
+def fitKeys(times, values, tolerance=0.01):
+	""" Returns the Bezier keys of a curve passing within tolerance of every sample.
+
+	Segments are grown greedily from the first sample. The length of each one is found with an
+	exponential search followed by a binary search, so a reduction costs O(n log n) segment fits
+	and every fit is vectorized over its samples with numpy.
+
+	Args:
+		times (list): The sample times, increasing.
+		values (list): The sample values.
+		tolerance (float): The maximum distance between a sample and the fitted curve.
+
+	Returns:
+		list: The fitted Key objects.
+	"""
+	import numpy as np
+	times = np.asarray(times, dtype=float)
+	values = np.asarray(values, dtype=float)
+	count = len(times)
+	if count < 3:
+		return [Key(time=t, value=v, inTangentType=TangentType.Linear, outTangentType=TangentType.Linear) for t, v in zip(times, values)]
+
+	breaks = [0]
+	handles = []
+	start = 0
+	while start < count - 1:
+		fits = lambda end: _fitSegment(np, times, values, start, end)
+
+		# Doubling the segment until it does not fit anymore.
+		good, step = start + 1, 2
+		fit = fits(good)
+		while good < count - 1:
+			candidate = min(start + step, count - 1)
+			candidateFit = fits(candidate)
+			if candidateFit[2] > tolerance:
+				bad = candidate
+				break
+			good, fit = candidate, candidateFit
+			step *= 2
+		else:
+			bad = None
+
+		# Narrowing down the longest segment that fits.
+		while bad is not None and bad - good > 1:
+			middle = (good + bad) // 2
+			middleFit = fits(middle)
+			if middleFit[2] > tolerance:
+				bad = middle
+			else:
+				good, fit = middle, middleFit
+
+		handles.append(fit[:2])
+		breaks.append(good)
+		start = good
+
+	keys = []
+	for index, sample in enumerate(breaks):
+		time, value = float(times[sample]), float(values[sample])
+		kwargs = {'time': time, 'value': value, 'inTangentType': TangentType.Bezier, 'outTangentType': TangentType.Bezier, 'brokenTangents': True}
+		if index > 0:
+			third = (time - times[breaks[index - 1]]) / 3.0
+			offset = handles[index - 1][1] - value
+			kwargs['inTangentAngle'] = math.atan2(offset, third)
+			kwargs['inTangentLength'] = math.hypot(offset, third)
+		if index < len(handles):
+			third = (times[breaks[index + 1]] - time) / 3.0
+			offset = handles[index][0] - value
+			kwargs['outTangentAngle'] = math.atan2(offset, third)
+			kwargs['outTangentLength'] = math.hypot(offset, third)
+		keys.append(Key(**kwargs))
+	return keys
+
+def _uniqueTimes(times, tolerance=1e-6):
+	""" Sorts times and removes the ones found twice where two curve pieces meet. """
+	unique = []
+	for time in sorted(times):
+		if not unique or time - unique[-1] > tolerance:
+			unique.append(time)
+	return unique
+
 
 class Key(object):
 
@@ -167,7 +340,7 @@ class FCurve(object):
 			setattr(key, attr, round(v))
 
 	def invert(self, conversionRatio=1.0):
-		""" Inverse time and values of each key.
+		""" Inverse time and values of each key in place. See inverse.
 
 		Args:
 			conversionRatio(float): The conversion ratio to go from Y to X.
@@ -175,34 +348,238 @@ class FCurve(object):
 			The X values will need to be divided by a frame rate to become meaningful Y values.
 			On the other hand Y values will have to be multiplied by that same ratio to become meaningful X values.
 		"""
+		self._keys = self.inverse(conversionRatio).keys()
+
+	def inverse(self, conversionRatio=1.0):
+		""" Returns a new curve mapping the values of this curve back to its times.
+
+		The control points of every Bezier segment are mirrored over the time = value line, which
+		is the exact inverse of the segment. The curve has to be monotonic for the result to be a
+		valid curve.
+
+		Args:
+			conversionRatio(float): The conversion ratio to go from Y to X. See invert.
+
+		Returns:
+			FCurve: The inverted curve.
+		"""
+		source = copy.deepcopy(self)
 
 		# Before we flip we rationalize the Y axis based on provided conversion ratio.
 		if conversionRatio and conversionRatio != 1.0:
-			self.scale(conversionRatio, attr='value')
+			source.scale(conversionRatio, attr='value')
 
-		for key in self._keys:
-			time = key.time
-			value = key.value
-
-			# Swapping time and value.
-			key.time = value
-			key.value = time
+		keys = source._sortedKeys()
+		increasing = len(keys) < 2 or keys[-1].value >= keys[0].value
+		for key in keys:
+			key.time, key.value = key.value, key.time
 
-			# Flipping tangents based on a 45 degrees line.
-			key.inTangentAngle = math.pi / 2.0 - key.inTangentAngle
-			key.outTangentAngle = math.pi / 2.0 - key.outTangentAngle
+			# Mirroring the tangents. On a decreasing curve the tangents also swap sides.
+			if increasing:
+				key.inTangentAngle, key.outTangentAngle = -(math.pi / 2.0 + key.inTangentAngle), math.pi / 2.0 - key.outTangentAngle
+			else:
+				key.inTangentAngle, key.outTangentAngle = math.pi / 2.0 + key.outTangentAngle, key.inTangentAngle - math.pi / 2.0
+				key.inTangentLength, key.outTangentLength = key.outTangentLength, key.inTangentLength
+				key.inTangentType, key.outTangentType = key.outTangentType, key.inTangentType
+		source._keys = source._sortedKeys()
 
 		# We revert the scale of the Y axis.
 		if conversionRatio and conversionRatio != 1.0:
-			self.scale(1 / conversionRatio, attr='value')
+			source.scale(1 / conversionRatio, attr='value')
+
+		return source
 
 	def range(self, attr='time'):
-		
-		# TODO: This will only work for curves whos start at their minumum and ends at their maximum.
 		keys = self._keys
-		start = getattr(keys[0], attr) if len(keys) > 1 else 0
-		end = getattr(keys[-1], attr) if len(keys) > 1 else 0
-		return ValueRange(start, end)
+		if len(keys) < 2:
+			return ValueRange(0, 0)
+		if attr == 'value':
+			return self.valueRange()
+		values = [getattr(key, attr) for key in keys]
+		return ValueRange(min(values), max(values))
+
+	def _sortedKeys(self):
+		return sorted(self._keys, key=lambda k: k.time)
+
+	def _segmentValueRange(self, key0, key1, start, end):
+		""" Returns the lowest and highest values of the segment between two keys within [start, end]. """
+		px, py = _segmentPoints(key0, key1)
+		s0 = _bezierParameter(px, start) if start > key0.time else 0.0
+		s1 = _bezierParameter(px, end) if end < key1.time else 1.0
+		values = [_bezier(py, s0), _bezier(py, s1)]
+		values += [_bezier(py, s) for s in _bezierStationaryParameters(py) if s0 < s < s1]
+		return min(values), max(values)
+
+	def extrema(self):
+		""" Returns the local minimums and maximums of the curve between its first and last key.
+
+		They are computed from the derivative of each Bezier segment, so peaks that fall between
+		frames are found as well. Keys where the curve changes direction are included.
+
+		Returns:
+			list: Sorted (time, value) tuples.
+		"""
+		keys = self._sortedKeys()
+		extrema = []
+		previousDirection = 0
+		for key0, key1 in zip(keys[:-1], keys[1:]):
+			px, py = _segmentPoints(key0, key1)
+
+			# The direction the segment leaves key0 with, and the one it enters key1 with.
+			startDirection = next((cmp(v, py[0]) for v in py[1:] if v != py[0]), 0)
+			endDirection = next((cmp(py[3], v) for v in reversed(py[:3]) if v != py[3]), 0)
+			if previousDirection * startDirection < 0:
+				extrema.append((key0.time, key0.value))
+
+			for s in _bezierStationaryParameters(py):
+				# Only roots where the derivative changes sign are extrema.
+				if _bezierDerivative(py, max(s - 1e-6, 0.0)) * _bezierDerivative(py, min(s + 1e-6, 1.0)) < 0:
+					extrema.append((_bezier(px, s), _bezier(py, s)))
+
+			previousDirection = endDirection or previousDirection
+		return extrema
+
+	def _monotonicPieces(self):
+		""" Splits the segments of the curve where their value changes direction.
+
+		Returns:
+			list: (timePoints, valuePoints, startParameter, endParameter, lowValue, highValue) tuples.
+		"""
+		pieces = []
+		keys = self._sortedKeys()
+		for key0, key1 in zip(keys[:-1], keys[1:]):
+			px, py = _segmentPoints(key0, key1)
+			bounds = [0.0] + _bezierStationaryParameters(py) + [1.0]
+			for s0, s1 in zip(bounds[:-1], bounds[1:]):
+				v0, v1 = _bezier(py, s0), _bezier(py, s1)
+				pieces.append((px, py, s0, s1, min(v0, v1), max(v0, v1)))
+		return pieces
+
+	def timesForValue(self, value, extrapolate=False):
+		""" Returns the times at which the curve equals a value. See timesForValues. """
+		return self.timesForValues([value], extrapolate)[0]
+
+	def timesForValues(self, values, extrapolate=False, tolerance=1e-9):
+		""" Returns the times at which the curve equals each of the values.
+
+		Each segment is split in pieces over which its value is monotonic, and the cubic of each
+		piece is solved with a bracketed Newton search. The values are sorted once so every piece
+		only solves the values that fall in its range.
+
+		Args:
+			values (list): The values to look up.
+			extrapolate (bool): Also solve past the first and last keys for linear extrapolations.
+			tolerance (float): How far outside of a piece range a value is still considered in it.
+
+		Returns:
+			list: A sorted list of times per value. Flat pieces matching a value give their start
+				and end times.
+		"""
+		values = list(values)
+		order = sorted(range(len(values)), key=values.__getitem__)
+		sortedValues = [values[index] for index in order]
+		results = [[] for value in values]
+
+		for px, py, s0, s1, low, high in self._monotonicPieces():
+			first = bisect.bisect_left(sortedValues, low - tolerance)
+			last = bisect.bisect_right(sortedValues, high + tolerance)
+			for index in range(first, last):
+				if high - low <= tolerance:
+					times = [_bezier(px, s0), _bezier(px, s1)]
+				else:
+					times = [_bezier(px, _bezierParameter(py, sortedValues[index], s0, s1))]
+				results[order[index]].extend(times)
+
+		keys = self._sortedKeys()
+		if extrapolate and keys:
+			for before, mode in ((True, self._inExtrapolation), (False, self._outExtrapolation)):
+				if mode != ExtrapolationType.Linear:
+					continue
+				key = keys[0] if before else keys[-1]
+				direction = -1.0 if before else 1.0
+				slope = (self.extrapolateValue(key.time + direction) - key.value) * direction
+				if not slope:
+					continue
+				for index, value in enumerate(values):
+					time = key.time + (value - key.value) / slope
+					if (time < key.time) if before else (time > key.time):
+						results[index].append(time)
+
+		return [_uniqueTimes(times) for times in results]
+
+	def valueRange(self, timeRange=None):
+		""" Returns the lowest and highest values the curve reaches over a time range.
+
+		The range is solved analytically from the Bezier segments so its cost depends on the
+		number of keys, not on the number of frames, and sub-frame peaks are accounted for.
+
+		Args:
+			timeRange (list): The start and end times. Defaults to the range of the keys.
+
+		Returns:
+			ValueRange: The lowest and highest values.
+		"""
+		keys = self._sortedKeys()
+		if not keys:
+			return ValueRange(0, 0)
+		first, last = keys[0].time, keys[-1].time
+		start, end = (first, last) if timeRange is None else (min(timeRange), max(timeRange))
+
+		values = []
+		for key0, key1 in zip(keys[:-1], keys[1:]):
+			if key1.time > start and key0.time < end:
+				values.extend(self._segmentValueRange(key0, key1, max(start, key0.time), min(end, key1.time)))
+		values.extend(key.value for key in keys if start <= key.time <= end)
+
+		# Outside of the keys the curve follows its extrapolation.
+		for before, outside in ((True, start < first), (False, end > last)):
+			if not outside:
+				continue
+			times = (start, min(end, first)) if before else (max(start, last), end)
+			mode = self._inExtrapolation if before else self._outExtrapolation
+			if mode in (ExtrapolationType.Constant, ExtrapolationType.Linear) or last <= first:
+				# Both are monotonic so the extremes are at the boundaries.
+				values.extend(self.valueAtTime(time) for time in times)
+			elif mode in (ExtrapolationType.Cycled, ExtrapolationType.CycledWithOffset):
+				values.extend(self._cycledValues(times[0], times[1], before, mode == ExtrapolationType.CycledWithOffset))
+			else:
+				# Ping pong repeats the values of the whole curve.
+				values.extend(self.valueRange())
+
+		return ValueRange(min(values), max(values))
+
+	def _cycledValues(self, start, end, before, withOffset):
+		""" Returns the lowest and highest values of the cycles repeating the keys over a time range
+		outside of them.
+
+		Each cycle covered by the range is mapped back into the keys, so a range covering part of a
+		cycle only accounts for the part of the curve it covers. Full cycles all have the same range,
+		shifted by the offset of the cycle, so only the first and last two are evaluated.
+		"""
+		keys = self._sortedKeys()
+		first, last = keys[0].time, keys[-1].time
+		period = last - first
+		delta = keys[-1].value - keys[0].value if withOffset else 0.0
+
+		# The cycle n maps the times t of the range to t - n * period after the keys and to
+		# t + n * period before them.
+		if before:
+			cycles = (max(1, int(math.ceil((first - end) / period))), int(math.floor((last - start) / period)))
+			shift, offset = period, -delta
+		else:
+			cycles = (max(1, int(math.ceil((start - last) / period))), int(math.floor((end - first) / period)))
+			shift, offset = -period, delta
+		if cycles[1] - cycles[0] > 3:
+			indexes = (cycles[0], cycles[0] + 1, cycles[1] - 1, cycles[1])
+		else:
+			indexes = range(cycles[0], cycles[1] + 1)
+
+		values = []
+		for cycle in indexes:
+			low, high = max(first, start + cycle * shift), min(last, end + cycle * shift)
+			if low <= high:
+				values.extend(value + cycle * offset for value in self.valueRange((low, high)))
+		return values
 
 	def setExtrapolation(self, extrapolation=[None, None]):
 		self._inExtrapolation = extrapolation[0] or self._inExtrapolation
@@ -228,6 +605,37 @@ class FCurve(object):
 		self._keys.append(key)
 		return self._keys
 
+	@classmethod
+	def fromSamples(cls, times, values, tolerance=0.01, **kwargs):
+		""" Creates a curve with as few keys as possible passing within tolerance of the samples.
+
+		Args:
+			times (list): The sample times, increasing.
+			values (list): The sample values.
+			tolerance (float): The maximum distance between a sample and the curve.
+			kwargs: Passed to the FCurve constructor.
+
+		Returns:
+			FCurve: The fitted curve.
+		"""
+		fCurve = cls(**kwargs)
+		fCurve._keys = fitKeys(times, values, tolerance)
+		return fCurve
+
+	def reduce(self, tolerance=0.01):
+		""" Replaces the keys with the fewest Bezier keys passing within tolerance of them.
+
+		This is meant for baked curves, where each key is a sample. The shape of the curve between
+		keys is not taken into account.
+
+		Returns:
+			int: The number of keys removed.
+		"""
+		keys = self._sortedKeys()
+		count = len(keys)
+		self._keys = fitKeys([key.time for key in keys], [key.value for key in keys], tolerance)
+		return count - len(self._keys)
+
 	def __len__(self):
 		return len(self.keys())
 
@@ -473,6 +881,13 @@ class FCurve(object):
 
 		d = 3*f + 3*g - 2
 		n = 2*f + g - 1
+
+		if abs(d) < 1e-6:
+			# The time handles are (nearly) evenly spread so the time is not a cubic of the
+			# parameter and the closed form below would divide by zero.
+			t = _bezierParameter((p0x, p1x, p2x, p3x), frame)
+			return _bezier((p0y, p1y, p2y, p3y), t)
+
 		r = (n*n - f*d) / (d*d)
 		q = ((3*f*d*n - 2*n*n*n) / (d*d*d)) - xVal/d
 
@@ -12,19 +12,25 @@
 
 import os
 import re
-import copy
 import glob
 import shutil
 import subprocess
 import time
 import warnings
+from collections import namedtuple
 
 import cross3d
 from framerange import FrameRange
+from frameset import FrameSet
 from cross3d.constants import VideoCodec, PaddingStyle
 
 #------------------------------------------------------------------------------------------------------------------------
 
+# The parsed name of a sequence. Fields are named after the groups of FileSequence._regex.
+SequenceTokens = namedtuple('SequenceTokens', ('baseName', 'separator', 'range', 'start', 'end', 'extension'))
+
+#------------------------------------------------------------------------------------------------------------------------
+
 
 class FileSequence(object):
 
@@ -120,15 +126,42 @@ class FileSequence(object):
 		"""
 			\remarks	Initialize the class.
 		"""
-		self._path = unicode(self.buildPath(path, frameRange) if frameRange else path)
+		self._setPath(unicode(self.buildPath(path, frameRange) if frameRange else path))
 		self._step = step
 
+	def _setPath(self, path):
+		""" Sets the path and clears the tokens parsed from the previous one. """
+		self._path = path
+		self._tokens = None
+		self._pathTemplate = None
+
+	def _parsedTokens(self):
+		""" Returns the SequenceTokens of the name, or None if it is not a sequence name.
+
+		The name is only parsed once per path.
+		"""
+		if self._tokens is None:
+			match = self._regex.match(self.name())
+			self._tokens = SequenceTokens(**match.groupdict()) if match else False
+		return self._tokens or None
+
+	def _frameTemplate(self):
+		""" Returns a normalized path template that only needs to be formatted with a frame number. """
+		if self._pathTemplate is None:
+			# The placeholder keeps the frame out of the normalization, it is applied only once.
+			path = os.path.normpath(os.path.join(self.basePath(), self.baseName() + self.nameToken('separator') + '\0.' + self.extension()))
+			prefix, suffix = path.split('\0', 1)
+			self._pathTemplate = prefix.replace('%', '%%') + '%0{}d'.format(self.padding()) + suffix.replace('%', '%%')
+		return self._pathTemplate
+
 	@classmethod
 	def isValidSequencePath(cls, path):
 		return bool(cls._regex.match(os.path.basename(path)))
 
 	@classmethod
 	def buildPath(cls, uniquePath, frameRange):
+		if isinstance(frameRange, FrameSet):
+			frameRange = (frameRange.start(), frameRange.end())
 		extension = os.path.splitext(uniquePath)[1]
 		if extension:
 			return uniquePath.replace(extension, '.%i-%i%s' % (frameRange[0], frameRange[1], extension))
@@ -158,29 +191,29 @@ class FileSequence(object):
 		if separator:
 			nameTokens['separator'] = separator
 
-		self._path = os.path.join(self.basePath(), self.nameMask() % nameTokens)
+		self._setPath(os.path.join(self.basePath(), self.nameMask() % nameTokens))
 		return True
 
 	def nameMask(self):
 		return '%(baseName)s%(separator)s%(start)s-%(end)s.%(extension)s'
 
 	def nameTokens(self):
-		match = self._regex.match(self.name())
-		if match:
-			dict = match.groupdict()
-			for key in dict.keys():
-				dict[key] = dict[key]
-			return dict
+		tokens = self._parsedTokens()
+		if tokens:
+			return tokens._asdict()
 		return {}
 
 	def separator(self):
-		return self.nameTokens().get('separator', '')
+		return self.nameToken('separator')
 
 	def setSeparator(self, separator):
 		self.setName(separator=separator)
 
 	def nameToken(self, key):
-		return self.nameTokens().get(key, '')
+		tokens = self._parsedTokens()
+		if tokens:
+			return getattr(tokens, key, '')
+		return ''
 
 	def baseName(self):
 		''' From "Path/Sequence.0-100.jpg" it will return "Sequence".
@@ -203,6 +236,10 @@ class FileSequence(object):
 			return self.nameToken('range')
 		return FrameRange([self.start(), self.end()])
 
+	def frames(self):
+		""" Returns the FrameSet of the frames of the sequence, taking its step into account. """
+		return FrameSet.fromRange(self.start(), self.end(), self._step)
+
 	def start(self):
 		try:
 			return int(self.nameToken('start'))
@@ -224,7 +261,7 @@ class FileSequence(object):
 			extension = extension[1:] if extension[0] == '.' else extension
 
 		split = os.path.splitext(self._path)
-		self._path = '{}.{}'.format(split[0], extension)
+		self._setPath('{}.{}'.format(split[0], extension))
 		return True
 
 	def extension(self):
@@ -236,16 +273,21 @@ class FileSequence(object):
 		return self.end() - self.start() + 1
 
 	def setRange(self, rng):
+		if isinstance(rng, FrameSet):
+			rng = (rng.start(), rng.end())
 		tokens = self.nameTokens()
 		tokens['start'] = str(rng[0])
 		tokens['end'] = str(rng[1])
 		fileName = self.nameMask() % tokens
-		self._path = os.path.join(self.basePath(), fileName)
+		self._setPath(os.path.join(self.basePath(), fileName))
 		return True
 
 	def padding(self, style=PaddingStyle.Number):
 		try:
-			padding = len(str(self.nameTokens()['start']))
+			tokens = self._parsedTokens()
+			if not tokens:
+				raise KeyError('start')
+			padding = len(str(tokens.start))
 
 			# This will return something like "####".
 			if style == PaddingStyle.Pound:
@@ -287,7 +329,7 @@ class FileSequence(object):
 		return os.path.split(self._path)[0]
 
 	def setBasePath(self, basePath):
-		self._path = os.path.join(basePath, os.path.split(self._path)[1])
+		self._setPath(os.path.join(basePath, os.path.split(self._path)[1]))
 
 	def framePath(self, frame):
 		start = self.start()
@@ -306,32 +348,28 @@ class FileSequence(object):
 		return False
 
 	def existingPaths(self):
-		existingPaths = []
-		for path in self.paths():
-			if os.path.exists(path):
-				existingPaths.append(path)
-		return existingPaths
-		
+		return [path for path in self.paths() if os.path.exists(path)]
+
 	def paths(self):
-		paths = []
-		for frame in range(self.start(), self.end() + 1, self._step):
-			name = self.baseName() + self.nameToken('separator') + str(frame).zfill(self.padding()) + '.' + self.extension()
-			paths.append(os.path.normpath(os.path.join(self.basePath(), name)))
-		return paths
+		""" Returns the list of the paths of every frame of the sequence. """
+		template = self._frameTemplate()
+		return [template % frame for frame in xrange(self.start(), self.end() + 1, self._step)]
 
 	def isComplete(self):
 		if len(self.missingFrames()) > 0:
 			return False
 		return True
 
-	def missingFrames(self):
-		frames = []
-		for frame in range(self.start(), self.end() + 1, self._step):
-			name = self.baseName() + self.nameToken('separator') + str(frame).zfill(self.padding()) + '.' + self.extension()
-			path = os.path.join(self.basePath(), name)
-			if not os.path.exists(path):
-				frames.append(frame)
-		return frames
+	def missingFrames(self, asFrameSet=False):
+		""" Returns the frames that do not exist on disk.
+
+		Args:
+			asFrameSet (bool): Returns a FrameSet instead of a list, which stays compact for long
+				sequences with few or many missing frames.
+		"""
+		template = self._frameTemplate()
+		frames = [frame for frame in xrange(self.start(), self.end() + 1, self._step) if not os.path.exists(template % frame)]
+		return FrameSet(frames) if asFrameSet else frames
 
 	def offsetRange(self, offset):
 		self.setRange(self.frameRange().offseted(offset))
@@ -340,7 +378,7 @@ class FileSequence(object):
 	def move(self, output):
 		self.copy(output)
 		self.delete()
-		self._path = output.path()
+		self._setPath(output.path())
 
 	def copy(self, output):
 		if output.path() == self.path() and output.frameRange().overlaps(self.frameRange()):
@@ -486,17 +524,14 @@ class FileSequence(object):
 		# We cannot initialize a FileSequence with a unique path.
 		retimedSequence = FileSequence('{}.0-0{}'.format(*os.path.splitext(outputPath)))
 
-		# We'll prescan the input range to find the bounds of our target output
-		start = None
-		end = None
-
-		invertedCurve = copy.deepcopy(retimeCurve)
-		invertedCurve.invert()
-
-		for frame in xrange(self.start(), self.end() + 1, self.step()):
-			targetFrame = int(round(invertedCurve.valueAtTime(frame)))
-			start = targetFrame if start is None else min(targetFrame, start)
-			end = targetFrame if end is None else max(targetFrame, end)
+		# We'll prescan the input range to find the bounds of our target output.
+		# Solving the curve for all the source frames at once gives the output frames that use them.
+		sourceFrames = xrange(self.start(), self.end() + 1, self.step())
+		targetFrames = [time for times in retimeCurve.timesForValues(sourceFrames, extrapolate=True) for time in times]
+		if not targetFrames:
+			raise ValueError('The retime curve never reaches the frames of {}.'.format(self.path()))
+		start = int(round(min(targetFrames)))
+		end = int(round(max(targetFrames)))
 
 		# We'll invert the curve so we can lookup in the opposite direction, and
 		# find the source frames for our target range.
@@ -0,0 +1,334 @@
+##
+#	\namespace	cross3d.classes.frameset
+#
+#	\remarks	This module holds the FrameSet class to handle sparse, stepped and multi-range
+#				frame lists without expanding them.
+#
+#	\author		Blur Studio
+#
+
+import bisect
+import re
+
+from framerange import FrameRange
+
+#------------------------------------------------------------------------------------------------------------------------
+
+# Matches one comma separated part of a spec string: "5", "1-100" or "1-100x2". Frames can be negative.
+_specPart = re.compile(r'^\s*(-?\d+)(?:\s*-\s*(-?\d+)(?:\s*x\s*(\d+))?)?\s*$')
+
+def _gcd(a, b):
+	while b:
+		a, b = b, a % b
+	return abs(a)
+
+def _modularInverse(a, m):
+	""" Returns x such as a * x % m == 1. a and m have to be coprime. """
+	x0, x1, r0, r1 = 1, 0, a % m, m
+	while r1:
+		q = r0 // r1
+		r0, r1 = r1, r0 - q * r1
+		x0, x1 = x1, x0 - q * x1
+	return x0 % m if m > 1 else 0
+
+def _clip(span, low, high):
+	""" Returns the part of a span between low and high included, or None. """
+	start, end, step = span
+	first = start + max(0, -((start - low) // step)) * step
+	last = start + ((min(end, high) - start) // step) * step
+	if first > last or first < start:
+		return None
+	return (first, last, step)
+
+def _intersectSpans(a, b, low, high):
+	""" Returns the frames two spans have in common between low and high as a span, or None. """
+	(s1, e1, k1), (s2, e2, k2) = a, b
+	g = _gcd(k1, k2)
+	if (s2 - s1) % g:
+		return None
+
+	# Chinese remainder theorem, the common frames repeat every lcm(k1, k2).
+	lcm = k1 // g * k2
+	t = ((s2 - s1) // g * _modularInverse(k1 // g, k2 // g)) % (k2 // g) if k2 // g > 1 else 0
+	origin = s1 + k1 * t
+	return _clip((origin - ((origin - low) // lcm + 1) * lcm, high, lcm), max(low, s1, s2), min(high, e1, e2))
+
+def _contains(span, frame):
+	start, end, step = span
+	return start <= frame <= end and (frame - start) % step == 0
+
+def _frames(span):
+	return xrange(span[0], span[1] + 1, span[2])
+
+def _canonical(pieces):
+	""" Rebuilds sorted non overlapping pieces into the spans the frames would give if they were
+	read one by one: each span is the longest run with a constant step starting at its first frame.
+	Runs of two frames are only kept for consecutive frames. Equal sets always get equal spans.
+	"""
+	spans = []
+	current = None
+	pieces = list(pieces)
+	pieces.reverse()
+	while pieces:
+		piece = pieces.pop()
+		start, end, step = piece
+		if current is None:
+			current = piece if start != end else (start, start, 1)
+			continue
+		cStart, cEnd, cStep = current
+
+		if cStart == cEnd:
+			# A single frame starts a run with the next frame.
+			current = (cStart, start, start - cStart)
+		elif start == cEnd + cStep:
+			if start == end or step == cStep:
+				current = (cStart, end, cStep)
+				continue
+			current = (cStart, start, cStep)
+		else:
+			if cStep != 1 and cEnd == cStart + cStep:
+				# Two frames are not a run, the second one can start the next run.
+				spans.append((cStart, cStart, 1))
+				current = (cEnd, cEnd, 1)
+			else:
+				spans.append(current)
+				current = None
+			pieces.append(piece)
+			continue
+
+		# The rest of the piece still has to be read.
+		if start != end:
+			pieces.append((start + step, end, step))
+
+	if current is not None:
+		cStart, cEnd, cStep = current
+		if cStep != 1 and cEnd == cStart + cStep:
+			spans.extend(((cStart, cStart, 1), (cEnd, cEnd, 1)))
+		else:
+			spans.append(current)
+	return spans
+
+#------------------------------------------------------------------------------------------------------------------------
+
+class FrameSet(object):
+	""" An immutable set of integer frames stored as sorted (start, end, step) spans.
+
+	Frames are never expanded to a list unless they are iterated over, so a set like
+	`1-1000000x2` costs a single span. Membership is tested with a binary search over the
+	spans and set operations work span by span::
+
+		frames = FrameSet('1-100x2,150,200-210')
+		150 in frames						# True
+		frames - FrameSet('1-50')			# cross3d.FrameSet('51-99x2,150,200-210')
+		str(frames | [151, 152])			# '1-99x2,150-152,200-210'
+
+	Args:
+		frames: A spec string, a FrameRange, another FrameSet or an iterable of frames.
+	"""
+
+	__slots__ = ('_spans', '_starts', '_count')
+
+	def __init__(self, frames=None):
+		if frames is None:
+			spans = []
+		elif isinstance(frames, FrameSet):
+			spans = frames._spans
+		elif isinstance(frames, basestring):
+			spans = self._parse(frames)
+		elif isinstance(frames, FrameRange):
+			spans = [(frames.start(), frames.end(), 1)] if frames.end() >= frames.start() else []
+		else:
+			spans = [(frame, frame, 1) for frame in sorted(set(int(frame) for frame in frames))]
+		self._setSpans(_canonical(spans) if not isinstance(frames, FrameSet) else spans)
+
+	def _setSpans(self, spans):
+		self._spans = tuple(spans)
+		self._starts = [span[0] for span in self._spans]
+		self._count = sum((end - start) // step + 1 for start, end, step in self._spans)
+
+	@classmethod
+	def _fromCanonical(cls, spans):
+		frameSet = cls()
+		frameSet._setSpans(spans)
+		return frameSet
+
+	@classmethod
+	def _parse(cls, spec):
+		spans = []
+		for part in spec.split(','):
+			if not part.strip():
+				continue
+			match = _specPart.match(part)
+			if not match:
+				raise ValueError('Invalid frame spec "{}" in "{}".'.format(part, spec))
+			start = int(match.group(1))
+			end = int(match.group(2)) if match.group(2) is not None else start
+			step = int(match.group(3)) if match.group(3) is not None else 1
+			if end < start or step < 1:
+				raise ValueError('Invalid frame spec "{}" in "{}".'.format(part, spec))
+			spans.append((start, start + (end - start) // step * step, step))
+		return cls._normalize(spans)
+
+	@classmethod
+	def _normalize(cls, spans):
+		""" Returns sorted non overlapping pieces for spans that may overlap. """
+		spans = sorted(spans)
+		if all(a[1] < b[0] for a, b in zip(spans[:-1], spans[1:])):
+			return spans
+
+		# Splitting the work in halves keeps large overlapping specs at O(n log n) combines.
+		if len(spans) == 1:
+			return spans
+		middle = len(spans) // 2
+		return cls._combine(cls._normalize(spans[:middle]), cls._normalize(spans[middle:]), 'union')
+
+	@classmethod
+	def fromRange(cls, start, end, step=1):
+		""" Creates a set of the frames from start to end included, every step frames. """
+		if end < start:
+			return cls()
+		return cls._fromCanonical(_canonical([(int(start), int(start) + (int(end) - int(start)) // step * step, int(step))]))
+
+	@staticmethod
+	def _combine(a, b, operation):
+		""" Combines two lists of sorted non overlapping spans.
+
+		Both lists are cut at every span boundary. Within each of the resulting intervals each
+		list has at most one span, so they can be combined directly. Frames are only expanded
+		when spans with unrelated steps overlap.
+		"""
+		cuts = sorted(set([span[0] for span in a + b] + [span[1] + 1 for span in a + b]))
+		pieces = []
+		ia = ib = 0
+		for low, nextCut in zip(cuts[:-1], cuts[1:]):
+			high = nextCut - 1
+			while ia < len(a) and a[ia][1] < low:
+				ia += 1
+			while ib < len(b) and b[ib][1] < low:
+				ib += 1
+			spanA = _clip(a[ia], low, high) if ia < len(a) and a[ia][0] <= low else None
+			spanB = _clip(b[ib], low, high) if ib < len(b) and b[ib][0] <= low else None
+
+			if operation == 'union':
+				if spanA is None or spanB is None:
+					result = [spanA or spanB] if (spanA or spanB) else []
+				elif spanA[2] == 1 or (spanB[2] != 1 and _intersectSpans(spanA, spanB, low, high) == spanB):
+					result = [spanA]
+				elif spanB[2] == 1 or _intersectSpans(spanA, spanB, low, high) == spanA:
+					result = [spanB]
+				else:
+					frames = sorted(set(_frames(spanA)).union(_frames(spanB)))
+					result = [(frame, frame, 1) for frame in frames]
+
+			elif operation == 'intersection':
+				common = _intersectSpans(spanA, spanB, low, high) if spanA and spanB else None
+				result = [common] if common else []
+
+			else:
+				if spanA is None:
+					result = []
+				elif spanB is None:
+					result = [spanA]
+				else:
+					common = _intersectSpans(spanA, spanB, low, high)
+					if common is None:
+						result = [spanA]
+					elif common == spanA:
+						result = []
+					else:
+						result = [(frame, frame, 1) for frame in _frames(spanA) if not _contains(spanB, frame)]
+			pieces.extend(result)
+		return pieces
+
+	#--------------------------------------------------------------------------------
+	#	Set api
+	#--------------------------------------------------------------------------------
+
+	def union(self, other):
+		other = other if isinstance(other, FrameSet) else FrameSet(other)
+		return self._fromCanonical(_canonical(self._combine(list(self._spans), list(other._spans), 'union')))
+
+	def intersection(self, other):
+		other = other if isinstance(other, FrameSet) else FrameSet(other)
+		return self._fromCanonical(_canonical(self._combine(list(self._spans), list(other._spans), 'intersection')))
+
+	def difference(self, other):
+		other = other if isinstance(other, FrameSet) else FrameSet(other)
+		return self._fromCanonical(_canonical(self._combine(list(self._spans), list(other._spans), 'difference')))
+
+	__or__ = union
+	__and__ = intersection
+	__sub__ = difference
+
+	def __contains__(self, frame):
+		index = bisect.bisect_right(self._starts, frame) - 1
+		return index >= 0 and _contains(self._spans[index], frame)
+
+	def __iter__(self):
+		for span in self._spans:
+			for frame in _frames(span):
+				yield frame
+
+	def __len__(self):
+		return self._count
+
+	def __nonzero__(self):
+		return bool(self._spans)
+
+	def __eq__(self, other):
+		if isinstance(other, FrameSet):
+			return self._spans == other._spans
+		return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __hash__(self):
+		return hash(self._spans)
+
+	def __repr__(self):
+		return "cross3d.FrameSet('{}')".format(self.toString())
+
+	def __str__(self):
+		return self.toString()
+
+	#--------------------------------------------------------------------------------
+	#	Frames
+	#--------------------------------------------------------------------------------
+
+	def spans(self):
+		""" Returns the (start, end, step) spans of the set. """
+		return list(self._spans)
+
+	def start(self):
+		return self._spans[0][0] if self._spans else 0
+
+	def end(self):
+		return self._spans[-1][1] if self._spans else 0
+
+	def frameRange(self):
+		""" Returns the FrameRange going from the first to the last frame. """
+		return FrameRange([self.start(), self.end()])
+
+	def offseted(self, offset):
+		offset = int(offset)
+		return self._fromCanonical([(start + offset, end + offset, step) for start, end, step in self._spans])
+
+	def toString(self, steps=True):
+		""" Returns the spec string of the set, for example "1-100x2,150,200-210".
+
+		Args:
+			steps (bool): If False stepped spans are written as individual frames, for
+				applications that only understand ranges.
+		"""
+		parts = []
+		for start, end, step in self._spans:
+			if start == end:
+				parts.append(str(start))
+			elif step == 1:
+				parts.append('{}-{}'.format(start, end))
+			elif steps:
+				parts.append('{}-{}x{}'.format(start, end, step))
+			else:
+				parts.extend(str(frame) for frame in xrange(start, end + 1, step))
+		return ','.join(parts)
@@ -0,0 +1,345 @@
+##
+#	\namespace	cross3d.classes.hostprofiler
+#
+#	\remarks	This module holds the HostProfiler class, counting and timing the calls cross3d makes
+#				into the host software (mxs, cmds, xsi, ...) per cross3d API entry point.
+#
+#	\author		Blur Studio
+#
+
+import sys
+import time
+import types
+import inspect
+import threading
+
+# The host objects the software specific modules import, as (module, attribute, label). The
+# attribute is None when the module itself is used.
+hostObjects = (
+	('Py3dsMax', 'mxs', 'mxs'),
+	('maya.cmds', None, 'cmds'),
+	('maya.mel', None, 'mel'),
+	('maya.OpenMaya', None, 'om'),
+	('maya.OpenMayaAnim', None, 'oma'),
+	('maya.OpenMayaUI', None, 'omUI'),
+	('PySoftimage', 'xsi', 'xsi'),
+	('pyfbsdk', None, 'mob'),
+)
+
+class HostCallStats(object):
+	""" The number of calls made to a host function and the time spent in them. """
+
+	__slots__ = ('count', 'seconds')
+
+	def __init__(self):
+		self.count = 0
+		self.seconds = 0.0
+
+	def __repr__(self):
+		return 'HostCallStats(count=%d, seconds=%f)' % (self.count, self.seconds)
+
+
+class OperationStats(object):
+	""" The host calls made by the invocations of a cross3d API entry point.
+
+	Attributes:
+		name (str): The entry point, like "StudiomaxScene.objects".
+		invocations (int): The number of invocations that made host calls.
+		calls (dict): A HostCallStats per host function name, like "mxs.getNodeByName".
+		suspects (dict): The host functions called at least the N+1 threshold of times in a single
+			invocation, with the highest number of calls of an invocation.
+	"""
+
+	def __init__(self, name):
+		self.name = name
+		self.invocations = 0
+		self.calls = {}
+		self.suspects = {}
+
+	def hostCalls(self):
+		return sum(stats.count for stats in self.calls.itervalues())
+
+	def hostSeconds(self):
+		return sum(stats.seconds for stats in self.calls.itervalues())
+
+
+class _Invocation(object):
+	__slots__ = ('frame', 'operation', 'counts')
+
+	def __init__(self, frame, operation):
+		# Holding the frame keeps its id from being reused by the next invocation.
+		self.frame = frame
+		self.operation = operation
+		self.counts = {}
+
+
+def _unwrap(value):
+	""" Returns the host value a HostFunction or a HostProxy stands in for. """
+	if isinstance(value, HostFunction):
+		return value._function
+	if isinstance(value, HostProxy):
+		return value._host
+	return value
+
+
+class HostFunction(object):
+	""" A callable of the host recording its calls in a HostProfiler.
+
+	Host classes can be callable values that are not python classes, like mxs.Point. So the
+	wrapper compares and hashes like the value it wraps, and is unwrapped when passed back to the
+	host, for instance mxs.isKindOf(node, mxs.Point).
+	"""
+
+	__slots__ = ('_profiler', '_function', '_name')
+
+	def __init__(self, profiler, function, name):
+		self._profiler = profiler
+		self._function = function
+		self._name = name
+
+	def __call__(self, *args, **kwargs):
+		args = [_unwrap(arg) for arg in args]
+		for key, value in kwargs.iteritems():
+			kwargs[key] = _unwrap(value)
+		start = time.time()
+		try:
+			return self._function(*args, **kwargs)
+		finally:
+			self._profiler.record(self._name, time.time() - start)
+
+	def __getattr__(self, name):
+		return getattr(self._function, name)
+
+	def __eq__(self, other):
+		return self._function == _unwrap(other)
+
+	def __ne__(self, other):
+		return self._function != _unwrap(other)
+
+	def __hash__(self):
+		return hash(self._function)
+
+	def __repr__(self):
+		return '<HostFunction %s>' % self._name
+
+
+class HostProxy(object):
+	""" Stands in for a host object like mxs or maya.cmds, recording the calls made through it.
+
+	Reading an attribute of a host object that is not a module, like mxs.selection, crosses the
+	bridge too and is recorded as well. Classes are returned as is, so isinstance keeps working,
+	and the values the host returns are not wrapped.
+	"""
+
+	__slots__ = ('_profiler', '_host', '_label', '_recordReads')
+
+	def __init__(self, profiler, host, label):
+		object.__setattr__(self, '_profiler', profiler)
+		object.__setattr__(self, '_host', host)
+		object.__setattr__(self, '_label', label)
+		object.__setattr__(self, '_recordReads', not isinstance(host, types.ModuleType))
+
+	def __getattr__(self, name):
+		start = time.time()
+		value = getattr(self._host, name)
+		if inspect.isclass(value) or isinstance(value, types.ModuleType):
+			return value
+		if callable(value):
+			return HostFunction(self._profiler, value, '%s.%s' % (self._label, name))
+		if self._recordReads:
+			self._profiler.record('%s.%s' % (self._label, name), time.time() - start)
+		return value
+
+	def __setattr__(self, name, value):
+		start = time.time()
+		setattr(self._host, name, _unwrap(value))
+		self._profiler.record('%s.%s' % (self._label, name), time.time() - start)
+
+	def __repr__(self):
+		return '<HostProxy %s of %r>' % (self._label, self._host)
+
+
+class HostProfiler(object):
+	""" Counts and times the calls cross3d makes into the host software.
+
+	Once installed, the host objects the modules of the profiled packages imported, like mxs in
+	the studiomax modules, are replaced by proxies recording each call. A call is attributed to
+	the outermost function of the profiled packages on the stack, which is the cross3d API entry
+	point the caller used, for instance AbstractScene.objects. The same host function called
+	nPlusOneThreshold times or more by a single invocation of an entry point is reported as a
+	N+1 suspect, typically a host call made in a loop over objects::
+
+		profiler = HostProfiler()
+		profiler.install()
+		scene.objects()
+		print profiler.report()
+		profiler.uninstall()
+
+	cross3d.hostProfiler is installed when cross3d.debugLevel is set to DebugLevels.High.
+
+	Args:
+		packages (tuple): The names of the packages whose modules are patched and whose functions
+			are entry points.
+		nPlusOneThreshold (int): The number of calls to a host function in a single invocation
+			reported as a N+1 suspect.
+	"""
+
+	def __init__(self, packages=('cross3d',), nPlusOneThreshold=20):
+		self.packages = tuple(packages)
+		self.nPlusOneThreshold = nPlusOneThreshold
+		self._operations = {}
+		self._lock = threading.Lock()
+		self._local = threading.local()
+		self._hosts = {}
+		self._patched = []
+		self._installed = False
+
+	def isInstalled(self):
+		return self._installed
+
+	def _isProfiled(self, moduleName):
+		return any(moduleName == package or moduleName.startswith(package + '.') for package in self.packages)
+
+	def install(self, hosts=None):
+		""" Replaces the host objects imported by the profiled modules with recording proxies.
+
+		Args:
+			hosts (dict): The host objects to profile by label. Defaults to the hostObjects that are
+				imported.
+		"""
+		if hosts is None:
+			hosts = {}
+			for moduleName, attribute, label in hostObjects:
+				module = sys.modules.get(moduleName)
+				if module is not None:
+					hosts[label] = module if attribute is None else getattr(module, attribute, None)
+		self._hosts = dict((id(host), HostProxy(self, host, label)) for label, host in hosts.iteritems() if host is not None)
+		self._installed = True
+		self.patchModules()
+
+	def patchModules(self):
+		""" Patches the profiled modules imported since install, like the modules of lazy symbols. """
+		if not self._installed:
+			return
+		for moduleName, module in sys.modules.items():
+			if module is None or not self._isProfiled(moduleName):
+				continue
+			namespace = module.__dict__
+			for key, value in namespace.items():
+				proxy = self._hosts.get(id(value))
+				if proxy is not None and proxy._host is value:
+					namespace[key] = proxy
+					self._patched.append((namespace, key, value))
+
+	def uninstall(self):
+		""" Restores the host objects of the patched modules. The statistics are kept. """
+		for namespace, key, value in self._patched:
+			if isinstance(namespace.get(key), HostProxy):
+				namespace[key] = value
+		self._patched = []
+		self._hosts = {}
+		self._installed = False
+		self._endInvocation()
+
+	def reset(self):
+		with self._lock:
+			self._operations = {}
+		self._local.invocation = None
+
+	def _entryPoint(self):
+		entry = None
+		frame = sys._getframe(1)
+		ownGlobals = globals()
+		while frame is not None:
+			if frame.f_globals is not ownGlobals and self._isProfiled(frame.f_globals.get('__name__', '')):
+				entry = frame
+			frame = frame.f_back
+		return entry
+
+	@staticmethod
+	def _operationName(frame):
+		code = frame.f_code
+		if code.co_argcount and code.co_varnames[0] in ('self', 'cls'):
+			owner = frame.f_locals.get(code.co_varnames[0])
+			if owner is not None:
+				return '%s.%s' % ((owner if inspect.isclass(owner) else type(owner)).__name__, code.co_name)
+		return '%s.%s' % (frame.f_globals.get('__name__', '?'), code.co_name)
+
+	def record(self, function, seconds):
+		""" Records a call to the host function named function, that took seconds. """
+		entry = self._entryPoint()
+		invocation = getattr(self._local, 'invocation', None)
+		if entry is None:
+			# A call made through a proxy outside of the profiled packages, not part of an invocation.
+			invocation = None
+			operation = self._operation('<outside %s>' % ', '.join(self.packages), newInvocation=True)
+		elif invocation is not None and invocation.frame is entry:
+			operation = invocation.operation
+		else:
+			self._endInvocation()
+			operation = self._operation(self._operationName(entry), newInvocation=True)
+			invocation = self._local.invocation = _Invocation(entry, operation)
+
+		with self._lock:
+			stats = operation.calls.get(function)
+			if stats is None:
+				stats = operation.calls[function] = HostCallStats()
+			stats.count += 1
+			stats.seconds += seconds
+		if invocation is not None:
+			invocation.counts[function] = invocation.counts.get(function, 0) + 1
+
+	def _operation(self, name, newInvocation=False):
+		with self._lock:
+			operation = self._operations.get(name)
+			if operation is None:
+				operation = self._operations[name] = OperationStats(name)
+			if newInvocation:
+				operation.invocations += 1
+		return operation
+
+	def _endInvocation(self):
+		invocation = getattr(self._local, 'invocation', None)
+		if invocation is None:
+			return
+		self._local.invocation = None
+		suspects = invocation.operation.suspects
+		with self._lock:
+			for function, count in invocation.counts.iteritems():
+				if count >= self.nPlusOneThreshold and count > suspects.get(function, 0):
+					suspects[function] = count
+
+	def operations(self):
+		""" Returns the OperationStats by entry point name. """
+		self._endInvocation()
+		return dict(self._operations)
+
+	def suspects(self):
+		""" Returns the N+1 suspects as (entry point, host function, calls) tuples, the most calls first. """
+		results = []
+		for operation in self.operations().itervalues():
+			for function, count in operation.suspects.iteritems():
+				results.append((operation.name, function, count))
+		return sorted(results, key=lambda suspect: (-suspect[2], suspect[0], suspect[1]))
+
+	def report(self, limit=10):
+		""" Returns a report of the host calls per entry point, the most expensive first, followed
+		by the N+1 suspects.
+
+		Args:
+			limit (int): The maximum number of host functions listed per entry point.
+		"""
+		operations = sorted(self.operations().itervalues(), key=lambda operation: (-operation.hostSeconds(), operation.name))
+		lines = []
+		for operation in operations:
+			lines.append('%s: %d invocations, %d host calls, %.2f ms' % (operation.name, operation.invocations,
+						operation.hostCalls(), operation.hostSeconds() * 1000))
+			calls = sorted(operation.calls.iteritems(), key=lambda item: (-item[1].seconds, item[0]))
+			for function, stats in calls[:limit]:
+				lines.append('    %-60s %8d calls %10.2f ms' % (function, stats.count, stats.seconds * 1000))
+		suspects = self.suspects()
+		if suspects:
+			lines.append('N+1 suspects:')
+			for operationName, function, count in suspects:
+				lines.append('    %s calls %s %d times in a single invocation' % (operationName, function, count))
+		return '\n'.join(lines)
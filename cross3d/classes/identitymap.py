@@ -0,0 +1,78 @@
+##
+#	\namespace	cross3d.classes.identitymap
+#
+#	\remarks	This module holds the IdentityMap class a scene uses to hand out a single wrapper per
+#				native object.
+#
+#	\author		Blur Studio
+#
+
+import weakref
+
+class IdentityMap(object):
+	""" Maps native identity keys (anim handles, MObjectHandle hash codes, ...) to the wrappers
+	created for them.
+
+	Wrappers are only weakly referenced, so the map never keeps a wrapper alive and an entry
+	disappears as soon as nothing uses its wrapper anymore. The map counts its hits and misses
+	so the benefit can be measured for a given workflow::
+
+		wrapper = identityMap.get(key, cross3d.SceneObject)
+		if wrapper is None:
+			wrapper = identityMap.add(key, cross3d.SceneObject(scene, nativeObject))
+		print identityMap.stats()
+	"""
+
+	def __init__(self):
+		self._wrappers = weakref.WeakValueDictionary()
+		self.hits = 0
+		self.misses = 0
+		self.invalidations = 0
+
+	def __contains__(self, key):
+		return key in self._wrappers
+
+	def __len__(self):
+		return len(self._wrappers)
+
+	def get(self, key, cls=object):
+		""" Returns the wrapper stored for key if it is an instance of cls, None otherwise.
+
+		Args:
+			key: The native identity key.
+			cls (type): The class the wrapper is requested for. A wrapper created by a more generic
+				factory is not returned to a more specialized one.
+		"""
+		wrapper = self._wrappers.get(key)
+		if wrapper is not None and isinstance(wrapper, cls):
+			self.hits += 1
+			return wrapper
+		self.misses += 1
+		return None
+
+	def add(self, key, wrapper):
+		""" Stores the wrapper for key and returns it. """
+		self._wrappers[key] = wrapper
+		return wrapper
+
+	def discard(self, key):
+		self._wrappers.pop(key, None)
+
+	def invalidate(self):
+		""" Forgets all the wrappers, the counters are kept. """
+		self._wrappers.clear()
+		self.invalidations += 1
+
+	def resetStats(self):
+		self.hits = 0
+		self.misses = 0
+		self.invalidations = 0
+
+	def hitRate(self):
+		""" Returns the ratio of lookups that returned an existing wrapper. """
+		lookups = self.hits + self.misses
+		return float(self.hits) / lookups if lookups else 0.0
+
+	def stats(self):
+		return {'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations,
+				'size': len(self._wrappers), 'hitRate': self.hitRate()}
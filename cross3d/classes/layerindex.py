@@ -0,0 +1,96 @@
+##
+#	\namespace	cross3d.classes.layerindex
+#
+#	\remarks	This module holds the LayerIndex class scenes use to find the attributes storing
+#				the data of their layers by layer id and layer name.
+#
+#	\author		Blur Studio
+#
+
+class LayerIndex(object):
+	""" An ordered list of per layer attributes indexed by layer id and by layer name.
+
+	The attributes are read once when the index is built, a layer then finds its attribute
+	with a dictionary hit instead of walking all of them. Like a walk, the first attribute
+	matching either the id or the name of the layer is returned::
+
+		index = LayerIndex()
+		index.reset(zip(attrs, layerIds, layerNames, groupIndexes), attributeCount)
+		attr = index.find(layerId, layerName)
+
+	Software specific subclasses read the attributes from the scene in build.
+	"""
+
+	def __init__(self):
+		self.reset()
+
+	def __len__(self):
+		return len(self._attrs)
+
+	def _append(self, attr, layerId, layerName, groupIndex):
+		position = len(self._attrs)
+		layerName = str(layerName) if layerName is not None else None
+		self._attrs.append(attr)
+		self._layerNames.append(layerName)
+		self._ids.setdefault(layerId, position)
+		if layerName is not None:
+			self._names.setdefault(layerName, position)
+		if groupIndex == 1:
+			self._order += 1
+
+	def reset(self, entries=(), attributeCount=None):
+		""" Rebuilds the index.
+
+		Args:
+			entries (list): An (attr, layerId, layerName, groupIndex) tuple per attribute.
+			attributeCount (int): The number of attributes of the node holding them, including
+				the ones that are not layer attributes. Defaults to the number of entries.
+		"""
+		self._attrs = []
+		self._layerNames = []
+		self._ids = {}
+		self._names = {}
+		self._order = 1
+		for attr, layerId, layerName, groupIndex in entries:
+			self._append(attr, layerId, layerName, groupIndex)
+		self._attributeCount = len(self._attrs) if attributeCount is None else attributeCount
+
+	def add(self, attr, layerId, layerName, groupIndex=1):
+		""" Records an attribute that was just added to the node holding them. """
+		self._append(attr, layerId, layerName, groupIndex)
+		self._attributeCount += 1
+
+	def attributeCount(self):
+		""" Returns the number of attributes of the node when the index was built, including the
+		added ones. A different count means the attributes were changed without notice.
+		"""
+		return self._attributeCount
+
+	def find(self, layerId, layerName):
+		""" Returns the first attribute matching the layer id or the layer name, None if none does. """
+		positions = [position for position in (self._ids.get(layerId), self._names.get(str(layerName))) if position is not None]
+		if not positions:
+			return None
+		return self._attrs[min(positions)]
+
+	def groupOrder(self):
+		""" Returns the group order of the next layer added to the first group. """
+		return self._order
+
+	def rename(self, layerId, layerName):
+		""" Records the new layer name of the attribute of the layer id. The old name no longer
+		finds the attribute, unless another attribute still uses it.
+		"""
+		position = self._ids.get(layerId)
+		if position is None:
+			return
+		layerName = str(layerName)
+		oldName = self._layerNames[position]
+		self._layerNames[position] = layerName
+		if oldName is not None and self._names.get(oldName) == position:
+			del self._names[oldName]
+			for other, name in enumerate(self._layerNames):
+				if name == oldName:
+					self._names[oldName] = other
+					break
+		self._names[layerName] = position
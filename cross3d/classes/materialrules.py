@@ -0,0 +1,121 @@
+##
+#	\namespace	cross3d.classes.materialrules
+#
+#	\remarks	This module holds the host independent pieces of the material override builders: a
+#				per class rule registry and the cache their results are memoized in.
+#
+#	\author		Blur Studio
+#
+
+class MaterialRules(object):
+	""" A table of rules registered per kind of query and per material class.
+
+	Applying a rule classifies the material once and dispatches to the rule registered for its
+	class, instead of comparing the class against every supported one in turn. Class names are
+	matched case insensitively::
+
+		rules = MaterialRules(className=lambda material: str(mxs.classOf(material)))
+
+		@rules.register('opacity', 'StandardMaterial')
+		def standardOpacity(material):
+			return material.opacityMap if material.opacityMapEnable else None
+
+		opacityMap = rules.apply('opacity', material)
+
+	Args:
+		className (callable): Returns the class name of a material.
+	"""
+
+	def __init__(self, className=lambda material: type(material).__name__):
+		self._className = className
+		self._rules = {}
+
+	def register(self, kind, *classNames):
+		""" Returns a decorator registering a rule for kind and all the classNames.
+
+		The rule is called with the material followed by the extra arguments given to apply.
+		"""
+		def decorator(function):
+			for className in classNames:
+				self._rules[(kind, className.lower())] = function
+			return function
+		return decorator
+
+	def setFallback(self, kind, function):
+		""" Sets the rule used for the classes that have no rule for kind. """
+		self._rules[(kind, None)] = function
+
+	def rule(self, kind, className):
+		""" Returns the rule for kind and className, the fallback rule or None. """
+		rule = self._rules.get((kind, className.lower()))
+		if rule is None:
+			rule = self._rules.get((kind, None))
+		return rule
+
+	def hasRule(self, kind, className):
+		return (kind, className.lower()) in self._rules
+
+	def classNames(self, kind):
+		""" Returns the lower case names of the classes with a rule for kind. """
+		return sorted(className for ruleKind, className in self._rules if ruleKind == kind and className is not None)
+
+	def className(self, material):
+		return str(self._className(material))
+
+	def apply(self, kind, material, *args, **kwargs):
+		""" Runs the rule matching the class of material.
+
+		Args:
+			kind (str): The kind of rule to run.
+			material: The material to classify.
+			default: Keyword only, returned when no rule matches. Defaults to None.
+		"""
+		default = kwargs.pop('default', None)
+		if material is None:
+			return default
+		rule = self.rule(kind, self.className(material))
+		if rule is None:
+			return default
+		return rule(material, *args, **kwargs)
+
+
+class OverrideCache(object):
+	""" Memoizes built override materials by the key of what they were built from.
+
+	Keys are tuples of hashable values, for example the unique ids of the base and override
+	materials, the override options and a key for the advanced state. The cache counts its hits
+	and misses like the IdentityMap does.
+	"""
+
+	def __init__(self):
+		self._results = {}
+		self.hits = 0
+		self.misses = 0
+
+	def __contains__(self, key):
+		return key in self._results
+
+	def __len__(self):
+		return len(self._results)
+
+	def get(self, key, default=None):
+		if key in self._results:
+			self.hits += 1
+			return self._results[key]
+		self.misses += 1
+		return default
+
+	def add(self, key, result):
+		""" Stores the result for key and returns it. """
+		self._results[key] = result
+		return result
+
+	def clear(self):
+		self._results.clear()
+
+	def hitRate(self):
+		lookups = self.hits + self.misses
+		return float(self.hits) / lookups if lookups else 0.0
+
+	def stats(self):
+		return {'hits': self.hits, 'misses': self.misses, 'size': len(self._results), 'hitRate': self.hitRate()}
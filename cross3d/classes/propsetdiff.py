@@ -0,0 +1,141 @@
+##
+#	\namespace	cross3d.classes.propsetdiff
+#
+#	\remarks	This module plans the property writes of property set overrides, so only the values
+#				that change are written and each of them is written to many objects at once.
+#
+#	\author		Blur Studio
+#
+
+from collections import OrderedDict
+
+def _sameValue(a, b):
+	# True == 1 in python, but a host can treat booleans and integers differently.
+	return type(a) is type(b) and a == b
+
+def _valueKey(value):
+	try:
+		hash(value)
+	except TypeError:
+		return (type(value).__name__, repr(value))
+	return (type(value).__name__, value)
+
+def diffValues(current, target):
+	""" Returns the items of target that differ from current.
+
+	Args:
+		current (dict): The values the object has, None if they are unknown.
+		target (dict): The values the object should have.
+	"""
+	if current is None:
+		return dict(target)
+	return dict((key, value) for key, value in target.iteritems() if key not in current or not _sameValue(current[key], value))
+
+
+class PropSetPlan(object):
+	""" The writes needed to bring objects to their target values, grouped by property and value.
+
+	Each write is a (propname, value, objects) tuple, so a host can assign a value to all the
+	objects that need it with a single call.
+	"""
+
+	def __init__(self):
+		self._writes = OrderedDict()
+		self._objects = []
+
+	def __len__(self):
+		return len(self._writes)
+
+	def add(self, nativeObject, diff):
+		""" Adds the changes of one object to the plan. """
+		self._objects.append(nativeObject)
+		for key in sorted(diff):
+			value = diff[key]
+			write = self._writes.get((key, _valueKey(value)))
+			if write is None:
+				write = self._writes[(key, _valueKey(value))] = (key, value, [])
+			write[2].append(nativeObject)
+
+	def objects(self):
+		""" Returns all the objects the plan was built for, including the ones without changes. """
+		return list(self._objects)
+
+	def writeCount(self):
+		""" Returns the number of single object writes the plan groups. """
+		return sum(len(objects) for key, value, objects in self._writes.itervalues())
+
+	def writes(self):
+		return list(self._writes.values())
+
+
+class PropSetOverridePlanner(object):
+	""" Remembers the base values of the objects a property set override is applied to and the
+	values last written to them, and plans the writes of the next override.
+
+	Objects are identified by a hashable key, for example their anim handle. Switching from one
+	override to another only writes the properties whose effective values change::
+
+		planner.setBase(handle, baseValues)
+		plan = planner.plan([(handle, nativeObject)], {'renderable': False})
+		for key, value, nativeObjects in plan.writes():
+			setProperty(nativeObjects, key, value)
+
+	The values last written are only known for the objects whose base was read from the host
+	with setBase. Objects restored with loadBase get all their values written the first time.
+	"""
+
+	def __init__(self):
+		self._bases = {}
+		self._effective = {}
+
+	def __contains__(self, key):
+		return key in self._bases
+
+	def __len__(self):
+		return len(self._bases)
+
+	def base(self, key):
+		""" Returns the base values stored for key, None if there are none. """
+		return self._bases.get(key)
+
+	def setBase(self, key, values):
+		""" Stores the base values just read from an object, which are also its current values. """
+		self._bases[key] = dict(values)
+		self._effective[key] = dict(values)
+
+	def loadBase(self, key, values):
+		""" Stores base values recorded earlier, when the current values of the object are unknown. """
+		self._bases[key] = dict(values)
+		self._effective.pop(key, None)
+
+	def discard(self, key):
+		self._bases.pop(key, None)
+		self._effective.pop(key, None)
+
+	def clear(self):
+		self._bases.clear()
+		self._effective.clear()
+
+	def plan(self, entries, overrides):
+		""" Plans the writes applying overrides on top of the base values of the objects.
+
+		The planner assumes the plan is applied: afterwards the objects are known to have their
+		target values, and objects restored to their base by empty overrides are forgotten.
+
+		Args:
+			entries (list): (key, nativeObject) tuples for objects with base values stored.
+			overrides (dict): The active values of the property set, empty to restore the bases.
+
+		Returns:
+			PropSetPlan: The grouped writes.
+		"""
+		plan = PropSetPlan()
+		for key, nativeObject in entries:
+			target = dict(self._bases[key])
+			target.update(overrides)
+			plan.add(nativeObject, diffValues(self._effective.get(key), target))
+			if overrides:
+				self._effective[key] = target
+			else:
+				self.discard(key)
+		return plan
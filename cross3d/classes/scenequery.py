@@ -0,0 +1,137 @@
+##
+#	\namespace	cross3d.classes.scenequery
+#
+#	\remarks	This module holds the ObjectQuery class scenes use to stream native objects matching a
+#				set of predicates, without building the full list of the objects first.
+#
+#	\author		Blur Studio
+#
+
+import re
+
+def wildcardToRegex(wildcard):
+	""" Converts a star based wildcard into a regular expression matching whole names. """
+	# This will replace any "*" into ".*" therefore converting basic star based wildcards into a regular expression.
+	expression = re.sub(r'(?<!\\)\*', r'.*', wildcard)
+	if not expression.endswith('$'):
+		expression += '$'
+	return expression
+
+def first(iterable, default=None):
+	""" Returns the first item of iterable, default if it is empty. Only the first item is pulled
+	from a lazy iterable.
+	"""
+	for item in iterable:
+		return item
+	return default
+
+def walkChildren(parent, children, recursive=True):
+	""" Yields the descendants of parent depth first, in the order a recursive walk would, reading
+	the children of a node only when the walk reaches it.
+
+	Args:
+		parent: The node to walk.
+		children (callable): Returns the iterable children of a node.
+		recursive (bool): If False only the direct children are yielded.
+	"""
+	# An explicit stack instead of recursion, hierarchies can be deeper than the recursion limit.
+	stack = [iter(children(parent))]
+	while stack:
+		for child in stack[-1]:
+			yield child
+			if recursive:
+				stack.append(iter(children(child)))
+			break
+		else:
+			stack.pop()
+
+
+class ObjectQuery(object):
+	""" The predicates of an object lookup: a name wildcard, an object type, a layer and a
+	selection state.
+
+	A back-end translates what it can into a native filtered query, for instance by iterating
+	the nodes of a layer instead of the whole scene, and lets the query test the predicates it
+	could not apply. Objects are tested and yielded one at a time, in the order of the native
+	iterable::
+
+		query = ObjectQuery(wildcard='Box*', objectType=ObjectType.Geometry)
+		nativeObjects = query.filter(mxs.geometry, applied=('objectType',), name=lambda obj: obj.name)
+
+	Args:
+		wildcard (str): A star based wildcard matched case insensitively against the object names.
+		objectType (int): A cross3d.constants.ObjectType, 0 matches any type.
+		layer: The native layer the objects must be on, None for any layer.
+		selected (bool): True for selected objects only, False for unselected objects only, None
+			for both.
+	"""
+
+	predicates = ('selected', 'layer', 'wildcard', 'objectType')
+
+	def __init__(self, wildcard='', objectType=0, layer=None, selected=None):
+		self.wildcard = wildcard
+		self.objectType = objectType
+		self.layer = layer
+		self.selected = selected
+		self._regex = None
+
+	def __repr__(self):
+		return 'ObjectQuery(%s)' % ', '.join('%s=%r' % (predicate, getattr(self, predicate)) for predicate in self.activePredicates())
+
+	def activePredicates(self, applied=()):
+		""" Returns the names of the predicates that filter objects, except the applied ones.
+
+		The predicates are returned in the order filter tests them: the selection state, the layer,
+		the name and last the object type, which is usually the most expensive to read.
+		"""
+		values = {'selected': self.selected is not None, 'layer': self.layer is not None,
+				'wildcard': bool(self.wildcard), 'objectType': bool(self.objectType)}
+		return [predicate for predicate in self.predicates if values[predicate] and predicate not in applied]
+
+	def matchesName(self, name):
+		if not self.wildcard:
+			return True
+		if self._regex is None:
+			self._regex = re.compile(wildcardToRegex(self.wildcard), flags=re.I)
+		return self._regex.match(name) is not None
+
+	def filter(self, nativeObjects, applied=(), name=None, objectType=None, layer=None, selected=None):
+		""" Yields the native objects matching the predicates that were not applied natively.
+
+		Args:
+			nativeObjects (iterable): The candidate objects, consumed lazily.
+			applied (tuple): The names of the predicates the candidates already satisfy.
+			name (callable): Returns the name of a native object.
+			objectType (callable): Returns the cross3d.constants.ObjectType of a native object.
+			layer (callable): Returns the native layer of a native object.
+			selected (callable): Returns whether a native object is selected.
+
+		Raises:
+			ValueError: If a predicate has to be tested but its accessor is missing.
+		"""
+		accessors = {'wildcard': name, 'objectType': objectType, 'layer': layer, 'selected': selected}
+		tests = []
+		for predicate in self.activePredicates(applied):
+			accessor = accessors[predicate]
+			if accessor is None:
+				raise ValueError('No accessor to test the %s predicate of %r.' % (predicate, self))
+			tests.append(self._test(predicate, accessor))
+		return self._filter(nativeObjects, tests)
+
+	def _test(self, predicate, accessor):
+		if predicate == 'wildcard':
+			return lambda nativeObject: self.matchesName(accessor(nativeObject))
+		if predicate == 'objectType':
+			return lambda nativeObject: accessor(nativeObject) == self.objectType
+		if predicate == 'layer':
+			return lambda nativeObject: accessor(nativeObject) == self.layer
+		return lambda nativeObject: bool(accessor(nativeObject)) == bool(self.selected)
+
+	@staticmethod
+	def _filter(nativeObjects, tests):
+		for nativeObject in nativeObjects:
+			for test in tests:
+				if not test(nativeObject):
+					break
+			else:
+				yield nativeObject
@@ -0,0 +1,344 @@
+##
+#	\namespace	cross3d.classes.signalbus
+#
+#	\remarks	This module holds a pure python implementation of the signals Dispatch is built on, so
+#				scene notifications can be used without Qt in batch and farm processes.
+#
+#	\author		Blur Studio
+#
+
+import sys
+import time
+import inspect
+import weakref
+import threading
+from collections import deque
+
+class ConnectionType(object):
+	""" How a slot is called when its signal is emitted.
+
+	Auto calls the slot directly when the signal is emitted from the thread of the bus and queues
+	the call otherwise, like Qt.AutoConnection. Queued calls are made by SignalBus.processEvents.
+	"""
+	Auto = 0
+	Direct = 1
+	Queued = 2
+
+def _argumentCount(function):
+	""" Returns the number of positional arguments function takes, None if it takes any number. """
+	if not inspect.isroutine(function) and not inspect.isclass(function):
+		function = getattr(function, '__call__', function)
+	try:
+		spec = inspect.getargspec(function)
+	except TypeError:
+		return None
+	if spec.varargs:
+		return None
+	count = len(spec.args)
+	if inspect.ismethod(function) and function.__self__ is not None:
+		count -= 1
+	return count
+
+
+class Slot(object):
+	""" A connected function. Bound methods are weakly referenced, so connecting a method does not
+	keep its object alive and the connection goes away with the object: onDead is called with the
+	slot when the object is deleted.
+	"""
+
+	__slots__ = ('priority', 'connectionType', 'argumentCount', '_function', '_self', '__weakref__')
+
+	def __init__(self, function, priority, connectionType, weak, onDead):
+		self.priority = priority
+		self.connectionType = connectionType
+		self.argumentCount = _argumentCount(function)
+		self._self = None
+		instance = getattr(function, '__self__', None)
+		if weak and instance is not None and hasattr(function, '__func__'):
+			selfRef = weakref.ref(self)
+			self._self = weakref.ref(instance, lambda ref: onDead(selfRef()))
+			self._function = function.__func__
+		else:
+			self._function = function
+
+	def target(self):
+		""" Returns the function to call, None if the object of the method was deleted. """
+		if self._self is None:
+			return self._function
+		instance = self._self()
+		if instance is None:
+			return None
+		return self._function.__get__(instance, type(instance))
+
+	def matches(self, function):
+		if self._self is None:
+			return self._function == function
+		return self._self() is getattr(function, '__self__', None) and self._function is getattr(function, '__func__', None)
+
+
+class BoundSignal(object):
+	""" A signal of a SignalBus instance, connected to slots and emitted like a pyqtBoundSignal. """
+
+	def __init__(self, bus, name=''):
+		self._bus = bus
+		self._name = name
+		# Replaced instead of modified, so emit iterates a consistent list without locking.
+		self._slots = ()
+
+	def __len__(self):
+		return len(self._slots)
+
+	def __repr__(self):
+		return '<BoundSignal %s of %r>' % (self._name, self._bus)
+
+	def connect(self, slot, priority=0, connectionType=ConnectionType.Auto, weak=True):
+		""" Connects slot to the signal.
+
+		Args:
+			slot (callable): Called with the arguments of the signal. Arguments the slot does not
+				take are dropped, like PyQt does.
+			priority (int): Slots with a higher priority are called first, slots of the same
+				priority in the order they were connected.
+			connectionType (int): A ConnectionType.
+			weak (bool): If True a bound method is disconnected when its object is deleted.
+		"""
+		if not callable(slot):
+			raise TypeError('connect() slot argument should be a callable, not %r' % slot)
+		entry = Slot(slot, priority, connectionType, weak, self._removeSlot)
+		with self._bus._signalLock:
+			slots = list(self._slots)
+			index = len(slots)
+			while index and slots[index - 1].priority < priority:
+				index -= 1
+			slots.insert(index, entry)
+			self._slots = tuple(slots)
+
+	def disconnect(self, slot=None):
+		""" Disconnects slot, or all the slots when None.
+
+		Raises:
+			TypeError: If slot is not connected, like PyQt does.
+		"""
+		with self._bus._signalLock:
+			if slot is None:
+				self._slots = ()
+				return
+			for index, entry in enumerate(self._slots):
+				if entry.matches(slot):
+					self._slots = self._slots[:index] + self._slots[index + 1:]
+					return
+		raise TypeError('disconnect() failed between %s and %r' % (self._name or 'signal', slot))
+
+	def _removeSlot(self, entry):
+		with self._bus._signalLock:
+			self._slots = tuple(slot for slot in self._slots if slot is not entry)
+
+	def emit(self, *args):
+		bus = self._bus
+		if bus._signalsBlocked:
+			return
+		ownerThread = None
+		for entry in self._slots:
+			function = entry.target()
+			if function is None:
+				continue
+			callArgs = args if entry.argumentCount is None else args[:entry.argumentCount]
+			connectionType = entry.connectionType
+			if connectionType == ConnectionType.Auto:
+				if ownerThread is None:
+					ownerThread = bus.isOwnerThread()
+				connectionType = ConnectionType.Direct if ownerThread else ConnectionType.Queued
+			if connectionType == ConnectionType.Direct:
+				_call(function, callArgs)
+			else:
+				bus.post(function, *callArgs)
+
+	__call__ = emit
+
+
+def _call(function, args):
+	# An exception in a slot does not stop the other slots, it is reported the way PyQt does.
+	try:
+		function(*args)
+	except Exception:
+		sys.excepthook(*sys.exc_info())
+
+
+class Signal(object):
+	""" Declares a signal on a SignalBus subclass, like pyqtSignal::
+
+		class Bus(SignalBus):
+			objectRenamed = Signal(str, str, object)
+
+		bus = Bus()
+		bus.objectRenamed.connect(slot)
+		bus.objectRenamed.emit('old', 'new', sceneObject)
+
+	Args:
+		*types: The types of the arguments, only informative.
+	"""
+
+	def __init__(self, *types):
+		self.types = types
+
+	def __get__(self, instance, owner):
+		if instance is None:
+			return self
+		return instance._boundSignal(self)
+
+
+class SignalBus(object):
+	""" The base class of the objects declaring signals, standing in for QObject.
+
+	Queued calls are made by processEvents, which has to be called regularly from the thread the
+	bus was created in, for instance from the loop of a batch process. It also fires the timers
+	of the bus.
+	"""
+
+	def __init__(self):
+		# A singleton subclass may run __init__ again on the same instance.
+		if '_signalLock' in self.__dict__:
+			return
+		self._signalLock = threading.RLock()
+		self._signalsBlocked = False
+		self._boundSignals = {}
+		self._queue = deque()
+		self._timers = []
+		self._ownerThread = threading.current_thread()
+
+	def _boundSignal(self, signal, name=None):
+		bound = self._boundSignals.get(signal)
+		if bound is None:
+			with self._signalLock:
+				bound = self._boundSignals.get(signal)
+				if bound is None:
+					if name is None:
+						name = next((key for cls in type(self).__mro__ for key, value in vars(cls).items() if value is signal), '')
+					bound = self._boundSignals[signal] = BoundSignal(self, name)
+		return bound
+
+	def signal(self, name):
+		""" Returns the declared signal called name, or a custom signal created on first use. This
+		replaces the string based SIGNAL() signals of Qt.
+		"""
+		declared = getattr(type(self), name, None)
+		if isinstance(declared, Signal):
+			return self._boundSignal(declared)
+		return self._boundSignal(name, name)
+
+	def blockSignals(self, state):
+		""" Blocks or unblocks the signals of the bus, returns the previous state. """
+		previous = self._signalsBlocked
+		self._signalsBlocked = bool(state)
+		return previous
+
+	def signalsBlocked(self):
+		return self._signalsBlocked
+
+	def isOwnerThread(self):
+		return threading.current_thread() is self._ownerThread
+
+	def moveToThread(self, thread):
+		""" Makes thread the one auto connected slots are called in directly. """
+		self._ownerThread = thread
+
+	def post(self, function, *args):
+		""" Queues a call to function, made by the next processEvents. Can be called from any thread. """
+		self._queue.append((function, args))
+
+	def pendingEvents(self):
+		return len(self._queue)
+
+	def processEvents(self, maximum=None):
+		""" Fires the due timers and makes the queued calls.
+
+		Args:
+			maximum (int): The maximum number of queued calls to make, None for all of them. Calls
+				queued by the calls being made wait for the next processEvents.
+
+		Returns:
+			int: The number of queued calls made.
+		"""
+		if self._timers:
+			now = time.time()
+			for timer in list(self._timers):
+				timer._fireIfDue(now)
+
+		count = len(self._queue)
+		if maximum is not None:
+			count = min(count, maximum)
+		popleft = self._queue.popleft
+		for index in xrange(count):
+			function, args = popleft()
+			_call(function, args)
+		return count
+
+
+class Timer(SignalBus):
+	""" A timer fired by the processEvents of its parent bus, standing in for QTimer. """
+
+	timeout = Signal()
+
+	def __init__(self, parent):
+		SignalBus.__init__(self)
+		self._parent = parent
+		self._interval = 0
+		self._singleShot = False
+		self._deadline = None
+
+	def interval(self):
+		return self._interval
+
+	def setInterval(self, interval):
+		self._interval = interval
+
+	def isSingleShot(self):
+		return self._singleShot
+
+	def setSingleShot(self, state):
+		self._singleShot = state
+
+	def isActive(self):
+		return self._deadline is not None
+
+	def start(self, interval=None):
+		""" Starts or restarts the timer, interval is in milliseconds. """
+		if interval is not None:
+			self._interval = interval
+		self._deadline = time.time() + self._interval / 1000.0
+		with self._parent._signalLock:
+			if self not in self._parent._timers:
+				self._parent._timers.append(self)
+
+	def stop(self):
+		self._deadline = None
+		with self._parent._signalLock:
+			if self in self._parent._timers:
+				self._parent._timers.remove(self)
+
+	def _fireIfDue(self, now):
+		if self._deadline is None or now < self._deadline:
+			return
+		if self._singleShot:
+			self.stop()
+		else:
+			self._deadline = now + self._interval / 1000.0
+		self.timeout.emit()
+
+
+class Thread(SignalBus, threading.Thread):
+	""" A thread with the signals of a SignalBus, standing in for QThread. Subclasses reimplement run. """
+
+	def __init__(self, parent=None):
+		SignalBus.__init__(self)
+		threading.Thread.__init__(self)
+		self.daemon = True
+
+	def isRunning(self):
+		return self.is_alive()
+
+	def wait(self, timeout=None):
+		""" Waits for the thread to finish, timeout is in milliseconds like QThread.wait. """
+		if self.is_alive():
+			self.join(None if timeout is None else timeout / 1000.0)
+		return not self.is_alive()
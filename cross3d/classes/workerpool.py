@@ -0,0 +1,252 @@
+##
+#	\namespace	cross3d.classes.workerpool
+#
+#	\remarks	Keeps headless host processes alive and sends them scripts to run over a
+#				local socket. Launching a host is by far the most expensive part of running
+#				a small script externally, so reusing the same processes for many jobs
+#				makes batch processing much faster.
+#
+#				The worker side of the protocol is implemented in workerprocess.py. Use
+#				cross3d.external(appName).workerPool() to create a pool for a host.
+#
+#	\author		Blur Studio
+#
+
+import collections
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from exceptions import Exceptions
+import workerprocess
+
+def _forwardStream(stream, lines):
+	""" Copies the output of a worker to sys.stderr, keeping its last lines for error messages. """
+	for line in iter(stream.readline, b''):
+		lines.append(line)
+		sys.stderr.write(line)
+	stream.close()
+
+class Worker(object):
+	""" A single host process connected to the pool. """
+
+	def __init__(self, command, env=None, startTimeout=300):
+		self.jobCount = 0
+		self.pid = None
+		self._connection = None
+		token = uuid.uuid4().hex
+
+		listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		try:
+			listener.bind(('127.0.0.1', 0))
+			listener.listen(1)
+			# Wakes up regularly to notice a worker that exits before it connects.
+			listener.settimeout(0.1)
+
+			env = dict(env if env is not None else os.environ)
+			env[workerprocess.ADDRESS_VARIABLE] = '127.0.0.1:{}'.format(listener.getsockname()[1])
+			env[workerprocess.TOKEN_VARIABLE] = token
+			self.process = subprocess.Popen(command, env=env, stderr=subprocess.PIPE)
+			self._stderr = collections.deque(maxlen=100)
+			self._stderrThread = threading.Thread(target=_forwardStream, args=(self.process.stderr, self._stderr))
+			self._stderrThread.daemon = True
+			self._stderrThread.start()
+
+			deadline = time.time() + startTimeout
+			while True:
+				try:
+					connection = listener.accept()[0]
+					break
+				except socket.timeout:
+					if self.process.poll() is not None:
+						raise Exceptions.WorkerError(self._exitMessage('The worker exited before connecting', command))
+					if time.time() >= deadline:
+						self.kill()
+						raise Exceptions.WorkerError('The worker did not connect within {} seconds: {}'.format(startTimeout, command))
+		finally:
+			listener.close()
+
+		connection.settimeout(startTimeout)
+		try:
+			hello = workerprocess.receiveMessage(connection)
+		except (EOFError, socket.error):
+			hello = {}
+		if hello.get('token') != token:
+			connection.close()
+			if not hello and self.process.poll() is not None:
+				raise Exceptions.WorkerError(self._exitMessage('The worker exited while starting', command))
+			self.kill()
+			raise Exceptions.WorkerError('Unexpected connection while starting worker.')
+		self.pid = hello.get('pid')
+		self._connection = connection
+
+	def _exitMessage(self, message, command):
+		# Lets the forwarding thread read the output the worker wrote before exiting.
+		self._stderrThread.join(1)
+		return '{} with code {}: {}\n{}'.format(message, self.process.returncode, command, ''.join(self._stderr))
+
+	def isAlive(self):
+		return self._connection is not None and self.process.poll() is None
+
+	def execute(self, job, timeout=None):
+		""" Sends the job message and waits for its reply.
+
+		Raises:
+			Exceptions.WorkerError: The worker died or did not reply within timeout. The
+				worker is killed in both cases.
+		"""
+		self.jobCount += 1
+		try:
+			self._connection.settimeout(timeout)
+			workerprocess.sendMessage(self._connection, job)
+			return workerprocess.receiveMessage(self._connection)
+		except socket.timeout:
+			self.kill()
+			raise Exceptions.WorkerError('Job {} timed out after {} seconds.'.format(job.get('id'), timeout))
+		except (EOFError, socket.error), e:
+			self.kill()
+			raise Exceptions.WorkerError('Worker {} died while running job {}: {}'.format(self.pid, job.get('id'), e))
+
+	def kill(self):
+		if self._connection is not None:
+			self._connection.close()
+			self._connection = None
+		if self.process.poll() is None:
+			self.process.kill()
+			self.process.wait()
+
+	def shutdown(self, timeout=30):
+		""" Asks the worker to quit, killing it if it doesn't exit in time. """
+		if self._connection is not None:
+			try:
+				workerprocess.sendMessage(self._connection, {'type': 'quit'})
+			except socket.error:
+				pass
+			self._connection.close()
+			self._connection = None
+		# Popen.wait has no timeout in python 2, poll until the process exits.
+		for i in range(int(timeout * 10)):
+			if self.process.poll() is not None:
+				return
+			time.sleep(0.1)
+		self.kill()
+
+
+class WorkerPool(object):
+	""" Runs scripts on a pool of long lived host processes.
+
+	Workers are started on demand, at most `workers` of them are alive at once and each
+	one is replaced after running `maxJobs` jobs. The pool is thread safe, several threads
+	can run jobs at the same time::
+
+		with cross3d.external('studiomax').workerPool(workers=4) as pool:
+			for path in paths:
+				pool.run('result = cross3d.Scene().loadFile(r"%s")' % path)
+
+	Python scripts return a value by assigning it to a global variable named result.
+
+	Args:
+		command (list): The command line used to launch a worker process.
+		workers (int): The maximum number of worker processes.
+		maxJobs (int): Number of jobs a worker runs before it is recycled. 0 disables recycling.
+		startTimeout (float): Seconds to wait for a new worker to connect.
+		env (dict): Environment of the worker processes, defaults to os.environ.
+	"""
+
+	def __init__(self, command, workers=2, maxJobs=100, startTimeout=300, env=None):
+		self._command = command
+		self._size = max(1, workers)
+		self._maxJobs = maxJobs
+		self._startTimeout = startTimeout
+		self._env = env
+		self._idle = []
+		self._count = 0
+		self._closed = False
+		self._jobIds = 0
+		self._condition = threading.Condition()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+		return False
+
+	def _acquire(self):
+		with self._condition:
+			while True:
+				if self._closed:
+					raise Exceptions.WorkerError('The worker pool is closed.')
+				if self._idle:
+					return self._idle.pop()
+				if self._count < self._size:
+					self._count += 1
+					break
+				self._condition.wait()
+		try:
+			return Worker(self._command, self._env, self._startTimeout)
+		except:
+			with self._condition:
+				self._count -= 1
+				self._condition.notify()
+			raise
+
+	def _release(self, worker):
+		recycle = not worker.isAlive() or (self._maxJobs and worker.jobCount >= self._maxJobs)
+		if recycle or self._closed:
+			worker.shutdown()
+		with self._condition:
+			if recycle or self._closed:
+				self._count -= 1
+			else:
+				self._idle.append(worker)
+			self._condition.notify()
+
+	def _nextJobId(self):
+		with self._condition:
+			self._jobIds += 1
+			return self._jobIds
+
+	def close(self):
+		""" Shuts down all idle workers. Busy workers are shut down when their job finishes. """
+		with self._condition:
+			self._closed = True
+			workers, self._idle = self._idle, []
+			self._count -= len(workers)
+			self._condition.notifyAll()
+		for worker in workers:
+			worker.shutdown()
+
+	def run(self, script, language='Python', timeout=None):
+		""" Runs a script on the next available worker and returns its result.
+
+		Args:
+			script (str): The script source, or the path to a script file.
+			language (str): The cross3d.constants.ScriptLanguage label of the script.
+			timeout (float): Seconds to wait for the job. The worker is killed if it times out.
+
+		Returns:
+			The value the script assigned to `result`. Values that can't be serialized to json
+			are returned as their repr.
+
+		Raises:
+			Exceptions.ScriptFailed: The script raised an exception.
+			Exceptions.WorkerError: The worker could not be started, died or timed out.
+		"""
+		job = {'type': 'job', 'id': self._nextJobId(), 'script': script, 'isPath': os.path.isfile(script), 'language': language}
+		worker = self._acquire()
+		try:
+			reply = worker.execute(job, timeout)
+		finally:
+			self._release(worker)
+		if not reply.get('success'):
+			raise Exceptions.ScriptFailed(reply.get('error'), reply.get('traceback', ''))
+		return reply.get('result')
+
+	def workerCount(self):
+		""" Returns the number of worker processes currently alive. """
+		return self._count
@@ -0,0 +1,177 @@
+##
+#	\namespace	cross3d.classes.workerprocess
+#
+#	\remarks	The worker side of cross3d.classes.workerpool. This file is executed inside
+#				a headless host (or a plain python interpreter acting as a stand-in host).
+#				It connects back to the pool, runs the jobs it receives and replies with
+#				their result or exception.
+#
+#				It also runs the single jobs submitted with External.submit. In that case
+#				the job is described by a job.json file and the reply is written to a
+#				status file next to it.
+#
+#				It intentionally does not import cross3d so it can be executed by path
+#				before cross3d is importable in the host.
+#
+#	\author		Blur Studio
+#
+
+import json
+import os
+import socket
+import struct
+import sys
+import traceback
+
+# Environment variables used to tell the worker where to connect.
+ADDRESS_VARIABLE = 'CROSS3D_WORKER_ADDRESS'
+TOKEN_VARIABLE = 'CROSS3D_WORKER_TOKEN'
+# Environment variable containing the job.json path of a single job.
+JOB_VARIABLE = 'CROSS3D_JOB'
+
+_header = struct.Struct('>I')
+
+#--------------------------------------------------------------------------------
+#	Protocol
+#--------------------------------------------------------------------------------
+
+def sendMessage(sock, message):
+	""" Sends a json serializable dict prefixed by its length. """
+	data = json.dumps(message).encode('utf-8')
+	sock.sendall(_header.pack(len(data)) + data)
+
+def _receiveExactly(sock, size):
+	chunks = []
+	while size:
+		chunk = sock.recv(min(size, 65536))
+		if not chunk:
+			raise EOFError('Connection closed.')
+		chunks.append(chunk)
+		size -= len(chunk)
+	return b''.join(chunks)
+
+def receiveMessage(sock):
+	""" Receives a message sent by sendMessage. Raises EOFError if the connection was closed. """
+	size = _header.unpack(_receiveExactly(sock, _header.size))[0]
+	return json.loads(_receiveExactly(sock, size).decode('utf-8'))
+
+#--------------------------------------------------------------------------------
+#	Executors
+#--------------------------------------------------------------------------------
+
+def _runPython(script, isPath):
+	namespace = {'__name__': '__main__', '__builtins__': __builtins__}
+	if isPath:
+		namespace['__file__'] = script
+		with open(script) as fle:
+			script = fle.read()
+	code = compile(script, namespace.get('__file__', '<cross3d job>'), 'exec')
+	exec(code, namespace)
+	# Scripts return a value by assigning it to a global named result.
+	return namespace.get('result')
+
+# Maps the ScriptLanguage label to the function that runs scripts in that language.
+_executors = {'Python': _runPython}
+
+def registerExecutor(language, function):
+	""" Registers the function used to run scripts of the given ScriptLanguage label.
+
+	Args:
+		language (str): The ScriptLanguage label, 'MAXScript' for example.
+		function (callable): Called with (script, isPath), returns the job result.
+	"""
+	_executors[language] = function
+
+def _registerHostExecutors():
+	try:
+		from Py3dsMax import mxs
+	except ImportError:
+		pass
+	else:
+		registerExecutor('MAXScript', lambda script, isPath: mxs.filein(script) if isPath else mxs.execute(script))
+	try:
+		import maya.mel
+	except ImportError:
+		pass
+	else:
+		registerExecutor('MEL', lambda script, isPath: maya.mel.eval('source "%s"' % script.replace('\\', '/') if isPath else script))
+
+def _serializable(value):
+	try:
+		json.dumps(value)
+		return value
+	except (TypeError, ValueError):
+		return repr(value)
+
+def runJob(job):
+	""" Runs a job message and returns the reply message. """
+	reply = {'type': 'result', 'id': job.get('id')}
+	executor = _executors.get(job.get('language', 'Python'))
+	try:
+		if executor is None:
+			raise ValueError('This worker can not run {} scripts.'.format(job.get('language')))
+		reply['result'] = _serializable(executor(job['script'], job.get('isPath', False)))
+		reply['success'] = True
+	except (Exception, SystemExit), e:
+		reply['success'] = False
+		reply['error'] = '{}: {}'.format(type(e).__name__, e)
+		reply['traceback'] = traceback.format_exc()
+	return reply
+
+#--------------------------------------------------------------------------------
+#	Main loop
+#--------------------------------------------------------------------------------
+
+def serve(address=None, token=None):
+	""" Connects to the pool and processes jobs until it asks the worker to quit. """
+	address = address or os.environ[ADDRESS_VARIABLE]
+	token = token or os.environ.get(TOKEN_VARIABLE, '')
+	host, port = address.rsplit(':', 1)
+	_registerHostExecutors()
+	sock = socket.create_connection((host, int(port)))
+	try:
+		sendMessage(sock, {'type': 'hello', 'token': token, 'pid': os.getpid()})
+		while True:
+			try:
+				message = receiveMessage(sock)
+			except EOFError:
+				break
+			if message.get('type') == 'quit':
+				break
+			sendMessage(sock, runJob(message))
+	finally:
+		sock.close()
+
+def runJobFile(jobPath=None):
+	""" Runs the job described by a job.json file. Output is written to the job's log file and
+	the reply message to its status file.
+	"""
+	jobPath = jobPath or os.environ[JOB_VARIABLE]
+	_registerHostExecutors()
+	with open(jobPath) as fle:
+		job = json.load(fle)
+	stdout, stderr = sys.stdout, sys.stderr
+	log = open(job['log'], 'a')
+	sys.stdout = sys.stderr = log
+	try:
+		reply = runJob(job)
+		if not reply['success']:
+			log.write(reply['traceback'])
+	finally:
+		sys.stdout, sys.stderr = stdout, stderr
+		log.close()
+	with open(job['status'], 'w') as fle:
+		json.dump(reply, fle)
+	return reply['success']
+
+def main():
+	""" Runs the worker or the single job described by the environment variables of the process. """
+	if ADDRESS_VARIABLE in os.environ:
+		serve()
+	elif JOB_VARIABLE in os.environ:
+		runJobFile()
+
+# The hosts and the stand-in python interpreter run this file by path as __main__. Importing it,
+# under any name, never runs a job, even in a process launched with the environment variables.
+if __name__ == '__main__':
+	main()
@@ -22,18 +22,34 @@ class _MetaEnumGroup(type):
 
 	def __call__(self, number):
 		number = int(number)
+		if number in self._COMPOSITES:
+			return self._COMPOSITES[number]
+		if number < 0:
+			indices = range(len(self._ENUMERATORS))
+		else:
+			# Only the enumerators sharing a bit with the number are visited.
+			indices = set(self._BITS.get(-1, ()))
+			bit = 0
+			while number >> bit:
+				if (number >> bit) & 1:
+					indices.update(self._BITS.get(bit, ()))
+				bit += 1
+			indices = sorted(indices)
 		e = None
-		for enum in self._ENUMERATORS:
+		for index in indices:
+			enum = self._ENUMERATORS[index]
 			if enum & number:
 				if e:
 					e = e | enum
 				else:
 					e = enum
+		# Building a composite creates a class, so decoded numbers are kept.
+		self._COMPOSITES[number] = e
 		return e
 
 	def __getitem__(self, key):
 		if isinstance(key, Number):
-			return list(self)[int(key)]
+			return self._ENUMERATORS[int(key)]
 		else:
 			return getattr(self, str(key))
 
@@ -353,6 +369,10 @@ class EnumGroup(object):
 	"""
 	__metaclass__ = _MetaEnumGroup
 	_ENUMERATORS = None
+	_LABELS = None
+	_VALUES = None
+	_BITS = None
+	_COMPOSITES = None
 	_copyCount = 1
 	All = 0
 	Nothing = 0
@@ -432,10 +452,9 @@ class EnumGroup(object):
 		Returns:
 			Enum
 		"""
-		label = str(label)
-		for e in cls._ENUMERATORS:
-			if e.label == label:
-				return e
+		e = cls._LABELS.get(str(label))
+		if e is not None:
+			return e
 		if default is not None:
 			return default
 		raise ValueError('No enumerators exist with the given label.')
@@ -459,10 +478,9 @@ class EnumGroup(object):
 		Returns:
 			Enum
 		"""
-		value = int(value)
-		for e in cls._ENUMERATORS:
-			if int(e) == value:
-				return e
+		e = cls._VALUES.get(int(value))
+		if e is not None:
+			return e
 		if default is not None:
 			return default
 		raise ValueError('No enumerators exist with the given value.')
@@ -550,6 +568,7 @@ class EnumGroup(object):
 				enum._labelIndex = labelIndex
 				labelIndex += 1
 		cls._ENUMERATORS = enums
+		cls._buildLookups()
 		# Build the All object if its not defined
 		if isinstance(cls.All, int):
 			for e in enums:
@@ -574,6 +593,33 @@ class EnumGroup(object):
 				processed.add(enumClass)
 			
 
+	@classmethod
+	def _buildLookups(cls):
+		""" Builds the label, value and bit lookup tables of the enumerators.
+
+		When several enumerators share a label or a value the first one wins, as it did when
+		the enumerators were scanned.
+		"""
+		labels = {}
+		values = {}
+		bits = {}
+		for index, e in enumerate(cls._ENUMERATORS):
+			labels.setdefault(e.label, e)
+			values.setdefault(int(e), e)
+			number = int(e)
+			if number < 0:
+				# Negative numbers share bits with any number, -1 holds them.
+				bits.setdefault(-1, []).append(index)
+			bit = 0
+			while number > 0 and number >> bit:
+				if (number >> bit) & 1:
+					bits.setdefault(bit, []).append(index)
+				bit += 1
+		cls._LABELS = labels
+		cls._VALUES = values
+		cls._BITS = dict((bit, tuple(indices)) for bit, indices in bits.iteritems())
+		cls._COMPOSITES = {}
+
 	@classmethod
 	def _varNameToLabel(cls, varName):
 		label = str(varName)
@@ -689,6 +735,34 @@ class enum(object):
 					out |= self.__dict__[k]
 			self.__dict__['All'] = out
 
+		self._buildLookups()
+
+	def _buildLookups(self):
+		""" Builds the lookup tables used by the query methods. The parameters should not be
+		modified once the enum is created.
+		"""
+		self._indices = {}
+		self._valueIndices = {}
+		self._labelsByKey = {}
+		self._foldedKeys = {}
+		self._bitIndices = {}
+		for index, key in enumerate(self._keys):
+			value = self.__dict__[key]
+			self._indices.setdefault(key, index)
+			self._labelsByKey[key] = ' '.join(re.findall('[A-Z]+[^A-Z]*', key))
+			try:
+				self._valueIndices.setdefault(value, index)
+			except TypeError:
+				pass
+			if key not in self._compound and isinstance(value, (int, long)) and value > 0:
+				bit = 0
+				while value >> bit:
+					if (value >> bit) & 1:
+						self._bitIndices.setdefault(bit, []).append(index)
+					bit += 1
+		for key in self._keys + ['All']:
+			self._foldedKeys.setdefault(key.lower(), key)
+
 	def count(self):
 		return len(self._keys)
 
@@ -715,15 +789,15 @@ class enum(object):
 		:returns: A list of labels as strings
 		"""
 		if byVal:
-			return [' '.join(re.findall('[A-Z]+[^A-Z]*', key)) for key in sorted(self.keys(), key=lambda i:getattr(self, i))]
-		return [' '.join(re.findall('[A-Z]+[^A-Z]*', key)) for key in self.keys()]
+			return [self._labelsByKey[key] for key in sorted(self.keys(), key=lambda i:getattr(self, i))]
+		return [self._labelsByKey[key] for key in self.keys()]
 
 	def labelByValue(self, value):
 		""" Returns the label for a specific value. Labels automatically add spaces
 		for every capital letter after the first.
 		:param value: The value you want the label for
 		"""
-		return ' '.join(re.findall('[A-Z]+[^A-Z]*', self.keyByValue(value)))
+		return self._labelsByKey.get(self.keyByValue(value), '')
 
 	def isValid(self, value):
 		""" Returns True if this value is stored in the parameters.
@@ -739,7 +813,7 @@ class enum(object):
 		:param index: The index to lookup
 		:returns: The key for the provided index or a empty string if it was not found.
 		"""
-		if index in range(self.count()):
+		if isinstance(index, (int, long)) and 0 <= index < self.count():
 			return self._keys[index]
 		return ''
 
@@ -748,9 +822,9 @@ class enum(object):
 		:param value: The value to find the parameter name of.
 		:returns: String. The parameter name or empty string.
 		"""
-		for key in self._keys:
-			if self.__dict__[key] == value:
-				return key
+		index = self.indexByValue(value)
+		if index != -1:
+			return self._keys[index]
 		return ''
 
 	def keys(self):
@@ -767,11 +841,10 @@ class enum(object):
 		if caseSensitive:
 			return self.__dict__.get(str(key), 0)
 		else:
-			key = str(key).lower()
-			for k in self.__dict__.keys():
-				if k.lower() == key:
-					return self.__dict__[k]
-			return 0
+			key = self._foldedKeys.get(str(key).lower())
+			if key is None:
+				return 0
+			return self.__dict__[key]
 
 	def values(self):
 		""" Returns a list of all values for stored parameters
@@ -800,9 +873,7 @@ class enum(object):
 		:returns: Int, The index for the key or -1
 		.. seealso:: :meth:`keyByValue`
 		"""
-		if key in self._keys:
-			return self._keys.index(key)
-		return -1
+		return self._indices.get(key, -1)
 
 	def indexByValue(self, value):
 		""" Return the index for a value.
@@ -810,10 +881,13 @@ class enum(object):
 		:returns: Int, the index of the value or -1
 		.. seealso:: :meth:`keyByValue`
 		"""
-		for index in range(len(self._keys)):
-			if (self.__dict__[ self._keys[index] ] == value):
-				return index
-		return -1
+		try:
+			return self._valueIndices.get(value, -1)
+		except TypeError:
+			for index in range(len(self._keys)):
+				if (self.__dict__[ self._keys[index] ] == value):
+					return index
+			return -1
 
 	def toString(self, value, default='None', sep=' '):
 		""" For the provided value return the parameter name(s) seperated by sep. If you provide
@@ -826,10 +900,20 @@ class enum(object):
 		:return: Returns a string of values or the provided default
 		.. seealso:: :meth:`fromString`
 		"""
-		parts = []
-		for key in self._keys:
-			if (not key in self._compound and value & self.value(key)):
-				parts.append(key)
+		if isinstance(value, (int, long)) and value >= 0:
+			# Only the parameters sharing a bit with the value are visited.
+			indices = set()
+			bit = 0
+			while value >> bit:
+				if (value >> bit) & 1:
+					indices.update(self._bitIndices.get(bit, ()))
+				bit += 1
+			parts = [self._keys[index] for index in sorted(indices)]
+		else:
+			parts = []
+			for key in self._keys:
+				if (not key in self._compound and value & self.value(key)):
+					parts.append(key)
 		if parts:
 			return sep.join(parts)
 		return default
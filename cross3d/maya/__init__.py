@@ -8,23 +8,35 @@
 #   :date       09/10/14
 #
 
+import cross3d
 import external
 
+# The layer's modules and the symbols they register. They are imported the first time one of their
+# symbols is used.
+_lazyModules = (
+	('mayaexceptionrouter', ('ExceptionRouter',)),
+	('mayauserprops', ('UserProps', 'FileProps')),
+	('mayascene', ('Scene',)),
+	('mayascenewrapper', ('SceneWrapper',)),
+	('mayasceneobject', ('SceneObject',)),
+	('mayagroup', ('Group',)),
+	('mayascenemodel', ('SceneModel',)),
+	('mayascenecamera', ('SceneCamera',)),
+	('mayasceneviewport', ('SceneViewport',)),
+	('mayascenematerial', ('SceneMaterial',)),
+	('mayasceneanimationcontroller', ('SceneAnimationController',)),
+	('collection', ('Collection',)),
+)
+
 def init():
 
 	# Making sure we can import the layer.
 	import maya.cmds
 	
-	# Importing the layer's classes.
-	import mayaexceptionrouter
-	import mayauserprops
+	# Registering the layer's classes.
+	for module, symbols in _lazyModules:
+		for symbol in symbols:
+			cross3d.registerSymbol(symbol, '{}.{}'.format(__name__, module), lazy=True)
+
+	# The application connects the Maya callbacks to the dispatch, so it is imported upfront.
 	import mayaapplication
-	import mayascene
-	import mayascenewrapper
-	import mayasceneobject
-	import mayagroup
-	import mayascenemodel
-	import mayascenecamera
-	import mayasceneviewport
-	import mayascenematerial
-	import collection
@@ -1,5 +1,5 @@
 ##
-#   \namespace  cross3d.softimage.collection
+#   \namespace  cross3d.maya.collection
 #
 #   \remarks    This module implements the collection class allowing to manipulate multiple objects.
 #   
@@ -11,10 +11,43 @@
 #------------------------------------------------------------------------------------------------------------------------
 
 import cross3d
+import maya.cmds as cmds
+from cross3d.constants import ObjectType
 from cross3d.abstract.collection import Collection as AbstractCollection
 
 class Collection(AbstractCollection):
-	pass
+
+	def _transformNames(self):
+		return [obj._mObjName(obj._nativeTransform, True) for obj in self]
+
+	def setParent(self, parent):
+		# Parenting to a model is handled object by object.
+		if parent and parent.isObjectType(ObjectType.Model):
+			return super(Collection, self).setParent(parent)
+
+		names = self._transformNames()
+		if parent:
+			parentName = parent._mObjName(parent._nativeTransform, True)
+
+			# Maya raises an error for objects that already are children of the parent.
+			children = set(cmds.listRelatives(parentName, children=True, fullPath=True) or [])
+			names = [name for name in names if name not in children]
+			if names:
+				cmds.parent(names, parentName)
+		else:
+			names = [name for name in names if name.count('|') > 1]
+			if names:
+				cmds.parent(names, world=True)
+		return True
+
+	def translate(self, axes, relative=False):
+		names = self._transformNames()
+		if names:
+			if relative:
+				cmds.move(axes[0], axes[1], axes[2], names, relative=True)
+			else:
+				cmds.move(axes[0], axes[1], axes[2], names, absolute=True)
+		return True
 
 # Registering the symbol.
 cross3d.registerSymbol('Collection', Collection)
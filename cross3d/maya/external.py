@@ -53,7 +53,8 @@ class External(AbstractExternal):
 				fle.write(script)
 
 			with open(scriptTemplate) as fle:
-				script = fle.read().format(debug=unicode(debug).lower())
+				# The path is inside a MEL string, backslashes need to be escaped.
+				script = fle.read().format(scriptPath=pythonScritpPath.replace('\\', '\\\\'), debug=unicode(debug).lower())
 				
 			scriptPath = os.path.splitext(cls.scriptPath())[0] + '.mel'
 			logPath = os.path.splitext(cls.scriptPath())[0] + '.log'
@@ -81,6 +82,31 @@ class External(AbstractExternal):
 		# TODO: Need to figure out a way to return False if the script has failed.
 		return True
 
+	@classmethod
+	def _pythonScriptCommand(cls, pythonPath, scriptPath, logPath, version=None, architecture=64, debug=False, headless=True):
+		""" Writes a MEL file to scriptPath that runs the python file pythonPath and returns the
+		command line that runs it in Maya.
+		"""
+		scriptTemplate = os.path.join(os.path.dirname(__file__), 'templates', 'external_python_script.meltempl')
+		with open(scriptTemplate) as fle:
+			# The path is inside a MEL string, backslashes need to be escaped.
+			script = fle.read().format(scriptPath=pythonPath.replace('\\', '\\\\'), debug=unicode(debug).lower())
+
+		with open(scriptPath, "w") as fle:
+			fle.write(script)
+
+		binary = os.path.join(cls.binariesPath(version, architecture), 'mayabatch.exe' if headless else 'maya.exe')
+		return [binary, '-script', scriptPath, '-log', logPath]
+
+	@classmethod
+	def jobCommand(cls, runnerPath, directory, version=None, architecture=64, debug=False, headless=True):
+		return cls._pythonScriptCommand(runnerPath, os.path.join(directory, 'job.mel'), os.path.join(directory, 'maya.log'), version, architecture, debug, headless)
+
+	@classmethod
+	def workerCommand(cls, version=None, architecture=64, debug=False):
+		basePath = os.path.splitext(cls.scriptPath())[0]
+		return cls._pythonScriptCommand(cls.workerScriptPath(), basePath + '_worker.mel', basePath + '_worker.log', version, architecture, debug)
+
 	@classmethod
 	def binariesPath(cls, version=None, architecture=64, language='English'):
 		""" Finds the install path for various software installations.
@@ -22,6 +22,7 @@ import collections as _collections
 import cross3d
 from collections import OrderedDict
 from cross3d import constants
+from cross3d.classes import ObjectQuery
 from cross3d.constants import ObjectType, RotationOrder
 from cross3d.abstract.abstractscene import AbstractScene
 
@@ -249,6 +250,27 @@ class MayaScene(AbstractScene):
 			mtls.append(cross3d.SceneWrapper._asMOBject(name))
 		return mtls
 
+	def _iterNativeObjects(self, wildcard='', objectType=0, layer=None, selected=None):
+		""" Implements the AbstractScene._iterNativeObjects method to stream the native objects matching the predicates.
+			Only the selection or the dependency nodes of the native type are iterated, and the world node is skipped like
+			_objects does.
+			:return: iterator [<maya.OpenMaya.MObject> nativeObject, ..]
+		"""
+		if selected:
+			objects = self._selectionIter()
+			applied = ('selected',)
+		else:
+			mType = cross3d.SceneObject._abstractToNativeObjectType.get(objectType, (om.MFn.kDagNode, om.MFn.kCharacter))
+			objects = self._objectsOfMTypeIter(mType)
+			applied = ()
+
+		objects = (obj for obj in objects if obj.apiType() != om.MFn.kWorld)
+		query = ObjectQuery(wildcard, objectType, layer, selected)
+		return query.filter(objects, applied, name=lambda obj: cross3d.SceneObject._mObjName(obj, False),
+							objectType=cross3d.SceneObject._typeOfNativeObject,
+							layer=lambda obj: cross3d.SceneObject(self, obj)._nativeLayer(),
+							selected=lambda obj: cross3d.SceneObject(self, obj).isSelected())
+
 	def _nativeObjects(self, getsFromSelection=False, wildcard='', objectType=0):
 		""" Implements the AbstractScene._nativeObjects method to return the native objects from the scene
 			:return: list [<Py3dsMax.mxs.Object> nativeObject, ..]
@@ -324,6 +346,20 @@ class MayaScene(AbstractScene):
 				ret = False
 		return ret
 
+	def _hideNativeObjects(self, nativeObjects, state):
+		""" Hides/unhides the inputed objects with a single command
+			:param nativeObjects:	<list> [ <variant> nativeObject, .. ]
+			:param state:	<bool>
+			:return: <bool> success
+		"""
+		names = [cross3d.SceneWrapper._mObjName(obj, True) for obj in nativeObjects]
+		if names:
+			if state:
+				cmds.hide(names)
+			else:
+				cmds.showHidden(names)
+		return True
+
 	def _removeNativeObjects(self, nativeObjects):
 		""" Removes the inputed objects from the scene
 			:param nativeObjects:	<list> [ <variant> nativeObject, .. ]
@@ -588,6 +624,14 @@ class MayaScene(AbstractScene):
 			return self._addToNativeSelection(nativeObjects) if additive else self._setNativeSelection(nativeObjects)
 		raise TypeError('Argument 1 must be str or list of cross3d.SceneObjects')
 	
+	def translate(self, objects, axes, relative=False):
+		""" Translates the objects in the scene with a single move of the Collection
+			:param objects: Translate these objects
+			:param axes: A list with a length of 3 floats representing x, y, z
+			:param relative: Apply the translation as relative or absolute. Absolute by default.
+		"""
+		return cross3d.Collection(self, objects).translate(axes, relative)
+	
 	def viewports(self):
 		""" Returns all the visible viewports
 			:return: [<cross3d.SceneViewport>, ...]
@@ -0,0 +1,201 @@
+##
+#	\namespace	cross3d.maya.mayasceneanimationcontroller
+#
+#	\remarks	The Maya implementation of SceneAnimationController. Controllers wrap animCurve nodes.
+#
+#	\author		Blur Studio
+#
+
+import math
+import maya.cmds as cmds
+import maya.OpenMaya as om
+import maya.OpenMayaAnim as oma
+from cross3d import FCurve
+from cross3d.constants import ControllerType, TangentType, ExtrapolationType
+from cross3d.abstract.abstractsceneanimationcontroller import AbstractSceneAnimationController
+
+
+class MayaSceneAnimationController(AbstractSceneAnimationController):
+
+	_nativeToAbstractTypes = {'animCurveTL': ControllerType.BezierFloat,
+							'animCurveTA': ControllerType.BezierFloat,
+							'animCurveTU': ControllerType.BezierFloat}
+
+	_nativeToAbstractTangentTypes = {'auto': TangentType.Automatic,
+									'spline': TangentType.Automatic,
+									'clamped': TangentType.Automatic,
+									'plateau': TangentType.Automatic,
+									'fixed': TangentType.Bezier,
+									'flat': TangentType.Bezier,
+									'linear': TangentType.Linear,
+									'step': TangentType.Stepped,
+									'stepnext': TangentType.Stepped}
+
+	# Maya only supports stepped out tangents.
+	_abstractToNativeInTangentTypes = {TangentType.Automatic: 'spline',
+									TangentType.Bezier: 'fixed',
+									TangentType.Linear: 'linear',
+									TangentType.Stepped: 'linear'}
+
+	_abstractToNativeOutTangentTypes = {TangentType.Automatic: 'spline',
+									TangentType.Bezier: 'fixed',
+									TangentType.Linear: 'linear',
+									TangentType.Stepped: 'step'}
+
+	_nativeToAbstractExtrapolationType = {'constant': ExtrapolationType.Constant,
+										'linear': ExtrapolationType.Linear,
+										'cycle': ExtrapolationType.Cycled,
+										'oscillate': ExtrapolationType.PingPong,
+										'cycleRelative': ExtrapolationType.CycledWithOffset}
+
+	_abstractToNativeExtrapolationType = dict((value, key) for key, value in _nativeToAbstractExtrapolationType.items())
+
+	@classmethod
+	def _timeRanges(cls, frames):
+		# keyframe takes one (start, end) tuple per time it evaluates.
+		return [(frame, frame) for frame in frames]
+
+	def type(self):
+		return self._nativeToAbstractTypes.get(cmds.nodeType(self.name()), 0)
+
+	def valueAtFrame(self, frame):
+		return self.valuesAtFrames([frame])[0]
+
+	def valuesAtFrames(self, frames):
+		""" Evaluates the anim curve at all the frames with a single keyframe query.
+		"""
+		frames = list(frames)
+		if not frames:
+			return []
+		return cmds.keyframe(self.name(), query=True, eval=True, time=self._timeRanges(frames)) or []
+
+	@classmethod
+	def valuesAtFramesForControllers(cls, controllers, frames):
+		frames = list(frames)
+		if not controllers or not frames:
+			return [[] for controller in controllers]
+		names = [controller.name() for controller in controllers]
+		values = cmds.keyframe(names, query=True, eval=True, time=cls._timeRanges(frames)) or []
+
+		# The query returns a flat list ordered by curve.
+		count = len(frames)
+		return [values[index * count:(index + 1) * count] for index in range(len(names))]
+
+	def extrapolation(self):
+		infinities = (cmds.setInfinity(self.name(), query=True, preInfinite=True)[0], cmds.setInfinity(self.name(), query=True, postInfinite=True)[0])
+		return [self._nativeToAbstractExtrapolationType.get(infinity, ExtrapolationType.Constant) for infinity in infinities]
+
+	def setExtrapolation(self, extrapolation=[None, None]):
+		""" None will leave the the extrapolation unaffected.
+		"""
+		if not isinstance(extrapolation, (list, tuple)):
+			extrapolation = (extrapolation, extrapolation)
+		if extrapolation[0]:
+			cmds.setInfinity(self.name(), preInfinite=self._abstractToNativeExtrapolationType.get(extrapolation[0], 'constant'))
+		if extrapolation[1]:
+			cmds.setInfinity(self.name(), postInfinite=self._abstractToNativeExtrapolationType.get(extrapolation[1], 'constant'))
+		return True
+
+	@classmethod
+	def _queryKeys(cls, names):
+		""" Reads the keys of many anim curves with one query per key attribute.
+
+		Returns:
+			list: The keyword arguments of the keys of each curve.
+		"""
+		counts = [cmds.keyframe(name, query=True, keyframeCount=True) for name in names]
+		if not sum(counts):
+			return [[] for name in names]
+
+		# Each query returns a flat list covering the keys of all the curves.
+		columns = (cmds.keyframe(names, query=True, timeChange=True),
+				cmds.keyframe(names, query=True, valueChange=True),
+				cmds.keyTangent(names, query=True, inAngle=True),
+				cmds.keyTangent(names, query=True, outAngle=True),
+				cmds.keyTangent(names, query=True, inTangentType=True),
+				cmds.keyTangent(names, query=True, outTangentType=True),
+				cmds.keyTangent(names, query=True, lock=True))
+
+		# Maya measures tangent angles against seconds, FCurve against frames.
+		fps = cls._framesPerSecond()
+		curves = []
+		start = 0
+		for count in counts:
+			times, values, inAngles, outAngles, inTypes, outTypes, locks = [column[start:start + count] for column in columns]
+			keys = []
+			for index in range(count):
+				inAngle = math.atan(math.tan(math.radians(inAngles[index])) / fps)
+				outAngle = math.atan(math.tan(math.radians(outAngles[index])) / fps)
+
+				# Non weighted tangents always reach a third of the way to the neighbor key.
+				inTime = (times[index] - times[index - 1]) / 3.0 if index > 0 else 0.0
+				outTime = (times[index + 1] - times[index]) / 3.0 if index < count - 1 else 0.0
+				keys.append({'time': times[index],
+							'value': values[index],
+							'inTangentAngle': -inAngle,
+							'outTangentAngle': outAngle,
+							'inTangentLength': inTime / math.cos(inAngle),
+							'outTangentLength': outTime / math.cos(outAngle),
+							'inTangentType': cls._nativeToAbstractTangentTypes.get(inTypes[index], TangentType.Automatic),
+							'outTangentType': cls._nativeToAbstractTangentTypes.get(outTypes[index], TangentType.Automatic),
+							'normalizedTangents': True,
+							'brokenTangents': not locks[index]})
+			curves.append(keys)
+			start += count
+		return curves
+
+	@classmethod
+	def _framesPerSecond(cls):
+		return cross3d.Scene.animationFPS()
+
+	def _fCurveFromKeys(self, keys):
+		fCurve = FCurve(name=self.displayName(), tpe=self.type())
+		fCurve.setExtrapolation(self.extrapolation())
+		for kwargs in keys:
+			fCurve.addKey(**kwargs)
+		return fCurve
+
+	def fCurve(self):
+		""" Returns a FCurve object to manipulate or save the curve data.
+		"""
+		return self._fCurveFromKeys(self._queryKeys([self.name()])[0])
+
+	@classmethod
+	def fCurvesForControllers(cls, controllers):
+		curves = cls._queryKeys([controller.name() for controller in controllers])
+		return [controller._fCurveFromKeys(keys) for controller, keys in zip(controllers, curves)]
+
+	def setFCurve(self, fCurve):
+		""" Replaces the keys of the anim curve with the ones of the fCurve.
+
+		All the keys are created with a single MFnAnimCurve.addKeys call, their tangents are then
+		set with one keyTangent edit per key.
+		"""
+		name = self.name()
+		keys = sorted(fCurve.keys(), key=lambda k: k.time)
+		cmds.cutKey(name, clear=True)
+		if keys:
+			times = om.MTimeArray()
+			values = om.MDoubleArray()
+			for k in keys:
+				times.append(om.MTime(k.time, om.MTime.uiUnit()))
+				values.append(k.value)
+			oma.MFnAnimCurve(self._nativePointer).addKeys(times, values)
+
+			fps = self._framesPerSecond()
+			for index, k in enumerate(keys):
+				cmds.keyTangent(name, edit=True, index=(index, index),
+							lock=not k.brokenTangents,
+							inTangentType=self._abstractToNativeInTangentTypes.get(k.inTangentType, 'spline'),
+							outTangentType=self._abstractToNativeOutTangentTypes.get(k.outTangentType, 'spline'))
+				if k.inTangentType == TangentType.Bezier or k.outTangentType == TangentType.Bezier:
+					cmds.keyTangent(name, edit=True, index=(index, index),
+								inAngle=math.degrees(math.atan(math.tan(-k.inTangentAngle) * fps)),
+								outAngle=math.degrees(math.atan(math.tan(k.outTangentAngle) * fps)))
+
+		self.setExtrapolation(fCurve.extrapolation())
+		return True
+
+# register the symbol
+import cross3d
+cross3d.registerSymbol('SceneAnimationController', MayaSceneAnimationController)
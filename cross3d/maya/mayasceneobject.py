@@ -239,6 +239,12 @@ class MayaSceneObject( AbstractSceneObject ):
 				return cls._nativeToAbstractObjectType[apiType]
 
 		return AbstractSceneObject._typeOfNativeObject(nativeObject)
+
+	@classmethod
+	def _nativeIdentity(cls, nativeObject):
+		""" Returns the MObjectHandle hash code of the nativeObject, the same value uniqueId returns.
+		"""
+		return om.MObjectHandle(cls._asMOBject(nativeObject)).hashCode()
 	
 	#--------------------------------------------------------------------------------
 	#							cross3d public methods
@@ -24,6 +24,13 @@ type conversion to and from Qt types.
 The blurdev XML module defines two classes -- :class:`XMLElement` and 
 :class:`XMLDocument`
 
+Two backends implement this api. The default wraps :mod:`xml.dom.minidom` and
+requires PyQt4. The ElementTree backend (:class:`ETreeElement` and 
+:class:`ETreeDocument`) uses lxml when it is installed, otherwise 
+:mod:`xml.etree.cElementTree`, and does not require Qt. Set the environment 
+variable CROSS3D_XML_BACKEND to "etree" to use it for :class:`XMLDocument`. 
+If the minidom backend can not be imported the ElementTree backend is used.
+
 
 .. autoclass:: XMLElement
    :members:
@@ -38,7 +45,22 @@ The blurdev XML module defines two classes -- :class:`XMLElement` and
 
 from __future__ import absolute_import
 
-from .xmlelement import XMLElement
-from .xmldocument import XMLDocument
+import os
+
 from .minidom import escape, unescape
+from .etreeelement import ETreeElement
+from .etreedocument import ETreeDocument, XMLStreamWriter
+
+backend = os.getenv('CROSS3D_XML_BACKEND', 'minidom')
+if backend == 'minidom':
+	try:
+		from .xmlelement import XMLElement
+		from .xmldocument import XMLDocument
+	except ImportError:
+		backend = 'etree'
+
+if backend != 'minidom':
+	backend = 'etree'
+	XMLElement = ETreeElement
+	XMLDocument = ETreeDocument
 
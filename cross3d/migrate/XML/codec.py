@@ -0,0 +1,147 @@
+##
+#	\namespace	cross3d.migrate.XML.codec
+#
+#	\remarks	Table driven conversion of basic python values to and from the
+#				string attributes stored by XMLElement.recordValue. Nothing in
+#				this module uses eval, unknown type names simply fail to decode.
+#
+#	\author		Blur Studio
+#
+
+import base64
+import struct
+
+def _decodeBool(text):
+	text = text.strip()
+	if text in ('True', 'true', '1'):
+		return True
+	if text in ('False', 'false', '0', ''):
+		return False
+	raise ValueError('Invalid bool value: %r' % text)
+
+def _decodeInt(text):
+	# Older documents may contain floats stored with an int type, int(float) matches what
+	# eval('int(1.0)') used to return.
+	try:
+		return int(text)
+	except ValueError:
+		return int(float(text))
+
+def _decodeNone(text):
+	return None
+
+# Maps the type attribute stored in the document to the function used to decode its value.
+DECODERS = {
+	'int': _decodeInt,
+	'long': long,
+	'float': float,
+	'bool': _decodeBool,
+	'str': unicode,
+	'unicode': unicode,
+	'QString': unicode,
+	'NoneType': _decodeNone,
+}
+
+# Maps python types to the name stored in the type attribute and the function used to
+# convert the value into a string. Floats use repr so they survive a round trip.
+ENCODERS = {
+	int: ('int', unicode),
+	long: ('long', unicode),
+	float: ('float', repr),
+	bool: ('bool', unicode),
+	str: ('str', unicode),
+	unicode: ('str', unicode),
+	type(None): ('NoneType', unicode),
+}
+
+def isBasicType(valtype):
+	""" Returns True if values of valtype can be stored using encodeBasic. """
+	return valtype in ENCODERS
+
+def encodeBasic(value):
+	""" Returns a (typeName, text) tuple for the provided basic value. """
+	typeName, method = ENCODERS[type(value)]
+	return typeName, method(value)
+
+def decodeBasic(typeName, text, fail=None):
+	""" Decodes a basic value recorded by encodeBasic, returning fail if it can't be decoded. """
+	method = DECODERS.get(typeName)
+	if method is None:
+		return fail
+	try:
+		return method(text)
+	except (ValueError, TypeError, OverflowError):
+		return fail
+
+#--------------------------------------------------------------------------------
+#	Compact numeric arrays
+#--------------------------------------------------------------------------------
+
+# The type attribute used for compact numeric lists.
+ARRAY_TYPE = 'array'
+
+# Supported encodings for compact numeric lists.
+TEXT_ENCODING = 'text'
+BASE64_ENCODING = 'base64'
+
+# itemType: (struct format code, text decoder)
+_ARRAY_ITEMS = {
+	'int': ('q', _decodeInt),
+	'float': ('d', float),
+}
+
+_TEXT_SEPARATOR = ' '
+
+def arrayItemType(values):
+	""" Returns the item type name used to compactly store values, or None if values is not
+	a homogeneous list of ints or floats. Bools are not considered numeric here, they need
+	to restore as bools.
+	"""
+	if not values:
+		return None
+	valtype = type(values[0])
+	if valtype not in (int, float):
+		return None
+	for value in values:
+		if type(value) is not valtype:
+			return None
+	return ENCODERS[valtype][0]
+
+def encodeArray(values, itemType, encoding=TEXT_ENCODING):
+	""" Packs a homogeneous list of numbers into a single string.
+
+	Args:
+		values (list): The numbers to encode.
+		itemType (str): 'int' or 'float' as returned by arrayItemType.
+		encoding (str): TEXT_ENCODING stores a space delimited list, BASE64_ENCODING stores
+			little endian 64 bit values.
+
+	Returns:
+		str: The encoded values.
+	"""
+	if encoding == BASE64_ENCODING:
+		code = _ARRAY_ITEMS[itemType][0]
+		return base64.b64encode(struct.pack('<%d%s' % (len(values), code), *values))
+	method = ENCODERS[float][1] if itemType == 'float' else unicode
+	return _TEXT_SEPARATOR.join([method(value) for value in values])
+
+def decodeArray(text, itemType, encoding=TEXT_ENCODING):
+	""" Unpacks a string created by encodeArray into a list of numbers. """
+	code, method = _ARRAY_ITEMS[itemType]
+	if encoding == BASE64_ENCODING:
+		data = base64.b64decode(text)
+		count = len(data) // struct.calcsize('<' + code)
+		return list(struct.unpack('<%d%s' % (count, code), data))
+	return [method(value) for value in text.split()]
+
+def canPackArray(values, itemType):
+	""" Returns False if an int array has values outside of the 64 bit range used by the
+	base64 encoding.
+	"""
+	if itemType != 'int':
+		return True
+	limit = 2 ** 63
+	for value in values:
+		if value >= limit or value < -limit:
+			return False
+	return True
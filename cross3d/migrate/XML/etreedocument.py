@@ -0,0 +1,246 @@
+##
+#	\namespace	cross3d.migrate.XML.etreedocument
+#
+#	\remarks	defines an XML Document wrapper built on ElementTree. Parsing, pretty
+#				printing and saving do not require Qt.
+#
+#	\author		Blur Studio
+#
+
+import os
+
+from etreeelement import ETreeElement, etree
+from minidom import escape
+
+# Name of the hidden element that holds the root of the document. Using an element
+# lets the document behave like any other element when adding or finding children.
+_CONTAINER = 'document'
+
+def _stripWhitespace(root):
+	"""
+	Removes text that is only whitespace from elements that have child elements. Files
+	saved with pretty=True would otherwise read the indentation back in. This is a single
+	non recursive pass over the tree.
+	"""
+	for element in root.iter():
+		if (len(element)):
+			if (element.text and not element.text.strip()):
+				element.text = None
+			for child in element:
+				if (child.tail and not child.tail.strip()):
+					child.tail = None
+
+def _indent(element, indented='\t', level=0):
+	"""
+	Adds indentation whitespace in place. Only text and tails that are empty or only
+	whitespace are changed so element values are preserved.
+	"""
+	newline = '\n' + level * indented
+	if (len(element)):
+		if (not element.text or not element.text.strip()):
+			element.text = newline + indented
+		for child in element:
+			_indent(child, indented, level + 1)
+		# child is the last child of element here.
+		if (not child.tail or not child.tail.strip()):
+			child.tail = newline
+	if (level and (not element.tail or not element.tail.strip())):
+		element.tail = newline
+
+def _indentString(indented):
+	if (isinstance(indented, (int, long))):
+		return ' ' * indented
+	return indented
+
+
+class ETreeDocument(ETreeElement):
+	""" ElementTree based replacement for :class:`XMLDocument` """
+
+	def __init__(self, object=None):
+		container = etree.Element(_CONTAINER)
+		if (object is not None):
+			# Accept ElementTree instances as well as root elements.
+			if (hasattr(object, 'getroot')):
+				object = object.getroot()
+			container.append(object)
+		ETreeElement.__init__(self, container, owner=self)
+		self._parentMap = None
+		self.__file__ = ''
+
+	def _parentOf(self, element):
+		""" Looks up the parent of the provided element, rebuilding the parent map if the
+		tree was modified since it was last built.
+		"""
+		if (self._parentMap is None or element not in self._parentMap):
+			self._parentMap = dict((child, parent) for parent in self._object.iter() for child in parent)
+		return self._parentMap.get(element)
+
+	def _setRootElement(self, root):
+		container = etree.Element(_CONTAINER)
+		container.append(root)
+		self._object = container
+		self._parentMap = None
+
+	def findElementById(self, childId):
+		split = childId.split('::')
+		outTemplate = None
+		if (split):
+			outTemplate = self.root().findChildById(split[0])
+			index = 1
+
+			while (index < len(split) and outTemplate):
+				outTemplate = outTemplate.findChildById(split[index])
+				index += 1
+		return outTemplate
+
+	def load(self, fileName):
+		"""
+		Loads the given xml file, setting this instances object to the resulting value.
+
+		"""
+		fileName = unicode(fileName)
+		if (os.path.exists(fileName)):
+			try:
+				tree = etree.parse(fileName)
+			except Exception, e:
+				print 'Unable to parse filename!!!!', fileName
+				print e
+				return False
+
+			root = tree.getroot()
+			_stripWhitespace(root)
+			self._setRootElement(root)
+			self.__file__ = fileName
+			return True
+		return False
+
+	def parse(self, xmlString):
+		if (isinstance(xmlString, unicode)):
+			xmlString = xmlString.encode('utf-8')
+		else:
+			xmlString = str(xmlString)
+		if (xmlString):
+			root = etree.fromstring(xmlString)
+			_stripWhitespace(root)
+			self._setRootElement(root)
+			return True
+		return False
+
+	def root(self):
+		"""Returns the root xml node for this document.
+
+		"""
+		for child in self._children():
+			return ETreeElement(child, self.__file__, self, self)
+		return None
+
+	def save(self, fileName, pretty=True, showDialog=False):
+		"""
+		Saves the xml document to the given file, converting it to a
+		pretty XML document if so desired. The document is streamed to
+		the file rather than converted to a string first.
+
+		:param fileName: path to the save location
+		:param pretty: if set to True, will format spaces and line breaks.
+		:param showDialog: if set to True, if an error occurs while saving,
+		                   a dialog will be displayed showing the errors.
+		:type fileName: str
+		:type pretty: bool
+		:type showDialog: bool
+
+		"""
+		root = self.root()
+		if (root is not None and os.path.exists(os.path.split(fileName)[0])):
+			self.__file__ = fileName
+			if (pretty):
+				_indent(root._object, _indentString(4))
+			try:
+				with open(fileName, 'wb') as f:
+					f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+					etree.ElementTree(root._object).write(f, encoding='utf-8')
+			except (UnicodeError, ValueError):
+				print 'Encoding error while saving XML'
+				if showDialog:
+					from PyQt4.QtGui	import QMessageBox
+					QMessageBox.critical(None, 'Encoding Error', 'Unable to save xml data, please check for unsupported characters.')
+				return False
+			return True
+		if showDialog:
+			from PyQt4.QtGui	import QMessageBox
+			QMessageBox.warning(None, 'Unable to Save', 'Unable to save xml data, please verify you have the correct privileges.')
+		return False
+
+	def toxml(self, encoding='utf-8'):
+		root = self.root()
+		text = '<?xml version="1.0" encoding="utf-8"?>'
+		if (root is not None):
+			text += etree.tostring(root._object, encoding='utf-8')
+		if encoding == 'utf-8':
+			return unicode(text, 'utf-8')
+		return text
+
+	def toprettyxml(self, indent='\t', newl='\n', encoding=None):
+		root = self.root()
+		if (root is not None):
+			_indent(root._object, indent)
+		return self.toxml(encoding or 'utf-8')
+
+	@staticmethod
+	def formatXml(xmltext, indented=4):
+		if (isinstance(xmltext, unicode)):
+			xmltext = xmltext.encode('utf-8')
+		root = etree.fromstring(xmltext)
+		_stripWhitespace(root)
+		_indent(root, _indentString(indented))
+		return unicode(etree.tostring(root, encoding='utf-8'), 'utf-8')
+
+
+class XMLStreamWriter(object):
+	""" Writes large documents to disk one top level element at a time.
+
+	Elements created through addNode are serialized and released by write, so only
+	one of them needs to be in memory at a time::
+
+		with XMLStreamWriter(fileName, 'layers') as writer:
+			for layer in layers:
+				element = writer.addNode('layer')
+				layer.recordXml(element)
+				writer.write(element)
+	"""
+
+	def __init__(self, fileName, rootName, attributes=None, pretty=True):
+		self._rootName = rootName
+		self._pretty = pretty
+		self._file = open(fileName, 'wb')
+		self._file.write('<?xml version="1.0" encoding="utf-8"?>\n')
+		attrs = ''.join([' %s="%s"' % (key, escape(escape(unicode(value)))) for key, value in (attributes or {}).iteritems()])
+		self._file.write(('<%s%s>' % (rootName, attrs)).encode('utf-8'))
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+		return False
+
+	def addNode(self, nodeName):
+		""" Creates a detached element that can be passed to write. """
+		return ETreeElement(etree.Element(nodeName), self._file.name)
+
+	def write(self, element):
+		""" Serializes the element to the file and clears it from memory. """
+		if (isinstance(element, ETreeElement)):
+			element = element._object
+		if (self._pretty):
+			_indent(element, _indentString(4), 1)
+			self._file.write('\n' + _indentString(4))
+		element.tail = None
+		self._file.write(etree.tostring(element, encoding='utf-8'))
+		element.clear()
+
+	def close(self):
+		if (not self._file.closed):
+			if (self._pretty):
+				self._file.write('\n')
+			self._file.write('</%s>\n' % self._rootName)
+			self._file.close()
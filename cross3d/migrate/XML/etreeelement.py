@@ -0,0 +1,238 @@
+##
+#	\namespace	cross3d.migrate.XML.etreeelement
+#
+#	\remarks	defines an XML Element wrapper built on ElementTree. It provides the
+#				same api as XMLElement without depending on minidom or Qt.
+#
+#	\author		Blur Studio
+#
+
+import copy
+
+# Use lxml when it is available, it provides parent lookups and faster parsing.
+try:
+	from lxml import etree
+except ImportError:
+	try:
+		import xml.etree.cElementTree as etree
+	except ImportError:
+		import xml.etree.ElementTree as etree
+
+from minidom import escape, unescape
+from xmlbase import XMLElementBase
+
+class ETreeElement(XMLElementBase):
+	"""Ease of use wrapper class for ElementTree elements.
+
+	ElementTree elements do not know their parent, so the wrapper keeps a reference
+	to the wrapper it was created from and to its owning :class:`ETreeDocument`.
+
+	"""
+	def __eq__( self, other ):
+		""" checks to see if the wrapped element instance is the same """
+		if ( isinstance( other, ETreeElement ) ):
+			return self._object is other._object
+		return False
+
+	def __getattr__( self, key ):
+		""" pass along all unknown attributes to the wrapped element """
+		if ( key == '_object' ):
+			raise AttributeError( key )
+		if ( key in ('nodeName', 'tagName') ):
+			return self._object.tag
+		return getattr( self._object, key )
+
+	def __init__( self, object = None, filename = '', parent = None, owner = None ):
+		""" initialize the class with an ElementTree element instance """
+		if ( object is None ):
+			object = etree.Element( 'element' )
+		self._object = object
+		self._parent = parent
+		self._owner = owner
+		self.__file__ = filename
+		# Used to allow saving empty attributes.
+		self.allowEmptyAttrs = False
+
+	def _children( self ):
+		""" collects the child elements, skipping comments and processing instructions """
+		return [ child for child in self._object if isinstance( child.tag, basestring ) ]
+
+	def _wrap( self, object, parent = None ):
+		return ETreeElement( object, self.__file__, parent, self._owner )
+
+	def _descendants( self, childName ):
+		""" yields the descendants of this element with the given name, excluding itself """
+		for child in self._object.iter( childName ):
+			if ( child is not self._object ):
+				yield child
+
+	def clear( self ):
+		del self._object[:]
+		self._object.text = None
+
+	def addComment( self, comment ):
+		self._object.append( etree.Comment( comment ) )
+		return True
+
+	def addNode( self, nodeName ):
+		"""Adds a new node child to the current element with the given node name.
+
+		:param nodeName: name of the child to add
+		:type nodeName: str
+		:rtype: :class:`ETreeElement`
+
+		"""
+		return self._wrap( etree.SubElement( self._object, nodeName ), self )
+
+	def addChild( self, child, clone = True, deep = True ):
+		if ( isinstance( child, ETreeElement ) ):
+			if ( not clone ):
+				child.remove()
+			child = child._object
+
+		if ( clone ):
+			if ( deep ):
+				child = copy.deepcopy( child )
+			else:
+				text = child.text
+				child = etree.Element( child.tag, dict( child.attrib ) )
+				child.text = text
+		self._object.append( child )
+
+	def attribute( self, attr, fail = '' ):
+		"""Gets the attribute value of the element by the given attribute id
+		:param attr: Name of the atribute you want to recover.
+		:param fail: If the atribute does not exist return this.
+		"""
+		out = self._object.get( attr )
+		if ( out ):
+			out = unescape( unicode( out ) )
+			if ( out ):
+				return out
+		return fail
+
+	def attributeDict( self ):
+		"""
+			\Remarks	Returns a dictionary of attributes
+			\Return		<dict>
+		"""
+		return dict( self._object.attrib )
+
+	def childAt( self, index ):
+		"""Finds the child at the given index, provided the index is within the child range
+		"""
+		childList = self._children()
+		if ( 0 <= index and index < len( childList ) ):
+			return self._wrap( childList[index], self )
+		return None
+
+	def childNames( self ):
+		"""Collects the names of the child elements of this element
+		"""
+		return [ child.tag for child in self._children() ]
+
+	def children( self ):
+		"""Collects the child elements of this element, wrapping each child as an
+		:class:`ETreeElement`.
+
+		"""
+		return [ self._wrap( child, self ) for child in self._children() ]
+
+	def index( self, object ):
+		"""Finds the index of the inputed child object in this instance's
+		children, returning -1 if it cannot be found.
+
+		"""
+		if ( isinstance( object, ETreeElement ) ):
+			object = object._object
+		for index, child in enumerate( self._object ):
+			if ( child is object ):
+				return index
+		return -1
+
+	def findChild( self, childName, recursive = False, autoCreate = False ):
+		"""Finds the first instance of the child of this instance whose nodeName is the given child name.
+		:param childName: Name to search for.
+		:param recursive: Recursively search each child node for more child nodes. Default is False
+		:param autoCreate: Create the node if it is not found.
+		"""
+		if ( not recursive ):
+			for child in self._object:
+				if ( child.tag == childName ):
+					return self._wrap( child, self )
+		else:
+			for child in self._descendants( childName ):
+				return self._wrap( child )
+
+		if ( autoCreate ):
+			return self.addNode( childName )
+
+		return None
+
+	def findChildren( self, childName, recursive = False ):
+		"""Finds all the children of this instance whose nodeName is the given child name.
+
+		:param childName: The name of the child nodes to look for.
+		:param recursive: Recursively search each child node for more child nodes. Default is False
+		"""
+		if ( recursive ):
+			return [ self._wrap( child ) for child in self._descendants( childName ) ]
+		return [ self._wrap( child, self ) for child in self._object if child.tag == childName ]
+
+	def name( self ):
+		return self._object.tag
+
+	def _parentElement( self ):
+		""" returns the native parent of this element, or None if it is not known """
+		if ( self._parent is not None ):
+			return self._parent._object
+		# lxml elements know their parent.
+		getparent = getattr( self._object, 'getparent', None )
+		if ( getparent is not None ):
+			return getparent()
+		if ( self._owner is not None ):
+			return self._owner._parentOf( self._object )
+		return None
+
+	def parent( self ):
+		parent = self._parentElement()
+		if ( parent is None or ( self._owner is not None and parent is self._owner._object ) ):
+			return None
+		if ( self._parent is not None and self._parent._object is parent ):
+			return self._parent
+		return self._wrap( parent )
+
+	def remove( self ):
+		parent = self._parentElement()
+		if ( parent is not None ):
+			parent.remove( self._object )
+		self._parent = None
+		return True
+
+	def setAttribute( self, attr, val ):
+		"""Sets the attribute of this instance to the inputed value,
+		automatically converting the value to a string.
+
+		"""
+		if ( val != '' or self.allowEmptyAttrs ):
+			val = unicode( val )
+			# Escaped the same way as the minidom backend so files are interchangeable.
+			val = escape( val )
+			self._object.set( attr, val )
+			return True
+		return False
+
+	def setValue( self, val ):
+		"""Sets the text value for this instance, automatically converting
+		the inputed value to a string.
+
+		"""
+		self._object.text = unicode( val )
+		return True
+
+	def value( self ):
+		"""Returns the string value of the text of this instance.  If there is
+		no text, a blank string is returned.
+
+		"""
+		return self._object.text or ''
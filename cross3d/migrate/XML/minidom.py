@@ -13,7 +13,10 @@ import xml.dom.minidom
 
 escape_dict = {'&': "&amp;", ">": "&gt;", "<": "&lt;", '"': '&quot;', '\r': '&#xD;', '\n': '&#xA;', '\t': '&#x9;'}
 def escape(data, entities={}):
+    # must do ampersand first
+    data = data.replace("&", "&amp;")
     for k,v in escape_dict.iteritems():
+        if k == '&': continue
         data = data.replace(k,v)
     return data
 
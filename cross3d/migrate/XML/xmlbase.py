@@ -0,0 +1,365 @@
+##
+#	\namespace	cross3d.migrate.XML.xmlbase
+#
+#	\remarks	defines the backend independent part of the XML Element wrapper. The
+#				value recording and Qt type helpers are implemented on top of a few
+#				primitive methods provided by each backend (addNode, attribute,
+#				setAttribute, children, findChild, name, parent).
+#	
+#	\author		Blur Studio
+#
+
+# PyQt4 is optional here so the ElementTree backend can be used outside of Qt.
+try:
+	from PyQt4 import QtCore
+	from PyQt4.QtCore	import QRect, QRectF, QPoint, QPointF, QSize, QSizeF, QDate, QDateTime, QString, QByteArray, Qt
+	from PyQt4.QtGui	import QColor, QFont
+except ImportError:
+	QtCore = None
+	QRect = QRectF = QPoint = QPointF = QSize = QSizeF = QDate = QDateTime = QString = QByteArray = Qt = None
+	QColor = QFont = None
+
+import codec
+
+_qtTypeNames = set(['QDateTime', 'QDate', 'QRect', 'QRectF', 'QSize', 'QSizeF', 'QPoint', 'QPointF', 'QColor', 'QFont', 'QByteArray', 'CheckState'])
+
+class XMLElementBase:
+	"""Backend independent methods shared by :class:`XMLElement` and :class:`ETreeElement`.
+	
+	Subclasses wrap a native node and implement the primitive accessors used here.
+	
+	"""
+	def _findPoint(self, name, cls, method):
+		child = self.findChild(name)
+		if child:
+			x = method(child.attribute('x', 0))
+			y = method(child.attribute('y', 0))
+			return cls(x, y)
+		return cls()
+	
+	def _findRect( self, name, cls, method ):
+		rect 	= cls()
+		child 	= self.findChild( name )
+		if ( child ):
+			x = method( child.attribute( 'x', 0 ) )
+			y = method( child.attribute( 'y', 0 ) )
+			w = method( child.attribute( 'width', 0 ) )
+			h = method( child.attribute( 'height', 0 ) )
+		
+			rect = cls( x, y, w, h )
+			
+		return rect
+	
+	def _findSize(self, name, cls, method):
+		child = self.findChild(name)
+		if child:
+			w = method(child.attribute('width', 0))
+			h = method(child.attribute('height', 0))
+			return cls(w, h)
+		return cls()
+	
+	def recordValue( self, value, compact = False, encoding = codec.TEXT_ENCODING ):
+		"""Records the value on this element so it can be restored with restoreValue.
+		
+		:param value: The value to record.
+		:param compact: If True, lists containing only ints or only floats are stored as a
+						single attribute instead of one entry node per item.
+		:param encoding: The encoding used by compact lists, 'text' or 'base64'.
+		"""
+		# Convert Qt basics to python basics where possible
+		if ( type( value ) == QString ):
+			value = unicode( value )
+			
+		valtype = type( value )
+		
+		# Record a basic property
+		if ( codec.isBasicType( valtype ) ):
+			typ, text = codec.encodeBasic( value )
+			self.setAttribute( 'value', text )
+			self.setAttribute( 'type', typ )
+		
+		# Record a list of properties
+		elif ( valtype in (list,tuple) ):
+			itemType = codec.arrayItemType( value ) if compact else None
+			if ( itemType and (encoding != codec.BASE64_ENCODING or codec.canPackArray( value, itemType )) ):
+				self.setAttribute( 'type', codec.ARRAY_TYPE )
+				self.setAttribute( 'itemType', itemType )
+				self.setAttribute( 'encoding', encoding )
+				self.setAttribute( 'value', codec.encodeArray( value, itemType, encoding ) )
+			else:
+				self.setAttribute( 'type', 'list' )
+				for val in value:
+					entry = self.addNode( 'entry' )
+					entry.recordValue( val, compact, encoding )
+		
+		# Record a dictionary of properties
+		elif ( valtype == dict ):
+			self.setAttribute( 'type', 'dict' )
+			
+			for key, val in value.items():
+				entry = self.addNode( 'entry' )
+				entry.setAttribute( 'key', key )
+				entry.recordValue( val, compact, encoding )
+			
+		# Record a qdatetime
+		elif ( valtype == QDateTime ):
+			self.setAttribute( 'type', 'QDateTime' )
+			self.setAttribute( 'value', value.toString( 'yyyy-MM-dd hh:mm:ss' ) )	
+			
+		# Record a qdate
+		elif ( valtype == QDate ):
+			self.setAttribute( 'type', 'QDate' )
+			self.setAttribute( 'value', value.toString( 'yyyy-MM-dd' ) )
+		
+		# Record a qrect
+		elif ( valtype in (QRect,QRectF) ):
+			self.setAttribute( 'type', valtype.__name__ )
+			self.setRect( 'rect', value )
+		
+		# Record a point
+		elif ( valtype in (QPoint,QPointF) ):
+			self.setAttribute( 'type', valtype.__name__ )
+			self.setPoint( 'point', value )
+		
+		# record a QFont
+		elif ( valtype == QFont ):
+			self.setAttribute( 'type', 'QFont' )
+			self.setAttribute( 'value', value.toString() )
+		
+		# Record a size
+		elif valtype in (QSize, QSizeF):
+			self.setAttribute( 'type', valtype.__name__ )
+			self.setSize( 'size', value )
+		
+		# Record a qcolor
+		elif ( valtype == QColor ):
+			self.setAttribute( 'type', 'QColor' )
+			self.setColor( 'color', value )
+		
+		# Record a QByteArray (Experimental)
+		elif ( valtype == QByteArray ):
+			self.setAttribute( 'type', 'QByteArray' )
+			self.setAttribute( 'value', value.toPercentEncoding() )
+		
+		# Record any other value by its string representation
+		else:
+			self.setAttribute( 'value', value )
+			typ = type( value ).__name__
+			if ( typ == 'unicode' ):
+				typ = 'str'
+			self.setAttribute( 'type', typ )
+	
+	def restoreValue( self, fail = None ):
+		
+		valtype = self.attribute( 'type' )
+		value	= None
+		
+		# Restore a basic value
+		if ( valtype in codec.DECODERS ):
+			value = codec.decodeBasic( valtype, self.attribute( 'value' ), fail )
+		
+		# Restore a list item
+		elif ( valtype == 'list' ):
+			value = []
+			for child in self.children():
+				value.append( child.restoreValue() )
+		
+		# Restore a compact list of numbers
+		elif ( valtype == codec.ARRAY_TYPE ):
+			try:
+				value = codec.decodeArray( self.attribute( 'value' ), self.attribute( 'itemType' ), self.attribute( 'encoding', codec.TEXT_ENCODING ) )
+			except (KeyError, ValueError, TypeError):
+				value = fail
+		
+		# Restore a dictionary item
+		elif ( valtype == 'dict' ):
+			value = {}
+			for child in self.children():
+				value[ child.attribute( 'key' ) ] = child.restoreValue()
+		
+		# Qt types can only be restored when PyQt4 is available
+		elif ( QtCore is None and valtype in _qtTypeNames ):
+			value = fail
+		
+		# Record a qdatetime
+		elif ( valtype == 'QDateTime' ):
+			value = QDateTime.fromString( self.attribute( 'value' ), 'yyyy-MM-dd hh:mm:ss' )
+			
+		# Record a qdate
+		elif ( valtype == 'QDate' ):
+			value = QDate.fromString( self.attribute( 'value' ), 'yyyy-MM-dd' )
+		
+		# Restore a QRect
+		elif ( valtype == 'QRect' ):
+			value = self.findRect( 'rect' )
+		
+		# Restore a QRectF
+		elif ( valtype == 'QRectF' ):
+			value = self.findRectF( 'rect' )
+		
+		# Restore a QSize
+		elif ( valtype == 'QSize' ):
+			value = self.findSize( 'size' )
+		
+		# Restore a QSizeF
+		elif ( valtype == 'QSizeF' ):
+			value = self.findSizeF( 'size' )
+		
+		# Restore a QPoint
+		elif ( valtype == 'QPoint' ):
+			value = self.findPoint( 'point' )
+		
+		# Restore a QPointF
+		elif ( valtype == 'QPointF' ):
+			value = self.findPointF( 'point' )
+		
+		# Restore a QColor
+		elif ( valtype == 'QColor' ):
+			value = self.findColor( 'color' )
+		
+		# restore a QFont
+		elif ( valtype == 'QFont' ):
+			value = QFont()
+			value.fromString(self.attribute('value'))
+		
+		elif ( valtype == 'ViewMode' ):
+			# If treated as a basic value would return fail
+			value = int( self.attribute( 'value' ) )
+		
+		# Restore a QByteArray (Experimental)
+		elif ( valtype == 'QByteArray' ):
+			value = QByteArray.fromPercentEncoding( self.attribute( 'value', '' ) )
+		
+		# Restore a Qt.CheckState
+		elif valtype == 'CheckState':
+			value = Qt.CheckState(self.attribute('value', 0))
+		
+		# Unknown types are not evaluated
+		else:
+			value = fail
+			
+		return value
+		
+	def findChildById( self, key ):
+		import re
+		key = '_'.join( re.findall( '[a-zA-Z0-9]*', key ) ).lower()
+		for child in self.children():
+			if ( key == child.getId() or key == '_'.join( re.findall( '[a-zA-Z0-9]*', child.nodeName ) ).lower() ):
+				return child
+		return None
+	
+	def findColor( self, name, fail = None ):
+		element = self.findChild( name )
+		if ( element ):
+			return QColor( float( element.attribute( 'red' ) ), float( element.attribute( 'green' ) ), float( element.attribute( 'blue' ) ), float( element.attribute( 'alpha' ) ) )
+		elif ( fail ):
+			return fail
+		else:
+			return QColor()
+	
+	def findFont( self, name, fail = None ):
+		element = self.findChild( name )
+		if ( element ):
+			font = QFont()
+			font.fromString( element.attribute( 'value' ) )
+			return font
+		elif ( fail ):
+			return fail
+		else:
+			return QFont()
+	
+	def findProperty( self, propName, fail = '' ):
+		child = self.findChild( propName )
+		if ( child ):
+			return child.value()
+		return fail
+	
+	def findPoint(self, name):
+		return self._findPoint(name, QPoint, int)
+	
+	def findPointF(self, name):
+		return self._findPoint(name, QPointF, float)
+	
+	def findRect( self, name ):
+		return self._findRect( name, QRect, int )
+	
+	def findRectF( self, name ):
+		return self._findRect( name, QRectF, float )
+	
+	def findSize(self, name):
+		return self._findSize(name, QSize, int)
+	
+	def findSizeF(self, name):
+		return self._findSize(name, QSizeF, float)
+	
+	def getId( self ):
+		out = self.attribute( 'id' )
+		if ( not out ):
+			import re
+			out = '_'.join( re.findall( '[a-zA-Z0-9]*', self.attribute( 'name' ) ) ).lower()
+		return out
+	
+	def recordProperty( self, name, value, compact = False, encoding = codec.TEXT_ENCODING ):
+		element = self.findChild( name )
+		if ( element ):
+			element.remove()
+			
+		element = self.addNode( name )
+		element.recordValue( value, compact, encoding )
+	
+	def restoreProperty( self, name, fail = None ):
+		element = self.findChild( name )
+		if ( element ):
+			return element.restoreValue( fail )
+		return fail
+	
+	def setColor( self, name, color ):
+		element = self.addNode( name )
+		if ( element ):
+			element.setAttribute( 'red', 	color.red() )
+			element.setAttribute( 'green', 	color.green() )
+			element.setAttribute( 'blue', 	color.blue() )
+			element.setAttribute( 'alpha',	color.alpha() )
+	
+	def setProperty( self, propName, val ):
+		prop = self.findChild( propName )
+		if ( not prop ):
+			prop = self.addNode( propName )
+		prop.setValue( val )
+	
+	def setFont( self, name, font ):
+		element = self.addNode( name )
+		element.setAttribute( 'value', font.toString() )
+		return element
+	
+	def setPoint( self, name, point ):
+		element = self.addNode( name )
+		element.setAttribute( 'x', point.x() )
+		element.setAttribute( 'y', point.y() )
+		return element
+	
+	def setRect( self, name, rect ):
+		element = self.addNode( name )
+		element.setAttribute( 'x', 		rect.x() )
+		element.setAttribute( 'y', 		rect.y() )
+		element.setAttribute( 'width', 	rect.width() )
+		element.setAttribute( 'height',	rect.height() )
+		return element
+	
+	def setSize( self, name, size ):
+		element = self.addNode( name )
+		element.setAttribute( 'width', 	size.width() )
+		element.setAttribute( 'height', size.height() )
+		return element
+	
+	def uri( self ):
+		out 	= []
+		temp 	= self
+		while ( temp ):
+			name = temp.getId()
+			if ( not name ):
+				name = temp.name()
+			out.insert(0,name)
+			temp = temp.parent()
+		
+		return '::'.join( out )
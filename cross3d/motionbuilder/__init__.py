@@ -8,14 +8,25 @@
 #	\date		06/21/12
 #
 
+import cross3d
 import external
 
+# The layer's modules and the symbols they register. They are imported the first time one of their
+# symbols is used.
+_lazyModules = (
+	('motionbuilderscene', ('Scene',)),
+	('collection', ('Collection',)),
+)
+
 def init():
 
 	# Making sure we can import the layer.
 	import pyfbsdk as mob
 	
-	# Importing the layer's classes.
+	# Registering the layer's classes.
+	for module, symbols in _lazyModules:
+		for symbol in symbols:
+			cross3d.registerSymbol(symbol, '{}.{}'.format(__name__, module), lazy=True)
+
+	# The application connects the Motion Builder callbacks to the dispatch, so it is imported upfront.
 	import motionbuilderapplication
-	import motionbuilderscene
-	import collection
@@ -8,23 +8,34 @@
 #	\date		03/15/10
 #
 
+import cross3d
 import external
 
+# The layer's modules and the symbols they register. They are imported the first time one of their
+# symbols is used.
+_lazyModules = (
+	('softimageuserprops', ('UserProps', 'FileProps')),
+	('softimageundocontext', ('UndoContext',)),
+	('softimagescene', ('Scene',)),
+	('softimagescenewrapper', ('SceneWrapper',)),
+	('softimagesceneobject', ('SceneObject',)),
+	('softimagegroup', ('Group',)),
+	('softimagescenemodel', ('SceneModel',)),
+	('softimagescenecamera', ('SceneCamera',)),
+	('softimagescenerenderpass', ('SceneRenderPass',)),
+	('softimagesceneviewport', ('SceneViewport',)),
+	('collection', ('Collection',)),
+)
+
 def init():
 	
 	# Making sure we can import the layer.
 	from PySoftimage import xsi
 	
-	# Importing the layer's classes.
-	import softimageuserprops
-	import softimageundocontext
+	# Registering the layer's classes.
+	for module, symbols in _lazyModules:
+		for symbol in symbols:
+			cross3d.registerSymbol(symbol, '{}.{}'.format(__name__, module), lazy=True)
+
+	# The application connects the Softimage callbacks to the dispatch, so it is imported upfront.
 	import softimageapplication
-	import softimagescene
-	import softimagescenewrapper
-	import softimagesceneobject
-	import softimagegroup
-	import softimagescenemodel
-	import softimagescenecamera
-	import softimagescenerenderpass
-	import softimagesceneviewport
-	import collection
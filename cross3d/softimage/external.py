@@ -108,3 +108,16 @@ class External(AbstractExternal):
 		if ret:
 			return os.path.join(os.path.normpath(ret), 'Application', 'bin')
 		raise Exceptions.SoftwareNotInstalled('Softimage', version=version, architecture=architecture, language=language)
+
+	@classmethod
+	def jobCommand(cls, runnerPath, directory, version=None, architecture=64, debug=False, headless=True):
+		binary = os.path.join(cls.binariesPath(version, architecture), 'xsibatch.exe' if headless else 'xsi.exe')
+		command = [binary, '-continue', '-script' if headless else '-uiscript', runnerPath]
+		if headless:
+			command.insert(1, '-processing')
+		return command
+
+	@classmethod
+	def workerCommand(cls, version=None, architecture=64, debug=False):
+		binary = os.path.join(cls.binariesPath(version, architecture), 'xsibatch.exe')
+		return [binary, '-processing', '-continue', '-script', cls.workerScriptPath()]
@@ -336,6 +336,15 @@ class SoftimageSceneObject(AbstractSceneObject):
 			
 		return abstractType
 
+	@classmethod
+	def _nativeIdentity(cls, nativeObject):
+		"""
+			\remarks	reimplements the AbstractSceneObject._nativeIdentity method to return the ObjectID of the nativeObject
+			\param		<PySoftimage.xsi.Object> nativeObject
+			\return		<int> id
+		"""
+		return nativeObject.ObjectID
+
 	#------------------------------------------------------------------------------------------------------------------------
 	# 												static methods
 	#------------------------------------------------------------------------------------------------------------------------
@@ -9,6 +9,7 @@
 #
 
 import os
+import cross3d
 from cross3d.enum import Enum, EnumGroup
 
 import external
@@ -19,6 +20,37 @@ class StudiomaxAppData(EnumGroup):
 	AltMtlIndex = _StudiomaxAppData(1108)
 	AltPropIndex = _StudiomaxAppData(1110)
 
+# The layer's modules and the symbols they register. They are imported the first time one of their
+# symbols is used.
+_lazyModules = (
+	('studiomaxuserprops', ('UserProps', 'FileProps')),
+	('studiomaxscene', ('Scene',)),
+	('studiomaxscenewrapper', ('SceneWrapper',)),
+	('studiomaxsceneobject', ('SceneObject',)),
+	('studiomaxscenelayer', ('SceneLayer',)),
+	('studiomaxgroup', ('Group',)),
+	('studiomaxscenelayergroup', ('SceneLayerGroup',)),
+	('studiomaxscenematerial', ('SceneMaterial',)),
+	('studiomaxscenepropset', ('ScenePropSet', 'SceneObjectPropSet')),
+	('studiomaxscenemap', ('SceneMap',)),
+	('studiomaxsceneatmospheric', ('SceneAtmospheric',)),
+	('studiomaxscenefx', ('SceneFx',)),
+	('studiomaxscenerenderer', ('SceneRenderer',)),
+	('studiomaxscenemodel', ('SceneModel',)),
+	('studiomaxscenecamera', ('SceneCamera',)),
+	('studiomaxsceneanimationcontroller', ('SceneAnimationController',)),
+	('studiomaxsceneanimationkey', ('SceneAnimationKey',)),
+	('studiomaxscenecache', ('SceneCache',)),
+	('studiomaxsceneviewport', ('SceneViewport',)),
+	('mixer.trackportion', ('TrackPortion',)),
+	('mixer.clipportion', ('ClipPortion',)),
+	('mixer.clip', ('Clip',)),
+	('mixer.track', ('Track',)),
+	('mixer.trackgroup', ('TrackGroup',)),
+	('mixer.mixer', ('Mixer',)),
+	('collection', ('Collection',)),
+)
+
 def init():
 	
 	# Making sure we can import the layer.
@@ -26,26 +58,10 @@ def init():
 	path = os.path.join(os.path.split(unicode(__file__))[0], 'maxscript', 'helpers.ms')
 	mxs.filein(path)
 	
-	# Importing the layer's classes.
-	import studiomaxuserprops
+	# Registering the layer's classes.
+	for module, symbols in _lazyModules:
+		for symbol in symbols:
+			cross3d.registerSymbol(symbol, '{}.{}'.format(__name__, module), lazy=True)
+
+	# The application connects the Max callbacks to the dispatch, so it is imported upfront.
 	import studiomaxapplication
-	import studiomaxscene
-	import studiomaxscenewrapper
-	import studiomaxsceneobject	
-	import studiomaxscenelayer
-	import studiomaxgroup	
-	import studiomaxscenelayergroup	
-	import studiomaxscenematerial	
-	import studiomaxscenepropset
-	import studiomaxscenemap
-	import studiomaxsceneatmospheric
-	import studiomaxscenefx
-	import studiomaxscenerenderer
-	import studiomaxscenemodel
-	import studiomaxscenecamera
-	import studiomaxsceneanimationcontroller
-	import studiomaxsceneanimationkey
-	import studiomaxscenecache
-	import studiomaxsceneviewport
-	import mixer
-	import collection
@@ -11,10 +11,53 @@
 #------------------------------------------------------------------------------------------------------------------------
 
 import cross3d
+from Py3dsMax import mxs
+from PyQt4.QtGui import QColor
+from cross3d.constants import ObjectType
 from cross3d.abstract.collection import Collection as AbstractCollection
 
 class Collection(AbstractCollection):
-	pass
+
+	def _setNodesProperty(self, name, value):
+		# Max can't assign a property to an array of nodes from python, the helper does it in one call.
+		return mxs.cross3dhelper.setNodesProperty(self._nativeObjects, mxs.pyhelper.namify(name), value)
+
+	def setLayer(self, layer):
+		nativeLayer = layer.nativeLayer() if layer else mxs.layerManager.getLayer(0)
+		nativeLayer.addNodes(self._nativeObjects)
+		return True
+
+	def setMaterial(self, material):
+		return self._setNodesProperty('material', material.nativePointer() if material else None)
+
+	def setParent(self, parent):
+		# Parenting to a model also renames the objects, which is done object by object.
+		if parent and parent.isObjectType(ObjectType.Model):
+			return super(Collection, self).setParent(parent)
+		return self._setNodesProperty('parent', parent.nativePointer() if parent else None)
+
+	def setWireColor(self, color):
+		return self._setNodesProperty('wireColor', self._scene._toNativeValue(QColor(color)))
+
+	def setUserProps(self, props):
+		UserProps = cross3d.UserProps
+		keys = [UserProps.escapeKey(key) for key in props]
+		values = [UserProps.escapeValue('%f' % value if isinstance(value, float) else value) for value in props.values()]
+		mxs.cross3dhelper.setNodesUserProps(self._nativeObjects, keys, values)
+		for nativeObject in self._nativeObjects:
+			UserProps(nativeObject).emitChange()
+		return True
+
+	def translate(self, axes, relative=False):
+		position = mxs.point3(*axes)
+		if relative:
+			mxs.move(self._nativeObjects, position)
+			return True
+		return self._setNodesProperty('pos', position)
+
+	def userProps(self):
+		buffers = mxs.cross3dhelper.getNodesUserPropBuffers(self._nativeObjects)
+		return [cross3d.UserProps.parseBuffer(buff) for buff in buffers]
 
 # Registering the symbol.
-cross3d.registerSymbol('Collection', Collection)
\ No newline at end of file
+cross3d.registerSymbol('Collection', Collection)
@@ -80,6 +80,30 @@ class External(AbstractExternal):
 		# TODO: Need to figure out a way to return False if the script has failed.
 		return True
 
+	@classmethod
+	def _pythonScriptCommand(cls, pythonPath, scriptPath, version=None, architecture=64, debug=False):
+		""" Writes a MAXScript file to scriptPath that runs the python file pythonPath and returns
+		the command line that runs it in studiomax.
+		"""
+		scriptTemplate = os.path.join(os.path.dirname(__file__), 'templates', 'external_python_script.mstempl')
+		with open(scriptTemplate) as fle:
+			script = fle.read().format(scriptPath=pythonPath, debug=debug)
+
+		with open(scriptPath, "w") as fle:
+			fle.write(script)
+
+		binary = os.path.join(cls.binariesPath(version, architecture), '3dsmax.exe')
+		return [binary, '-U', 'MAXScript', scriptPath]
+
+	@classmethod
+	def jobCommand(cls, runnerPath, directory, version=None, architecture=64, debug=False, headless=True):
+		return cls._pythonScriptCommand(runnerPath, os.path.join(directory, 'job.ms'), version, architecture, debug)
+
+	@classmethod
+	def workerCommand(cls, version=None, architecture=64, debug=False):
+		scriptPath = os.path.splitext(cls.scriptPath())[0] + '_worker.ms'
+		return cls._pythonScriptCommand(cls.workerScriptPath(), scriptPath, version, architecture, debug)
+
 	@classmethod
 	def _getHkey(cls, version, langId):
 		# Max uses diffrent locations to store its install path
@@ -9,240 +9,429 @@
 #
 
 from Py3dsMax import mxs
+from cross3d.classes.materialrules import MaterialRules
 
-def buildMaterialFrom( material, opacityMap = None, displacementMap = None, bumpMap = None ):
-	"""
-		\remarks	creates a new material using the properties from the inputed material as its base,
-					creating the material with an inputed opacity and displacement map overrides
-		\param		material		<Py3dsMax.mxs.Material>
-		\param		opacityMap		<Py3dsMax.mxs.Map>
-		\param		displacementMap	<Py3dsMax.mxs.Map>
-		\param		bumpMap			<Py3dsMax.mxs.Map>
-		\return		<Py3dsMax.mxs.Material> builtMaterial
-	"""
-	# if there is no opacity of displacement map, then there is no need to modify the inputed material
-	if ( not (opacityMap or displacementMap or bumpMap) ):
-		return material
+# The per class rules used to find the maps of a material and to build override materials.
+rules = MaterialRules(className=lambda material: mxs.classOf(material))
 
-	# store useful methods
-	mcopy 		= mxs.copy
-	class_of	= mxs.classof
-	is_prop		= mxs.isproperty
-	cls 		= class_of( material )
+# Override materials that replace blend materials entirely instead of being applied within them.
+_blendReplacingOverrides = frozenset(['standardmaterial', 'matteshadow', 'blur_matte_mtl'])
+_blendMaterials = frozenset(['vrayblendmtl', 'vrayoverridemtl', 'vraymtlwrapper'])
 
-	#----------------------------------------
+def _displacementTexture( displacementTexture, displacementMap ):
+	"""
+		\remarks	returns the inputed displacement texture, or a new Displacement_3D texture holding the displacement map
+	"""
+	if ( not displacementTexture ):
+		displacementTexture = mxs.Displacement_3D__3dsmax()
+		displacementTexture.map = displacementMap
+	return displacementTexture
 
-	# GK 02/05/10 if texture is nested in a "Displacement 3D" or "Height Map" texture, get the root map
-	# and use it in the material's own displacement slot. (trying to maintain some comaptibility between vray and mental ray here.)
-	# if not nested, we must convert to mr connection displacement and put it there anyway since max's displacement spinner
-	# does not correlate correctly to mental ray displacement amounts.
-	displacementTexture = None
+def _outputTexture( bumpMap, amount ):
+	"""
+		\remarks	wraps the inputed bump map in an Output texture scaling it by the given amount
+	"""
+	bumpTexture = mxs.Output()
+	bumpTexture.map1 = bumpMap
+	bumpTexture.output.bump_amount = amount
+	return bumpTexture
 
-	# extract from a Displacement_3d texture
-	if ( class_of( displacementMap ) == mxs.Displacement_3D__3dsmax ):
-		displacementTexture 	= displacementMap
-		displacementMap 		= displacementMap.map
+def _mentalRayDisplacement( material ):
+	"""
+		\remarks	returns the unlocked mental ray displacement of the inputed material if it has one
+	"""
+	if ( mxs.isproperty( material, 'mental_ray__material_custom_attribute' ) ):
+		mrattr = material.mental_ray__material_custom_attribute
+		if ( mrattr.displacementOn and not mrattr.displacementLocked ):
+			return mrattr.displacement
+	return None
 
-	# extract from a Height_Map texture
-	elif ( class_of( displacementMap ) == mxs.Height_Map_Displacement__3dsmax ):
-		displacementTexture = displacementMap
-		displacementMap 	= displacementMap.heightMap
+#----------------------------------------
+# 	displacement textures
+#----------------------------------------
+
+# GK 02/05/10 if texture is nested in a "Displacement 3D" or "Height Map" texture, get the root map
+# and use it in the material's own displacement slot. (trying to maintain some comaptibility between vray and mental ray here.)
+# if not nested, we must convert to mr connection displacement and put it there anyway since max's displacement spinner
+# does not correlate correctly to mental ray displacement amounts.
+@rules.register( 'displacementSource', 'Displacement_3D__3dsmax' )
+def _displacement3dSource( texture ):
+	return texture.map
+
+@rules.register( 'displacementSource', 'Height_Map_Displacement__3dsmax' )
+def _heightMapSource( texture ):
+	return texture.heightMap
+
+#----------------------------------------
+# 	override builders
+#----------------------------------------
+
+# build a matte shadow reflection material
+@rules.register( 'build', 'Matte_Shadow_Reflection__mi', 'mr_Matte_Shadow_Reflection_Mtl' )
+def _buildMatte( material, opacityMap, displacementMap, bumpMap, displacementTexture ):
+	matteMtl 					= mxs.copy( material )
+	matteMtl.opacity_shader 	= opacityMap
+	output						= mxs.mental_ray()
+	output.surface				= mxs.Material_to_Shader()
+	output.surface.material		= matteMtl
+	output.displacement 		= displacementTexture
+	output.bump					= bumpMap
+	return output
+
+# build a standard material
+@rules.register( 'build', 'StandardMaterial' )
+def _buildStandard( material, opacityMap, displacementMap, bumpMap, displacementTexture ):
+	output = mxs.copy( material )
+
+	# use the opacity map
+	if ( opacityMap ):
+		output.opacityMap = opacityMap
+
+	# use the bump map
+	if ( bumpMap ):
+		output.bumpMap = bumpMap
+		output.bumpMapAmount = 100
+
+	# use the displacement map
+	if ( displacementMap ):
+		output.displacementMap 			= displacementMap
+		output.displacementMapEnable 	= True
+
+		if ( mxs.isproperty( output, 'mental_ray__material_custom_attribute' ) ):
+			output.mental_ray__material_custom_attribute.displacement 		= _displacementTexture( displacementTexture, displacementMap )
+			output.mental_ray__material_custom_attribute.displacementLocked = False
+
+	return output
+
+# build a Vray material
+@rules.register( 'build', 'VrayMtl' )
+def _buildVray( material, opacityMap, displacementMap, bumpMap, displacementTexture ):
+	output = mxs.copy( material )
+
+	# use the bump map
+	if ( bumpMap ):
+		output.texmap_bump					= bumpMap
+		output.texmap_bump_on				= True
+		output.texmap_bump_multiplier		= 100
+
+	# use the opacity map
+	if ( opacityMap ):
+		output.texmap_opacity 				= opacityMap
+		output.texmap_opacity_on 			= True
+		output.texmap_opacity_multiplier	= 100
+
+	# use the displacementmap
+	if ( displacementMap ):
+		output.texmap_displacement 				= displacementMap
+		output.texmap_displacement_on 			= True
+		output.texmap_displacement_multiplier	= 100
+
+	return output
+
+# build a Vray Light material
+@rules.register( 'build', 'VrayLightMtl' )
+def _buildVrayLight( material, opacityMap, displacementMap, bumpMap, displacementTexture ):
+	# light materials only need opacity maps
+	if ( not opacityMap ):
+		return material
 
-	#----------------------------------------
+	output = mxs.copy( material )
+	output.opacity_texmap = opacityMap
+	output.opacity_texmap_on = True
+	return output
+
+# build a Arch_Design material
+@rules.register( 'build', 'Arch___Design__mi' )
+def _buildArchDesign( material, opacityMap, displacementMap, bumpMap, displacementTexture ):
+	output = mxs.copy( material )
+	output.cutout_map = opacityMap
+
+	# displace the texture
+	if ( not displacementTexture ):
+		output.displacementMap = displacementMap
+
+	# use the bump map
+	if ( bumpMap ):
+		output.bump_map 	= bumpMap
+		output.bump_map_amt = 1.0
+
+	# displace the property
+	elif ( mxs.isproperty( material, 'mental_ray__material_custom_attribute' ) ):
+		output.mental_ray__material_custom_attribute.displacement 		= displacementTexture
+		output.mental_ray__material_custom_attribute.displacementLocked	= False
+
+	return output
+
+# build a blend material
+@rules.register( 'build', 'Blend' )
+def _buildBlend( material, opacityMap, displacementMap, bumpMap, displacementTexture ):
+	if ( displacementMap and mxs.isproperty( material, 'mental_ray__material_custom_attribute' ) ):
+		output = mxs.copy( material )
+		output.displace = _displacementTexture( displacementTexture, displacementMap )
+		return output
+	return material
 
-	# build a matte shadow reflection material
-	if ( cls in (mxs.Matte_Shadow_Reflection__mi,mxs.mr_Matte_Shadow_Reflection_Mtl) ):
-		matteMtl 					= mcopy( material )
-		matteMtl.opacity_shader 	= opacityMap
-		output						= mxs.mental_ray()
-		output.surface				= mxs.Material_to_Shader()
-		output.surface.material		= matteMtl
+# build a fast skin shader
+@rules.register( 'build', 'SSS_Fast_Skin_Material_Displace__mi', 'SSS_Fast_Skin___w__Disp___mi' )
+def _buildFastSkin( material, opacityMap, displacementMap, bumpMap, displacementTexture ):
+	if ( displacementMap ):
+		output = mxs.copy( material )
 
-		if ( displacementTexture ):
-			dispTexture 		= mxs.Displacement_3D__3dsmax()
-			dispTexture.map 	= displacementMap
+		# use the bump map
+		if ( bumpMap ):
+			if ( mxs.classof( bumpMap ) != mxs.Bump__3dsmax ):
+				bumpTexture 	= mxs.Bump__3dsmax()
+				bumpTexture.map	= bumpMap
+				output.bump		= bumpTexture
+			else:
+				output.bump = bumpMap
 
-		output.displacement 	= displacementTexture
-		output.bump				= bumpMap
+		# use the displacement texture
+		output.displace = _displacementTexture( displacementTexture, displacementMap )
 		return output
+	return material
 
-	# build a standard material
-	elif ( cls == mxs.StandardMaterial ):
-		output = mcopy( material )
-
-		# use the opacity map
-		if ( opacityMap ):
-			output.opacityMap = opacityMap
+# build a mental_ray shader
+@rules.register( 'build', 'Mental_Ray' )
+def _buildMentalRay( material, opacityMap, displacementMap, bumpMap, displacementTexture ):
+	output = mxs.copy( material )
 
-		# use the bump map
-		if ( bumpMap ):
-			output.bumpMap = bumpMap
-			output.bumpMapAmount = 100
+	# use displacement
+	if ( displacementMap ):
+		output.displacement = _displacementTexture( displacementTexture, displacementMap )
 
-		# use the displacement map
-		if ( displacementMap ):
-			output.displacementMap 			= displacementMap
-			output.displacementMapEnable 	= True
+	# use opacity
+	if ( opacityMap ):
+		opacityMtl = mxs.Opacity__base()
+		opacityMtl.input_shader 	= material.surface
+		opacityMtl.opacity_shader	= opacityMap
+		output.surface				= opacityMtl
 
-			if ( is_prop( output, 'mental_ray__material_custom_attribute' ) ):
-				if ( not displacementTexture ):
-					displacementTexture = mxs.Displacement_3D__3dsmax()
-					displacementTexture.map = displacementMap
+	return output
 
-				output.mental_ray__material_custom_attribute.displacement 		= displacementTexture
-				output.mental_ray__material_custom_attribute.displacementLocked = False
+# build a multi/material
+@rules.register( 'build', 'MultiMaterial' )
+def _buildMultiMaterial( material, opacityMap, displacementMap, bumpMap, displacementTexture ):
+	output 			= mxs.copy( material )
+	count			= material.numsubs
+	output.numsubs 	= count
 
-		return output
+	for i in range(count):
+		output[i] = buildMaterialFrom( material[i], opacityMap = opacityMap, displacementMap = displacementMap, bumpMap = bumpMap )
 
-	# build a Vray material
-	elif ( cls == mxs.VrayMtl ):
-		output = mcopy( material )
+	return output
 
-		# use the bump map
-		if ( bumpMap ):
-			output.texmap_bump					= bumpMap
-			output.texmap_bump_on				= True
-			output.texmap_bump_multiplier		= 100
-
-		# use the opacity map
-		if ( opacityMap ):
-			output.texmap_opacity 				= opacityMap
-			output.texmap_opacity_on 			= True
-			output.texmap_opacity_multiplier	= 100
-
-		# use the displacementmap
-		if ( displacementMap ):
-			output.texmap_displacement 				= displacementMap
-			output.texmap_displacement_on 			= True
-			output.texmap_displacement_multiplier	= 100
+# build any other material from its sub materials
+def _buildDefault( material, opacityMap, displacementMap, bumpMap, displacementTexture ):
+	count = mxs.getNumSubMtls( material )
+	if ( count ):
+		output = mxs.copy( material )
 
-		return output
+		get_submtl = mxs.getSubMtl
+		set_submtl = mxs.setSubMtl
 
-	# build a Vray Light material
-	elif ( cls == mxs.VrayLightMtl ):
-		# light materials only need opacity maps
-		if ( not opacityMap ):
-			return material
+		for i in range( count ):
+			set_submtl( output, i + 1, buildMaterialFrom( get_submtl( material, i + 1 ), opacityMap = opacityMap, displacementMap = displacementMap, bumpMap = bumpMap ) )
 
-		output = mcopy( material )
-		output.opacity_texmap = opacityMap
-		output.opacity_texmap_on = True
 		return output
 
-	# build a Arch_Design material
-	elif ( cls == mxs.Arch___Design__mi ):
-		output = mcopy( material )
-		output.cutout_map = opacityMap
+	return material
 
-		# displace the texture
-		if ( not displacementTexture ):
-			output.displacementMap = displacementMap
+rules.setFallback( 'build', _buildDefault )
 
-		# use the bump map
-		if ( bumpMap ):
-			output.bump_map 	= bumpMap
-			output.bump_map_amt = 1.0
+#----------------------------------------
+# 	bump maps
+#----------------------------------------
 
-		# displace the property
-		elif ( is_prop( material, 'mental_ray__material_custom_attribute' ) ):
-			output.mental_ray__material_custom_attribute.displacement 		= displacementTexture
-			output.mental_ray__material_custom_attribute.displacementLocked	= False
+# return a standard material's bump map
+@rules.register( 'bump', 'StandardMaterial' )
+def _standardBump( material ):
+	if ( material.bumpMapEnable ):
+		bumpmap = material.bumpMap
+		if ( bumpmap and material.bumpMapAmount != 100 ):
+			return _outputTexture( bumpmap, material.bumpMapAmount / 100.0 )
+		return bumpmap
+	return None
 
-		return output
+# return a vray bump map
+@rules.register( 'bump', 'VrayMtl', 'VrayFastSSS2', 'VRaySkinMtl' )
+def _vrayBump( material ):
+	if ( material.texmap_bump_on ):
+		bumpmap = material.texmap_bump
+		if ( bumpmap and material.texmap_bump_multiplier != 100 ):
+			return _outputTexture( bumpmap, material.texmap_bump_multiplier / 100.0 )
+		return bumpmap
+	return None
 
-	# build a blend material
-	elif ( cls == mxs.Blend ):
-		if ( displacementMap and is_prop( 'mental_ray__material_custom_attribute' ) ):
-			output = mcopy( material )
+# return a matte bump
+@rules.register( 'bump', 'Matte_Shadow_Reflection__mi', 'mr_Matte_Shadow_Reflection_Mtl' )
+def _matteBump( material ):
+	return material.bump
+
+# return an arch-design material
+@rules.register( 'bump', 'Arch___Design__mi' )
+def _archDesignBump( material ):
+	if ( material.bump_map_on ):
+		bumpmap = material.bump_map
+		if ( bumpmap and material.bump_map_amt != 1.0 ):
+			return _outputTexture( bumpmap, material.bump_map_amt )
+		return bumpmap
+	return None
 
-			# create a displacement texture
-			if ( not displacementTexture ):
-				displacementTexture = mxs.Displacement_3D__3dsmax()
-				displacementTexutre.map = displacementMap
+# return a skin bump map
+@rules.register( 'bump', 'SSS_Fast_Skin___w__Disp___mi', 'SSS_Fast_Skin___mi', 'SSS_Fast_Skin_Material_Displace__mi', 'SSS_Fast_Skin_Material__mi', 'SSS_Fast_Material__mi' )
+def _skinBump( material ):
+	if ( mxs.classof( material.bump ) == mxs.Bump__3dsmax ):
+		bumpmap = material.bump.map
+		if ( bumpmap ):
+			return _outputTexture( bumpmap, material.bump.multiplier )
+		return None
+	return material.bump
+
+#----------------------------------------
+# 	displacement maps
+#----------------------------------------
+
+# return a standard material's displacement map
+@rules.register( 'displacement', 'StandardMaterial' )
+def _standardDisplacement( material ):
+	if ( material.displacementMap and material.displacementMapEnable ):
+		return material.displacementMap
+	return _mentalRayDisplacement( material )
+
+# return a vray material's displacement map
+@rules.register( 'displacement', 'VrayMtl', 'VRayFastSSS2', 'VRaySkinMtl' )
+def _vrayDisplacement( material ):
+	if material.texmap_displacement_on:
+		return material.texmap_displacement
+	return None
 
-			output.displace = displacementTexture
-			return output
-		return material
+# return an arch design's material
+@rules.register( 'displacement', 'Arch___Design__mi' )
+def _archDesignDisplacement( material ):
+	# first check for mental ray properties
+	outMap = _mentalRayDisplacement( material )
+
+	# create a custom output material to match the output amount
+	if ( not outMap and material.displacementMap and material.displacement_map_on ):
+		if ( material.displacement_map_amt ):
+			outMap 						= mxs.Output()
+			outMap.map1 				= material.displacementMap
+			outMap.map1Enabled 			= True
+			outMap.output.Output_Amount = material.displacement_map_amt
+		else:
+			outMap = material.displacementMap
 
-	# build a fast skin shader
-	elif ( cls in (mxs.SSS_Fast_Skin_Material_Displace__mi,mxs.SSS_Fast_Skin___w__Disp___mi) ):
-		if ( displacementMap ):
-			output = mcopy( material )
-
-			# use the bump map
-			if ( bumpMap ):
-				if ( mxs.classof( bumpMap != mxs.Bump__3dsmax ) ):
-					bumpTexture 	= mxs.Bump__3dsmax
-					bumpTexture.map	= bumpMap
-					output.bump		= bumpTexture
-				else:
-					output.bump = bumpMap
+	return outMap
 
-			# use the displacement texture
-			if ( not displacementTexture ):
-				displacementTexture = mxs.Displacement_3D__3dsmax()
-				displacementTexture.map = displacementMap
+# return a blend's displacement
+@rules.register( 'displacement', 'Blend' )
+def _blendDisplacement( material ):
+	return _mentalRayDisplacement( material )
 
-			output.displace = displacementTexture
+# return skin shader displacements
+@rules.register( 'displacement', 'SSS_Fast_Skin_Material_Displace__mi', 'SSS_Fast_Skin___w__Disp___mi' )
+def _skinDisplacement( material ):
+	return material.displace
 
-			return output
-		return material
+# return a mental ray displacement
+@rules.register( 'displacement', 'Mental_Ray' )
+def _mentalRayShaderDisplacement( material ):
+	if material.displaceOn:
+		return material.displacement
+	return None
 
-	# build a mental_ray shader
-	elif ( cls == mxs.Mental_Ray ):
-		output = mcopy( material )
+#----------------------------------------
+# 	opacity maps
+#----------------------------------------
 
-		# use displacement
-		if ( displacementMap ):
-			if ( not displacementTexture ):
-				displacementTexture = mxs.Displacement_3D__3dsmax()
-				displacementTexture.map = displacementMap
-			output.displacement = displacementTexture
+# return a standard material's opacity map
+@rules.register( 'opacity', 'StandardMaterial' )
+def _standardOpacity( material ):
+	if material.opacityMapEnable:
+		return material.opacityMap
+	return None
 
-		# use opacity
-		if ( opacityMap ):
-			opacityMtl = mxs.Opacity__base()
-			opacityMtl.input_shader 	= material.surface
-			opacityMtl.opacity_shader	= opacityMap
-			output.surface				= opacityMtl
+# return a vray material's opacity map
+@rules.register( 'opacity', 'VrayMtl', 'VRaySkinMtl' )
+def _vrayOpacity( material ):
+	if material.texmap_opacity_on:
+		return material.texmap_opacity
+	return None
 
-		return output
+# return a vray light material's opacity map
+@rules.register( 'opacity', 'VrayLightMtl' )
+def _vrayLightOpacity( material ):
+	if material.opacity_texmap_on:
+		return material.opacity_texmap
+	return None
 
-	# build a multi/material
-	elif ( cls == mxs.MultiMaterial ):
-		output 			= mcopy( material )
-		count			= material.numsubs
-		output.numsubs 	= count
+# return a matte's opactiy map
+@rules.register( 'opacity', 'Matte_Shadow_Reflection__mi', 'mr_Matte_Shadow_Reflection_Mtl' )
+def _matteOpacity( material ):
+	if material.opacity_connected:
+		return material.opacity_shader
+	return None
 
-		for i in range(count):
-			output[i] = buildMaterialFrom( material[i], opacityMap = opacityMap, displacementMap = displacementMap, bumpMap = bumpMap )
+# return an arch design's opacity map
+@rules.register( 'opacity', 'Arch___Design__mi' )
+def _archDesignOpacity( material ):
+	if material.cutoutmap_on:
+		return material.cutout_map
+	return None
 
-		return output
+#----------------------------------------
 
-	# create a default material
-	else:
-		count = mxs.getNumSubMtls( material )
-		if ( count ):
-			output = mcopy( material )
+def buildMaterialFrom( material, opacityMap = None, displacementMap = None, bumpMap = None ):
+	"""
+		\remarks	creates a new material using the properties from the inputed material as its base,
+					creating the material with an inputed opacity and displacement map overrides
+		\param		material		<Py3dsMax.mxs.Material>
+		\param		opacityMap		<Py3dsMax.mxs.Map>
+		\param		displacementMap	<Py3dsMax.mxs.Map>
+		\param		bumpMap			<Py3dsMax.mxs.Map>
+		\return		<Py3dsMax.mxs.Material> builtMaterial
+	"""
+	# if there is no opacity of displacement map, then there is no need to modify the inputed material
+	if ( not (opacityMap or displacementMap or bumpMap) ):
+		return material
 
-			get_submtl = mxs.getSubMtl
-			set_submtl = mxs.setSubMtl
+	# extract the root map from a displacement texture
+	displacementTexture = None
+	sourceMap = rules.apply( 'displacementSource', displacementMap )
+	if ( sourceMap is not None ):
+		displacementTexture = displacementMap
+		displacementMap 	= sourceMap
 
-			for i in range( output ):
-				set_submtl( output, i + 1, buildMaterialFrom( get_submtl( material, i + 1 ), opacityMap = opacityMap, displacementMap = displacementMap, bumpMap = bumpMap ) )
+	return rules.apply( 'build', material, opacityMap, displacementMap, bumpMap, displacementTexture, default = material )
 
-			return output
+def _advancedStateKey( advancedState ):
+	"""
+		\remarks	returns a hashable key for the inputed advanced state, used to memoize the overrides built with it
+	"""
+	if ( not advancedState ):
+		return ()
 
-	return material
+	unique_id = mxs.blurUtil.uniqueId
+	key = []
+	for baseMaterialId, (overrideSceneMaterial, ignoreOverride) in advancedState.items():
+		overrideId = unique_id( overrideSceneMaterial.nativePointer() ) if overrideSceneMaterial else None
+		key.append( (baseMaterialId, overrideId, bool(ignoreOverride)) )
+	return tuple( sorted( key ) )
 
-def createMaterialOverride( baseMaterial, overrideMaterial, options = None, advancedState = None ):
+def createMaterialOverride( baseMaterial, overrideMaterial, options = None, advancedState = None, cache = None ):
 	"""
 		\remarks	generate a proper override material based on the inputed base material by preserving aspects of the
-					base material based on the supplied options, while joining the main shader aspects of the override material
+					base material based on the supplied options, while joining the main shader aspects of the override material.
+					When a cache is supplied, the overrides already built for the same base material, override material,
+					options and advanced state are reused instead of being built again, this includes the overrides of sub materials.
+					The cache has to be cleared when the base or override materials are edited, StudiomaxScene clears its cache
+					when the scene is invalidated and on undo.
 		\param		baseMaterial		<Py3dsMax.mxs.Material>
 		\param		overrideMaterial	<Py3dsMax.mxs.Material>
 		\param		options				<cross3d.constants.MaterialOverrideOptions>
-		\param		advancedState	<dict> { <int> baseMaterialId: ( <blur3d.gui.SceneMaterial> override, <bool> ignored ) }
+		\param		advancedState		<dict> { <int> baseMaterialId: ( <blur3d.gui.SceneMaterial> override, <bool> ignored ) }
+		\param		cache				<cross3d.classes.materialrules.OverrideCache> || None
 	"""
 	from cross3d.constants import MaterialOverrideOptions
 
@@ -250,6 +439,10 @@ def createMaterialOverride( baseMaterial, overrideMaterial, options = None, adva
 	if ( options == None ):
 		options = MaterialOverrideOptions.All
 
+	stateKey = _advancedStateKey( advancedState ) if cache is not None else None
+	return _createMaterialOverride( baseMaterial, overrideMaterial, options, advancedState, cache, stateKey )
+
+def _createMaterialOverride( baseMaterial, overrideMaterial, options, advancedState, cache, stateKey ):
 	# make sure we have at least some overriding options or a base material to work from
 	if ( not (options or advancedState) ):
 		return overrideMaterial
@@ -258,6 +451,21 @@ def createMaterialOverride( baseMaterial, overrideMaterial, options = None, adva
 	if ( not (overrideMaterial and baseMaterial) ):
 		return overrideMaterial
 
+	unique_id = mxs.blurUtil.uniqueId
+
+	# reuse the override built from the same materials
+	if ( cache is not None ):
+		key = ( unique_id( baseMaterial ), unique_id( overrideMaterial ), int( options ), stateKey )
+		outputMaterial = cache.get( key )
+		if ( outputMaterial is None ):
+			outputMaterial = cache.add( key, _buildMaterialOverride( baseMaterial, overrideMaterial, options, advancedState, cache, stateKey ) )
+		return outputMaterial
+
+	return _buildMaterialOverride( baseMaterial, overrideMaterial, options, advancedState, cache, stateKey )
+
+def _buildMaterialOverride( baseMaterial, overrideMaterial, options, advancedState, cache, stateKey ):
+	from cross3d.constants import MaterialOverrideOptions
+
 	# store maxscript values that we use more than once (faster)
 	is_kindof 		= mxs.isKindOf
 	multi_material	= mxs.MultiMaterial
@@ -268,7 +476,7 @@ def createMaterialOverride( baseMaterial, overrideMaterial, options = None, adva
 
 	# process XRef materials
 	if ( is_kindof( baseMaterial, mxs.XRef_Material ) ):
-		return createMaterialOverride( (baseMaterial.getSourceMaterial(True)), overrideMaterial, options, advancedState )
+		return _createMaterialOverride( (baseMaterial.getSourceMaterial(True)), overrideMaterial, options, advancedState, cache, stateKey )
 
 	# process Multi/Sub Materials
 	elif ( is_kindof( baseMaterial, multi_material ) ):
@@ -279,7 +487,7 @@ def createMaterialOverride( baseMaterial, overrideMaterial, options = None, adva
 		for i in range( count ):
 			# determine the actual overriding material based on if the override material is a multi/sub or not
 			if ( is_kindof( overrideMaterial, multi_material ) ):
-				replaceMaterial = multi_material[i]
+				replaceMaterial = overrideMaterial[i]
 			else:
 				replaceMaterial = overrideMaterial
 			subMaterial 	= baseMaterial[i]
@@ -288,7 +496,7 @@ def createMaterialOverride( baseMaterial, overrideMaterial, options = None, adva
 			if ( class_of( subMaterial ) == mxs.Mental_Ray and not subMaterial.surface ):
 				outputMaterial[i] = subMaterial
 			else:
-				outputMaterial[i] = createMaterialOverride( subMaterial, replaceMaterial, options = options, advancedState = advancedState )
+				outputMaterial[i] = _createMaterialOverride( subMaterial, replaceMaterial, options, advancedState, cache, stateKey )
 
 		return outputMaterial
 
@@ -297,9 +505,9 @@ def createMaterialOverride( baseMaterial, overrideMaterial, options = None, adva
 	# however because we are now using VrayBlendMtls which are unsupported by renderers other than Vray, this method can create a situation where you're trying to render
 	# a scanline alt material with scanline, but it is nested within a VrayBlendMtl so it renders incorrectly. also, VrayBlendMtls do not support standard materials anyway
 	# so even rendering with Vray will not behave correctly.  below is code to handle this situation:
-	elif ( class_of( overrideMaterial ) in (mxs.StandardMaterial,mxs.MatteShadow,mxs.Blur_Matte_mtl) ):
-		if ( class_of( baseMaterial ) in (mxs.VrayBlendMtl,mxs.VrayOverrideMtl,mxs.VrayMtlWrapper) ):
-			return createMaterialOverride( get_submtl( baseMaterial, 1 ), overrideMaterial, options = options, advancedState = advancedState )
+	elif ( rules.className( overrideMaterial ).lower() in _blendReplacingOverrides ):
+		if ( rules.className( baseMaterial ).lower() in _blendMaterials ):
+			return _createMaterialOverride( get_submtl( baseMaterial, 1 ), overrideMaterial, options, advancedState, cache, stateKey )
 
 	# process any non-multi/sub multi-materials
 	elif ( get_numsubmtls( baseMaterial ) ):
@@ -308,7 +516,7 @@ def createMaterialOverride( baseMaterial, overrideMaterial, options = None, adva
 		count = get_numsubmtls( baseMaterial )
 		for i in range( count ):
 			if ( is_kindof( overrideMaterial, multi_material ) ):
-				replaceMaterial = multi_material[i]
+				replaceMaterial = overrideMaterial[i]
 			else:
 				replaceMaterial = overrideMaterial
 			subMaterial		= get_submtl( baseMaterial, i + 1 )
@@ -317,7 +525,7 @@ def createMaterialOverride( baseMaterial, overrideMaterial, options = None, adva
 				if ( class_of( subMaterial ) == mxs.Mental_Ray and not subMaterial.surface ):
 					set_submtl( outputMaterial, i+1, subMaterial )
 				else:
-					set_submtl( outputMaterial, i+1, createMaterialOverride( subMaterial, replaceMaterial, options = options, advancedState = advancedState ) )
+					set_submtl( outputMaterial, i+1, _createMaterialOverride( subMaterial, replaceMaterial, options, advancedState, cache, stateKey ) )
 
 		return outputMaterial
 
@@ -357,64 +565,7 @@ def findBumpMap( material ):
 		\param		material	<Py3dsMax.mxs.Material>
 		\return		<Py3dsMax.mxs.Map> opacityMap || None
 	"""
-	cls = mxs.classof( material )
-
-	# return a standard material's bump map
-	if ( cls == mxs.StandardMaterial ):
-		if ( material.bumpMapEnable ):
-			bumpmap = material.bumpMap
-			if ( bumpmap and material.bumpMapAmount != 100 ):
-				bumpTexture = mxs.Output()
-				bumpTexture.map1 = bumpmap
-				bumpTexture.output.bump_amount = ( material.bumpMapAmount / 100.0 )
-				return bumpTexture
-			return bumpmap
-		return None
-
-	# return a vray bump map
-	if ( cls in (mxs.VrayMtl,mxs.VrayFastSSS2, mxs.VRaySkinMtl) ):
-		if ( material.texmap_bump_on ):
-			bumpmap = material.texmap_bump
-			if ( bumpmap and material.texmap_bump_multiplier != 100 ):
-				bumpTexture = mxs.Output()
-				bumpTexture.map1 = bumpmap
-				bumpTexture.output.bump_amount = ( material.texmap_bump_multiplier / 100.0 )
-				return bumpTexture
-			return bumpmap
-		return None
-
-	# return a matte bump
-	if ( cls in (mxs.Matte_Shadow_Reflection__mi,mxs.mr_Matte_Shadow_Reflection_Mtl) ):
-		return material.bump
-
-	# return an arch-design material
-	if ( cls == mxs.Arch___Design__mi ):
-		if ( material.bump_map_on ):
-			bumpmap = material.bump_map
-			if ( bumpmap and material.bump_map_amt != 1.0 ):
-				bumpTexture = mxs.Output()
-				bumpTexture.map1 = bumpmap
-				bumpTexture.output.bump_amount = mtl.bump_map_amt
-				return bumpTexture
-			return bumpmap
-		return None
-
-	# return a skin bump map
-	if ( cls in (mxs.SSS_Fast_Skin___w__Disp___mi,mxs.SSS_Fast_Skin___mi,mxs.SSS_Fast_Skin_Material_Displace__mi,mxs.SSS_Fast_Skin_Material__mi,mxs.SSS_Fast_Material__mi) ):
-		if ( mxs.classof(material.bump) == mxs.Bump__3dsmax ):
-			bumpmap = material.bump.map
-			if ( bumpmap ):
-				bumpTexture = mxs.Output()
-				bumpTexture.map1 = bumpmap
-				bumpTexture.output.bump_amount = material.bump.multiplier
-				return bumpTexture
-			return None
-
-		else:
-			return material.bump
-
-	# no bump map found
-	return None
+	return rules.apply( 'bump', material )
 
 def findDisplacementMap( material ):
 	"""
@@ -422,69 +573,7 @@ def findDisplacementMap( material ):
 		\param		material	<Py3dsMax.mxs.Material>
 		\return		<Py3dsMax.mxs.Map> opacityMap || None
 	"""
-	cls = mxs.classof( material )
-
-	is_prop = mxs.isproperty
-
-	# return a standard material's displacement map
-	if ( cls == mxs.StandardMaterial ):
-		if ( material.displacementMap and material.displacementMapEnable ):
-			return material.displacementMap
-		elif ( is_prop( material, 'mental_ray__material_custom_attribute' ) ):
-			mrattr = material.mental_ray__material_custom_attribute
-			if ( mrattr.displacementOn and not mrattr.displacementLocked ):
-				return mrattr.displacement
-		return None
-
-	# return a vray material's displacement map
-	elif ( cls in (mxs.VrayMtl, mxs.VRayFastSSS2, mxs.VRaySkinMtl) ):
-		if material.texmap_displacement_on:
-			return material.texmap_displacement
-		else:
-			return None
-
-	# return an arch design's material
-	elif ( cls == mxs.Arch___Design__mi ):
-		outMap = None
-
-		# first check for mental ray properties
-		if ( is_prop( material, 'mental_ray__material_custom_attribute' ) ):
-			mrattr = material.mental_ray__material_custom_attribute
-			if ( mrattr.displacementOn and not mrattr.displacementLocked ):
-				outMap = mrattr.displacement
-			else:
-				outMap = None
-
-		# create a custom output material to match the output amount
-		if ( not outMap and material.displacementMap and material.displacement_map_on ):
-			if ( material.displacement_map_amt ):
-				outMap 						= mxs.Output()
-				outMap.map1 				= mtl.displacementMap
-				outMap.map1Enabled 			= True
-				outMap.output.Output_Amount = material.displacement_map_amt
-			else:
-				outMap = material.displacementMap
-
-		return outMap
-
-	# return a blend's displacement
-	elif ( cls == mxs.Blend ):
-		if ( is_prop( material, 'mental_ray__material_custom_attribute' ) ):
-			mrattr = material.mental_ray__material_custom_attribute
-			if ( mrattr.displacementOn and not mrattr.displacementLocked ):
-				return mrattr.displacement
-		return None
-
-	# return skin shader displacements
-	elif ( cls in (mxs.SSS_Fast_Skin_Material_Displace__mi,mxs.SSS_Fast_Skin___w__Disp___mi) ):
-		return material.displace
-
-	# return a mental ray displacement
-	elif ( cls == mxs.mental_ray ):
-		if material.displaceOn:
-			return material.displacement
-
-	return None
+	return rules.apply( 'displacement', material )
 
 def findOpacityMap( material ):
 	"""
@@ -492,31 +581,4 @@ def findOpacityMap( material ):
 		\param		material	<Py3dsMax.mxs.Material>
 		\return		<Py3dsMax.mxs.Map> opacityMap || None
 	"""
-	cls = mxs.classof( material )
-
-	# return a standard material's opacity map
-	if ( cls == mxs.StandardMaterial ):
-		if material.opacityMapEnable:
-			return material.opacityMap
-
-	# return a vray material's opacity map
-	elif ( cls in (mxs.VrayMtl, mxs.VRaySkinMtl)):
-		if material.texmap_opacity_on:
-			return material.texmap_opacity
-
-	# return a vray light material's opacity map
-	elif ( cls == mxs.VrayLightMtl ):
-		if material.opacity_texmap_on:
-			return material.opacity_texmap
-
-	# return a matte's opactiy map
-	elif ( cls in (mxs.Matte_Shadow_Reflection_mi,mxs.mr_Matte_Shadow_Reflection_Mtl) ):
-		if material.opacity_connected:
-			return material.opacity_shader
-
-	# return an arch design's opacity map
-	elif ( cls == mxs.Arch___Design__mi ):
-		if material.cutoutmap_on:
-			return material.cutout_map
-
-	return None
+	return rules.apply( 'opacity', material )
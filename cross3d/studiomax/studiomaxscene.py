@@ -21,6 +21,7 @@ import cross3d
 from Py3dsMax import mxs
 from PyQt4.QtCore import QTimer
 from cross3d import UserProps, application, FrameRange, constants
+from cross3d.classes import CacheIndex, ObjectQuery
 from cross3d.abstract.abstractscene import AbstractScene
 from cross3d.constants import UpVector, ExtrapolationType, RendererType
 
@@ -158,6 +159,12 @@ class StudiomaxScene(AbstractScene):
 	_fbxIOPresetModifiedTime = 0
 	_orignalFBXPresets = {}
 
+	# The native collections holding every object of a type, a type predicate only visits them.
+	_objectTypeCollections = {constants.ObjectType.Camera: 'cameras',
+							constants.ObjectType.Light: 'lights',
+							constants.ObjectType.Geometry: 'geometry',
+							constants.ObjectType.Model: 'helpers'}
+
 	def __init__(self):
 		AbstractScene.__init__(self)
 
@@ -166,10 +173,132 @@ class StudiomaxScene(AbstractScene):
 		self._mapCache = None
 		self._connectDefined = False
 
+		# indexes of the cached materials and maps, keyed by (isMap, cacheType)
+		self._cacheIndexes = {}
+		self._cacheIndexData = None
+
+		# whether the caches of the scene state are dropped when the scene is invalidated
+		self._sceneCachesConnected = False
+
+		# override materials already built, keyed by the base and override materials they were built from
+		self._overrideCache = None
+
+		# base and current property set values of the objects with a property set override
+		self._propSetPlanner = None
+
+		# the layer metadata attributes of the root node by layer id and name
+		self._layerIndex = None
+		self._layerIndexConnected = False
+
 	#------------------------------------------------------------------------------------------------------------------------
 	# 												protected methods
 	#------------------------------------------------------------------------------------------------------------------------
 
+	def _cacheIndex(self, cacheType, isMap=False):
+		"""
+			\remarks	returns the CacheIndex of the cached materials or maps for the inputed cache type, it is built from the scene metadata on first use
+						and invalidated when the scene is invalidated, on undo and when the metadata could not be written
+			\param		cacheType	<cross3d.constants.MaterialCacheType> || <cross3d.constants.MapCacheType>
+			\param		isMap		<bool>
+			\return		<cross3d.classes.CacheIndex> || None
+		"""
+		from cross3d.constants import MaterialCacheType, MapCacheType
+
+		self._connectSceneCaches()
+
+		data = self.metaData()
+		key = (isMap, cacheType)
+		index = self._cacheIndexes.get(key)
+
+		# rebuild the indexes when the scene metadata was replaced
+		if (index is not None and self._cacheIndexData is data):
+			return index
+		if (self._cacheIndexData is not data):
+			self._cacheIndexes = {}
+			self._cacheIndexData = data
+
+		if (isMap and cacheType == MapCacheType.EnvironmentMap):
+			items = data.environmentMapsCache().value('environmentMaps')
+		elif (not isMap and cacheType == MaterialCacheType.MaterialOverrideList):
+			items = data.value('materialLibraryList')
+		elif (not isMap and cacheType == MaterialCacheType.BaseMaterial):
+			items = data.value('baseMaterialCache')
+		else:
+			return None
+
+		index = CacheIndex(items or [], uniqueId=mxs.blurUtil.uniqueId, name=lambda item: item.name)
+		self._cacheIndexes[key] = index
+		return index
+
+	def _materialOverrideCache(self):
+		"""
+			\remarks	returns the cache the built override materials are memoized in. Its entries are keyed by the base and override materials
+						they were built from, so switching between overrides, like switching render layers, reuses them. The copies do not
+						follow the edits of those materials, the cache is cleared when the scene is invalidated and on undo
+			\return		<cross3d.classes.materialrules.OverrideCache>
+		"""
+		if (self._overrideCache is None):
+			from cross3d.classes.materialrules import OverrideCache
+			self._overrideCache = OverrideCache()
+			self._connectSceneCaches()
+		return self._overrideCache
+
+	def _flushCacheIndexes(self):
+		"""
+			\remarks	writes the cache indexes that were added to back to the scene metadata, with one write per cache type
+			\return		<bool> changed
+		"""
+		from cross3d.constants import MaterialCacheType, MapCacheType
+
+		changed = False
+		try:
+			for key, index in self._cacheIndexes.items():
+				if (not index.isDirty()):
+					continue
+
+				isMap, cacheType = key
+				written = False
+				if (isMap and cacheType == MapCacheType.EnvironmentMap):
+					written = self.metaData().environmentMapsCache().setValue('environmentMaps', index.items())
+				elif (not isMap and cacheType == MaterialCacheType.MaterialOverrideList):
+					written = self.metaData().setValue('materialLibraryList', index.items())
+				elif (not isMap and cacheType == MaterialCacheType.BaseMaterial):
+					written = self.metaData().setValue('baseMaterialCache', index.items())
+
+				# the index no longer matches the metadata when it was not written, it is read again on next use
+				if (not written):
+					self._cacheIndexes.pop(key, None)
+					continue
+				index.setDirty(False)
+				changed = True
+		except:
+			self._invalidateCacheIndexes()
+			raise
+		return changed
+
+	def _invalidateCacheIndexes(self, *args):
+		self._cacheIndexes = {}
+		self._cacheIndexData = None
+
+	def _connectSceneCaches(self):
+		"""
+			\remarks	connects the invalidation of the caches of the scene state to the sceneInvalidated signal, once
+		"""
+		if (not self._sceneCachesConnected):
+			cross3d.dispatch.connect('sceneInvalidated', self._invalidateSceneCaches)
+			self._sceneCachesConnected = True
+
+	def _invalidateSceneCaches(self, *args):
+		"""
+			\remarks	drops the caches built from the scene state, the cache indexes, the override materials and the property set values last written.
+						It is called when the scene is invalidated and on undo, which both change the scene behind the caches
+		"""
+		self._invalidateCacheIndexes()
+		if (self._overrideCache is not None):
+			self._overrideCache.clear()
+		if (self._propSetPlanner is not None):
+			self._propSetPlanner.clear()
+
 	def _cacheNativeMaterial(self, cacheType, nativeMaterial):
 		"""
 			\remarks	implements the AbstractScene._cacheNativeMaterial method to cache the inputed material in the scene
@@ -177,20 +306,26 @@ class StudiomaxScene(AbstractScene):
 			\param		nativeMaterial	<Py3dsMax.mxs.Material>
 			\return		<bool> changed
 		"""
-		from cross3d.constants import MaterialCacheType
+		return self._cacheNativeMaterials(cacheType, [nativeMaterial])
 
-		# cache alternate materials
-		if (cacheType == MaterialCacheType.BaseMaterial):
-			data = self.metaData()
-			cache = list(data.value('baseMaterialCache', []))
+	def _cacheNativeMaterials(self, cacheType, nativeMaterials):
+		"""
+			\remarks	implements the AbstractScene._cacheNativeMaterials method to cache the inputed materials in the scene with a single metadata write
+			\param		cacheType		<cross3d.constants.MaterialCacheType>
+			\param		nativeMaterials	<list> [ <Py3dsMax.mxs.Material> nativeMaterial, .. ]
+			\return		<bool> changed
+		"""
+		from cross3d.constants import MaterialCacheType
 
-			# record the scene data
-			if (nativeMaterial and not nativeMaterial in cache):
-				cache.append(nativeMaterial)
-				data.setValue('baseMaterialCache', cache)
-				return True
+		# only alternate materials are cached one by one
+		if (cacheType != MaterialCacheType.BaseMaterial):
+			return False
 
-		return False
+		index = self._cacheIndex(cacheType)
+		for nativeMaterial in nativeMaterials:
+			if (nativeMaterial):
+				index.add(nativeMaterial)
+		return self._flushCacheIndexes()
 
 	def _cachedNativeMaterial(self, cacheType, materialId, default=None):
 		"""
@@ -200,19 +335,23 @@ class StudiomaxScene(AbstractScene):
 			\param		default			<variant>	value to return if the id was not found
 			\return		<Py3dsMax.mxs.Material> nativeMaterial
 		"""
-		unique_id = mxs.blurUtil.uniqueId
-		cache = self._cachedNativeMaterials(cacheType)
-
-		for mtl in cache:
-			if (mtl == None):
-				continue
-
-			uid = str(unique_id(mtl))
-			unm = str(mtl.name)
+		index = self._cacheIndex(cacheType)
+		if (index is None):
+			return default
+		return index.find(materialId, default=default)
 
-			if (materialId == uid or materialId == unm):
-				return mtl
-		return None
+	def _cachedNativeMaterialsForIds(self, cacheType, materialIds, default=None):
+		"""
+			\remarks	implements the AbstractScene._cachedNativeMaterialsForIds method to return the cached materials for the inputed material ids
+			\param		cacheType		<cross3d.constants.MaterialCacheType>
+			\param		materialIds		<list> [ <str> materialId, .. ]
+			\param		default			<variant>	value returned for the ids that were not found
+			\return		<list> [ <Py3dsMax.mxs.Material> nativeMaterial, .. ]
+		"""
+		index = self._cacheIndex(cacheType)
+		if (index is None):
+			return [default for materialId in materialIds]
+		return index.findAll(materialIds, default=default)
 
 	def _cachedNativeMaterials(self, cacheType):
 		"""
@@ -220,17 +359,10 @@ class StudiomaxScene(AbstractScene):
 			\param		cacheType	<cross3d.constants.MaterialCacheType>
 			\return		<list> [ <Py3dsMax.mxs.Material> nativeMaterial, .. ]
 		"""
-		from cross3d.constants import MaterialCacheType
-
-		# return override material list
-		if (cacheType == MaterialCacheType.MaterialOverrideList):
-			return self.metaData().value('materialLibraryList')
-
-		# return alternate material cache
-		if (cacheType == MaterialCacheType.BaseMaterial):
-			return self.metaData().value('baseMaterialCache')
-
-		return []
+		index = self._cacheIndex(cacheType)
+		if (index is None):
+			return []
+		return index.items()
 
 	def _cacheNativeMap(self, cacheType, nativeMap):
 		"""
@@ -239,16 +371,23 @@ class StudiomaxScene(AbstractScene):
 			\param		nativeMap	<Py3dsMax.mxs.TextureMap>
 			\return		<bool> changed
 		"""
-		from cross3d.constants import MapCacheType
+		return self._cacheNativeMaps(cacheType, [nativeMap])
 
-		# return alternate environment map caches
-		if (cacheType == MapCacheType.EnvironmentMap):
-			data = self.metaData().environmentMapsCache()
-			maps = list(data.value('environmentMaps'))
-			maps.append(nativeMap)
-			data.setValue('environmentMaps', maps)
+	def _cacheNativeMaps(self, cacheType, nativeMaps):
+		"""
+			\remarks	implements the AbstractScene._cacheNativeMaps method to cache the inputed maps in the scene with a single metadata write
+			\param		cacheType	<cross3d.constants.MapCacheType>
+			\param		nativeMaps	<list> [ <Py3dsMax.mxs.TextureMap> nativeMap, .. ]
+			\return		<bool> changed
+		"""
+		index = self._cacheIndex(cacheType, isMap=True)
+		if (index is None):
+			return False
 
-		return False
+		for nativeMap in nativeMaps:
+			if (nativeMap):
+				index.add(nativeMap)
+		return self._flushCacheIndexes()
 
 	def _cachedNativeMap(self, cacheType, uniqueId, default=None):
 		"""
@@ -258,19 +397,23 @@ class StudiomaxScene(AbstractScene):
 			\param		default			<variant>	value to return if the id was not found
 			\return		<Py3dsMax.mxs.TextureMap> nativeMap
 		"""
-		unique_id = mxs.blurUtil.uniqueId
-		cache = self._cachedNativeMaps(cacheType)
-
-		for nativeMap in cache:
-			if (nativeMap == None):
-				continue
-
-			uid = str(unique_id(nativeMap))
-			unm = str(nativeMap.name)
+		index = self._cacheIndex(cacheType, isMap=True)
+		if (index is None):
+			return default
+		return index.find(uniqueId, default=default)
 
-			if (uniqueId == uid or uniqueId == unm):
-				return nativeMap
-		return None
+	def _cachedNativeMapsForIds(self, cacheType, uniqueIds, default=None):
+		"""
+			\remarks	implements the AbstractScene._cachedNativeMapsForIds method to return the cached maps for the inputed map ids
+			\param		cacheType		<cross3d.constants.MapCacheType>
+			\param		uniqueIds		<list> [ <str> uniqueId, .. ]
+			\param		default			<variant>	value returned for the ids that were not found
+			\return		<list> [ <Py3dsMax.mxs.TextureMap> nativeMap, .. ]
+		"""
+		index = self._cacheIndex(cacheType, isMap=True)
+		if (index is None):
+			return [default for uniqueId in uniqueIds]
+		return index.findAll(uniqueIds, default=default)
 
 	def _cachedNativeMaps(self, cacheType):
 		"""
@@ -278,14 +421,10 @@ class StudiomaxScene(AbstractScene):
 			\param		cacheType		<cross3d.constants.MapCacheType>
 			\return		<list> [ <Py3dsMax.mxs.TextureMap> nativeMap, .. ]
 		"""
-		from cross3d.constants import MapCacheType
-
-		# return alternate environment map caches
-		if (cacheType == MapCacheType.EnvironmentMap):
-			data = self.metaData().environmentMapsCache()
-			return data.value('environmentMaps')
-
-		return []
+		index = self._cacheIndex(cacheType, isMap=True)
+		if (index is None):
+			return []
+		return index.items()
 
 	def _clearNativeMaterialOverride(self, nativeObjects):
 		"""
@@ -303,6 +442,7 @@ class StudiomaxScene(AbstractScene):
 		del_appdata = mxs.deleteAppData
 		superclassof = mxs.superClassOf
 		geoclass = mxs.GeometryClass
+		overridden = []
 
 		for obj in nativeObjects:
 			# ignore non-geometric objects
@@ -318,56 +458,160 @@ class StudiomaxScene(AbstractScene):
 
 			# record the base material if it is not already recorded
 			if (mid and mid != 'undefined'):
-				# clear the cache data
-				del_appdata(obj, int(StudiomaxAppData.AltMtlIndex))
-				set_userprop(obj, 'basematerial', 'undefined')
+				overridden.append((obj, mid))
 
-				# restore the original material
-				if (mid == '0'):
-					obj.material = None
-				else:
-					obj.material = self._cachedNativeMaterial(MaterialCacheType.BaseMaterial, mid)
+		# look all the base materials up at once
+		mids = [baseId for node, baseId in overridden if baseId != '0']
+		baseMaterials = dict(zip(mids, self._cachedNativeMaterialsForIds(MaterialCacheType.BaseMaterial, mids)))
+
+		for obj, mid in overridden:
+			# clear the cache data
+			del_appdata(obj, int(StudiomaxAppData.AltMtlIndex))
+			set_userprop(obj, 'basematerial', 'undefined')
+
+			# restore the original material
+			obj.material = baseMaterials.get(mid)
 
 		return True
 
-	def _clearNativePropSetOverride(self, nativeObjects):
+	def _layerMetaDataIndex(self, rebuild=False):
 		"""
-			\remarks	implements the AbstractScene._clearNativePropSetOverride method to clear the inputed objects of any overriding property set information
-			\param		nativeObjects		<list> [ <Py3dsMax.mxs.Object> nativeObject, .. ]
+			\remarks	returns the index of the layer metadata attributes of the root node, it is built in a single pass on first use and
+						invalidated when layers are created, deleted or modified
+			\param		rebuild		<bool>	read the attributes again even if the index is valid
+			\return		<cross3d.studiomax.studiomaxscenelayer.LayerMetaDataIndex>
+		"""
+		if (not self._layerIndexConnected):
+			for signal in ('layerCreated', 'layerDeleted', 'layersModified', 'sceneInvalidated'):
+				cross3d.dispatch.connect(signal, self._invalidateLayerMetaDataIndex)
+			self._layerIndexConnected = True
+
+		if (self._layerIndex is None or rebuild):
+			from cross3d.studiomax.studiomaxscenelayer import LayerMetaDataIndex
+			index = LayerMetaDataIndex()
+			index.build()
+			self._layerIndex = index
+		return self._layerIndex
+
+	def _invalidateLayerMetaDataIndex(self, *args):
+		self._layerIndex = None
+
+	def _propSetOverridePlanner(self):
+		"""
+			\remarks	returns the planner remembering the base and current property set values of the overridden objects, it is cleared when the scene
+						is invalidated and on undo
+			\return		<cross3d.classes.propsetdiff.PropSetOverridePlanner>
+		"""
+		if (self._propSetPlanner is None):
+			from cross3d.classes.propsetdiff import PropSetOverridePlanner
+			self._propSetPlanner = PropSetOverridePlanner()
+			self._connectSceneCaches()
+		return self._propSetPlanner
+
+	def _applyNativePropSetOverride(self, nativeObjects, overrides):
+		"""
+			\remarks	applies the inputed override values on top of the base properties of the objects, recording the base properties of the objects
+						that do not have them yet. Only the properties whose values change are written, each value with one call for all the objects
+						that need it. Empty overrides restore the base properties and clear their records.
+			\param		nativeObjects	<list> [ <Py3dsMax.mxs.Object> nativeObject, .. ]
+			\param		overrides		<dict> { <str> propname: <variant> value, .. }
 			\return		<bool> success
 		"""
-		# store the methods we're going to use
 		from cross3d import SceneObjectPropSet
 		from cross3d.studiomax import StudiomaxAppData
 
 		get_appdata = mxs.getAppData
 		del_appdata = mxs.deleteAppData
+		set_appdata = mxs.setAppData
 		get_userprop = mxs.getUserProp
 		set_userprop = mxs.setUserProp
+		get_handle = mxs.getHandleByAnim
 		altpropindex = int(StudiomaxAppData.AltPropIndex)
+		planner = self._propSetOverridePlanner()
+		template = SceneObjectPropSet(self, None)
+
+		# objects usually share a few base states, each one is only parsed once
+		parsed = {}
+		entries = []
 
 		for obj in nativeObjects:
+			handle = get_handle(obj)
+			if (handle in planner):
+				entries.append((handle, obj))
+				continue
+
 			# restore base properties
 			props = get_appdata(obj, altpropindex)
 			if (not props):
 				props = get_userprop(obj, 'baseprops')
 
-			# restore the property set
 			if (props and props != 'undefined'):
+				base = parsed.get(props)
+				if (base is None):
+					nprop = SceneObjectPropSet(self, None)
+					nprop._setValueString(props)
+					base = parsed[props] = dict((key, nprop.value(key)) for key in nprop.propertyNames())
+				planner.loadBase(handle, base)
+
+			# record the base state if it is not already recorded
+			elif (overrides):
 				nprop = SceneObjectPropSet(self, None)
-				nprop._setValueString(props)
+				nprop.activateProperties(True)
+
+				# go through and pull the values
 				for key in nprop.propertyNames():
-					if (nprop.isCustomProperty(key)):
-						set_userprop(obj, key, str(self._toNativeValue(nprop.value(key))))
+					# The gbufferchannel property should be treated like a
+					# native property, but removing it from the custom property
+					# list breaks myriad other things.  The simple solution is to
+					# allow it to act as both by putting the additional condition
+					# here.  If this were not there any time you unset an altprop
+					# on a layer object ids would revert to a 0 value even if the
+					# user had set them to something else by hand via the Max
+					# interface.
+					if nprop.isCustomProperty(key) and key != 'gbufferchannel':
+						value = get_userprop(obj, key)
 					else:
-						obj.setProperty(key, self._toNativeValue(nprop.value(key)))
+						value = obj.property(key)
+
+					if (value != None):
+						nprop.setValue(key, self._fromNativeValue(value))
+
+				# collect the initial base properties
+				valueString = nprop._valueString()
+				set_userprop(obj, 'baseprops', valueString)
+				set_appdata(obj, altpropindex, valueString)
+				planner.setBase(handle, dict((key, nprop.value(key)) for key in nprop.propertyNames()))
+
+			# pass this object if it is null
+			else:
+				continue
+
+			entries.append((handle, obj))
+
+		# write each changed value to all the objects that need it at once
+		plan = planner.plan(entries, overrides)
+		for key, value, objects in plan.writes():
+			if (template.isCustomProperty(key)):
+				mxs.cross3dhelper.setNodesUserProps(objects, [key], [str(self._toNativeValue(value))])
+			else:
+				mxs.cross3dhelper.setNodesProperty(objects, mxs.pyhelper.namify(key), self._toNativeValue(value))
 
-				# if this propset is empty, this is all we need to do
+		# if this propset is empty, the base properties do not need to be recorded anymore
+		if (not overrides):
+			for obj in plan.objects():
 				set_userprop(obj, 'baseprops', 'undefined')
 				del_appdata(obj, altpropindex)
 
 		return True
 
+	def _clearNativePropSetOverride(self, nativeObjects):
+		"""
+			\remarks	implements the AbstractScene._clearNativePropSetOverride method to clear the inputed objects of any overriding property set information
+			\param		nativeObjects		<list> [ <Py3dsMax.mxs.Object> nativeObject, .. ]
+			\return		<bool> success
+		"""
+		return self._applyNativePropSetOverride(nativeObjects, {})
+
 	def _createNativeModel(self, name='Model', nativeObjects=[], referenced=False):
 		name = 'Model' if not name else name
 		output = mxs.Point(cross=False, name=name)
@@ -777,31 +1021,22 @@ class StudiomaxScene(AbstractScene):
 
 		return fxInstances
 
-	def _nativeLayers(self, wildcard=''):
+	def _iterNativeLayers(self, wildcard=''):
 		"""
-			\remarks	implements the AbstractScene._nativeLayers method to return a list of the native layers in this scene
-			\return		<list> [ <Py3dsMax.mxs.Layer> nativeLayer, .. ]
+			\remarks	implements the AbstractScene._iterNativeLayers method to stream the native layers of the layer manager
+			\return		<iterator> [ <Py3dsMax.mxs.Layer> nativeLayer, .. ]
 		"""
 		layerManager = mxs.layerManager
-		count = layerManager.count
 		getLayer = layerManager.getLayer
-		layers = [getLayer(i) for i in range(count)]
-
-		if wildcard:
-
-			# This will replace any "*" into ".+" therefore converting basic star based wildcards into a regular expression.
-			expression = re.sub(r'(?<!\\)\*', r'.*', wildcard)
-			if not expression[-1] == '$':
-				expression += '$'
+		layers = (getLayer(i) for i in xrange(layerManager.count))
+		return ObjectQuery(wildcard).filter(layers, name=lambda layer: layer.name)
 
-			holder = []
-			for layer in layers:
-				if re.match(expression, layer.name, re.I):
-					holder.append(layer)
-			return holder
-
-		else:
-			return layers
+	def _nativeLayers(self, wildcard=''):
+		"""
+			\remarks	implements the AbstractScene._nativeLayers method to return a list of the native layers in this scene
+			\return		<list> [ <Py3dsMax.mxs.Layer> nativeLayer, .. ]
+		"""
+		return list(self._iterNativeLayers(wildcard))
 
 	def _nativeLayerGroups(self):
 		"""
@@ -858,44 +1093,35 @@ class StudiomaxScene(AbstractScene):
 
 		return output
 
-	def _nativeObjects(self, getsFromSelection=False, wildcard='', objectType=0):
+	def _iterNativeObjects(self, wildcard='', objectType=0, layer=None, selected=None):
 		"""
-			\remarks	implements the AbstractScene._nativeObjects method to return the native objects from the scene
-			\return		<list> [ <Py3dsMax.mxs.Object> nativeObject, .. ]
+			\remarks	implements the AbstractScene._iterNativeObjects method to stream the native objects matching the predicates. Only
+						the nodes of the layer, the selection or the native collection of the object type are visited, the other predicates
+						are tested on each node as it is reached
+			\return		<iterator> [ <Py3dsMax.mxs.Object> nativeObject, .. ]
 		"""
-
-		# TODO: Needs to be severely optimzed. Using "nativeType = SceneObject._abstractToNativeObjectType.get(type)".
-
-		if getsFromSelection:
+		from cross3d import SceneObject, SceneLayer
+		if layer is not None:
+			objects = SceneLayer(self, layer)._nativeObjects()
+			applied = ('layer',)
+		elif selected:
 			objects = mxs.selection
+			applied = ('selected',)
 		else:
-			objects = mxs.objects
+			objects = getattr(mxs, self._objectTypeCollections.get(objectType, 'objects'))
+			applied = ()
 
-		# Processing the wildcard.
-		if wildcard:
+		# The type collections also hold other types, the type itself is still tested.
+		query = ObjectQuery(wildcard, objectType, layer, selected)
+		return query.filter(objects, applied, name=lambda obj: obj.name, objectType=SceneObject._typeOfNativeObject,
+							layer=lambda obj: obj.layer, selected=lambda obj: obj.isSelected)
 
-			# This will replace any "*" into ".+" therefore converting basic star based wildcards into a regular expression.
-			expression = re.sub(r'(?<!\\)\*', r'.*', wildcard)
-			if not expression[-1] == '$':
-				expression += '$'
-			holder = []
-			for obj in objects:
-				if re.match(expression, obj.name, flags=re.I):
-					holder.append(obj)
-			ret = holder
-
-		else:
-			ret = objects
-
-		if objectType:
-			holder = []
-			from cross3d import SceneObject
-			for obj in ret:
-				if SceneObject._typeOfNativeObject(obj) == objectType:
-					holder.append(obj)
-			ret = holder
-
-		return ret
+	def _nativeObjects(self, getsFromSelection=False, wildcard='', objectType=0):
+		"""
+			\remarks	implements the AbstractScene._nativeObjects method to return the native objects from the scene
+			\return		<list> [ <Py3dsMax.mxs.Object> nativeObject, .. ]
+		"""
+		return list(self._iterNativeObjects(wildcard, objectType, selected=True if getsFromSelection else None))
 
 	def _nativeSelection(self, wildcard=''):
 		return self._nativeObjects(getsFromSelection=True, wildcard=wildcard)
@@ -959,10 +1185,11 @@ class StudiomaxScene(AbstractScene):
 
 		# return alternate environment map caches
 		if (cacheType == MapCacheType.EnvironmentMap):
-			data.setValue('environmentMaps', nativeMaps)
+			self.metaData().environmentMapsCache().setValue('environmentMaps', nativeMaps)
+			self._cacheIndexes.pop((True, cacheType), None)
 			return True
 
-		return True
+		return False
 
 	def _setCachedNativeMaterials(self, cacheType, nativeMaterials):
 		"""
@@ -976,11 +1203,13 @@ class StudiomaxScene(AbstractScene):
 		# return override material list
 		if (cacheType == MaterialCacheType.MaterialOverrideList):
 			self.metaData().setValue('materialLibraryList', nativeMaterials)
+			self._cacheIndexes.pop((False, cacheType), None)
 			return True
 
 		# return alternate material cache
 		if (cacheType == MaterialCacheType.BaseMaterial):
 			self.metaData().setValue('baseMaterialCache', nativeMaterials)
+			self._cacheIndexes.pop((False, cacheType), None)
 			return True
 
 		return False
@@ -1036,6 +1265,8 @@ class StudiomaxScene(AbstractScene):
 			\param		nativeMap 	<Py3dsMax.mxs.TextureMap> || None
 			\return		<bool> success
 		"""
+		from cross3d.constants import MapCacheType
+
 		data = self.metaData().environmentMapsCache()
 		basedata = self.metaData().environmentMapCache()
 
@@ -1046,10 +1277,8 @@ class StudiomaxScene(AbstractScene):
 				basedata.setValue('environmentMap', mxs.environmentMap)
 
 			# make sure the map is cached as an override option
-			maps = list(data.value('environmentMaps'))
-			if (not nativeMap in maps):
-				maps.append(nativeMap)
-				data.setValue('environmentMaps', nativeMap)
+			self._cacheNativeMap(MapCacheType.EnvironmentMap, nativeMap)
+			maps = self._cachedNativeMaps(MapCacheType.EnvironmentMap)
 
 			# set the override in the system
 			data.setValue('currentIndex', maps.index(nativeMap) + 1)
@@ -1070,82 +1299,8 @@ class StudiomaxScene(AbstractScene):
 			\param		nativePropSet	<cross3d.SceneObjectPropSet>
 			\return		<bool> success
 		"""
-		from cross3d import SceneObjectPropSet
-		from cross3d.studiomax import StudiomaxAppData
-
-		get_appdata = mxs.getAppData
-		del_appdata = mxs.deleteAppData
-		set_appdata = mxs.setAppData
-		get_prop = mxs.getProperty
-		set_prop = mxs.setProperty
-		get_userprop = mxs.getUserProp
-		set_userprop = mxs.setUserProp
-		altpropindex = int(StudiomaxAppData.AltPropIndex)
-		empty = not nativePropSet.isActive()
-		values = [(key, nativePropSet.value(key), nativePropSet.isCustomProperty(key)) for key in nativePropSet.activeProperties()]
-
-		for obj in nativeObjects:
-			# restore base properties
-			props = get_appdata(obj, altpropindex)
-			if (not props):
-				props = get_userprop(obj, 'baseprops')
-
-			# restore the property set
-			if (props and props != 'undefined'):
-				nprop = SceneObjectPropSet(self, None)
-				nprop._setValueString(props)
-				for key in nprop.propertyNames():
-					if (nprop.isCustomProperty(key)):
-						set_userprop(obj, key, str(self._toNativeValue(nprop.value(key))))
-					else:
-						obj.setProperty(key, self._toNativeValue(nprop.value(key)))
-
-				# if this propset is empty, this is all we need to do
-				if (empty):
-					set_userprop(obj, 'baseprops', 'undefined')
-					del_appdata(obj, altpropindex)
-					continue
-
-			# record the base state if it is not already recorded
-			elif (not empty):
-				nprop = SceneObjectPropSet(self, None)
-				nprop.activateProperties(True)
-
-				# go through and pull the values
-				for key in nprop.propertyNames():
-					# The gbufferchannel property should be treated like a
-					# native property, but removing it from the custom property
-					# list breaks myriad other things.  The simple solution is to
-					# allow it to act as both by putting the additional condition
-					# here.  If this were not there any time you unset an altprop
-					# on a layer object ids would revert to a 0 value even if the
-					# user had set them to something else by hand via the Max
-					# interface.
-					if nprop.isCustomProperty(key) and key != 'gbufferchannel':
-						value = get_userprop(obj, key)
-					else:
-						value = obj.property(key)
-
-					if (value != None):
-						nprop.setValue(key, self._fromNativeValue(value))
-
-				# collect the initial base properties
-				valueString = nprop._valueString()
-				set_userprop(obj, 'baseprops', valueString)
-				set_appdata(obj, altpropindex, valueString)
-
-			# pass this object if it is null
-			else:
-				continue
-
-			# apply this property if it is not empty
-			for key, value, custom in values:
-				if (custom):
-					set_userprop(obj, key, str(self._toNativeValue(value)))
-				else:
-					obj.setProperty(key, self._toNativeValue(value))
-
-		return True
+		overrides = dict((key, nativePropSet.value(key)) for key in nativePropSet.activeProperties())
+		return self._applyNativePropSetOverride(nativeObjects, overrides)
 
 	def _setNativeMaterialOverride(self, nativeObjects, nativeMaterial, options=None, advancedState=None):
 		"""
@@ -1173,6 +1328,8 @@ class StudiomaxScene(AbstractScene):
 		geoclass = mxs.GeometryClass
 		unique_id = mxs.blurUtil.uniqueId
 		processed = {}
+		newBaseMaterials = []
+		cache = self._materialOverrideCache()
 
 		for obj in nativeObjects:
 			# ignore non-geometric objects
@@ -1194,7 +1351,7 @@ class StudiomaxScene(AbstractScene):
 					uid = unique_id(baseMaterial)
 					set_appdata(obj, int(StudiomaxAppData.AltMtlIndex), str(uid))
 					set_userprop(obj, 'basematerial', str(uid))
-					self._cacheNativeMaterial(MaterialCacheType.BaseMaterial, baseMaterial)
+					newBaseMaterials.append(baseMaterial)
 				else:
 					set_appdata(obj, int(StudiomaxAppData.AltMtlIndex), '0')
 					set_userprop(obj, 'basematerial', '0')
@@ -1225,11 +1382,13 @@ class StudiomaxScene(AbstractScene):
 				else:
 					processMaterial = nativeMaterial
 
-				overrideMaterial = matlib.createMaterialOverride(baseMaterial, processMaterial, options=options, advancedState=advancedState)
+				overrideMaterial = matlib.createMaterialOverride(baseMaterial, processMaterial, options=options, advancedState=advancedState, cache=cache)
 				processed[uid] = overrideMaterial
 
 			obj.material = overrideMaterial
 
+		# record the new base materials with a single metadata write
+		self._cacheNativeMaterials(MaterialCacheType.BaseMaterial, newBaseMaterials)
 		return True
 
 	def _setNativeFocus(self, objects):
@@ -1923,6 +2082,7 @@ class StudiomaxScene(AbstractScene):
 
 			data.setValue('currentIndex', currentIndex)
 			data.setValue('environmentMaps', newMaps)
+			self._cacheIndexes.clear()
 
 		# remove undefined layers
 		count = mxs.custAttributes.count(root)
@@ -1944,6 +2104,8 @@ class StudiomaxScene(AbstractScene):
 				if layer:
 					rem_attr(root, i + 1)
 
+		self._invalidateLayerMetaDataIndex()
+
 	def closeRenderSceneDialog(self):
 		"""
 			\remarks	implements the AbstractScene.closeRenderSceneDialog to close an open render scene dialog
@@ -2186,28 +2348,39 @@ class StudiomaxScene(AbstractScene):
 		# Creating the and RayFireCaches, PCs, and TMCs instanciated controllers.
 
 		# Handling PCs and TMCs.
+		from cross3d.classes.cachefile import readHeader
+		sampleRate = self.animationFPS() / float(cachesFrameRate)
+		# Caches often share files, the start frame is only parsed once per file.
+		startFrames = {}
 		nativeCaches = mxs.getClassInstances(mxs.Point_Cache) + mxs.getClassInstances(mxs.Transform_Cache)
 		for nativeCache in nativeCaches:
+			isPointCache = mxs.classOf(nativeCache) == mxs.Point_Cache
 
 			# This optimizes the playback greatly.
-			if mxs.classOf(nativeCache) == mxs.Point_Cache:
-				nativeCache.sampleRate = self.animationFPS() / float(cachesFrameRate)
+			if isPointCache:
+				nativeCache.sampleRate = sampleRate
 
 			# Some info like the first and last frame of the point cache must unfortunately come from parsing the file.
-			fileName = nativeCache.filename if mxs.classOf(nativeCache) == mxs.Point_Cache else nativeCache.CacheFile
-			if os.path.exists(fileName):
+			fileName = nativeCache.filename if isPointCache else nativeCache.CacheFile
+			if fileName not in startFrames and os.path.exists(fileName):
 
 				# Parsing the cache file. We need to extract the start frame.
-				if mxs.classof(nativeCache) == mxs.Point_Cache:
-					from blur3d.lib.pclib import PointCacheInfo
-					cacheInfo = PointCacheInfo.read(fileName, header_only=True)
-				elif mxs.classof(nativeCache) == mxs.Transform_Cache:
+				if isPointCache:
+					try:
+						startFrames[fileName] = readHeader(fileName).startFrame
+					except ValueError:
+						# Only PC2 files are read by cachefile, the other point cache formats go through pclib as before.
+						from blur3d.lib.pclib import PointCacheInfo
+						startFrames[fileName] = PointCacheInfo.read(fileName, header_only=True).start_frame
+				else:
 					from blur3d.lib.tmclib import TMCInfo
-					cacheInfo = TMCInfo.read(fileName, header_only=True)
+					startFrames[fileName] = TMCInfo.read(fileName, header_only=True).start_frame
+
+			if fileName in startFrames:
 
 				# Setting the playback to curve.
 				timeScriptController = mxs.Float_Script()
-				timeScriptController.script = '{} / frameRate * F - {}'.format(cachesFrameRate, cacheInfo.start_frame)
+				timeScriptController.script = '{} / frameRate * F - {}'.format(cachesFrameRate, startFrames[fileName])
 				nativeCache.playbackType = 3
 				mxs.setPropertyController(nativeCache, "playbackFrame", timeScriptController)
 
@@ -2802,13 +2975,33 @@ class StudiomaxScene(AbstractScene):
 	def setRenderFrameRange(self, frameRange):
 		"""
 			\remarks	set the render frame range of the scene
-			\param		size	<cross3d.FrameRange>
+			\param		size	<cross3d.FrameRange> || <cross3d.FrameSet> for sparse or stepped frames
 			\return		<bool> success
 		"""
+		if isinstance(frameRange, cross3d.FrameSet):
+			spans = frameRange.spans()
+
+			# A single span maps to a range rendered every nth frame.
+			if len(spans) == 1:
+				start, end, step = spans[0]
+				mxs.rendTimeType = 3
+				mxs.rendStart, mxs.rendEnd = start, end
+				# A single frame has no step, the one of a previous range must not stay.
+				mxs.rendNThFrame = step if end > start else 1
+
+			# Anything else is rendered as picked up frames, which do not support steps.
+			else:
+				mxs.rendTimeType = 4
+				mxs.rendNThFrame = 1
+				mxs.rendPickupFrames = frameRange.toString(steps=False)
+			return True
+
 		# not the ideal way to deal with all the options but I am in the rush
 		mxs.rendTimeType = 3
 		mxs.rendStart = frameRange[0]
 		mxs.rendEnd = frameRange[1]
+		# ranges render every frame, even after a stepped FrameSet was set
+		mxs.rendNThFrame = 1
 		return True
 
 	def setRenderPixelAspect(self, pixelAspect):
@@ -2966,12 +3159,23 @@ class StudiomaxScene(AbstractScene):
 		mxs.clearSelection()
 		return True
 
+	def translate(self, objects, axes, relative=False):
+		"""
+		Translates the objects in the scene with a single move of the Collection
+		:param objects: Translate these objects
+		:param axes: A list with a length of 3 floats representing x, y, z
+		:param relative: Apply the translation as relative or absolute. Absolute by default.
+		"""
+		return cross3d.Collection(self, objects).translate(axes, relative)
+
 	def undo(self):
 		"""
 			\remarks	undos the last action.
 			\return		<bool>
 		"""
 		mxs.execute('max undo')
+		# the undo may have restored older cached materials and maps, and older property values
+		self._invalidateSceneCaches()
 		return True
 
 	def userProps(self):
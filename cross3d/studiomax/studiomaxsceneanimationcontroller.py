@@ -43,6 +43,12 @@ class StudiomaxSceneAnimationController(AbstractSceneAnimationController):
 
 	_slopeDistortions = {24: 0.12, 25: 0.13, 30: 0.187, 60: 0.75}
 
+	# The names of the native tangent types, used to pack keys for cross3dhelper.setControllerKeyData.
+	_abstractToNativeTangentNames = {TangentType.Automatic: 'auto',
+                                  TangentType.Bezier: 'custom',
+                                  TangentType.Linear: 'linear',
+                                  TangentType.Stepped: 'step'}
+
 	#------------------------------------------------------------------------------------------------------------------------
 	# 												protected methods
 	#------------------------------------------------------------------------------------------------------------------------
@@ -126,11 +132,18 @@ class StudiomaxSceneAnimationController(AbstractSceneAnimationController):
 		return '.'.join(mxs.exprForMaxObject(self._nativePointer).split('.')[1:])
 
 	def valueAtFrame(self, frame):
-		mxs.execute("""fn getControllerValueAtFrame controller frame = (
-			at time frame
-			return controller.value
-		)""")
-		return mxs.getControllerValueAtFrame(self._nativePointer, frame)
+		return self.valuesAtFrames([frame])[0]
+
+	def valuesAtFrames(self, frames):
+		""" Samples all the frames with a single call to the cross3dhelper struct defined in helpers.ms.
+		"""
+		return list(mxs.cross3dhelper.getControllerValuesAtFrames(self._nativePointer, list(frames)))
+
+	@classmethod
+	def valuesAtFramesForControllers(cls, controllers, frames):
+		nativeControllers = [controller.nativePointer() for controller in controllers]
+		values = mxs.cross3dhelper.getControllersValuesAtFrames(nativeControllers, list(frames))
+		return [list(controllerValues) for controllerValues in values]
 
 	def extrapolation(self):
 		extrapolation = [mxs.getBeforeORT(self._nativePointer), mxs.getAfterORT(self._nativePointer)]
@@ -147,138 +160,162 @@ class StudiomaxSceneAnimationController(AbstractSceneAnimationController):
 			mxs.setAfterORT(self._nativePointer, self._abstractToNativeExtrapolationType.get(extrapolation[1], ExtrapolationType.Constant))
 		return True
 
-	def fCurve(self):
-		""" Returns a FCurve object to manipulate or save the curve data.
-		"""
-
-		# Importing SceneAnimationKey to get abstract types information.
-		from cross3d import SceneAnimationKey
-
-		# Getting what we need.
-		controllerType = self.type()
-		fCurve = FCurve(name=self.displayName(), tpe=controllerType)
+	def _slopeDistortion(self):
+		""" Getting the slope distortion based on scene frame rate. On of Max's treats. """
+		return self._slopeDistortions.get(int(self._scene.animationFPS()), 0.1)
 
-		# Writing the extrapolation.
-		fCurve.setExtrapolation(self.extrapolation())
-
-		# We only support controllers that can have keys.
-		if controllerType in (ControllerType.BezierFloat, ControllerType.LinearFloat):
-
-			# Getting the slope distortion based on scene frame rate. On of Max's treats.
-			sd = self._slopeDistortions.get(int(self._scene.animationFPS()), 0.1)
-
-			# Getting keys.
-			keys = self.keys()
-			keyCount = len(keys)
-
-			# Looping through keys.
-			for index in range(keyCount):
-
-				# Getting native key.
-				key = keys[index].nativePointer()
-
-				# Storing key data.
-				kwargs = {}
-				kwargs['value'] = key.value
-				kwargs['time'] = key.time
-				kwargs['normalizedTangents'] = not key.freeHandle
-
-				# Storing tangent type.
-				inTangentType = key.inTangentType
-				outTangentType = key.outTangentType
-
-				# If tangents are normalized calculating the tangent lenght is a bit more work.
-				# Do not try to bypass that by temporarly changing the key mode. This is the way I had it before.
-				# Restoring the key mode takes a lot of time somehow has a great impact on tools. Especialy with V-Ray cameras.
-				if kwargs['normalizedTangents']:
-
-					if index > 0:
-						pKey = keys[index - 1].nativePointer()
-						inTangentLength = (kwargs['time'] - pKey.time) * key.inTangentLength
-					else:
-						inTangentLength = 0.0
-
-					if index < keyCount - 1:
-						nKey = keys[index + 1].nativePointer()
-						outTangentLength = (nKey.time - kwargs['time']) * key.outTangentLength
-					else:
-						outTangentLength = 0.0
-
-				else:
-					inTangentLength = key.inTangentLength
-					outTangentLength = key.outTangentLength
-
-				# Bare in mind that inTangent and outTangent are the slopes.
-				kwargs['inTangentAngle'] = math.atan((key.inTangent * 0.1 / sd) * 10.0)
-				kwargs['outTangentAngle'] = math.atan((key.outTangent * 0.1 / sd) * 10.0)
-				kwargs['inTangentType'] = SceneAnimationKey._nativeToAbstractTangentTypes.get(str(inTangentType), TangentType.Automatic)
-				kwargs['outTangentType'] = SceneAnimationKey._nativeToAbstractTangentTypes.get(str(outTangentType), TangentType.Automatic)
-
-				# Bare in mind that Max tangent length is actually not the length but the length on the time axis.
-				kwargs['inTangentLength'] = inTangentLength / math.cos(kwargs['inTangentAngle']) if kwargs['inTangentAngle'] != 0.0 else inTangentLength
-				kwargs['outTangentLength'] = outTangentLength / math.cos(kwargs['outTangentAngle']) if kwargs['outTangentAngle'] != 0.0 else outTangentLength
-				kwargs['brokenTangents'] = not key.x_locked
-				fCurve.addKey(**kwargs)
-
-		return fCurve
+	@classmethod
+	def _keysFromData(cls, data, names, sd):
+		""" Converts the flat key arrays returned by cross3dhelper.getControllerKeyData to FCurve key arguments.
 
-	def setFCurve(self, fCurve):
-		""" 
-			Takes a fCurve object data and applies it to the controller.
+		Each key is described by 8 floats (time, value, inTangent, outTangent, inTangentLength,
+		outTangentLength, freeHandle, x_locked) and 2 names (inTangentType, outTangentType).
 		"""
 
 		# Importing SceneAnimationKey to get abstract types information.
 		from cross3d import SceneAnimationKey
 
-		# Getting what we need.
-		tpe = fCurve.type()
-		keys = fCurve.keys()
+		data = list(data)
+		names = list(names)
+		times = data[0::8]
+		keyCount = len(times)
+		keys = []
+
+		# Looping through keys.
+		for index in range(keyCount):
+			time, value, inTangent, outTangent, inLength, outLength, freeHandle, xLocked = data[index * 8:index * 8 + 8]
+
+			# Storing key data.
+			kwargs = {}
+			kwargs['value'] = value
+			kwargs['time'] = time
+			kwargs['normalizedTangents'] = not freeHandle
+
+			# If tangents are normalized calculating the tangent lenght is a bit more work.
+			# Do not try to bypass that by temporarly changing the key mode. This is the way I had it before.
+			# Restoring the key mode takes a lot of time somehow has a great impact on tools. Especialy with V-Ray cameras.
+			if kwargs['normalizedTangents']:
+				inTangentLength = (time - times[index - 1]) * inLength if index > 0 else 0.0
+				outTangentLength = (times[index + 1] - time) * outLength if index < keyCount - 1 else 0.0
+			else:
+				inTangentLength = inLength
+				outTangentLength = outLength
+
+			# Bare in mind that inTangent and outTangent are the slopes.
+			kwargs['inTangentAngle'] = math.atan((inTangent * 0.1 / sd) * 10.0)
+			kwargs['outTangentAngle'] = math.atan((outTangent * 0.1 / sd) * 10.0)
+			kwargs['inTangentType'] = SceneAnimationKey._nativeToAbstractTangentTypes.get(names[index * 2], TangentType.Automatic)
+			kwargs['outTangentType'] = SceneAnimationKey._nativeToAbstractTangentTypes.get(names[index * 2 + 1], TangentType.Automatic)
+
+			# Bare in mind that Max tangent length is actually not the length but the length on the time axis.
+			kwargs['inTangentLength'] = inTangentLength / math.cos(kwargs['inTangentAngle']) if kwargs['inTangentAngle'] != 0.0 else inTangentLength
+			kwargs['outTangentLength'] = outTangentLength / math.cos(kwargs['outTangentAngle']) if kwargs['outTangentAngle'] != 0.0 else outTangentLength
+			kwargs['brokenTangents'] = not xLocked
+			keys.append(kwargs)
+
+		return keys
 
-		if tpe and keys:
+	@classmethod
+	def _dataFromKeys(cls, keys, sd):
+		""" Packs FCurve keys in the flat arrays expected by cross3dhelper.setControllerKeyData.
 
-			# Making a fresh controller.
-			controller = self._abstractToNativeTypes.get(tpe)()
+		Each key is described by 8 floats (time, value, inTangentLength, inTangent, outTangentLength,
+		outTangent, freeHandle, x_locked) and 2 names (inTangentType, outTangentType).
+		"""
+		data = []
+		names = []
+		for k in keys:
+
+			# The Max tangent lenght is actually the distance on the time axis.
+			data.extend((k.time, k.value,
+				math.cos(k.inTangentAngle) * k.inTangentLength, (math.tan(k.inTangentAngle) / 10.0) * sd / 0.1,
+				math.cos(k.outTangentAngle) * k.outTangentLength, (math.tan(k.outTangentAngle) / 10.0) * sd / 0.1,
+				float(not k.normalizedTangents), float(not k.brokenTangents)))
+			names.append(cls._abstractToNativeTangentNames.get(k.inTangentType, 'auto'))
+			names.append(cls._abstractToNativeTangentNames.get(k.outTangentType, 'auto'))
+		return data, names
+
+	def _fCurveFromData(self, data, names, sd):
+		fCurve = FCurve(name=self.displayName(), tpe=self.type())
+		fCurve.setExtrapolation(self.extrapolation())
+		for kwargs in self._keysFromData(data, names, sd):
+			fCurve.addKey(**kwargs)
+		return fCurve
 
-			if controller:
+	def _hasKeys(self):
+		return self.type() in (ControllerType.BezierFloat, ControllerType.LinearFloat)
 
-				# Getting the slope distortion based on scene frame rate. On of Max's treats.
-				sd = self._slopeDistortions.get(int(self._scene.animationFPS()), 0.1)
+	def fCurve(self):
+		""" Returns a FCurve object to manipulate or save the curve data.
+
+		All the keys are read with a single call to cross3dhelper.getControllerKeyData.
+		"""
 
-				# For a reason that falls beyond my comprehension, it is important to set all the keys first.
-				for k in keys:
-					key = mxs.addNewKey(controller, k.time)
-					key.value = k.value
+		# We only support controllers that can have keys.
+		if not self._hasKeys():
+			fCurve = FCurve(name=self.displayName(), tpe=self.type())
+			fCurve.setExtrapolation(self.extrapolation())
+			return fCurve
 
-				# And then do a second pass to process the tangents.
-				for k in keys:
-					key = mxs.getKey(controller, mxs.getKeyIndex(controller, k.time))
+		data, names = mxs.cross3dhelper.getControllerKeyData(self._nativePointer)
+		return self._fCurveFromData(data, names, self._slopeDistortion())
 
-					# The tangeants do not expected the same values if the are free.
-					key.freeHandle = True
-					key.x_locked = False
-					key.inTangentType = mxs.pyhelper.namify('custom')
-					key.outTangentType = mxs.pyhelper.namify('custom')
+	@classmethod
+	def fCurvesForControllers(cls, controllers):
+		""" Reads the curves of many controllers with a single call to cross3dhelper.getControllersKeyData.
+		"""
+		keyed = [controller for controller in controllers if controller._hasKeys()]
+		fCurves = dict((id(controller), controller.fCurve()) for controller in controllers if not controller._hasKeys())
+		if keyed:
+			sd = keyed[0]._slopeDistortion()
+			keyData = mxs.cross3dhelper.getControllersKeyData([controller.nativePointer() for controller in keyed])
+			for controller, (data, names) in zip(keyed, keyData):
+				fCurves[id(controller)] = controller._fCurveFromData(data, names, sd)
+		return [fCurves[id(controller)] for controller in controllers]
 
-					# The Max tangent lenght is actually the distance on the time axis.
-					key.inTangentLength = math.cos(k.inTangentAngle) * k.inTangentLength
-					key.inTangent = (math.tan(k.inTangentAngle) / 10.0) * sd / 0.1
+	def _replaceNativeController(self, controller):
+		mxs.replaceInstances(self._nativePointer, controller)
 
-					# The Max tangent lenght is actually the distance on the time axis.
-					key.outTangentLength = math.cos(k.outTangentAngle) * k.outTangentLength
-					key.outTangent = (math.tan(k.outTangentAngle) / 10.0) * sd / 0.1
-					key.inTangentType = SceneAnimationKey._abstractToNativeTangentTypes.get(k.inTangentType, mxs.pyhelper.namify('auto'))
-					key.outTangentType = SceneAnimationKey._abstractToNativeTangentTypes.get(k.outTangentType, mxs.pyhelper.namify('auto'))
-					key.freeHandle = not k.normalizedTangents
-					key.x_locked = not k.brokenTangents
+		# It is essential to re-point the native pointer.
+		self._nativePointer = controller
 
-				mxs.replaceInstances(self._nativePointer, controller)
+	def setFCurve(self, fCurve):
+		""" 
+			Takes a fCurve object data and applies it to the controller.
+			All the keys are created with a single call to cross3dhelper.setControllerKeyData.
+		"""
+		return self.setFCurvesForControllers([self], [fCurve])
 
-				# It is essential to re-point the native pointer.
-				self._nativePointer = controller
+	@classmethod
+	def setFCurvesForControllers(cls, controllers, fCurves):
+		""" Applies curves to many controllers with a single call to cross3dhelper.setControllersKeyData.
+		"""
+		newControllers = []
+		keyData = []
+		keyNames = []
+		applied = []
+		for controller, fCurve in zip(controllers, fCurves):
+			tpe = fCurve.type()
+			keys = fCurve.keys()
+			if tpe and keys:
+
+				# Making a fresh controller.
+				nativeType = cls._abstractToNativeTypes.get(tpe)
+				if nativeType:
+					data, names = cls._dataFromKeys(keys, controller._slopeDistortion())
+					newControllers.append(nativeType())
+					keyData.append(data)
+					keyNames.append(names)
+					applied.append(controller)
+
+		if newControllers:
+			mxs.cross3dhelper.setControllersKeyData(newControllers, keyData, keyNames)
+			for controller, newController in zip(applied, newControllers):
+				controller._replaceNativeController(newController)
 
 		# Setting the extrapolation.
-		print fCurve.extrapolation()
-		self.setExtrapolation(fCurve.extrapolation())
+		for controller, fCurve in zip(controllers, fCurves):
+			controller.setExtrapolation(fCurve.extrapolation())
 		return True
 
 	def _nativeDerivatedController(self, timeUnit=TimeUnit.Seconds):
@@ -297,54 +334,6 @@ class StudiomaxSceneAnimationController(AbstractSceneAnimationController):
 										c.y / c.x""".format(t=t)
 		return derivatedController
 
-	def framesForValue(self, value, closest=True):
-		""" Returns a list o frames that match the given controller value.
-		
-		Args:
-		    value (float): The value we want to lookup frame for.
-		    closest (bool, optional): This will return the closest value if not value can be found.
-		
-		Returns:
-		    list: The list of matching frames.
-		"""
-
-		# TODO: (Douglas) This function is far from being perfect but it does the job.
-		frames = {}
-
-		keys = self.keys()
-		closestFrame = 0
-		if keys:
-			start = int(round(keys[0].time()))
-			end = int(round(keys[-1].time()))
-			index = 0
-			previousValue = None
-			closestValue = 0.0
-
-			# Looping through frames.
-			for frame in range(start, end + 1):
-				currentValue = self.valueAtFrame(frame)
-
-				if closest:
-					if abs(value - currentValue) < abs(value - closestValue):
-						closestValue = currentValue
-						closestFrame = frame
-
-				if round(currentValue) == round(value):
-					if previousValue is None or abs(value - currentValue) < abs(value - previousValue):
-						frames[index] = frame
-
-						# Saving value as previous value.
-						previousValue = currentValue
-
-				elif frames.get(index):
-					index += 1
-					previousValue = None
-
-		if not frames and closest:
-			return [closestFrame]
-
-		return sorted(frames.values())
-
 # register the symbol
 import cross3d
 cross3d.registerSymbol('SceneAnimationController', StudiomaxSceneAnimationController)
@@ -12,6 +12,7 @@ from Py3dsMax import mxs
 import cross3d
 from cross3d.abstract.abstractscenelayer import AbstractSceneLayer
 from cross3d import SceneObject
+from cross3d.classes.layerindex import LayerIndex
 
 #-----------------------------------------------------------------------------
 
@@ -157,6 +158,19 @@ class LayerMetaData( MXSCustAttribDef ):
 # register the definition to 3dsmax
 LayerMetaData.register()
 
+class LayerMetaDataIndex( LayerIndex ):
+	"""
+		\remarks	indexes the OnionData attributes of the root node by layer id and layer name, so a layer finds its
+					metadata without walking all the attributes of the root node
+	"""
+	def build( self ):
+		"""
+			\remarks	reads all the OnionData attributes of the root node with a single maxscript call
+		"""
+		root = mxs.rootNode
+		attrs, ids, names, groups = mxs.cross3dhelper.getLayerMetaData( root )
+		self.reset( zip( attrs, ids, names, groups ), mxs.custAttributes.count( root ) )
+
 #------------------------------------------------------------------------------------------------------------------------
 
 class StudiomaxSceneLayer( AbstractSceneLayer ):
@@ -198,27 +212,9 @@ class StudiomaxSceneLayer( AbstractSceneLayer ):
 			\param		nativeAtmos		<list> [ <Py3dsMax.mxs.Atmospheric> || <Py3dsMax.mxs.Effect> nativeAtmos ]
 			\return		<bool> success
 		"""
-		data 		= self.metaData()
-		atm 		= list(data.value('linkedAtmos'))
-		unique_id	= mxs.blurUtil.uniqueId
-
-		for atmos in nativeAtmos:
-			uid = unique_id( atmos )
-			if ( not uid in atm ):
-				atm.append( uid )
-
-		data.setValue( 'linkedAtmos', atm )
-
-		# reset the id's on other layers
-		for layer in self._scene.layers():
-			if ( layer == self ):
-				continue
-
-			latm = list(layer.metaData().value( 'linkedAtmos' ))
-			latm = [ i for i in latm if not i in atm ]
-			layer.metaData().setValue( 'linkedAtmos', latm )
-
-		return True
+		unique_id = mxs.blurUtil.uniqueId
+		atm = list(self.metaData().value('linkedAtmos')) + [ unique_id( atmos ) for atmos in nativeAtmos ]
+		return self._setLinkedIds( 'linkedAtmos', atm, exclusive = True )
 
 	def _addNativeFx(self, nativeFx):
 		"""
@@ -226,16 +222,38 @@ class StudiomaxSceneLayer( AbstractSceneLayer ):
 			\param		nativeFx	<list>
 			\return		<bool> success
 		"""
-		data = self.metaData()
-		fxIds = list(data.value('linkedFx'))
 		unique_id = mxs.blurUtil.uniqueId
+		fxIds = list(self.metaData().value('linkedFx')) + [unique_id(fx) for fx in nativeFx]
+		return self._setLinkedIds('linkedFx', fxIds)
 
-		for fx in nativeFx:
-			uid = unique_id(fx)
-			if not uid in fxIds:
-				fxIds.append(uid)
+	def _setLinkedIds( self, param, ids, exclusive = False ):
+		"""
+			\remarks	sets the unique ids linked to this layer in the inputed metadata parameter. Exclusive links are removed from all
+						the other layers at once, only the layers whose links change are written.
+			\param		param		<str>	'linkedAtmos' || 'linkedFx'
+			\param		ids			<list> [ <int> uniqueId, .. ]
+			\param		exclusive	<bool>	whether an id can only be linked to one layer
+			\return		<bool> success
+		"""
+		# remove the duplicates, keeping the order
+		seen = set()
+		ids = [ uid for uid in ids if not ( uid in seen or seen.add( uid ) ) ]
+
+		data = self.metaData()
+		if ( list( data.value( param ) ) != ids ):
+			data.setValue( param, ids )
+
+		# unlink the ids from the other layers
+		if ( exclusive and ids ):
+			for layer in self._scene.layers():
+				if ( layer == self ):
+					continue
+
+				layerData = layer.metaData()
+				linked = list( layerData.value( param ) )
+				if ( not seen.isdisjoint( linked ) ):
+					layerData.setValue( param, [ uid for uid in linked if not uid in seen ] )
 
-		data.setValue('linkedFx', fxIds)
 		return True
 
 	def _addNativeObjects( self, nativeObjects ):
@@ -368,19 +386,24 @@ class StudiomaxSceneLayer( AbstractSceneLayer ):
 			\sa			materials
 			\return		<list> [ <Py3dsMax.mxs.Material> nativeMaterial, .. ]
 		"""
-		mtls = []
-		for obj in self._nativeObjects():
-			if baseMaterials and self.materialOverride():
-				from cross3d.constants import MaterialCacheType
-				from cross3d.studiomax import StudiomaxAppData
-				get_userprop = mxs.getUserProp
-				get_appdata	= mxs.getAppData
+		nativeObjects = self._nativeObjects()
+		if baseMaterials and self.materialOverride():
+			from cross3d.constants import MaterialCacheType
+			from cross3d.studiomax import StudiomaxAppData
+			get_userprop = mxs.getUserProp
+			get_appdata	= mxs.getAppData
+			mids = []
+			for obj in nativeObjects:
 				mid = get_appdata(obj, int(StudiomaxAppData.AltMtlIndex))
 				if mid == None:
 					mid = get_userprop(obj, 'basematerial')
-				omtl = self.scene()._cachedNativeMaterial(MaterialCacheType.BaseMaterial, mid)
-			else:
-				omtl = obj.material
+				mids.append(mid)
+			omtls = self.scene()._cachedNativeMaterialsForIds(MaterialCacheType.BaseMaterial, mids)
+		else:
+			omtls = [obj.material for obj in nativeObjects]
+
+		mtls = []
+		for omtl in omtls:
 			if omtl and not omtl in mtls:
 				mtls.append(omtl)
 		return mtls
@@ -552,24 +575,8 @@ class StudiomaxSceneLayer( AbstractSceneLayer ):
 			\param		nativeAtmospherics	<list> [ <Py3dsMax.mxs.Atmospheric> nativeAtmospheric, .. ]
 			\return		<bool> success
 		"""
-		atm 		= []
-		unique_id 	= mxs.blurUtil.uniqueId
-
-		# collect the id's for this layer
-		for atmos in nativeAtmospherics:
-			atm.append( unique_id( atmos ) )
-		self.metaData().setValue( 'linkedAtmos', atm )
-
-		# reset the id's on other layers
-		for layer in self._scene.layers():
-			if ( layer == self ):
-				continue
-
-			latm = list(layer.metaData().value( 'linkedAtmos' ))
-			latm = [ i for i in latm if not i in atm ]
-			layer.metaData().setValue( 'linkedAtmos', latm )
-
-		return True
+		unique_id = mxs.blurUtil.uniqueId
+		return self._setLinkedIds( 'linkedAtmos', [ unique_id( atmos ) for atmos in nativeAtmospherics ], exclusive = True )
 
 	def _setNativeFxs( self, nativeFxs ):
 		"""
@@ -577,14 +584,8 @@ class StudiomaxSceneLayer( AbstractSceneLayer ):
 			\param		nativeFxs	<list> [ nativeFx, .. ]
 			\return		<bool> success
 		"""
-		atm 		= []
-		unique_id 	= mxs.blurUtil.uniqueId
-
-		# collect the id's for this layer
-		for atmos in nativeFxs:
-			atm.append( unique_id( atmos ) )
-		self.metaData().setValue( 'linkedFx', atm )
-		return True
+		unique_id = mxs.blurUtil.uniqueId
+		return self._setLinkedIds( 'linkedFx', [ unique_id( fx ) for fx in nativeFxs ] )
 
 	def _setNativeWireColor( self, nativeColor ):
 		"""
@@ -775,38 +776,32 @@ class StudiomaxSceneLayer( AbstractSceneLayer ):
 			layerName 	= str(self.name())
 			layerId		= self.uniqueId()
 
-			# grab the cust attribute by the layer name
+			# grab the cust attribute by the layer id or name from the scene index
 			root		= mxs.rootNode
-			order		= 1
-			count		= mxs.custAttributes.count( root )
-			get_attr	= mxs.custAttributes.get
-			is_prop		= mxs.isProperty
-
-			metaData	= None
-
-			for i in range(count):
-				attr = get_attr( root, i + 1 )
-				if ( str(attr.name).lower() == 'oniondata' ):
-					# lookup the property
-					if ((is_prop( attr, 'lnm' ) and layerName == attr.lnm) or attr.lid == layerId ):
-						metaData = LayerMetaData(attr)
-						if attr.lnm != layerName:
-							metaData.setValue('layerName', str(self.name()))
-						break
-
-					# create a new one if necessary
-					elif ( is_prop( attr, 'gi' ) and attr.gi == 1 ):
-						order += 1
+			index		= self._scene._layerMetaDataIndex()
+			attr		= index.find( layerId, layerName )
+
+			# the attributes may have been changed without notice, make sure the index is complete before creating new data
+			if ( attr == None and index.attributeCount() != mxs.custAttributes.count( root ) ):
+				index = self._scene._layerMetaDataIndex( rebuild = True )
+				attr = index.find( layerId, layerName )
+
+			if ( attr != None ):
+				metaData = LayerMetaData(attr)
+				if ( mxs.isProperty( attr, 'lnm' ) and attr.lnm != layerName ):
+					metaData.setValue('layerName', layerName)
+					index.rename( layerId, layerName )
 
 			# create new data if necessary
-			if ( not metaData ):
+			else:
 				metaData = LayerMetaData.createUnique( root )
 
 				# initialize some more data
-				metaData.setValue( 'layerId', 	self.uniqueId() )
-				metaData.setValue( 'layerName', str( self.name() ) )
+				metaData.setValue( 'layerId', 	layerId )
+				metaData.setValue( 'layerName', layerName )
 				metaData.setValue( 'groupIndex', 1 )
-				metaData.setValue( 'groupOrder', order )
+				metaData.setValue( 'groupOrder', index.groupOrder() )
+				index.add( metaData._mxsInstance, layerId, layerName )
 
 			self._metaData = metaData
 
@@ -833,7 +828,7 @@ class StudiomaxSceneLayer( AbstractSceneLayer ):
 		properties into it.
 		"""
 		get_attr = mxs.custAttributes.get
-		rem_attr = mxs.cutAttributes.delete
+		rem_attr = mxs.custAttributes.delete
 		root = mxs.rootNode
 		count = mxs.custAttributes.count(root)
 		mxsinst = ()
@@ -859,6 +854,7 @@ class StudiomaxSceneLayer( AbstractSceneLayer ):
 			rem_attr(root, inst)
 			LayerMetaData.register()
 			self._metaData = newMetaData
+			self._scene._invalidateLayerMetaDataIndex()
 
 	def remove( self, removeObjects = False ):
 		"""
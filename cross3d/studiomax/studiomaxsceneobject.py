@@ -12,6 +12,7 @@
 from Py3dsMax import mxs
 from cross3d import UserProps
 from cross3d.constants import ObjectType
+from cross3d.classes.scenequery import ObjectQuery, walkChildren
 from cross3d.abstract.abstractsceneobject import AbstractSceneObject
 
 class StudiomaxSceneObject( AbstractSceneObject ):
@@ -100,23 +101,29 @@ class StudiomaxSceneObject( AbstractSceneObject ):
 
 		return output
 
-	def _nativeChildren( self, recursive = False, parent = None, childrenCollector = [] ):
+	def _iterNativeChildren( self, recursive = False, wildcard = '', type = '', parent = None ):
+		"""
+			\remarks	implements the AbstractSceneObject._iterNativeChildren method to walk the native children for this object depth first,
+						reading the children of a node only when the walk reaches it
+			\sa			iterChildren
+			\return		<iterator> [ <Py3dsMax.mxs.Object> nativeObject, .. ]
+		"""
+		if parent is None:
+			parent = self._nativePointer
+		children = walkChildren( parent, lambda node: node.children, recursive )
+		return ObjectQuery( wildcard ).filter( children, name = lambda child: child.name )
+
+	def _nativeChildren( self, recursive = False, wildcard = '', type = '', parent = None, childrenCollector = None ):
 		"""
 			\remarks	implements the AbstractSceneObject._nativeChildren method to look up the native children for this object
 			\sa			children
 			\return		<list> [ <Py3dsMax.mxs.Object> nativeObject, .. ]
 		"""
-		if recursive:
-			if parent:
-				children = parent.children
-			else:
-				children = self._nativePointer.children
-			for child in children:
-				childrenCollector.append( child )
-				self._nativeChildren( True, child, childrenCollector )
+		children = list( self._iterNativeChildren( recursive, wildcard, type, parent ) )
+		if childrenCollector is not None:
+			childrenCollector.extend( children )
 			return childrenCollector
-		else:
-			return self._nativePointer.children
+		return children
 
 	def _nativeLayer( self ):
 		"""
@@ -612,6 +619,16 @@ class StudiomaxSceneObject( AbstractSceneObject ):
 					AbstractSceneObject._typeOfNativeObject(nativeObject)))
 		return output
 
+	@classmethod
+	def _nativeIdentity(cls, nativeObject):
+		"""
+			\remarks	reimplements the AbstractSceneObject._nativeIdentity method to return the anim handle of the nativeObject. Anim handles
+						are never reused during a Max session.
+			\param		<Py3dsMax.mxs.Object> nativeObject
+			\return		<int> handle
+		"""
+		return mxs.getHandleByAnim(nativeObject)
+
 # register the symbol
 import cross3d
 cross3d.registerSymbol( 'SceneObject', StudiomaxSceneObject )
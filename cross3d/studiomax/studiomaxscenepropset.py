@@ -10,7 +10,7 @@
 #
 
 from Py3dsMax import mxs
-from cross3d.abstract.abstractscenepropset	import AbstractScenePropSet
+from cross3d.abstract.abstractscenepropset	import AbstractScenePropSet, PropSetCodec
 
 class StudiomaxScenePropSet( AbstractScenePropSet ):
 	def __eq__( self, other ):
@@ -75,29 +75,30 @@ class StudiomaxScenePropSet( AbstractScenePropSet ):
 				break
 		return True
 	
+	def _codec( self ):
+		"""
+			\remarks	returns the codec shared by the property sets with the same properties as this one
+			\return		<cross3d.abstract.abstractscenepropset.PropSetCodec>
+		"""
+		return PropSetCodec.forKeys( self._keys )
+	
 	def _setValueString( self, valueString ):
 		"""
-			\remarks	sets the value for these properties by the inputed value string, which contains the properties with a '|' separating the values
+			\remarks	sets the value for these properties by the inputed value string, as written by _valueString or by the legacy format
 			\param		valueString		<str>
 			\return		<bool> success
 		"""
-		values = str(valueString).split( '|' )
-		for index, key in enumerate(self._keys):
-			try:
-				self.setValue( key, eval(values[index]) )
-			except:
-				break
+		values = self._codec().decode( valueString, [ self._values.get( key ) for key in self._keys ] )
+		for key, value in zip( self._keys, values ):
+			self.setValue( key, value )
 		return True
 		
 	def _valueString( self ):
 		"""
-			\remarks	returns the current key/value pairing to a string separated by '|'
+			\remarks	returns the current values encoded as a string
 			\return		<str>
 		"""
-		output = []
-		for key in self._keys:
-			output.append( str(self.value(key)) )
-		return '|'.join( output )
+		return self._codec().encode( [ self._values.get( key ) for key in self._keys ] )
 		
 	#------------------------------------------------------------------------------------------------------------------------
 	# 												public methods
@@ -210,42 +211,15 @@ class StudiomaxSceneObjectPropSet( StudiomaxScenePropSet ):
 	
 	def _setValueString( self, valueString ):
 		"""
-			\remarks	sets the value for these properties by the inputed value string, which contains the properties with a '|' separating the values
+			\remarks	sets the value for these properties by the inputed value string, as written by _valueString or by the legacy format
 			\param		valueString		<str>
 			\return		<bool> success
 		"""
-		values = str(valueString).split( '|' )
-		for index, key in enumerate(self._keys):
-			cval = self._values.get( str(key) )
-			try:
-				val = values[index]
-			except IndexError:
-				val = cval
-			else:
-				if ( type(cval) == bool ):
-					val = val == '1' or val == 'True'
-				elif val != 'undefined':
-					val = eval(val)
-			self._values[str(key)] = val
+		# the values are stored as is, setValue would map the Mr_castModeFGIllum names again
+		values = self._codec().decode( valueString, [ self._values.get( key ) for key in self._keys ] )
+		self._values.update( zip( self._keys, values ) )
 		return True
 		
-	def _valueString( self ):
-		"""
-			\remarks	returns the current key/value pairing to a string separated by '|'
-			\return		<str>
-		"""
-		output = []
-		for key in self._keys:
-			val = self._values.get( str(key), 1 )
-			
-			# record booleans as integers
-			if ( type(val) == bool ):
-				val = int(val)
-				
-			output.append( str(val) )
-		
-		return '|'.join( output )
-		
 	def setValue( self, key, value ):
 		if ( key == 'Mr_castModeFGIllum' ):
 			value = self.castModeFgIllumDict.get( str(value).lower(), value )
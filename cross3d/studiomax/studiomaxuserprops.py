@@ -68,7 +68,14 @@ class StudiomaxUserProps(AbstractUserProps):
 		return item
 
 	def lookupProps(self):
-		string = mxs.getUserPropBuffer(self._nativePointer)
+		return self.parseBuffer(mxs.getUserPropBuffer(self._nativePointer))
+
+	@classmethod
+	def parseBuffer(cls, string):
+		"""
+			\remarks	parses a user prop buffer as returned by getUserPropBuffer
+			\return		<dict>
+		"""
 		keyValues = string.split('\r\n')
 		props = {}
 		for kv in keyValues:
@@ -79,7 +86,7 @@ class StudiomaxUserProps(AbstractUserProps):
 					split = kv.split(' ', 1)
 					if not len(split) == 2:
 						continue
-			props[self.unescapeKey(split[0])] = self.unescapeValue(split[1])
+			props[cls.unescapeKey(split[0])] = cls.unescapeValue(split[1])
 		return props
 	
 	@staticmethod
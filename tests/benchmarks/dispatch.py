@@ -0,0 +1,105 @@
+""" Measures the throughput of the signals Dispatch is built on, headless.
+
+The pure python signal bus is compared with PyQt4 signals when PyQt4 is available. Each back-end
+emits a signal without arguments and a signal with the arguments of objectRenamed to 10 connected
+slots, directly from the thread of the bus, then queued from a worker thread and delivered by
+processing the events of the bus thread.
+
+Usage:
+	python dispatch.py [--emits 100000] [--slots 10]
+"""
+
+import sys
+import time
+import argparse
+import threading
+
+from cross3d.classes.signalbus import ConnectionType, Signal, SignalBus
+
+class Receiver(object):
+	def __init__(self):
+		self.count = 0
+
+	def slot(self, *args):
+		self.count += 1
+
+
+def pythonBackend():
+	class Bus(SignalBus):
+		sceneInvalidated = Signal()
+		objectRenamed = Signal(str, str, object)
+
+	bus = Bus()
+	return bus, bus.processEvents
+
+
+def qtBackend():
+	from PyQt4.QtCore import QCoreApplication, QObject, pyqtSignal
+
+	class Bus(QObject):
+		sceneInvalidated = pyqtSignal()
+		objectRenamed = pyqtSignal(str, str, object)
+
+	application = QCoreApplication.instance() or QCoreApplication(sys.argv)
+	bus = Bus()
+	bus._application = application
+	return bus, application.processEvents
+
+
+def measure(label, emits, function):
+	start = time.time()
+	function()
+	seconds = time.time() - start
+	print('%-40s %10.0f emits/s' % (label, emits / seconds))
+
+
+def run(name, backend, emits, slotCount):
+	bus, processEvents = backend()
+	receivers = [Receiver() for index in range(slotCount)]
+	for receiver in receivers:
+		bus.sceneInvalidated.connect(receiver.slot)
+		bus.objectRenamed.connect(receiver.slot)
+	node = object()
+
+	def direct():
+		for index in xrange(emits):
+			bus.sceneInvalidated.emit()
+
+	def directArguments():
+		for index in xrange(emits):
+			bus.objectRenamed.emit('old', 'new', node)
+
+	def queued():
+		# Qt queues the calls of an auto connection made from another thread, like the bus does.
+		thread = threading.Thread(target=directArguments)
+		thread.start()
+		thread.join()
+		processEvents()
+
+	measure('%s direct, no arguments' % name, emits, direct)
+	measure('%s direct, 3 arguments' % name, emits, directArguments)
+	measure('%s queued from a thread, 3 arguments' % name, emits, queued)
+
+	expected = emits * 3
+	for receiver in receivers:
+		if receiver.count != expected:
+			print('%s: a slot was called %d times instead of %d' % (name, receiver.count, expected))
+			break
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--emits', type=int, default=100000)
+	parser.add_argument('--slots', type=int, default=10)
+	args = parser.parse_args()
+
+	run('python', pythonBackend, args.emits, args.slots)
+	try:
+		import PyQt4.QtCore
+	except ImportError:
+		print('PyQt4 is not available, the Qt back-end is not measured.')
+	else:
+		run('qt', qtBackend, args.emits, args.slots)
+
+if __name__ == '__main__':
+	main()
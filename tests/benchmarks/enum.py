@@ -0,0 +1,74 @@
+""" Measures the lookups of EnumGroup and of the legacy enum class.
+
+Compares the lookup tables built when the enums are created with the linear scans the
+lookups used to do.
+
+Usage:
+	python enum.py [--members 32] [--number 20000] [--repeat 5]
+"""
+
+import argparse
+import re
+import timeit
+
+from cross3d.enum import enum, Enum, EnumGroup
+
+
+def legacyFromLabel(group, label):
+	for e in group._ENUMERATORS:
+		if e.label == label:
+			return e
+
+
+def legacyDecode(group, number):
+	e = None
+	for member in group._ENUMERATORS:
+		if member & number:
+			e = e | member if e else member
+	return e
+
+
+def legacyToString(legacy, value):
+	return ' '.join(key for key in legacy._keys if key not in legacy._compound and value & legacy.value(key))
+
+
+def legacyLabelByValue(legacy, value):
+	for key in legacy._keys:
+		if legacy.__dict__[key] == value:
+			return ' '.join(re.findall('[A-Z]+[^A-Z]*', key))
+	return ''
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--members', type=int, default=32)
+	parser.add_argument('--number', type=int, default=20000)
+	parser.add_argument('--repeat', type=int, default=5)
+	args = parser.parse_args()
+
+	names = ['Member{}Type'.format(index) for index in range(args.members)]
+	Group = type('Group', (EnumGroup,), dict((name, Enum()) for name in names))
+	legacy = enum(*names)
+	lastLabel = Group._varNameToLabel(names[-1])
+	lastValue = legacy.value(names[-1])
+	composite = lastValue | 1
+
+	cases = (
+		('legacy EnumGroup.fromLabel', lambda: legacyFromLabel(Group, lastLabel)),
+		('EnumGroup.fromLabel', lambda: Group.fromLabel(lastLabel)),
+		('legacy EnumGroup(composite)', lambda: legacyDecode(Group, composite)),
+		('EnumGroup(composite)', lambda: Group(composite)),
+		('legacy enum.labelByValue', lambda: legacyLabelByValue(legacy, lastValue)),
+		('enum.labelByValue', lambda: legacy.labelByValue(lastValue)),
+		('legacy enum.toString', lambda: legacyToString(legacy, composite)),
+		('enum.toString', lambda: legacy.toString(composite)),
+		('enum.value (case insensitive)', lambda: legacy.value(names[-1].lower(), caseSensitive=False)),
+	)
+	print('{} members, {} calls, best of {}'.format(args.members, args.number, args.repeat))
+	for name, function in cases:
+		best = min(timeit.repeat(function, number=args.number, repeat=args.repeat))
+		print('\t%-32s %.4fs' % (name, best))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,60 @@
+""" Measures the cost of building the frame paths of a FileSequence.
+
+Compares FileSequence.paths and missingFrames with the previous implementation,
+which parsed the sequence name with a regular expression several times per frame.
+
+Usage:
+	python filesequence.py [--frames 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+
+from cross3d.classes.filesequence import FileSequence
+
+
+def legacyNameToken(sequence, key):
+	match = FileSequence._regex.match(sequence.name())
+	return match.groupdict().get(key, '') if match else ''
+
+
+def legacyPaths(sequence):
+	""" The per frame implementation FileSequence.paths used to have. """
+	paths = []
+	start = int(legacyNameToken(sequence, 'start'))
+	end = int(legacyNameToken(sequence, 'end'))
+	for frame in range(start, end + 1, sequence.step()):
+		padding = len(legacyNameToken(sequence, 'start'))
+		name = legacyNameToken(sequence, 'baseName') + legacyNameToken(sequence, 'separator') + str(frame).zfill(padding) + '.' + legacyNameToken(sequence, 'extension')
+		paths.append(os.path.normpath(os.path.join(sequence.basePath(), name)))
+	return paths
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--frames', type=int, default=10000)
+	parser.add_argument('--repeat', type=int, default=5)
+	args = parser.parse_args()
+
+	directory = tempfile.mkdtemp()
+	path = os.path.join(directory, 'Render.{:05d}-{:05d}.exr'.format(1, args.frames))
+	sequence = FileSequence(path)
+	assert list(sequence.paths()) == legacyPaths(sequence)
+
+	cases = (
+		('legacy paths', lambda: legacyPaths(sequence)),
+		('paths', lambda: list(sequence.paths())),
+		('paths (new sequence)', lambda: list(FileSequence(path).paths())),
+		('missingFrames', lambda: sequence.missingFrames()),
+	)
+	print('{} frames, best of {}'.format(args.frames, args.repeat))
+	for name, function in cases:
+		best = min(timeit.repeat(function, number=1, repeat=args.repeat))
+		print('\t%-22s %.4fs' % (name, best))
+	os.rmdir(directory)
+
+
+if __name__ == '__main__':
+	main()
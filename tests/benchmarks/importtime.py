@@ -0,0 +1,55 @@
+""" Measures the time it takes to import cross3d outside of any host software.
+
+Each import runs in a fresh interpreter. The lazy symbol registry is compared with
+CROSS3D_EAGER_SYMBOLS, which resolves all the symbols while importing like older
+versions did. The interpreter must not find any host module (Py3dsMax, maya, ...),
+so it stands in for a farm or batch process.
+
+Usage:
+	python importtime.py [--repeat 20] [--profile]
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+SCRIPT = 'import time; start = time.time(); import cross3d; print(time.time() - start)'
+
+
+def importTime(environment):
+	output = subprocess.check_output([sys.executable, '-c', SCRIPT], env=environment)
+	return float(output.strip().splitlines()[-1])
+
+
+def measure(label, environment, repeat):
+	times = sorted(importTime(environment) for index in range(repeat))
+	print('%-8s min %8.1f ms   median %8.1f ms' % (label, times[0] * 1000, times[len(times) // 2] * 1000))
+	return times[0]
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--repeat', type=int, default=20)
+	parser.add_argument('--profile', action='store_true', help='print the import report of a lazy import')
+	args = parser.parse_args()
+
+	root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+	environment = dict(os.environ)
+	environment['PYTHONPATH'] = os.pathsep.join(filter(None, [root, environment.get('PYTHONPATH')]))
+	for name in ('CROSS3D_DEBUG_MODULE', 'CROSS3D_EAGER_SYMBOLS', 'CROSS3D_IMPORT_PROFILE'):
+		environment.pop(name, None)
+
+	# The first import compiles the modules, it is not measured.
+	importTime(environment)
+
+	eager = dict(environment, CROSS3D_EAGER_SYMBOLS='1')
+	lazyTime = measure('lazy', environment, args.repeat)
+	eagerTime = measure('eager', eager, args.repeat)
+	print('lazy import is %.1fx faster' % (eagerTime / lazyTime))
+
+	if args.profile:
+		subprocess.check_call([sys.executable, '-c', 'import cross3d'], env=dict(environment, CROSS3D_IMPORT_PROFILE='1'))
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,102 @@
+""" Measures the cost of reading and writing property set value strings.
+
+Compares PropSetCodec with the previous implementation, which joined the str()
+of each value with '|' and evaluated each field when reading them back.
+
+Usage:
+	python propsetcodec.py [--records 100000] [--distinct 500] [--repeat 3]
+"""
+
+import argparse
+import random
+import timeit
+
+from cross3d.abstract.abstractscenepropset import PropSetCodec
+
+# The properties and defaults of a StudiomaxSceneObjectPropSet.
+DEFAULTS = [('renderable', True), ('inheritVisibility', True), ('primaryVisibility', True),
+			('secondaryVisibility', True), ('receiveShadows', True), ('castShadows', True),
+			('applyAtmospherics', True), ('renderOccluded', False), ('gbufferchannel', 0),
+			('VRay_MoBlur_GeomSamples', 2), ('VRay_GI_Generate', True), ('VRay_GI_Receive', True),
+			('VRay_GI_Multipier', 1), ('VRay_GI_GenerateMultipier', 1), ('VRay_Caustics_Generate', True),
+			('VRay_Caustics_Receive', True), ('VRay_Caustics_Multipier', 1), ('VRay_MoBlur_DefaultGeomSamples', True),
+			('VRay_Matte_Enable', False), ('VRay_Matte_Alpha', 1), ('VRay_Matte_Shadows', False),
+			('VRay_Matte_ShadowAlpha', False), ('VRay_Matte_ShadowBrightness', 1), ('VRay_Matte_ReflectionAmount', 1),
+			('VRay_Matte_RefractionAmount', 1), ('VRay_Matte_GIAmount', 1), ('VRay_Matte_GI_OtherMattes', True),
+			('VRay_Surface_Priority', 0), ('VRay_GI_VisibleToGI', True), ('VRay_GI_VisibleToReflections', True),
+			('VRay_GI_VisibleToRefractions', True), ('Mr_castModeFGIllum', 1), ('MR_rcvFGIllum', True),
+			('GenerateGlobalIllum', True), ('RcvGlobalIllum', True)]
+KEYS = [key for key, value in DEFAULTS]
+
+
+def legacyValueString(values):
+	""" The implementation StudiomaxSceneObjectPropSet._valueString used to have. """
+	return '|'.join(str(int(value) if type(value) == bool else value) for value in values)
+
+
+def legacySetValueString(valueString, current):
+	""" The implementation StudiomaxSceneObjectPropSet._setValueString used to have. """
+	values = str(valueString).split('|')
+	output = []
+	for index, cval in enumerate(current):
+		try:
+			val = values[index]
+		except IndexError:
+			val = cval
+		else:
+			if (type(cval) == bool):
+				val = val == '1' or val == 'True'
+			elif val != 'undefined':
+				val = eval(val)
+		output.append(val)
+	return output
+
+
+def randomValues(generator):
+	values = []
+	for key, default in DEFAULTS:
+		if type(default) == bool:
+			values.append(generator.random() < 0.5)
+		else:
+			values.append(generator.choice([0, 1, 2, 3, 0.5]))
+	return values
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--records', type=int, default=100000)
+	parser.add_argument('--distinct', type=int, default=500, help='number of distinct records, objects share them')
+	parser.add_argument('--repeat', type=int, default=3)
+	args = parser.parse_args()
+
+	generator = random.Random(0)
+	states = [randomValues(generator) for index in range(args.distinct)]
+	states = [states[generator.randrange(args.distinct)] for index in range(args.records)]
+	defaults = [value for key, value in DEFAULTS]
+	legacyRecords = [legacyValueString(values) for values in states]
+	codec = PropSetCodec(KEYS)
+	records = [codec.encode(values) for values in states]
+
+	assert [codec.decode(record, defaults) for record in legacyRecords] == [legacySetValueString(record, defaults) for record in legacyRecords]
+	assert [codec.decode(record, defaults) for record in records] == states
+
+	def decodeCold(records):
+		codec.clearCache()
+		return [codec.decode(record, defaults) for record in records]
+
+	cases = (
+		('legacy write', lambda: [legacyValueString(values) for values in states]),
+		('codec write', lambda: [codec.encode(values) for values in states]),
+		('legacy read (eval)', lambda: [legacySetValueString(record, defaults) for record in legacyRecords]),
+		('codec read legacy', lambda: decodeCold(legacyRecords)),
+		('codec read', lambda: decodeCold(records)),
+		('codec read (no cache)', lambda: [codec._parse(record) for record in records]),
+	)
+	print('{} records, {} distinct, best of {}'.format(args.records, args.distinct, args.repeat))
+	for name, function in cases:
+		best = min(timeit.repeat(function, number=1, repeat=args.repeat))
+		print('\t%-24s %.4fs' % (name, best))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,128 @@
+""" Compares the minidom and ElementTree backends of cross3d.migrate.XML.
+
+Reports load, parse, serialize and save times and the memory used to hold the
+loaded document. Each backend runs in its own process so the memory numbers
+are not polluted by the other backend.
+
+Usage:
+	python xmlbackends.py [path/to/layerState.xml] [--layers 200] [--objects 250]
+
+If no file is provided a synthetic layer state document is generated.
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKENDS = ('minidom', 'etree')
+
+
+def buildSceneState(path, layers, objects):
+	""" Writes a document shaped like AbstractScene.recordLayerState output. """
+	from cross3d.migrate.XML import ETreeDocument
+	doc = ETreeDocument()
+	root = doc.addNode('layerState')
+	for layerIndex in range(layers):
+		layer = root.addNode('layer')
+		layer.setAttribute('name', 'Layer_%04d' % layerIndex)
+		layer.setAttribute('id', layerIndex)
+		layer.recordProperty('visible', bool(layerIndex % 2))
+		layer.recordProperty('settings', {'wireColor': [layerIndex % 255, 128, 64], 'renderable': True, 'opacity': 0.75})
+		for objectIndex in range(objects):
+			obj = layer.addNode('object')
+			obj.setAttribute('name', 'Object_%04d_%04d' % (layerIndex, objectIndex))
+			obj.recordProperty('props', {'primaryVisibility': True, 'motionBlur': 1.0, 'tag': 'hero|geo'})
+	doc.save(path)
+
+
+def _memory():
+	""" Returns the current process peak memory in KB, or None if it can't be measured. """
+	try:
+		import resource
+		return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	except ImportError:
+		return None
+
+
+def _timed(method, *args):
+	start = time.time()
+	result = method(*args)
+	return result, time.time() - start
+
+
+def runBackend(backend, path):
+	os.environ['CROSS3D_XML_BACKEND'] = backend
+	from cross3d.migrate import XML
+	if XML.backend != backend:
+		return {'backend': backend, 'error': 'backend is not available'}
+
+	with open(path, 'rb') as f:
+		text = f.read()
+
+	before = _memory()
+	doc = XML.XMLDocument()
+	_, loadTime = _timed(doc.load, path)
+	after = _memory()
+
+	other = XML.XMLDocument()
+	_, parseTime = _timed(other.parse, text.decode('utf-8'))
+	del other
+	gc.collect()
+
+	_, traverseTime = _timed(lambda: [child.restoreProperty('props') for layer in doc.root().children() for child in layer.children()])
+	_, serializeTime = _timed(doc.toxml)
+	out = tempfile.mktemp(suffix='.xml')
+	_, saveTime = _timed(doc.save, out, True)
+	os.remove(out)
+
+	return {
+		'backend': backend,
+		'load': loadTime,
+		'parse': parseTime,
+		'traverse': traverseTime,
+		'serialize': serializeTime,
+		'save (pretty)': saveTime,
+		'memory (KB)': (after - before) if before is not None else None,
+	}
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('path', nargs='?')
+	parser.add_argument('--layers', type=int, default=200)
+	parser.add_argument('--objects', type=int, default=250)
+	parser.add_argument('--backend', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.backend:
+		print(json.dumps(runBackend(args.backend, args.path)))
+		return
+
+	path = args.path
+	if not path:
+		path = tempfile.mktemp(suffix='.xml')
+		buildSceneState(path, args.layers, args.objects)
+	print('Document: %s (%.1f MB)' % (path, os.path.getsize(path) / 1048576.0))
+
+	for backend in BACKENDS:
+		output = subprocess.check_output([sys.executable, __file__, path, '--backend', backend])
+		result = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+		print('')
+		print(result.pop('backend'))
+		for key in sorted(result):
+			value = result[key]
+			if isinstance(value, float):
+				value = '%.3fs' % value
+			print('\t%-16s %s' % (key, value))
+
+	if not args.path:
+		os.remove(path)
+
+
+if __name__ == '__main__':
+	main()
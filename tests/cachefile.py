@@ -0,0 +1,101 @@
+import struct
+
+import pytest
+
+from cross3d.classes.cachefile import PC2_SIGNATURE, PointCacheFile, readHeader, scanHeaders
+
+POINTS = 4
+SAMPLES = 5
+
+def pointData(samples=SAMPLES, points=POINTS):
+	""" Returns the positions of each point of each sample, x is the sample and y the point. """
+	return [[(float(sample), float(point), 0.5) for point in range(points)] for sample in range(samples)]
+
+def writePC2(path, samples, startFrame=10.0, sampleRate=0.5, signature=PC2_SIGNATURE, truncate=0):
+	points = len(samples[0]) if samples else POINTS
+	data = struct.pack('<12siiffi', signature, 1, points, startFrame, sampleRate, len(samples))
+	for sample in samples:
+		for point in sample:
+			data += struct.pack('<fff', *point)
+	with open(path, 'wb') as fle:
+		fle.write(data[:len(data) - truncate])
+	return path
+
+@pytest.fixture
+def cachePath(tmpdir):
+	return writePC2(str(tmpdir.join('cache.pc2')), pointData())
+
+def test_read_header(cachePath):
+	header = readHeader(cachePath)
+	assert header.version == 1
+	assert header.pointCount == POINTS
+	assert header.sampleCount == SAMPLES
+	assert header.startFrame == 10.0
+	assert header.sampleRate == 0.5
+	assert header.endFrame == 12.0
+	assert header.dataSize == SAMPLES * POINTS * 12
+
+def test_invalid_files(tmpdir):
+	invalid = writePC2(str(tmpdir.join('invalid.pc2')), pointData(), signature='POINTCACHE1\0')
+	with pytest.raises(ValueError):
+		readHeader(invalid)
+	small = str(tmpdir.join('small.pc2'))
+	with open(small, 'wb') as fle:
+		fle.write(PC2_SIGNATURE)
+	with pytest.raises(ValueError):
+		readHeader(small)
+	with pytest.raises(IOError):
+		readHeader(str(tmpdir.join('missing.pc2')))
+
+def test_scan_headers(cachePath, tmpdir):
+	invalid = writePC2(str(tmpdir.join('invalid.pc2')), pointData(), signature='NOTACACHE\0\0\0')
+	missing = str(tmpdir.join('missing.pc2'))
+	headers = scanHeaders([cachePath, invalid, cachePath, missing])
+	assert sorted(headers) == sorted([cachePath, invalid, missing])
+	assert headers[cachePath].sampleCount == SAMPLES
+	assert headers[invalid] is None
+	assert headers[missing] is None
+
+def test_samples(cachePath):
+	np = pytest.importorskip('numpy')
+	with PointCacheFile(cachePath) as cache:
+		assert len(cache) == SAMPLES
+		assert cache.path() == cachePath
+		samples = cache.samples()
+		assert samples.shape == (SAMPLES, POINTS, 3)
+		assert samples.dtype == np.dtype('<f4')
+		assert (samples == np.array(pointData(), dtype='<f4')).all()
+		# The samples are views into the mapped file, not copies.
+		assert not samples.flags.owndata and not samples.flags.writeable
+		assert cache.samples() is samples
+
+		sample = cache.sample(3)
+		assert sample.shape == (POINTS, 3)
+		assert (sample[:, 0] == 3).all()
+		assert (sample[:, 1] == np.arange(POINTS)).all()
+		with pytest.raises(IndexError):
+			cache.sample(SAMPLES)
+		with pytest.raises(IndexError):
+			cache.sample(-1)
+
+def test_frames(cachePath):
+	pytest.importorskip('numpy')
+	with PointCacheFile(cachePath) as cache:
+		# Samples are half a frame apart from frame 10, frames outside the range are clamped.
+		assert [cache.sampleIndex(frame) for frame in (9, 10, 10.4, 10.6, 11, 12, 20)] == [0, 0, 1, 1, 2, 4, 4]
+		assert (cache.frame(11)[:, 0] == 2).all()
+
+def test_truncated(tmpdir):
+	path = writePC2(str(tmpdir.join('truncated.pc2')), pointData(), truncate=4)
+	# The header alone is still readable.
+	assert readHeader(path).sampleCount == SAMPLES
+	with pytest.raises(ValueError):
+		PointCacheFile(path)
+
+def test_empty(tmpdir):
+	pytest.importorskip('numpy')
+	path = writePC2(str(tmpdir.join('empty.pc2')), [])
+	with PointCacheFile(path) as cache:
+		assert len(cache) == 0
+		assert cache.samples().shape == (0, POINTS, 3)
+		assert cache.sampleIndex(10) == -1
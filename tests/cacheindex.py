@@ -0,0 +1,85 @@
+import pytest
+
+from cross3d.classes.cacheindex import CacheIndex
+
+class Item(object):
+	""" Counts the host calls a CacheIndex makes. """
+	calls = 0
+
+	def __init__(self, uid, name):
+		self.uid = uid
+		self._name = name
+
+	@property
+	def name(self):
+		Item.calls += 1
+		return self._name
+
+def uniqueId(item):
+	Item.calls += 1
+	return item.uid
+
+@pytest.fixture
+def items():
+	return [Item(index, 'mtl%d' % index) for index in range(100)]
+
+@pytest.fixture
+def index(items):
+	return CacheIndex(items + [None], uniqueId=uniqueId, name=lambda item: item.name)
+
+def test_lookups_do_not_scan(index, items):
+	Item.calls = 0
+	for item in items:
+		assert index.find(str(item.uid)) is item
+	assert Item.calls == 0
+	assert index.find('mtl42') is items[42]
+	assert Item.calls == 1
+
+def test_first_item_wins(items):
+	twin = Item(500, 'mtl3')
+	index = CacheIndex(items[:5] + [twin], uniqueId=uniqueId, name=lambda item: item.name)
+	assert index.find('mtl3') is items[3]
+	assert index.find('500') is twin
+
+def test_add(index, items):
+	assert not index.add(items[0])
+	assert not index.add(None)
+	assert not index.isDirty()
+	item = Item(1000, 'new')
+	assert index.add(item)
+	assert index.isDirty()
+	assert index.find('1000') is item
+	assert index.items()[-1] is item
+	assert len(index) == 102
+	index.setDirty(False)
+	assert not index.isDirty()
+
+def test_renamed(index, items):
+	items[7]._name = 'renamed'
+	assert index.find('mtl7') is None
+	assert index.find('renamed') is items[7]
+	items[8]._name = 'mtl9'
+	items[9]._name = 'other'
+	assert index.find('mtl9') is items[8]
+
+def test_find_all(index, items):
+	Item.calls = 0
+	found = index.findAll(['3', 'mtl4', 'missing', 'mtl5'], default=False)
+	assert found == [items[3], items[4], False, items[5]]
+	# One name read per item plus a check per name hit.
+	assert Item.calls == len(items) + 2
+
+def test_find_all_without_miss(index, items):
+	Item.calls = 0
+	assert index.findAll(['3', 'mtl4', 'mtl5']) == [items[3], items[4], items[5]]
+	# The names are only read again when a key misses.
+	assert Item.calls == 2
+	items[6]._name = 'renamed'
+	assert index.findAll(['renamed', 'mtl6', 'mtl7'], default=False) == [items[6], False, items[7]]
+
+def test_reset(index, items):
+	index.add(Item(1000, 'new'))
+	index.reset(items[:2])
+	assert not index.isDirty()
+	assert len(index) == 2
+	assert index.find('50') is None
@@ -0,0 +1,109 @@
+import pytest
+
+import cross3d
+
+class FakeNode(object):
+	def __init__(self, name):
+		self.name = name
+		self.hidden = False
+		self.frozen = False
+
+
+class FakeScene(cross3d.Scene):
+	""" A back-end over in-memory nodes, recording the bulk calls the collection makes. """
+
+	def __init__(self, nodes):
+		super(FakeScene, self).__init__()
+		self.nodes = list(nodes)
+		self.calls = []
+
+	def _hideNativeObjects(self, nativeObjects, state):
+		self.calls.append(('hide', list(nativeObjects), state))
+		for node in nativeObjects:
+			node.hidden = state
+		return True
+
+	def _freezeNativeObjects(self, nativeObjects, state):
+		self.calls.append(('freeze', list(nativeObjects), state))
+		for node in nativeObjects:
+			node.frozen = state
+		return True
+
+	def _removeNativeObjects(self, nativeObjects):
+		self.calls.append(('remove', list(nativeObjects)))
+		for node in nativeObjects:
+			self.nodes.remove(node)
+		return True
+
+	def translate(self, objects, axes, relative=False):
+		self.calls.append(('translate', [obj.nativePointer() for obj in objects], axes, relative))
+		return True
+
+
+class FakeObject(cross3d.SceneObject):
+	""" A wrapper keeping its user props in memory. """
+
+	props = {}
+
+	def userProps(self):
+		return self.props.setdefault(self.nativePointer(), {})
+
+
+@pytest.fixture
+def scene():
+	return FakeScene([FakeNode('node%d' % index) for index in range(5)])
+
+def test_container(scene):
+	collection = cross3d.Collection(scene, scene.nodes)
+	assert len(collection) == 5
+	assert collection.nativeObjects() == scene.nodes
+
+	# Wrappers are only created when items are accessed, and then kept.
+	assert collection._objects == [None] * 5
+	first = collection[0]
+	assert isinstance(first, cross3d.SceneObject)
+	assert first.nativePointer() is scene.nodes[0]
+	assert collection[0] is first
+	assert [obj.nativePointer() for obj in collection[1:3]] == scene.nodes[1:3]
+
+	del collection[0]
+	assert collection.nativeObjects() == scene.nodes[1:]
+	collection.insert(0, first)
+	assert collection.nativeObjects() == scene.nodes
+	assert collection[0] is first
+	collection[1] = scene.nodes[4]
+	assert collection.nativeObjects()[1] is scene.nodes[4]
+	collection.append(scene.nodes[1])
+	assert len(collection) == 6
+
+def test_bulk_operations(scene):
+	nodes = list(scene.nodes)
+	collection = cross3d.Collection(scene, [cross3d.SceneObject(scene, node) for node in nodes[:3]] + nodes[3:])
+	assert collection.setHidden(True)
+	assert collection.setFrozen(True)
+	# A single call to the back-end for all the objects.
+	assert scene.calls == [('hide', nodes, True), ('freeze', nodes, True)]
+	assert all(node.hidden and node.frozen for node in nodes)
+
+	assert collection.delete()
+	assert scene.calls[-1] == ('remove', nodes)
+	assert scene.nodes == []
+	assert len(collection) == 0
+
+def test_translate(scene):
+	collection = cross3d.Collection(scene, scene.nodes)
+	# Without a software specific implementation, the objects are given to Scene.translate at once.
+	assert collection.translate([1, 2, 3], relative=True)
+	assert scene.calls == [('translate', scene.nodes, [1, 2, 3], True)]
+
+	# The abstract scene does not translate anything, and does not call back into the collection.
+	assert not cross3d.Collection(cross3d.Scene(), scene.nodes).translate([1, 2, 3])
+
+def test_user_props(scene):
+	objects = [FakeObject(scene, node) for node in scene.nodes]
+	collection = cross3d.Collection(scene, objects)
+	assert collection.setUserProps({'collectionTest': 12})
+	assert collection.userProps() == [{'collectionTest': 12}] * 5
+	# The returned dictionaries are copies.
+	collection.userProps()[0]['collectionTest'] = 0
+	assert objects[0].userProps()['collectionTest'] == 12
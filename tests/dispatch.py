@@ -0,0 +1,127 @@
+import gc
+import threading
+
+import pytest
+
+import cross3d
+from cross3d.classes.dispatch import signalBackend
+
+pythonBackend = pytest.mark.skipif(signalBackend != 'python', reason='needs the python signal back-end')
+
+class Receiver(object):
+	def __init__(self):
+		self.calls = []
+
+	def slot(self, *args):
+		self.calls.append(args)
+
+
+@pytest.fixture
+def callbacks():
+	""" Records the application callbacks Dispatch connects and disconnects. """
+	application = cross3d.application
+	calls = []
+	application.connectCallback = lambda signal: calls.append(('connect', signal))
+	application.disconnectCallback = lambda signal: calls.append(('disconnect', signal))
+	yield calls
+	del application.connectCallback
+	del application.disconnectCallback
+
+def test_connect_disconnect(callbacks):
+	dispatch = cross3d.dispatch
+	receiver = Receiver()
+	dispatch.connect('sceneSaveFinished', receiver.slot)
+	assert dispatch.isConnected() and dispatch.isConnected('sceneSaveFinished')
+	assert callbacks == [('connect', 'sceneSaveFinished')]
+
+	dispatch.dispatch('sceneSaveFinished', 'scene.max')
+	assert receiver.calls == [('scene.max',)]
+
+	dispatch.disconnect('sceneSaveFinished', receiver.slot)
+	dispatch.dispatch('sceneSaveFinished', 'scene.max')
+	assert receiver.calls == [('scene.max',)]
+	assert callbacks[-1] == ('disconnect', 'sceneSaveFinished')
+	assert not dispatch.isConnected()
+
+def test_linked_signals(callbacks):
+	dispatch = cross3d.dispatch
+	receiver = Receiver()
+	dispatch.connect('sceneInvalidated', receiver.slot)
+	try:
+		# The application links sceneInvalidated to the file signals, their callbacks are connected instead.
+		assert ('connect', 'sceneOpenFinished') in callbacks
+		assert ('connect', 'sceneInvalidated') not in callbacks
+		dispatch.dispatch('sceneOpenFinished', 'scene.max')
+		assert receiver.calls == [()]
+	finally:
+		dispatch.disconnect('sceneInvalidated', receiver.slot)
+	assert ('disconnect', 'sceneOpenFinished') in callbacks
+
+def test_block_signals(callbacks):
+	dispatch = cross3d.dispatch
+	receiver = Receiver()
+	dispatch.connect('layerCreated', receiver.slot)
+	try:
+		dispatch.blockSignals(True)
+		dispatch.dispatch('layerCreated')
+		dispatch.blockSignals(False)
+		assert receiver.calls == []
+		dispatch.dispatch('layerCreated')
+		assert receiver.calls == [()]
+	finally:
+		dispatch.disconnect('layerCreated', receiver.slot)
+
+def test_dispatch_function(callbacks):
+	dispatch = cross3d.dispatch
+	receiver = Receiver()
+	dispatch.connect('viewportRedrawn', receiver.slot)
+	try:
+		dispatch.dispatchFunction('viewportRedrawn')
+		assert receiver.calls == [()]
+	finally:
+		dispatch.disconnect('viewportRedrawn', receiver.slot)
+
+@pythonBackend
+def test_deleted_receivers(callbacks):
+	dispatch = cross3d.dispatch
+	receiver = Receiver()
+	calls = receiver.calls
+	dispatch.connect('layerDeleted', receiver.slot)
+	dispatch.dispatch('layerDeleted')
+	assert calls == [()]
+
+	# The connection does not keep the receiver alive and goes away with it.
+	del receiver
+	gc.collect()
+	dispatch.dispatch('layerDeleted')
+	assert calls == [()]
+	assert not dispatch.isConnected('layerDeleted')
+	assert callbacks[-1] == ('disconnect', 'layerDeleted')
+
+@pythonBackend
+def test_custom_signals():
+	dispatch = cross3d.dispatch
+	receiver = Receiver()
+	dispatch.signal('customValueChanged').connect(receiver.slot)
+	try:
+		dispatch.dispatch('customValueChanged', 'node', 'value')
+		dispatch.dispatchObject('customValueChanged', None, 'value')
+		assert receiver.calls == [('node', 'value'), (None, 'value')]
+	finally:
+		dispatch.signal('customValueChanged').disconnect(receiver.slot)
+
+@pythonBackend
+def test_signals_from_other_threads(callbacks):
+	dispatch = cross3d.dispatch
+	receiver = Receiver()
+	dispatch.connect('sceneSaveFinished', receiver.slot)
+	try:
+		thread = threading.Thread(target=dispatch.dispatch, args=('sceneSaveFinished', 'scene.max'))
+		thread.start()
+		thread.join()
+		# Delivered in the thread of Dispatch when its events are processed.
+		assert receiver.calls == []
+		dispatch.processEvents()
+		assert receiver.calls == [('scene.max',)]
+	finally:
+		dispatch.disconnect('sceneSaveFinished', receiver.slot)
@@ -0,0 +1,32 @@
+from cross3d.enum import enum, Enum, EnumGroup
+
+class Suit(Enum):
+	pass
+
+class Suits(EnumGroup):
+	Hearts = Suit()
+	Spades = Suit()
+	Clubs = Suit()
+	DiamondsRed = Suit()
+
+def test_enum_group_lookups():
+	assert Suits.fromLabel('Diamonds Red') is Suits.DiamondsRed
+	assert Suits.fromValue(4) is Suits.Clubs
+	assert Suits.fromLabel('Joker', default=0) == 0
+	composite = Suits(5)
+	assert int(composite) == 5
+	assert composite & Suits.Hearts and composite & Suits.Clubs
+	assert Suits(5) is composite
+	assert Suits(0) is None
+
+def test_legacy_lookups():
+	colors = enum('Red', 'Yellow', 'BlueSky', White=7, Alias=2)
+	assert colors.keyByValue(2) == 'Yellow'
+	assert colors.indexByValue(4) == 2
+	assert colors.labelByValue(4) == 'Blue Sky'
+	assert colors.labels()[:3] == ['Red', 'Yellow', 'Blue Sky']
+	assert colors.value('bluesky', caseSensitive=False) == 4
+	assert colors.value('ALL', caseSensitive=False) == colors.All
+	assert colors.toString(5) == 'Red BlueSky'
+	assert colors.toString(0) == 'None'
+	assert colors.keyByIndex(10) == ''
@@ -0,0 +1,187 @@
+import os
+import time
+
+import pytest
+
+# The Dispatch tests run on the python signal back-end unless another one was requested.
+os.environ.setdefault('CROSS3D_SIGNAL_BACKEND', 'python')
+
+import cross3d
+from cross3d.classes.dispatch import signalBackend
+from cross3d.classes.eventcoalescer import EventCoalescer
+
+pythonBackend = pytest.mark.skipif(signalBackend != 'python', reason='needs the python signal back-end')
+
+def test_deduplication():
+	coalescer = EventCoalescer()
+	assert coalescer.add('objectCreated', ('a',), key=1)
+	assert coalescer.add('objectCreated', ('b',), key=2)
+	assert not coalescer.add('objectCreated', ('a',), key=1)
+	assert coalescer.add('newObject')
+	assert not coalescer.add('newObject')
+	assert len(coalescer) == 3
+	assert coalescer.received == 5
+	assert coalescer.dropped == 2
+
+def test_flush_order():
+	coalescer = EventCoalescer()
+	coalescer.add('selectionChanged')
+	coalescer.add('objectCreated', ('a',))
+	coalescer.add('selectionChanged')
+	coalescer.add('objectCreated', ('b',))
+	assert coalescer.flush() == [('selectionChanged', [()]), ('objectCreated', [('a',), ('b',)])]
+	assert len(coalescer) == 0
+	assert coalescer.flush() == []
+
+def test_unhashable_payload():
+	coalescer = EventCoalescer()
+	assert coalescer.add('valueChanged', ([1], 'x'))
+	assert coalescer.add('valueChanged', ([1], 'x'))
+	assert len(coalescer) == 2
+
+class FakeNode(object):
+	def __init__(self, name):
+		self.name = name
+
+
+class Recorder(object):
+	""" Connects to Dispatch signals and records their emits in order. """
+
+	def __init__(self, dispatch, signals):
+		self.dispatch = dispatch
+		self.events = []
+		self._slots = {}
+		for signal in signals:
+			slot = self._slots[signal] = self._slot(signal)
+			dispatch.connect(signal, slot)
+
+	def _slot(self, signal):
+		def slot(*args):
+			self.events.append((signal, tuple(self._native(arg) for arg in args)))
+		return slot
+
+	@classmethod
+	def _native(cls, value):
+		if isinstance(value, cross3d.SceneObject):
+			return value.nativePointer().name
+		if isinstance(value, list):
+			return [cls._native(item) for item in value]
+		return value
+
+	def signals(self):
+		return [signal for signal, args in self.events]
+
+	def disconnect(self):
+		for signal, slot in self._slots.iteritems():
+			self.dispatch.disconnect(signal, slot)
+
+
+@pytest.fixture
+def dispatch():
+	dispatch = cross3d.dispatch
+	interval = dispatch._coalescingInterval
+	# Events are only flushed by endCoalescing and flushEvents.
+	dispatch.setCoalescingInterval(0)
+	yield dispatch
+	dispatch.setCoalescingInterval(interval)
+	dispatch.coalesceFileOperations = False
+	while dispatch.isCoalescing():
+		dispatch.endCoalescing()
+
+def test_dispatch_deduplication(dispatch):
+	a, b = FakeNode('a'), FakeNode('b')
+	recorder = Recorder(dispatch, ['objectCreated', 'objectsCreated', 'selectionChanged'])
+	try:
+		dispatch.beginCoalescing()
+		dispatch.dispatchObject('objectCreated', a)
+		dispatch.dispatchObject('objectCreated', b)
+		dispatch.dispatchObject('objectCreated', a)
+		for index in range(3):
+			dispatch.dispatch('selectionChanged')
+		assert recorder.events == []
+		dispatch.endCoalescing()
+		assert not dispatch.isCoalescing()
+		# Each event once per object, followed by the batched signal.
+		assert recorder.events == [('objectCreated', ('a',)), ('objectCreated', ('b',)),
+									('objectsCreated', (['a', 'b'],)), ('selectionChanged', ())]
+	finally:
+		recorder.disconnect()
+
+def test_nested_coalescing(dispatch):
+	recorder = Recorder(dispatch, ['layerCreated'])
+	try:
+		dispatch.beginCoalescing()
+		dispatch.beginCoalescing()
+		dispatch.dispatch('layerCreated')
+		dispatch.endCoalescing()
+		assert dispatch.isCoalescing() and recorder.events == []
+		dispatch.endCoalescing()
+		assert recorder.signals() == ['layerCreated']
+	finally:
+		recorder.disconnect()
+
+def test_flush_events(dispatch):
+	recorder = Recorder(dispatch, ['layerDeleted'])
+	try:
+		dispatch.beginCoalescing()
+		dispatch.dispatch('layerDeleted')
+		dispatch.flushEvents()
+		assert recorder.signals() == ['layerDeleted']
+		# Events are still queued after a flush until the last endCoalescing.
+		dispatch.dispatch('layerDeleted')
+		assert recorder.signals() == ['layerDeleted']
+		dispatch.endCoalescing()
+		assert recorder.signals() == ['layerDeleted', 'layerDeleted']
+	finally:
+		recorder.disconnect()
+
+def test_linked_signals(dispatch):
+	a, b = FakeNode('a'), FakeNode('b')
+	recorder = Recorder(dispatch, ['newObject', 'sceneOpenFinished', 'sceneInvalidated'])
+	try:
+		dispatch.beginCoalescing()
+		dispatch.dispatchObject('objectCreated', a)
+		dispatch.dispatchObject('objectCloned', b)
+		# Signals that are not coalesced and the signals linked to them are emitted right away.
+		dispatch.dispatch('sceneOpenFinished', 'scene.max')
+		assert recorder.events == [('sceneOpenFinished', ('scene.max',)), ('sceneInvalidated', ())]
+		dispatch.endCoalescing()
+		# newObject is linked to objectCreated and objectCloned, it is emitted once per flush.
+		assert recorder.signals() == ['sceneOpenFinished', 'sceneInvalidated', 'newObject']
+	finally:
+		recorder.disconnect()
+
+def test_coalesce_file_operations(dispatch):
+	a = FakeNode('a')
+	dispatch.coalesceFileOperations = True
+	recorder = Recorder(dispatch, ['scenePreInvalidated', 'sceneInvalidated', 'objectAdded', 'objectsAdded'])
+	try:
+		dispatch.dispatch('sceneMergeRequested')
+		assert dispatch.isCoalescing()
+		for index in range(3):
+			dispatch.dispatchObject('objectAdded', a)
+		assert recorder.signals() == ['scenePreInvalidated']
+		dispatch.dispatch('sceneMergeFinished')
+		assert not dispatch.isCoalescing()
+		assert recorder.events == [('scenePreInvalidated', ()), ('sceneInvalidated', ()),
+									('objectAdded', ('a',)), ('objectsAdded', (['a'],))]
+	finally:
+		recorder.disconnect()
+
+@pythonBackend
+def test_coalescing_interval(dispatch):
+	recorder = Recorder(dispatch, ['layersModified'])
+	try:
+		dispatch.setCoalescingInterval(10)
+		dispatch.beginCoalescing()
+		dispatch.dispatch('layersModified')
+		dispatch.processEvents()
+		assert recorder.events == []
+		time.sleep(0.05)
+		# The flush timer fires while still coalescing.
+		dispatch.processEvents()
+		assert recorder.signals() == ['layersModified']
+		dispatch.endCoalescing()
+		assert recorder.signals() == ['layersModified']
+	finally:
+		recorder.disconnect()
@@ -0,0 +1,111 @@
+import os
+import time
+
+import pytest
+
+from cross3d import Exceptions
+from cross3d.abstract.external import External
+from cross3d.classes.externaljob import ExternalJob, JobQueue, waitForJobs
+
+# External.jobCommand runs the job in a plain python interpreter instead of a 3d application.
+def standInCommand(runnerPath, directory):
+	return External.jobCommand(runnerPath, directory)
+
+# Blocks the job until the test creates the file.
+BLOCKING_SCRIPT = '''
+import os, time
+while not os.path.exists(%r):
+	time.sleep(0.05)
+result = 'released'
+'''
+
+@pytest.fixture
+def queue():
+	return JobQueue(maxConcurrent=1)
+
+def test_submit(queue):
+	job = External.submit('print "hello"\nresult = 6 * 7', queue=queue)
+	assert isinstance(job, ExternalJob)
+	assert job.result(30) == 42
+	assert job.state() == ExternalJob.Finished
+	assert job.done() and job.exitCode() == 0
+	assert 'hello' in job.log()
+
+def test_script_path(queue, tmpdir):
+	script = tmpdir.join('job.py')
+	script.write('result = __file__')
+	job = queue.submit(ExternalJob(str(script), commandBuilder=standInCommand))
+	assert job.result(30) == str(script)
+
+def test_failure(queue):
+	job = External.submit('raise ValueError("bad value")', queue=queue, keepFiles=False)
+	with pytest.raises(Exceptions.ScriptFailed) as info:
+		job.result(30)
+	assert 'ValueError: bad value' in str(info.value)
+	assert job.state() == ExternalJob.Failed
+	# The logs are read before the job directory is removed.
+	assert 'Traceback' in job.log()
+	assert not os.path.exists(job.directory)
+
+def test_launch_failure(queue):
+	job = queue.submit(ExternalJob('result = 1', commandBuilder=lambda runner, directory: ['cross3d-missing-application']))
+	with pytest.raises(Exceptions.ScriptFailed):
+		job.result(30)
+	assert job.state() == ExternalJob.Failed
+
+def test_timeout(queue):
+	job = External.submit('import time\ntime.sleep(30)', queue=queue, timeout=0.5)
+	with pytest.raises(Exceptions.WorkerError):
+		job.result(30)
+	assert job.state() == ExternalJob.TimedOut
+	assert job.exitCode() is not None
+
+def test_cancel(queue, tmpdir):
+	release = str(tmpdir.join('release'))
+	running = queue.submit(ExternalJob(BLOCKING_SCRIPT % release, commandBuilder=standInCommand))
+	pending = queue.submit(ExternalJob('result = 1', commandBuilder=standInCommand))
+	calls = []
+	pending.addDoneCallback(calls.append)
+	try:
+		while running.state() == ExternalJob.Pending:
+			time.sleep(0.05)
+		# The queue runs a single job at a time, the second one has not started.
+		assert not running.cancel()
+		assert pending.cancel()
+		assert pending.cancelled() and pending.done()
+		assert calls == [pending]
+		with pytest.raises(Exceptions.WorkerError):
+			pending.result(0)
+	finally:
+		open(release, 'w').close()
+	assert running.result(30) == 'released'
+	queue.join()
+	# The queue skips the cancelled job, its callbacks are not called again.
+	assert pending.state() == ExternalJob.Cancelled
+	assert calls == [pending]
+
+def test_cancel_before_run():
+	job = ExternalJob('result = 1', commandBuilder=standInCommand)
+	calls = []
+	job.addDoneCallback(calls.append)
+	assert job.cancel()
+	assert not job.cancel()
+	job._run()
+	assert job.state() == ExternalJob.Cancelled
+	assert calls == [job]
+	# Callbacks added once the job finished are called immediately.
+	job.addDoneCallback(calls.append)
+	assert calls == [job, job]
+
+def test_wait_for_jobs(tmpdir):
+	queue = JobQueue(maxConcurrent=2)
+	release = str(tmpdir.join('release'))
+	finished = queue.submit(ExternalJob('result = 1', commandBuilder=standInCommand))
+	blocked = queue.submit(ExternalJob(BLOCKING_SCRIPT % release, commandBuilder=standInCommand))
+	try:
+		assert finished.wait(30)
+		assert waitForJobs([finished, blocked], timeout=0.2) == [blocked]
+	finally:
+		open(release, 'w').close()
+	assert waitForJobs([finished, blocked], timeout=30) == []
+	assert [job.result() for job in (finished, blocked)] == [1, 'released']
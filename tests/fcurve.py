@@ -0,0 +1,110 @@
+import math
+
+import pytest
+
+from cross3d.classes.fcurve import FCurve
+from cross3d.constants import ExtrapolationType
+
+def sampled(fCurve, start, end, step=0.01):
+	count = int(round((end - start) / step))
+	return [fCurve.valueAtTime(start + i * step) for i in range(count + 1)]
+
+@pytest.fixture
+def overshoot():
+	""" A curve whose peak falls between two frames, after its middle key. """
+	fCurve = FCurve()
+	fCurve.addKey(time=0, value=0, outTangentAngle=0.0, outTangentLength=3)
+	fCurve.addKey(time=10, value=10, inTangentAngle=-0.5, inTangentLength=3, outTangentAngle=0.5, outTangentLength=3)
+	fCurve.addKey(time=20, value=0, inTangentAngle=0.0, inTangentLength=3)
+	return fCurve
+
+def test_value_range(overshoot):
+	values = sampled(overshoot, 0, 20)
+	low, high = overshoot.valueRange()
+	assert low == pytest.approx(min(values), abs=1e-6)
+	assert high == pytest.approx(max(values), abs=1e-4)
+	assert high > 10.0
+	assert overshoot.range('value') == overshoot.valueRange()
+
+def test_value_range_window(overshoot):
+	values = sampled(overshoot, 2, 8)
+	low, high = overshoot.valueRange((2, 8))
+	assert low == pytest.approx(min(values), abs=1e-6)
+	assert high == pytest.approx(max(values), abs=1e-6)
+
+def test_value_range_extrapolation(overshoot):
+	overshoot.setExtrapolation([ExtrapolationType.Constant, ExtrapolationType.Cycled])
+	assert overshoot.valueRange((-10, 40)) == overshoot.valueRange()
+	overshoot.setExtrapolation([ExtrapolationType.Constant, ExtrapolationType.CycledWithOffset])
+	overshoot.keys()[-1].value = 5
+	assert overshoot.valueRange((0, 40))[1] == pytest.approx(overshoot.valueRange()[1] + 5)
+
+@pytest.mark.parametrize('extrapolation, start, end', [
+	(ExtrapolationType.Cycled, 22, 28),
+	(ExtrapolationType.Cycled, -8, -2),
+	(ExtrapolationType.Cycled, 15, 25),
+	(ExtrapolationType.CycledWithOffset, 22, 28),
+	(ExtrapolationType.CycledWithOffset, -8, -2),
+	(ExtrapolationType.CycledWithOffset, 35, 47),
+	(ExtrapolationType.CycledWithOffset, -95, -53),
+	(ExtrapolationType.CycledWithOffset, 5, 187),
+])
+def test_value_range_partial_cycle(overshoot, extrapolation, start, end):
+	overshoot.setExtrapolation([extrapolation, extrapolation])
+	overshoot.keys()[-1].value = 5
+	values = sampled(overshoot, start, end)
+	low, high = overshoot.valueRange((start, end))
+	# Only the part of the cycles the range covers is accounted for.
+	assert low == pytest.approx(min(values), abs=1e-3)
+	assert high == pytest.approx(max(values), abs=1e-3)
+
+def test_extrema(overshoot):
+	extrema = overshoot.extrema()
+	assert len(extrema) == 1
+	time, value = extrema[0]
+	assert 10 < time < 11
+	assert value == pytest.approx(overshoot.valueRange()[1])
+
+@pytest.fixture
+def monotonic():
+	fCurve = FCurve()
+	fCurve.addKey(time=0, value=0, outTangentAngle=0.3, outTangentLength=4)
+	fCurve.addKey(time=10, value=25, inTangentAngle=-1.0, inTangentLength=3, outTangentAngle=0.8, outTangentLength=3)
+	fCurve.addKey(time=30, value=40, inTangentAngle=-0.1, inTangentLength=6)
+	return fCurve
+
+def test_times_for_value(monotonic, overshoot):
+	times = [i / 10.0 for i in range(301)]
+	values = [monotonic.valueAtTime(time) for time in times]
+	for time, solved in zip(times, monotonic.timesForValues(values)):
+		assert len(solved) == 1
+		assert solved[0] == pytest.approx(time, abs=1e-6)
+	assert overshoot.timesForValue(100) == []
+	assert len(overshoot.timesForValue(5)) == 2
+
+def test_times_for_value_extrapolation(monotonic):
+	monotonic.setExtrapolation([ExtrapolationType.Linear, ExtrapolationType.Linear])
+	assert monotonic.timesForValue(50) == []
+	time = monotonic.timesForValue(50, extrapolate=True)[0]
+	assert monotonic.valueAtTime(time) == pytest.approx(50)
+
+def test_inverse(monotonic):
+	inverse = monotonic.inverse()
+	for i in range(301):
+		time = i / 10.0
+		assert inverse.valueAtTime(monotonic.valueAtTime(time)) == pytest.approx(time, abs=1e-6)
+
+def test_from_samples():
+	times = range(1000)
+	values = [math.sin(time / 40.0) * 10 + math.sin(time / 7.0) for time in times]
+	fCurve = FCurve.fromSamples(times, values, tolerance=0.01)
+	assert len(fCurve) < len(times) / 5
+	for time, value in zip(times, values):
+		assert fCurve.valueAtTime(time) == pytest.approx(value, abs=0.01 + 1e-9)
+
+def test_reduce_linear():
+	fCurve = FCurve()
+	for time in range(100):
+		fCurve.addKey(time=time, value=time * 0.5)
+	assert fCurve.reduce(0.001) == 98
+	assert fCurve.valueAtTime(42.5) == pytest.approx(21.25)
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from cross3d.constants import PaddingStyle
+from cross3d.classes.filesequence import FileSequence, SequenceTokens
+from cross3d.classes.frameset import FrameSet
+
+@pytest.mark.parametrize('name, tokens', [
+	('Sequence.0-100.jpg', ('Sequence', '.', '0-100', '0', '100', 'jpg')),
+	('Sequence.0:100.jpg', ('Sequence', '.', '0:100', '0', '100', 'jpg')),
+	('Sequence0-100.abc', ('Sequence', '', '0-100', '0', '100', 'abc')),
+	('Sequence[0-100].abc', ('Sequence', '', '0-100', '0', '100', 'abc')),
+	('Sequence_[0:100].abc', ('Sequence', '_', '0:100', '0', '100', 'abc')),
+	('Shot_010 v2.0001-0250.exr', ('Shot_010 v2', '.', '0001-0250', '0001', '0250', 'exr')),
+])
+def test_parse(name, tokens):
+	tokens = SequenceTokens(*tokens)
+	sequence = FileSequence(os.path.join('renders', name))
+	assert FileSequence.isValidSequencePath(sequence.path())
+	assert sequence.nameTokens() == tokens._asdict()
+	assert sequence.baseName() == tokens.baseName
+	assert sequence.separator() == tokens.separator
+	assert sequence.extension() == tokens.extension
+	assert sequence.frameRange(returnsAsString=True) == tokens.range
+	assert (sequence.start(), sequence.end()) == (int(tokens.start), int(tokens.end))
+	assert sequence.count() == int(tokens.end) - int(tokens.start) + 1
+
+@pytest.mark.parametrize('name', ['image.jpg', 'Sequence.0-100', 'Sequence.jpg.0-100'])
+def test_parse_invalid(name):
+	sequence = FileSequence(name)
+	assert not FileSequence.isValidSequencePath(name)
+	assert sequence.nameTokens() == {}
+	assert sequence.baseName() == ''
+	assert (sequence.start(), sequence.end()) == (0, 0)
+	assert sequence.padding() == 0
+
+def test_parse_after_edit():
+	sequence = FileSequence('renders/Sequence.1-10.jpg')
+	sequence.setBaseName('Other')
+	sequence.setExtension('.png')
+	sequence.setRange((5, 20))
+	assert sequence.name() == 'Other.5-20.png'
+	assert (sequence.baseName(), sequence.extension(), sequence.start(), sequence.end()) == ('Other', 'png', 5, 20)
+
+@pytest.mark.parametrize('style, expected', [
+	(PaddingStyle.Number, 4),
+	(PaddingStyle.Pound, '####'),
+	(PaddingStyle.Percent, '%4d'),
+	(PaddingStyle.Wildcard, '*'),
+	(PaddingStyle.Blank, ''),
+])
+def test_padding(style, expected):
+	sequence = FileSequence('renders/Sequence.0001-0100.jpg')
+	assert sequence.padding(style) == expected
+
+def test_set_padding():
+	sequence = FileSequence('renders/Sequence.1-100.jpg')
+	assert sequence.padding() == 1
+	assert sequence.uniqueName(PaddingStyle.Pound) == 'Sequence.#.jpg'
+	sequence.setPadding(4)
+	assert sequence.name() == 'Sequence.0001-0100.jpg'
+	assert sequence.padding() == 4
+	assert sequence.uniqueName() == 'Sequence.jpg'
+	assert sequence.uniqueName(PaddingStyle.Pound) == 'Sequence.####.jpg'
+
+def test_build_path():
+	assert FileSequence.buildPath('renders/Sequence.jpg', (1, 10)) == 'renders/Sequence.1-10.jpg'
+	assert FileSequence.buildPath('renders/Sequence.jpg', FrameSet('5-8')) == 'renders/Sequence.5-8.jpg'
+	with pytest.raises(Exception):
+		FileSequence.buildPath('renders/Sequence', (1, 10))
+	sequence = FileSequence('renders/Sequence.jpg', frameRange=(1, 10))
+	assert sequence.name() == 'Sequence.1-10.jpg'
+	assert sequence.count() == 10
+
+def test_paths():
+	sequence = FileSequence(os.path.join('renders', 'sub', '..', 'Sequence.0098-0102.jpg'))
+	paths = sequence.paths()
+	# A list, so callers can index it and take its length.
+	assert isinstance(paths, list)
+	assert len(paths) == sequence.count() == 5
+	expected = [os.path.normpath(os.path.join('renders', 'Sequence.%04d.jpg' % frame)) for frame in range(98, 103)]
+	assert paths == expected
+
+def test_paths_step_and_edit():
+	sequence = FileSequence('Sequence_1-9.exr', step=4)
+	assert sequence.paths() == ['Sequence_1.exr', 'Sequence_5.exr', 'Sequence_9.exr']
+	# The paths follow the changes to the name.
+	sequence.setRange((10, 18))
+	sequence.setSeparator('.')
+	assert sequence.paths() == ['Sequence.10.exr', 'Sequence.14.exr', 'Sequence.18.exr']
+
+def test_paths_special_characters():
+	# Percent signs in the path are not formatting directives.
+	sequence = FileSequence(os.path.join('100%', 'Sequence.1-2.jpg'))
+	assert sequence.paths() == [os.path.join('100%', 'Sequence.1.jpg'), os.path.join('100%', 'Sequence.2.jpg')]
+
+def test_missing_frames(tmpdir):
+	sequence = FileSequence(str(tmpdir.join('Sequence.001-006.jpg')), step=1)
+	for path in sequence.paths()[::2]:
+		open(path, 'w').close()
+	assert sequence.exists()
+	assert not sequence.isComplete()
+	assert sequence.missingFrames() == [2, 4, 6]
+	assert sequence.missingFrames(asFrameSet=True) == FrameSet('2-6x2')
+	assert sequence.existingPaths() == sequence.paths()[::2]
+	sequence.delete()
+	assert sequence.existingPaths() == []
+	assert not sequence.exists()
@@ -0,0 +1,38 @@
+import pytest
+
+from cross3d.classes.frameset import FrameSet
+from cross3d.classes.framerange import FrameRange
+
+def test_spec():
+	frames = FrameSet('1-100x2,150,200-210')
+	assert str(frames) == '1-99x2,150,200-210'
+	assert len(frames) == 50 + 1 + 11
+	assert FrameSet(str(frames)) == frames
+	assert FrameSet('5,1-3') == FrameSet([1, 2, 3, 5])
+	assert FrameSet(FrameRange([5, 9])) == FrameSet('5-9')
+	with pytest.raises(ValueError):
+		FrameSet('10-1')
+
+def test_membership():
+	frames = FrameSet('1-1000000x2,-10')
+	assert 999999 in frames
+	assert 1000000 not in frames
+	assert -10 in frames
+	assert 0 not in frames
+
+def test_canonical():
+	# The same frames always give the same spans.
+	assert FrameSet([1, 3, 5, 7, 10, 11, 12]).spans() == [(1, 7, 2), (10, 12, 1)]
+	assert FrameSet('1-4') | FrameSet('5-8') == FrameSet('1-8')
+	assert FrameSet([1, 3, 4, 5]).spans() == [(1, 1, 1), (3, 5, 1)]
+
+def test_operations():
+	a = set(range(0, 300, 2)) | set([7, 301])
+	b = set(range(50, 400, 3)) | set(range(120, 140))
+	fa, fb = FrameSet(a), FrameSet(b)
+	assert set(fa | fb) == a | b
+	assert set(fa & fb) == a & b
+	assert set(fa - fb) == a - b
+	assert fa | fb == FrameSet(a | b)
+	assert len(FrameSet('1-1000000x2') & FrameSet('1-1000000x3')) == len(range(1, 1000001, 6))
+	assert FrameSet('1-100') - FrameSet('1-100x2') == FrameSet('2-100x2')
@@ -0,0 +1,197 @@
+import sys
+import types
+
+import pytest
+
+from cross3d.classes.hostprofiler import HostFunction, HostProfiler, HostProxy
+
+# A back-end module importing its host object like the studiomax modules import mxs.
+BACKEND = '''
+from fakehost import mxs
+
+class FakeScene(object):
+	def objects(self):
+		return list(mxs.objects)
+
+	def objectNames(self):
+		# A host call per object, the N+1 pattern the profiler reports.
+		return [mxs.getName(node) for node in self.objects()]
+
+	def findObject(self, name):
+		return mxs.getNodeByName(name)
+
+	def createPoint(self):
+		return mxs.Point3(0, 0, 0)
+
+	def isPoint(self, node):
+		return mxs.classOf(node) == mxs.Point
+
+	def isKindOfPoint(self, node):
+		return mxs.isKindOf(node, mxs.Point)
+
+	def pointClasses(self):
+		return set([mxs.Point, mxs.classOf(mxs.Point())])
+'''
+
+class ClassValue(object):
+	""" A callable host value that is not a python class, like the MaxScript class values. """
+
+	def __init__(self, name):
+		self.name = name
+
+	def __call__(self):
+		return FakeNode(self)
+
+	def __eq__(self, other):
+		if not isinstance(other, ClassValue):
+			return NotImplemented
+		return self is other
+
+	def __ne__(self, other):
+		if not isinstance(other, ClassValue):
+			return NotImplemented
+		return self is not other
+
+	def __hash__(self):
+		return id(self)
+
+
+class FakeNode(object):
+	def __init__(self, cls):
+		self.cls = cls
+
+class FakeMxs(object):
+	""" A fake host object, counting the calls that reach it. """
+
+	class Point3(object):
+		def __init__(self, x, y, z):
+			self.x, self.y, self.z = x, y, z
+
+	def __init__(self, count):
+		self.objects = ['node%d' % index for index in range(count)]
+		self.calls = 0
+		self.Point = ClassValue('Point')
+
+	def classOf(self, node):
+		return node.cls
+
+	def isKindOf(self, node, cls):
+		# The host only knows its own values.
+		return node.cls is cls
+
+	def getName(self, node):
+		self.calls += 1
+		return node
+
+	def getNodeByName(self, name):
+		self.calls += 1
+		return name if name in self.objects else None
+
+
+def importModule(name, source):
+	module = types.ModuleType(name)
+	sys.modules[name] = module
+	exec source in module.__dict__
+	return module
+
+@pytest.fixture
+def backend():
+	host = types.ModuleType('fakehost')
+	host.mxs = FakeMxs(50)
+	sys.modules['fakehost'] = host
+	sys.modules['fakecross3d'] = types.ModuleType('fakecross3d')
+	module = importModule('fakecross3d.scene', BACKEND)
+	yield module
+	for name in ('fakehost', 'fakecross3d', 'fakecross3d.scene', 'fakecross3d.later'):
+		sys.modules.pop(name, None)
+
+@pytest.fixture
+def profiler(backend):
+	profiler = HostProfiler(packages=('fakecross3d',), nPlusOneThreshold=20)
+	profiler.install({'mxs': backend.mxs})
+	yield profiler
+	profiler.uninstall()
+
+def test_install(backend, profiler):
+	mxs = sys.modules['fakehost'].mxs
+	assert isinstance(backend.mxs, HostProxy)
+	assert isinstance(backend.mxs.getName, HostFunction)
+	# Classes are not wrapped, so instances can still be tested against them.
+	assert isinstance(backend.FakeScene().createPoint(), mxs.Point3)
+	profiler.uninstall()
+	assert backend.mxs is mxs
+	assert not profiler.isInstalled()
+
+def test_callable_host_values(backend, profiler):
+	mxs = sys.modules['fakehost'].mxs
+	scene = backend.FakeScene()
+	node = mxs.Point()
+	assert isinstance(backend.mxs.Point, HostFunction)
+	# Profiling does not change the comparisons or what the host receives.
+	assert scene.isPoint(node)
+	assert scene.isKindOfPoint(node)
+	assert scene.pointClasses() == set([mxs.Point])
+	assert backend.mxs.Point == mxs.Point and not backend.mxs.Point != mxs.Point
+	assert profiler.operations()['FakeScene.isKindOfPoint'].calls['mxs.isKindOf'].count == 1
+
+def test_calls_per_entry_point(backend, profiler):
+	scene = backend.FakeScene()
+	assert scene.objectNames() == sys.modules['fakehost'].mxs.objects
+	assert sys.modules['fakehost'].mxs.calls == 50
+
+	operations = profiler.operations()
+	# The calls of objects are attributed to objectNames, the entry point that was called.
+	assert list(operations) == ['FakeScene.objectNames']
+	operation = operations['FakeScene.objectNames']
+	assert operation.invocations == 1
+	assert operation.calls['mxs.objects'].count == 1
+	assert operation.calls['mxs.getName'].count == 50
+	assert operation.hostCalls() == 51
+	assert operation.hostSeconds() >= 0
+
+	scene.objectNames()
+	assert profiler.operations()['FakeScene.objectNames'].invocations == 2
+
+def test_n_plus_one(backend, profiler):
+	scene = backend.FakeScene()
+	scene.objectNames()
+	# The same host function called once per invocation is not a N+1 suspect, however many
+	# times the entry point is called.
+	for index in range(30):
+		scene.findObject('node%d' % index)
+	assert profiler.operations()['FakeScene.findObject'].invocations == 30
+	assert profiler.suspects() == [('FakeScene.objectNames', 'mxs.getName', 50)]
+
+	report = profiler.report()
+	assert 'FakeScene.objectNames: 1 invocations, 51 host calls' in report
+	assert 'FakeScene.objectNames calls mxs.getName 50 times in a single invocation' in report
+
+def test_reset(backend, profiler):
+	backend.FakeScene().objectNames()
+	profiler.reset()
+	assert profiler.operations() == {}
+	assert profiler.suspects() == []
+
+def test_patch_modules(backend, profiler):
+	later = importModule('fakecross3d.later', 'from fakehost import mxs')
+	assert not isinstance(later.mxs, HostProxy)
+	profiler.patchModules()
+	assert isinstance(later.mxs, HostProxy)
+	profiler.uninstall()
+	assert later.mxs is sys.modules['fakehost'].mxs
+
+def test_module_hosts(backend):
+	# Reading an attribute of a module does not cross the bridge, only its calls are recorded.
+	host = sys.modules['fakehost']
+	host.getName = host.mxs.getName
+	backend.cmds = host
+	profiler = HostProfiler(packages=('fakecross3d',))
+	profiler.install({'cmds': host})
+	try:
+		exec 'def names():\n\treturn [cmds.getName(node) for node in cmds.mxs.objects]' in backend.__dict__
+		backend.names()
+		operation = profiler.operations()['fakecross3d.scene.names']
+		assert sorted(operation.calls) == ['cmds.getName']
+	finally:
+		profiler.uninstall()
+	assert backend.cmds is host
@@ -0,0 +1,134 @@
+import gc
+
+import pytest
+
+import cross3d
+from cross3d.classes.identitymap import IdentityMap
+
+class Wrapper(object):
+	pass
+
+class CameraWrapper(Wrapper):
+	pass
+
+def test_lookup():
+	identityMap = IdentityMap()
+	wrapper = identityMap.add(1, Wrapper())
+	assert identityMap.get(1) is wrapper
+	assert identityMap.get(2) is None
+	assert identityMap.stats()['hits'] == 1
+	assert identityMap.stats()['misses'] == 1
+	assert identityMap.hitRate() == 0.5
+
+def test_class_filter():
+	identityMap = IdentityMap()
+	wrapper = identityMap.add(1, Wrapper())
+	assert identityMap.get(1, CameraWrapper) is None
+	assert identityMap.get(1, Wrapper) is wrapper
+
+def test_weak_values():
+	identityMap = IdentityMap()
+	identityMap.add(1, Wrapper())
+	gc.collect()
+	assert 1 not in identityMap
+	assert len(identityMap) == 0
+
+def test_invalidate():
+	identityMap = IdentityMap()
+	wrappers = [identityMap.add(key, Wrapper()) for key in range(3)]
+	identityMap.discard(0)
+	assert len(identityMap) == 2
+	assert identityMap.get(0) is None
+	assert all(identityMap.get(key) is wrappers[key] for key in (1, 2))
+	identityMap.invalidate()
+	assert len(identityMap) == 0
+	assert identityMap.stats()['invalidations'] == 1
+
+class FakeNode(object):
+	def __init__(self, handle):
+		self.handle = handle
+
+
+class FakeObject(cross3d.SceneObject):
+	""" A back-end wrapper identifying its native nodes by handle and counting the type probes. """
+
+	probes = 0
+
+	@classmethod
+	def _typeOfNativeObject(cls, nativeObject):
+		FakeObject.probes += 1
+		return super(FakeObject, cls)._typeOfNativeObject(nativeObject)
+
+	@classmethod
+	def _nativeIdentity(cls, nativeObject):
+		return getattr(nativeObject, 'handle', None)
+
+
+class FakeCamera(FakeObject):
+	pass
+
+
+@pytest.fixture
+def scene():
+	scene = cross3d.Scene()
+	scene.setIdentityMapEnabled(True)
+	yield scene
+	scene.setIdentityMapEnabled(False)
+
+def test_same_wrapper(scene):
+	node = FakeNode(1)
+	wrapper = FakeObject(scene, node)
+	assert FakeObject(scene, node) is wrapper
+	assert FakeObject(scene, FakeNode(1)) is wrapper
+	assert wrapper._identityKey == 1
+	assert FakeObject(scene, FakeNode(2)) is not wrapper
+	assert scene.identityMap().stats()['hits'] == 2
+
+def test_probe_skipped(scene):
+	node = FakeNode(1)
+	FakeObject.probes = 0
+	wrapper = FakeObject(scene, node)
+	assert FakeObject.probes == 1
+	wrapper.state = 'kept'
+	for index in range(10):
+		assert FakeObject(scene, node).state == 'kept'
+	# Neither __new__ nor __init__ run for a cached wrapper.
+	assert FakeObject.probes == 1
+
+def test_without_identity(scene):
+	node = object()
+	assert FakeObject(scene, node) is not FakeObject(scene, node)
+	disabled = cross3d.Scene()
+	node = FakeNode(1)
+	assert FakeObject(disabled, node) is not FakeObject(disabled, node)
+
+def test_specialized_wrapper(scene):
+	node = FakeNode(1)
+	generic = FakeObject(scene, node)
+	camera = FakeCamera(scene, node)
+	# A generic wrapper is not returned to a more specialized class, the other way around works.
+	assert camera is not generic and isinstance(camera, FakeCamera)
+	assert FakeObject(scene, node) is camera
+
+def test_invalidation(scene):
+	node = FakeNode(1)
+	wrapper = FakeObject(scene, node)
+	scene.setIdentityMapEnabled(False)
+	assert scene.identityMap() is None
+	assert FakeObject(scene, node) is not wrapper
+	scene.setIdentityMapEnabled(True)
+
+	wrapper = FakeObject(scene, node)
+	cross3d.dispatch.dispatch('sceneInvalidated')
+	assert FakeObject(scene, node) is not wrapper
+
+	wrapper = FakeObject(scene, node)
+	cross3d.dispatch.dispatch('objectDeleted', 'name')
+	assert FakeObject(scene, node) is not wrapper
+
+	wrapper = FakeObject(scene, node)
+	other = FakeObject(scene, FakeNode(2))
+	cross3d.dispatch.objectRenamed.emit('old', 'new', wrapper)
+	assert FakeObject(scene, node) is not wrapper
+	assert FakeObject(scene, FakeNode(2)) is other
+	assert scene.identityMap().stats()['invalidations'] == 2
@@ -0,0 +1,58 @@
+from cross3d.classes.layerindex import LayerIndex
+
+def buildIndex():
+	index = LayerIndex()
+	# attr, layer id, layer name, group index
+	index.reset([('attr0', 10, 'characters', 1), ('attr1', 11, 'props', 2), ('attr2', 12, 'lights', 1),
+				('stale', 13, 'props', 1)], attributeCount=6)
+	return index
+
+def test_find():
+	index = buildIndex()
+	assert len(index) == 4
+	assert index.attributeCount() == 6
+	assert index.find(11, 'props') == 'attr1'
+	assert index.find(99, 'lights') == 'attr2'
+	assert index.find(12, 'unknown') == 'attr2'
+	assert index.find(99, 'unknown') is None
+	# The first attribute matching the id or the name wins, like a walk of the attributes.
+	assert index.find(13, 'props') == 'attr1'
+	assert index.find(12, 'characters') == 'attr0'
+
+def test_add():
+	index = buildIndex()
+	assert index.groupOrder() == 4
+	index.add('attr4', 14, 'fx')
+	assert index.find(14, 'fx') == 'attr4'
+	assert index.attributeCount() == 7
+	assert index.groupOrder() == 5
+	index.add('attr5', 15, 'other', groupIndex=2)
+	assert index.groupOrder() == 5
+
+def test_rename():
+	index = buildIndex()
+	index.rename(10, 'creatures')
+	assert index.find(99, 'creatures') == 'attr0'
+	# The old name no longer finds the attribute.
+	assert index.find(99, 'characters') is None
+
+	# The name is taken over by the renamed layer, and the next attribute using the old name
+	# is found by it.
+	index.rename(12, 'props')
+	assert index.find(99, 'props') == 'attr2'
+	index.rename(12, 'lights')
+	assert index.find(99, 'props') == 'attr1'
+	index.rename(11, 'set')
+	assert index.find(99, 'props') == 'stale'
+	assert index.find(99, 'set') == 'attr1'
+
+	index.rename(99, 'ignored')
+	assert index.find(99, 'ignored') is None
+
+def test_reset():
+	index = buildIndex()
+	index.reset()
+	assert len(index) == 0
+	assert index.attributeCount() == 0
+	assert index.groupOrder() == 1
+	assert index.find(10, 'characters') is None
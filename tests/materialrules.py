@@ -0,0 +1,87 @@
+import pytest
+
+from cross3d.classes.materialrules import MaterialRules, OverrideCache
+
+class StandardMaterial(object):
+	def __init__(self, opacityMap=None, enabled=True):
+		self.opacityMap = opacityMap
+		self.opacityMapEnable = enabled
+
+class VRayMtl(object):
+	def __init__(self, opacityMap=None):
+		self.texmap_opacity = opacityMap
+		self.texmap_opacity_on = opacityMap is not None
+
+class MultiMaterial(object):
+	def __init__(self, *subs):
+		self.subs = list(subs)
+
+class Unknown(object):
+	pass
+
+@pytest.fixture
+def rules():
+	rules = MaterialRules()
+
+	@rules.register('opacity', 'StandardMaterial')
+	def standardOpacity(material):
+		return material.opacityMap if material.opacityMapEnable else None
+
+	@rules.register('opacity', 'VrayMtl', 'VRaySkinMtl')
+	def vrayOpacity(material):
+		return material.texmap_opacity if material.texmap_opacity_on else None
+
+	@rules.register('build', 'MultiMaterial')
+	def buildMulti(material, suffix):
+		return [rules.apply('build', sub, suffix) for sub in material.subs]
+
+	rules.setFallback('build', lambda material, suffix: type(material).__name__ + suffix)
+	return rules
+
+def test_apply(rules):
+	assert rules.apply('opacity', StandardMaterial('map')) == 'map'
+	assert rules.apply('opacity', StandardMaterial('map', enabled=False)) is None
+	assert rules.apply('opacity', VRayMtl('vmap')) == 'vmap'
+	assert rules.apply('opacity', Unknown(), default=False) is False
+	assert rules.apply('opacity', None, default=1) == 1
+
+def test_case_insensitive(rules):
+	assert rules.hasRule('opacity', 'VRAYMTL')
+	assert not rules.hasRule('build', 'VRayMtl')
+	assert rules.classNames('opacity') == ['standardmaterial', 'vraymtl', 'vrayskinmtl']
+
+def test_fallback(rules):
+	tree = MultiMaterial(StandardMaterial(), MultiMaterial(VRayMtl()), Unknown())
+	assert rules.apply('build', tree, '!') == ['StandardMaterial!', ['VRayMtl!'], 'Unknown!']
+	assert rules.rule('opacity', 'Unknown') is None
+
+def test_class_name():
+	calls = []
+	def className(material):
+		calls.append(material)
+		return material.cls
+	rules = MaterialRules(className=className)
+	rules.register('opacity', 'StandardMaterial')(lambda material: 'map')
+	material = type('Fake', (object,), {'cls': 'Standardmaterial'})()
+	assert rules.apply('opacity', material) == 'map'
+	assert calls == [material]
+
+def test_override_cache():
+	cache = OverrideCache()
+	builds = []
+	def build(base, override, options):
+		key = (base, override, options)
+		result = cache.get(key)
+		if result is None:
+			builds.append(key)
+			result = cache.add(key, '%s:%s' % (base, override))
+		return result
+
+	for i in range(1000):
+		build(i % 10, 'override', 3)
+	assert len(builds) == 10
+	assert len(cache) == 10
+	assert cache.stats()['hits'] == 990
+	assert cache.hitRate() == pytest.approx(0.99)
+	cache.clear()
+	assert (1, 'override', 3) not in cache
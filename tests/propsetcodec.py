@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from cross3d.abstract.abstractscenepropset import PropSetCodec
+
+KEYS = ['renderable', 'gbufferchannel', 'VRay_GI_Multipier', 'Mr_castModeFGIllum', 'label']
+DEFAULTS = [True, 0, 1, 1, '']
+
+@pytest.fixture
+def codec():
+	return PropSetCodec(KEYS)
+
+def test_round_trip(codec):
+	values = [False, -12, 0.1, 3, 'a|b\\c']
+	record = codec.encode(values)
+	assert record.startswith('#2:' + codec.schemaId() + '|')
+	assert record.count('|') == len(KEYS)
+	assert codec.decode(record, DEFAULTS) == values
+	assert codec.decode(codec.encode([None, 1 << 40, u'\xe9t\xe9|', 2.5e-12, '\\p']), DEFAULTS) == [None, 1 << 40, u'\xe9t\xe9|', 2.5e-12, '\\p']
+
+def test_legacy(codec):
+	assert codec.isLegacy('1|3|0.5|2')
+	assert codec.decode('1|3|0.5|2', DEFAULTS) == [True, 3, 0.5, 2, '']
+	assert codec.decode('False|3|1e-05|undefined', DEFAULTS) == [False, 3, 1e-05, 'undefined', '']
+	assert codec.decode("0|2|1|1|'name'", DEFAULTS) == [False, 2, 1, 1, 'name']
+
+def test_never_evaluates(codec):
+	record = "1|__import__('os').getcwd()|[1]|x|"
+	assert codec.decode(record, DEFAULTS) == DEFAULTS
+
+def test_missing_fields(codec):
+	assert codec.decode(codec.encode([False]), DEFAULTS) == [False] + DEFAULTS[1:]
+	assert codec.decode('#2:00000000|F|i4|i2|i7|sa|sextra', DEFAULTS) == [False, 4, 2, 7, 'a']
+	assert codec.decode('#2:00000000|F|x4', DEFAULTS) == [False] + DEFAULTS[1:]
+
+def test_other_keys(codec):
+	# A record written by a codec with other property names is read by name.
+	other = PropSetCodec(['label', 'renderable', 'VRay_GI_Multipier', 'removed'])
+	record = other.encode(['name', False, 0.5, 12])
+	assert codec.decode(record, DEFAULTS) == [False, 0, 0.5, 1, 'name']
+	assert other.decode(codec.encode([False, 2, 0.5, 3, 'x']), ['', True, 1, 0]) == ['x', False, 0.5, 0]
+
+def test_unknown_version(codec):
+	assert codec.decode('#3:%s|F|i4' % codec.schemaId(), DEFAULTS) == DEFAULTS
+
+def test_cache(codec):
+	record = codec.encode([False, 2, 1, 1, 'x'])
+	for index in range(100):
+		values = codec.decode(record, DEFAULTS)
+	values[0] = True
+	assert codec.decode(record, DEFAULTS)[0] is False
+	assert codec.misses == 1
+	assert codec.hits == 100
+
+def test_shared_codecs():
+	assert PropSetCodec.forKeys(KEYS) is PropSetCodec.forKeys(tuple(KEYS))
+	assert PropSetCodec.forKeys(KEYS).schemaId() != PropSetCodec.forKeys(KEYS[:-1]).schemaId()
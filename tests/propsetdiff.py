@@ -0,0 +1,70 @@
+import pytest
+
+from cross3d.classes.propsetdiff import diffValues, PropSetPlan, PropSetOverridePlanner
+
+BASE = {'renderable': True, 'castShadows': True, 'gbufferchannel': 0, 'VRay_GI_Multipier': 1.0}
+
+def test_diff_values():
+	assert diffValues(BASE, BASE) == {}
+	assert diffValues(None, {'a': 1}) == {'a': 1}
+	assert diffValues({'a': 1}, {'a': 2, 'b': 3}) == {'a': 2, 'b': 3}
+	# Booleans and integers are written as they are typed.
+	assert diffValues({'a': 1}, {'a': True}) == {'a': True}
+
+def test_plan_groups_writes():
+	plan = PropSetPlan()
+	for index in range(100):
+		plan.add('obj%d' % index, {'renderable': False, 'gbufferchannel': index % 2})
+	writes = plan.writes()
+	assert len(writes) == 3
+	assert plan.writeCount() == 200
+	grouped = dict(((key, value), objects) for key, value, objects in writes)
+	assert len(grouped[('renderable', False)]) == 100
+	assert len(grouped[('gbufferchannel', 1)]) == 50
+	assert len(plan.objects()) == 100
+
+def test_plan_keeps_types_apart():
+	plan = PropSetPlan()
+	plan.add('a', {'value': 1})
+	plan.add('b', {'value': True})
+	plan.add('c', {'value': [1]})
+	plan.add('d', {'value': [1]})
+	assert len(plan) == 3
+
+@pytest.fixture
+def planner():
+	planner = PropSetOverridePlanner()
+	for index in range(10):
+		planner.setBase(index, BASE)
+	return planner
+
+def entries(count=10):
+	return [(index, 'obj%d' % index) for index in range(count)]
+
+def test_switch_overrides(planner):
+	plan = planner.plan(entries(), {'renderable': False})
+	assert [(key, value) for key, value, objects in plan.writes()] == [('renderable', False)]
+
+	# Applying the same override again writes nothing.
+	assert planner.plan(entries(), {'renderable': False}).writeCount() == 0
+
+	# Switching only writes what differs between both overrides.
+	plan = planner.plan(entries(), {'renderable': False, 'castShadows': False})
+	assert [(key, value) for key, value, objects in plan.writes()] == [('castShadows', False)]
+
+	plan = planner.plan(entries(), {'gbufferchannel': 3})
+	assert sorted((key, value) for key, value, objects in plan.writes()) == [('castShadows', True), ('gbufferchannel', 3), ('renderable', True)]
+
+def test_restore(planner):
+	planner.plan(entries(), {'renderable': False})
+	plan = planner.plan(entries(5), {})
+	assert [(key, value) for key, value, objects in plan.writes()] == [('renderable', True)]
+	assert 3 not in planner
+	assert 7 in planner
+
+def test_unknown_current_values():
+	planner = PropSetOverridePlanner()
+	planner.loadBase('a', BASE)
+	plan = planner.plan([('a', 'obj')], {'renderable': False})
+	assert plan.writeCount() == len(BASE)
+	assert planner.plan([('a', 'obj')], {'renderable': False}).writeCount() == 0
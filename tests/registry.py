@@ -0,0 +1,47 @@
+import sys
+import types
+
+import pytest
+
+import cross3d
+
+def test_module_is_replaced():
+	assert isinstance(sys.modules['cross3d'], types.ModuleType)
+	assert sys.modules['cross3d'] is cross3d
+	# The modules imported while cross3d was initialized see the module the symbols are registered in.
+	assert sys.modules['cross3d.classes.dispatch'].cross3d is cross3d
+	assert isinstance(cross3d.migrate, types.ModuleType)
+
+def test_lazy_symbols():
+	assert 'application' in dir(cross3d)
+	assert isinstance(cross3d.application, cross3d.Application)
+	with pytest.raises(AttributeError):
+		cross3d.notASymbol
+
+def test_register_lazy_symbol():
+	cross3d.registerSymbol('RegistryTestLevels', 'cross3d.constants:DebugLevels', lazy=True)
+	cross3d.registerSymbol('RegistryTestMissing', 'cross3d.constants', lazy=True)
+	try:
+		assert 'RegistryTestLevels' not in vars(cross3d)
+		assert cross3d.RegistryTestLevels is cross3d.constants.DebugLevels
+		assert 'RegistryTestLevels' in vars(cross3d)
+		# The module does not register the symbol and no attribute was given.
+		with pytest.raises(ImportError):
+			cross3d.RegistryTestMissing
+	finally:
+		for name in ('RegistryTestLevels', 'RegistryTestMissing'):
+			cross3d._lazySymbols.pop(name, None)
+			vars(cross3d).pop(name, None)
+
+def test_connect_slot():
+	calls = []
+	slot = lambda: calls.append(True)
+	cross3d.dispatch.connect('layerCreated', slot)
+	try:
+		assert cross3d.dispatch.isConnected('layerCreated')
+		cross3d.dispatch.dispatch('layerCreated')
+		assert calls == [True]
+	finally:
+		cross3d.dispatch.disconnect('layerCreated', slot)
+	assert not cross3d.dispatch.isConnected('layerCreated')
+	assert not cross3d.dispatch.isConnected()
@@ -0,0 +1,126 @@
+import pytest
+
+from cross3d.classes.scenequery import ObjectQuery, first, walkChildren, wildcardToRegex
+
+GEOMETRY = 1
+CAMERA = 2
+
+class FakeNode(object):
+	""" An in-memory native node counting how many times the back-end reads it. """
+
+	def __init__(self, name, objectType=GEOMETRY, layer='0', selected=False, children=()):
+		self._name = name
+		self.objectType = objectType
+		self.layer = layer
+		self.selected = selected
+		self._children = list(children)
+		self.reads = 0
+
+	@property
+	def name(self):
+		self.reads += 1
+		return self._name
+
+	@property
+	def children(self):
+		self.reads += 1
+		return self._children
+
+
+class FakeScene(object):
+	""" A back-end over in-memory nodes, pushing the layer and type predicates down to its own
+	indexes like a host query would.
+	"""
+
+	def __init__(self, nodes):
+		self.nodes = nodes
+		self.visited = 0
+
+	def _stream(self, nodes):
+		for node in nodes:
+			self.visited += 1
+			yield node
+
+	def _iterNativeObjects(self, wildcard='', objectType=0, layer=None, selected=None):
+		if layer is not None:
+			nodes = [node for node in self.nodes if node.layer == layer]
+			applied = ('layer',)
+		elif objectType:
+			nodes = [node for node in self.nodes if node.objectType == objectType]
+			applied = ('objectType',)
+		else:
+			nodes = self.nodes
+			applied = ()
+		query = ObjectQuery(wildcard, objectType, layer, selected)
+		return query.filter(self._stream(nodes), applied, name=lambda node: node.name,
+							objectType=lambda node: node.objectType, layer=lambda node: node.layer,
+							selected=lambda node: node.selected)
+
+
+@pytest.fixture
+def scene():
+	nodes = []
+	for index in range(1000):
+		nodes.append(FakeNode('Box%03d' % index, layer='layer%d' % (index % 4), selected=index % 3 == 0))
+	nodes.append(FakeNode('Camera01', objectType=CAMERA, layer='cameras'))
+	return FakeScene(nodes)
+
+def test_wildcard_to_regex():
+	assert wildcardToRegex('Box*') == 'Box.*$'
+	assert wildcardToRegex('Box\\*') == 'Box\\*$'
+	assert ObjectQuery('box*').matchesName('Box001')
+	assert not ObjectQuery('Box').matchesName('Box001')
+
+def test_first_match_is_lazy(scene):
+	objects = scene._iterNativeObjects(wildcard='Box01*')
+	assert scene.visited == 0
+	assert first(objects).name == 'Box010'
+	assert scene.visited == 11
+
+def test_order_is_kept(scene):
+	names = [node.name for node in scene._iterNativeObjects(layer='layer1', selected=True)]
+	assert names == ['Box%03d' % index for index in range(1000) if index % 4 == 1 and index % 3 == 0]
+
+def test_pushed_down_predicates(scene):
+	cameras = list(scene._iterNativeObjects(objectType=CAMERA))
+	assert [node.name for node in cameras] == ['Camera01']
+	assert scene.visited == 1
+
+	# Applied predicates are not tested again.
+	assert cameras[0].reads == 1
+	list(scene._iterNativeObjects(objectType=CAMERA, wildcard='Cam*'))
+	assert cameras[0].reads == 2
+
+def test_unselected(scene):
+	assert len(list(scene._iterNativeObjects(selected=False))) == 1001 - 334
+
+def test_missing_accessor():
+	with pytest.raises(ValueError):
+		ObjectQuery(objectType=CAMERA).filter([], name=lambda node: node.name)
+	# Nothing to test, nothing to read.
+	assert list(ObjectQuery().filter([1, 2, 3])) == [1, 2, 3]
+
+def test_active_predicates():
+	query = ObjectQuery('Box*', CAMERA, 'layer0', False)
+	assert query.activePredicates() == ['selected', 'layer', 'wildcard', 'objectType']
+	assert query.activePredicates(('layer', 'objectType')) == ['selected', 'wildcard']
+
+def test_walk_children():
+	leaf = FakeNode('leaf')
+	root = FakeNode('root', children=[FakeNode('a', children=[FakeNode('a1', children=[leaf]), FakeNode('a2')]), FakeNode('b')])
+	walk = walkChildren(root, lambda node: node.children)
+	assert [node.name for node in walk] == ['a', 'a1', 'leaf', 'a2', 'b']
+	assert [node.name for node in walkChildren(root, lambda node: node.children, recursive=False)] == ['a', 'b']
+
+	# Only the branch leading to the first match is read.
+	reads = leaf.reads
+	assert first(walkChildren(root, lambda node: node.children)).name == 'a'
+	assert leaf.reads == reads
+
+def test_walk_deep_hierarchy():
+	root = node = FakeNode('root')
+	for index in range(5000):
+		child = FakeNode('node%d' % index)
+		node._children.append(child)
+		node = child
+	assert sum(1 for child in walkChildren(root, lambda node: node.children)) == 5000
@@ -0,0 +1,186 @@
+import gc
+import sys
+import time
+import threading
+
+import pytest
+
+from cross3d.classes.signalbus import ConnectionType, Signal, SignalBus, Thread, Timer
+
+class Bus(SignalBus):
+	sceneInvalidated = Signal()
+	objectRenamed = Signal(str, str, object)
+
+class Receiver(object):
+	def __init__(self):
+		self.calls = []
+
+	def slot(self, *args):
+		self.calls.append(args)
+
+	def renamed(self, oldName, newName):
+		self.calls.append((oldName, newName))
+
+def test_connect_emit():
+	bus = Bus()
+	calls = []
+	bus.objectRenamed.connect(lambda *args: calls.append(args))
+	bus.objectRenamed.emit('a', 'b', None)
+	assert calls == [('a', 'b', None)]
+	assert bus.objectRenamed is bus.objectRenamed
+	assert isinstance(Bus.objectRenamed, Signal)
+
+def test_extra_arguments_are_dropped():
+	bus = Bus()
+	receiver = Receiver()
+	bus.objectRenamed.connect(receiver.renamed)
+	calls = []
+	bus.objectRenamed.connect(lambda: calls.append(True))
+	bus.objectRenamed.emit('a', 'b', object())
+	assert receiver.calls == [('a', 'b')]
+	assert calls == [True]
+
+def test_priority():
+	bus = Bus()
+	order = []
+	bus.sceneInvalidated.connect(lambda: order.append('low'), priority=-1)
+	bus.sceneInvalidated.connect(lambda: order.append('first'))
+	bus.sceneInvalidated.connect(lambda: order.append('high'), priority=10)
+	bus.sceneInvalidated.connect(lambda: order.append('second'))
+	bus.sceneInvalidated.emit()
+	assert order == ['high', 'first', 'second', 'low']
+
+def test_weak_slots():
+	bus = Bus()
+	receiver = Receiver()
+	bus.sceneInvalidated.connect(receiver.slot)
+	assert len(bus.sceneInvalidated) == 1
+	calls = receiver.calls
+	del receiver
+	gc.collect()
+	assert len(bus.sceneInvalidated) == 0
+	bus.sceneInvalidated.emit()
+	assert calls == []
+
+	# A strong connection keeps the object alive.
+	receiver = Receiver()
+	bus.sceneInvalidated.connect(receiver.slot, weak=False)
+	calls = receiver.calls
+	del receiver
+	gc.collect()
+	assert len(bus.sceneInvalidated) == 1
+	bus.sceneInvalidated.emit()
+	assert calls == [()]
+
+def test_disconnect():
+	bus = Bus()
+	receiver = Receiver()
+	bus.sceneInvalidated.connect(receiver.slot)
+	bus.sceneInvalidated.disconnect(receiver.slot)
+	bus.sceneInvalidated.emit()
+	assert receiver.calls == []
+	with pytest.raises(TypeError):
+		bus.sceneInvalidated.disconnect(receiver.slot)
+	bus.sceneInvalidated.connect(receiver.slot)
+	bus.sceneInvalidated.disconnect()
+	assert len(bus.sceneInvalidated) == 0
+
+def test_block_signals():
+	bus = Bus()
+	receiver = Receiver()
+	bus.sceneInvalidated.connect(receiver.slot)
+	assert bus.blockSignals(True) is False
+	bus.sceneInvalidated.emit()
+	assert bus.signalsBlocked()
+	assert bus.blockSignals(False) is True
+	bus.sceneInvalidated.emit()
+	assert receiver.calls == [()]
+
+def test_custom_signals():
+	bus = Bus()
+	receiver = Receiver()
+	bus.signal('valueChanged').connect(receiver.slot)
+	bus.signal('valueChanged').emit(1, 2)
+	assert receiver.calls == [(1, 2)]
+	assert bus.signal('sceneInvalidated') is bus.sceneInvalidated
+
+def test_slot_exceptions():
+	bus = Bus()
+	errors = []
+	calls = []
+	bus.sceneInvalidated.connect(lambda: 1 / 0)
+	bus.sceneInvalidated.connect(lambda: calls.append(True))
+	excepthook = sys.excepthook
+	sys.excepthook = lambda *info: errors.append(info[0])
+	try:
+		bus.sceneInvalidated.emit()
+	finally:
+		sys.excepthook = excepthook
+	assert errors == [ZeroDivisionError]
+	assert calls == [True]
+
+def test_queued_delivery():
+	bus = Bus()
+	receiver = Receiver()
+	bus.sceneInvalidated.connect(receiver.slot, connectionType=ConnectionType.Queued)
+	bus.sceneInvalidated.emit()
+	assert receiver.calls == []
+	assert bus.processEvents() == 1
+	assert receiver.calls == [()]
+
+def test_auto_connections_across_threads():
+	bus = Bus()
+	calls = []
+	bus.objectRenamed.connect(lambda *args: calls.append((args, threading.current_thread())))
+
+	def emitter():
+		for index in range(1000):
+			bus.objectRenamed.emit('a', str(index), None)
+
+	threads = [threading.Thread(target=emitter) for index in range(4)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	# The calls were queued and are made in the thread of the bus.
+	assert calls == []
+	assert bus.pendingEvents() == 4000
+	assert bus.processEvents(maximum=10) == 10
+	assert bus.processEvents() == 3990
+	assert len(calls) == 4000
+	assert set(thread for args, thread in calls) == set([threading.current_thread()])
+
+def test_timer():
+	bus = Bus()
+	calls = []
+	timer = Timer(bus)
+	timer.setSingleShot(True)
+	timer.timeout.connect(lambda: calls.append(True))
+	timer.start(0)
+	assert timer.isActive()
+	time.sleep(0.01)
+	bus.processEvents()
+	bus.processEvents()
+	assert calls == [True]
+	assert not timer.isActive()
+
+	timer.start(10000)
+	timer.stop()
+	bus.processEvents()
+	assert calls == [True]
+
+def test_thread():
+	class Worker(Thread):
+		finished = Signal(int)
+
+		def run(self):
+			self.finished.emit(42)
+
+	results = []
+	worker = Worker()
+	worker.finished.connect(results.append, connectionType=ConnectionType.Queued)
+	worker.start()
+	assert worker.wait(5000)
+	worker.processEvents()
+	assert results == [42]
@@ -0,0 +1,62 @@
+import pytest
+
+# These tests drive a live 3ds Max session.
+Py3dsMax = pytest.importorskip('Py3dsMax')
+mxs = Py3dsMax.mxs
+
+import cross3d
+
+@pytest.fixture
+def scene():
+	mxs.resetMaxFile(mxs.pyhelper.namify('noPrompt'))
+	return cross3d.Scene()
+
+def test_prop_set_override_after_undo(scene):
+	box = mxs.Box(name='propSetUndo')
+	propSet = cross3d.SceneObjectPropSet(scene, None)
+	propSet.setValue('renderable', False)
+	propSet.activateProperty('renderable', True)
+
+	scene._setNativePropSetOverride([box], propSet)
+	assert not box.renderable
+
+	# What max undo restores, the override was not recorded on the undo stack.
+	box.renderable = True
+	scene.undo()
+
+	# The values written before the undo are forgotten, the override is written again.
+	scene._setNativePropSetOverride([box], propSet)
+	assert not box.renderable
+
+def test_material_override_reused(scene):
+	box = mxs.Box(name='materialOverride', material=mxs.StandardMaterial(name='base'))
+	first = mxs.StandardMaterial(name='first')
+	second = mxs.StandardMaterial(name='second')
+
+	# Switching between overrides, like switching render layers, reuses the copies built before.
+	scene._setNativeMaterialOverride([box], first)
+	built = box.material
+	scene._clearNativeMaterialOverride([box])
+	scene._setNativeMaterialOverride([box], second)
+	scene._clearNativeMaterialOverride([box])
+	scene._setNativeMaterialOverride([box], first)
+	assert box.material == built
+	assert scene._materialOverrideCache().hits
+
+	# The copies are built again once the scene was invalidated.
+	cross3d.dispatch.dispatch('sceneInvalidated')
+	scene._clearNativeMaterialOverride([box])
+	scene._setNativeMaterialOverride([box], first)
+	assert box.material != built
+
+def test_render_frame_range_step(scene):
+	scene.setRenderFrameRange(cross3d.FrameSet('1-9x2'))
+	assert mxs.rendNThFrame == 2
+
+	# The step of a stepped set does not stay for the ranges set afterwards.
+	scene.setRenderFrameRange(cross3d.FrameRange([10, 20]))
+	assert mxs.rendNThFrame == 1
+
+	scene.setRenderFrameRange(cross3d.FrameSet('1-9x2'))
+	scene.setRenderFrameRange(cross3d.FrameSet('5'))
+	assert mxs.rendNThFrame == 1
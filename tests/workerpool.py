@@ -0,0 +1,73 @@
+import imp
+import os
+import sys
+import time
+
+import pytest
+
+from cross3d import Exceptions
+from cross3d.classes import workerprocess
+from cross3d.classes.workerpool import Worker, WorkerPool
+
+# Runs the worker in a plain python interpreter instead of a 3d application.
+STAND_IN_COMMAND = [sys.executable, os.path.splitext(workerprocess.__file__)[0] + '.py']
+
+@pytest.fixture
+def pool():
+	pool = WorkerPool(STAND_IN_COMMAND, workers=2, maxJobs=3, startTimeout=30)
+	yield pool
+	pool.close()
+
+def test_result(pool):
+	assert pool.run('result = 6 * 7') == 42
+	assert pool.run('import os\nresult = os.getpid()') != os.getpid()
+
+def test_script_path(pool, tmpdir):
+	script = tmpdir.join('job.py')
+	script.write('result = __file__')
+	assert pool.run(str(script)) == str(script)
+
+def test_exception(pool):
+	with pytest.raises(Exceptions.ScriptFailed) as info:
+		pool.run('raise ValueError("bad value")')
+	assert 'ValueError: bad value' in str(info.value)
+	assert 'Traceback' in info.value.traceback
+	# The worker survives a failed job.
+	assert pool.run('result = 1') == 1
+
+def test_recycle():
+	with WorkerPool(STAND_IN_COMMAND, workers=1, maxJobs=3, startTimeout=30) as pool:
+		pids = [pool.run('import os\nresult = os.getpid()') for i in range(6)]
+	assert len(set(pids[:3])) == 1
+	assert len(set(pids[3:])) == 1
+	assert pids[0] != pids[3]
+
+def test_timeout(pool):
+	with pytest.raises(Exceptions.WorkerError):
+		pool.run('import time\ntime.sleep(30)', timeout=0.5)
+	assert pool.run('result = "recovered"') == 'recovered'
+
+def test_unsupported_language(pool):
+	with pytest.raises(Exceptions.ScriptFailed):
+		pool.run('print "hello";', language='MAXScript')
+
+def test_import_does_not_run(tmpdir):
+	# A job script importing the worker module by path inherits the variables of its process.
+	path = str(tmpdir.join('job.json'))
+	os.environ[workerprocess.JOB_VARIABLE] = path
+	try:
+		imp.load_source('cross3d_workerprocess_copy', STAND_IN_COMMAND[1])
+	finally:
+		del os.environ[workerprocess.JOB_VARIABLE]
+		sys.modules.pop('cross3d_workerprocess_copy', None)
+	assert not os.path.exists(path)
+
+def test_worker_exits_on_start():
+	# A worker failing to start is reported with its output, without waiting for the start timeout.
+	command = [sys.executable, '-c', 'import sys; sys.stderr.write("no host license\\n"); sys.exit(3)']
+	start = time.time()
+	with pytest.raises(Exceptions.WorkerError) as info:
+		Worker(command, startTimeout=30)
+	assert time.time() - start < 10
+	assert 'code 3' in str(info.value)
+	assert 'no host license' in str(info.value)
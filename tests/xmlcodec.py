@@ -0,0 +1,141 @@
+import sys
+
+import pytest
+
+from cross3d.migrate.XML import codec, ETreeDocument
+
+# Evaluating this text would register a module, which the tests check never happens.
+PROBE = "__import__('sys').modules.__setitem__('cross3dCodecProbe', 1)"
+
+@pytest.fixture
+def element():
+	return ETreeDocument().addNode('value')
+
+@pytest.mark.parametrize('value', [0, -12, 2 ** 70, 0.1, -1e300, True, False, 'text', u'caf\xe9', None])
+def test_basic_round_trip(value):
+	typeName, text = codec.encodeBasic(value)
+	assert typeName in codec.DECODERS
+	assert isinstance(text, basestring)
+	decoded = codec.decodeBasic(typeName, text)
+	assert decoded == value
+	assert type(decoded) in (type(value), unicode)
+
+def test_tables():
+	# Every encoded type name can be decoded, and only the listed types are basic.
+	for valtype, (typeName, method) in codec.ENCODERS.items():
+		assert codec.isBasicType(valtype)
+		assert typeName in codec.DECODERS
+	for valtype in (list, tuple, dict, set, object):
+		assert not codec.isBasicType(valtype)
+	assert codec.encodeBasic(u'text') == ('str', u'text')
+	assert codec.encodeBasic(0.1) == ('float', u'0.1')
+
+@pytest.mark.parametrize('typeName, text, expected', [
+	('int', '1.0', 1),
+	('int', ' 7 ', 7),
+	('bool', 'true', True),
+	('bool', '0', False),
+	('bool', '', False),
+	('QString', 'text', u'text'),
+	('NoneType', 'None', None),
+])
+def test_decode_legacy(typeName, text, expected):
+	assert codec.decodeBasic(typeName, text) == expected
+
+@pytest.mark.parametrize('typeName, text', [
+	('int', 'twelve'),
+	('int', PROBE),
+	('float', '1,5'),
+	('float', PROBE),
+	('bool', 'yes'),
+	('bool', PROBE),
+	('long', PROBE),
+	('tuple', '(1, 2)'),
+	('eval', PROBE),
+	('', PROBE),
+])
+def test_malformed_basic(typeName, text):
+	fail = object()
+	assert codec.decodeBasic(typeName, text, fail) is fail
+	assert 'cross3dCodecProbe' not in sys.modules
+
+@pytest.mark.parametrize('typeName, text', [
+	('int', PROBE),
+	('tuple', '(1, 2)'),
+	('set', PROBE),
+	('function', PROBE),
+])
+def test_malformed_element(element, typeName, text):
+	element.setAttribute('type', typeName)
+	element.setAttribute('value', text)
+	assert element.restoreValue('fail') == 'fail'
+	assert 'cross3dCodecProbe' not in sys.modules
+
+ARRAYS = [
+	([1, -2, 3], 'int'),
+	([2 ** 40, -sys.maxint - 1, sys.maxint], 'int'),
+	([0.1, -2.5, 1e-300], 'float'),
+]
+
+@pytest.mark.parametrize('values, itemType, encoding', [
+	(values, itemType, encoding) for values, itemType in ARRAYS for encoding in (codec.TEXT_ENCODING, codec.BASE64_ENCODING)
+])
+def test_array_round_trip(element, values, itemType, encoding):
+	assert codec.arrayItemType(values) == itemType
+	assert codec.decodeArray(codec.encodeArray(values, itemType, encoding), itemType, encoding) == values
+
+	element.recordValue(values, compact=True, encoding=encoding)
+	assert element.attribute('type') == codec.ARRAY_TYPE
+	assert element.attribute('itemType') == itemType
+	assert element.attribute('encoding') == encoding
+	assert element.children() == []
+	assert element.restoreValue() == values
+
+def test_array_text_form():
+	assert codec.encodeArray([1, 2, 3], 'int') == '1 2 3'
+	assert codec.encodeArray([0.1, 2.0], 'float') == '0.1 2.0'
+	# The encoding attribute defaults to text for documents that do not record it.
+	element = ETreeDocument().addNode('value')
+	element.setAttribute('type', codec.ARRAY_TYPE)
+	element.setAttribute('itemType', 'int')
+	element.setAttribute('value', '4 5 6')
+	assert element.restoreValue() == [4, 5, 6]
+
+@pytest.mark.parametrize('values', [
+	[],
+	[1, 2.0],
+	[True, False],
+	[1, 'two'],
+	[[1, 2]],
+])
+def test_array_not_compact(element, values):
+	assert codec.arrayItemType(values) is None
+	element.recordValue(values, compact=True)
+	assert element.attribute('type') == 'list'
+	assert element.restoreValue() == values
+
+def test_array_out_of_range(element):
+	# Values that do not fit the 64 bit base64 encoding are longs, and are stored as a list.
+	values = [1, 2 ** 63]
+	assert not codec.canPackArray(values, 'int')
+	assert codec.arrayItemType(values) is None
+	element.recordValue(values, compact=True, encoding=codec.BASE64_ENCODING)
+	assert element.attribute('type') == 'list'
+	assert element.restoreValue() == values
+
+@pytest.mark.parametrize('itemType, encoding, text', [
+	('int', codec.TEXT_ENCODING, '1 two 3'),
+	('int', codec.TEXT_ENCODING, PROBE),
+	('float', codec.TEXT_ENCODING, '0.5 [1]'),
+	('int', codec.BASE64_ENCODING, 'not base64!'),
+	('bool', codec.TEXT_ENCODING, '1 0 1'),
+	('str', codec.TEXT_ENCODING, 'a b'),
+	('int', 'hex', '0x01'),
+])
+def test_malformed_array(element, itemType, encoding, text):
+	element.setAttribute('type', codec.ARRAY_TYPE)
+	element.setAttribute('itemType', itemType)
+	element.setAttribute('encoding', encoding)
+	element.setAttribute('value', text)
+	assert element.restoreValue('fail') == 'fail'
+	assert 'cross3dCodecProbe' not in sys.modules
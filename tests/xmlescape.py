@@ -0,0 +1,19 @@
+import pytest
+
+from cross3d.migrate.XML.minidom import escape, unescape
+
+@pytest.mark.parametrize('value', [
+	'plain',
+	'a & b',
+	'"quoted" & <bracketed>',
+	'&quot; is not a quote',
+	'line one\nline two\r\n\tindented',
+	'&amp;&lt;&gt;',
+])
+def test_round_trip(value):
+	assert unescape(escape(value)) == value
+
+def test_escape():
+	# Ampersands are replaced first, so the entities of the other characters are not escaped again.
+	assert escape('"a" & <b>') == '&quot;a&quot; &amp; &lt;b&gt;'
+	assert escape('\n') == '&#xA;'
@@ -0,0 +1,138 @@
+import xml.dom.minidom
+
+import pytest
+
+from cross3d.migrate.XML import ETreeDocument, XMLStreamWriter, escape
+
+# Attribute values the minidom backend escapes, including values that already look escaped.
+ATTRIBUTES = {
+	'quotes': 'say "hello"',
+	'markup': '<a href="x">b & c</a>',
+	'entities': '&amp; &quot; &#xA;',
+	'whitespace': 'line one\nline two\r\n\tindented',
+	'unicode': u'caf\xe9 \u2713',
+}
+
+PROPERTIES = {
+	'count': 12,
+	'big': 2 ** 70,
+	'ratio': 0.1,
+	'enabled': False,
+	'nothing': None,
+	'name': u'"hero" & <sidekick>',
+	'items': [1, 'two', 3.0, [True, None]],
+	'settings': {'wireColor': [255, 128, 64], 'tag': 'hero|geo', 'nested': {'depth': 2}},
+}
+
+def buildDocument(document):
+	root = document.addNode('scene')
+	root.setAttribute('version', 2)
+	for key, value in sorted(ATTRIBUTES.items()):
+		root.setAttribute(key, value)
+	layer = root.addNode('layer')
+	layer.setAttribute('name', 'Layer_001')
+	for key, value in sorted(PROPERTIES.items()):
+		layer.recordProperty(key, value)
+	layer.recordProperty('positions', [0.5, 1.25, -3.0] * 4, compact=True)
+	layer.recordProperty('ids', [1, -2, 3] * 4, compact=True, encoding='base64')
+	layer.addNode('object').setAttribute('name', 'Box001')
+	layer.addNode('object').setAttribute('name', 'Box002')
+	return document
+
+def checkDocument(document):
+	root = document.root()
+	assert root.name() == 'scene'
+	assert root.attribute('version') == '2'
+	for key, value in ATTRIBUTES.items():
+		assert root.attribute(key) == value
+	layer = root.findChild('layer')
+	assert layer.attribute('name') == 'Layer_001'
+	assert layer.childNames() == sorted(PROPERTIES) + ['positions', 'ids', 'object', 'object']
+	for key, value in PROPERTIES.items():
+		assert layer.restoreProperty(key) == value
+	assert layer.restoreProperty('positions') == [0.5, 1.25, -3.0] * 4
+	assert layer.restoreProperty('ids') == [1, -2, 3] * 4
+	objects = root.findChildren('object', recursive=True)
+	assert [obj.attribute('name') for obj in objects] == ['Box001', 'Box002']
+	assert objects[1].parent().attribute('name') == 'Layer_001'
+	assert document.findElementById('layer_001::box002').attribute('name') == 'Box002'
+
+def test_parse():
+	document = buildDocument(ETreeDocument())
+	checkDocument(document)
+	for text in (document.toxml(), document.toprettyxml()):
+		parsed = ETreeDocument()
+		assert parsed.parse(text)
+		checkDocument(parsed)
+
+@pytest.mark.parametrize('pretty', [True, False])
+def test_save_load(tmpdir, pretty):
+	path = str(tmpdir.join('scene.xml'))
+	assert buildDocument(ETreeDocument()).save(path, pretty=pretty)
+	document = ETreeDocument()
+	assert document.load(path)
+	checkDocument(document)
+	# Saving the loaded document again does not change it.
+	again = str(tmpdir.join('again.xml'))
+	assert document.save(again, pretty=pretty)
+	assert open(again, 'rb').read() == open(path, 'rb').read()
+
+def test_edit():
+	document = buildDocument(ETreeDocument())
+	layer = document.root().findChild('layer')
+	layer.recordProperty('count', 13)
+	assert layer.findChildren('count')[0].restoreValue() == 13
+	assert len(layer.findChildren('count')) == 1
+	assert layer.addComment('comments are not children')
+	assert layer.childNames()[-3:] == ['object', 'object', 'count']
+	layer.findChild('object').remove()
+	assert [obj.attribute('name') for obj in layer.findChildren('object')] == ['Box002']
+	copy = document.root().addNode('copy')
+	copy.addChild(layer)
+	assert copy.findChild('layer').restoreProperty('settings') == PROPERTIES['settings']
+	assert document.root().index(copy) == 1
+
+@pytest.mark.parametrize('pretty', [True, False])
+def test_stream_writer(tmpdir, pretty):
+	path = str(tmpdir.join('stream.xml'))
+	with XMLStreamWriter(path, 'scene', ATTRIBUTES, pretty=pretty) as writer:
+		for index in range(3):
+			element = writer.addNode('layer')
+			element.setAttribute('name', 'Layer_%03d' % index)
+			for key, value in PROPERTIES.items():
+				element.recordProperty(key, value)
+			writer.write(element)
+
+	document = ETreeDocument()
+	assert document.load(path)
+	root = document.root()
+	for key, value in ATTRIBUTES.items():
+		assert root.attribute(key) == value
+	layers = root.children()
+	assert [layer.attribute('name') for layer in layers] == ['Layer_000', 'Layer_001', 'Layer_002']
+	for layer in layers:
+		for key, value in PROPERTIES.items():
+			assert layer.restoreProperty(key) == value
+
+def test_minidom_compatible():
+	# Attributes are escaped before they are stored, like the minidom backend does, so a file
+	# written by either backend reads back the same values in the other one.
+	document = buildDocument(ETreeDocument())
+	root = xml.dom.minidom.parseString(document.toxml().encode('utf-8')).documentElement
+	for key, value in ATTRIBUTES.items():
+		assert root.getAttribute(key) == escape(value)
+	layer = root.getElementsByTagName('layer')[0]
+	count = [node for node in layer.childNodes if node.nodeName == 'count'][0]
+	assert count.getAttribute('type') == 'int'
+	assert count.getAttribute('value') == '12'
+
+def test_minidom_backend():
+	pytest.importorskip('blurdev.XML.minidom')
+	from cross3d.migrate.XML.xmldocument import XMLDocument
+	etreeText = buildDocument(ETreeDocument()).toxml()
+	minidomText = buildDocument(XMLDocument()).toxml()
+	for text in (etreeText, minidomText):
+		for cls in (ETreeDocument, XMLDocument):
+			document = cls()
+			assert document.parse(text)
+			checkDocument(document)